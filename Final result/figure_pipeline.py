@@ -0,0 +1,595 @@
+#!/usr/bin/env python3
+"""
+Data-driven figure pipeline for slides, report and thesis.
+
+Every figure is a pure function of an analysis-result table computed from the
+long-format dataset (`final_analysis/Analysis long finals-.xlsx`); nothing is
+copied by hand from .tex files. Each figure spec is rendered once per variant:
+
+- slide  -> `Final result/slide_assets/`   (16:9, large type, titled)
+- report -> `Final result/report_assets/`  (same look as slides, smaller canvas)
+- thesis -> `final_thesis/Images/`         (print size, no titles - LaTeX captions)
+
+Renders run in a process pool with the Agg backend. Each output directory keeps
+a `.figure_hashes.json` manifest of input hashes (table content + the source of
+this module, so shared helpers count too + variant settings), and figures whose
+hash is unchanged are skipped.
+
+Usage:
+    python3 figure_pipeline.py                     # all figures, all variants
+    python3 figure_pipeline.py --variant slide     # one variant
+    python3 figure_pipeline.py --only slide1 A1_plot_mcq_accuracy --force
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+
+# Writable Matplotlib cache outside the repo (avoids warnings / slowdowns without
+# leaving a font cache next to the figures)
+os.environ.setdefault("MPLCONFIGDIR", os.path.join(tempfile.gettempdir(), "figure_pipeline-mplconfig"))
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+LONG_XLSX = REPO_ROOT / "final_analysis" / "Analysis long finals-.xlsx"
+
+TIMING_ORDER = ["pre_reading", "synchronous", "post_reading"]
+TIMING_LABELS = {"pre_reading": "Pre-reading", "synchronous": "Synchronous", "post_reading": "Post-reading"}
+STRUCTURE_ORDER = ["integrated", "segmented"]
+STRUCTURE_COLORS = {"integrated": "#0B3D91", "segmented": "#FF8C00"}
+ARTICLE_LABELS = {"uhi": "UHI", "crispr": "CRISPR", "semiconductors": "Semiconductors"}
+
+BG_AXES = "#F5F7FA"
+GRID = "#DDE3EA"
+
+
+@dataclass(frozen=True)
+class Variant:
+    name: str
+    outdir: Path
+    figsize: tuple
+    dpi: int
+    font_scale: float
+    titles: bool
+
+
+VARIANTS: Dict[str, Variant] = {
+    "slide": Variant("slide", SCRIPT_DIR / "slide_assets", (9.6, 5.4), 200, 1.0, True),
+    "report": Variant("report", SCRIPT_DIR / "report_assets", (8.0, 5.0), 200, 0.95, True),
+    "thesis": Variant("thesis", REPO_ROOT / "final_thesis" / "Images", (6.4, 4.2), 300, 0.9, False),
+}
+
+
+@dataclass(frozen=True)
+class FigureSpec:
+    name: str
+    filename: str
+    table: Callable[[pd.DataFrame], pd.DataFrame]
+    plot: Callable
+    title: str
+    variants: tuple = ("slide", "report", "thesis")
+    options: tuple = ()
+
+
+# ============================================================================
+# Data + analysis-result tables
+# ============================================================================
+def load_long_data(path: Path = LONG_XLSX) -> pd.DataFrame:
+    """Load the long dataset and add the derived timing columns used by the R scripts."""
+    df = pd.read_excel(path)
+    for col in df.columns:
+        if col not in ("participant_id", "experiment_group", "structure", "timing", "article"):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    df["reading_time_sec"] = df["reading_time_min"] * 60.0
+    df["total_time_sec"] = df["reading_time_sec"] + df["summary_time_sec"].fillna(0)
+    df["summary_prop"] = df["summary_time_sec"] / df["total_time_sec"]
+    return df
+
+
+def _ai_rows(df: pd.DataFrame) -> pd.DataFrame:
+    return df[(df["experiment_group"] == "AI") & df["timing"].isin(TIMING_ORDER)]
+
+
+def _describe(groups) -> pd.DataFrame:
+    out = groups.agg(n="count", mean="mean", sd="std").reset_index()
+    out["se"] = out["sd"] / np.sqrt(out["n"])
+    out["ci95"] = stats.t.ppf(0.975, np.maximum(out["n"] - 1, 1)) * out["se"]
+    return out
+
+
+def table_timing_means(dv: str) -> Callable[[pd.DataFrame], pd.DataFrame]:
+    """Mean / SD / 95% CI of `dv` by timing (AI group, structures pooled)."""
+    def build(df: pd.DataFrame) -> pd.DataFrame:
+        out = _describe(_ai_rows(df).groupby("timing")[dv])
+        return out.set_index("timing").reindex(TIMING_ORDER).reset_index()
+    build.__name__ = f"table_timing_means[{dv}]"
+    return build
+
+
+def table_cell_descriptives(dv: str) -> Callable[[pd.DataFrame], pd.DataFrame]:
+    """Structure x Timing cell descriptives of `dv` (as in the A1_descriptives_* tables)."""
+    def build(df: pd.DataFrame) -> pd.DataFrame:
+        out = _describe(_ai_rows(df).groupby(["structure", "timing"])[dv])
+        out["timing"] = pd.Categorical(out["timing"], TIMING_ORDER, ordered=True)
+        return out.sort_values(["structure", "timing"]).reset_index(drop=True)
+    build.__name__ = f"table_cell_descriptives[{dv}]"
+    return build
+
+
+def table_structure_lures(df: pd.DataFrame) -> pd.DataFrame:
+    """False lures selected and false-lure accuracy by structure (participant means across timing)."""
+    per_subject = (_ai_rows(df)
+                   .groupby(["participant_id", "structure"])[["false_lures_selected", "false_lure_accuracy"]]
+                   .mean().reset_index())
+    out = per_subject.groupby("structure").agg(
+        n=("participant_id", "count"),
+        mean_lures=("false_lures_selected", "mean"),
+        mean_acc=("false_lure_accuracy", "mean"),
+    ).reindex(STRUCTURE_ORDER).reset_index()
+    return out
+
+
+def table_summary_engagement(df: pd.DataFrame) -> pd.DataFrame:
+    """Summary time, summary share, reading time and total time by timing."""
+    ai = _ai_rows(df)
+    out = ai.groupby("timing")[["summary_time_sec", "summary_prop", "reading_time_min", "reading_time_sec",
+                                "total_time_sec"]].mean()
+    return out.reindex(TIMING_ORDER).reset_index()
+
+
+def table_leave_one_article_out(df: pd.DataFrame) -> pd.DataFrame:
+    """Pre - Sync contrast in MCQ accuracy with each article dropped.
+
+    Trial-level OLS with timing, article and participant fixed effects (the
+    within-subject analogue of the LMM used in the report).
+    """
+    ai = _ai_rows(df)
+    rows = []
+    for article in ["semiconductors", "uhi", "crispr"]:
+        kept = ai[ai["article"] != article].dropna(subset=["mcq_accuracy"])
+        X = pd.get_dummies(kept[["timing", "article", "participant_id"]], drop_first=True, dtype=float)
+        X.insert(0, "intercept", 1.0)
+        design = X.to_numpy()
+        y = kept["mcq_accuracy"].to_numpy(dtype=float)
+        beta, *_ = np.linalg.lstsq(design, y, rcond=None)
+        resid = y - design @ beta
+        dof = len(y) - np.linalg.matrix_rank(design)
+
+        contrast = np.zeros(len(beta))
+        columns = list(X.columns)
+        if "timing_pre_reading" in columns:
+            contrast[columns.index("timing_pre_reading")] += 1.0
+        if "timing_synchronous" in columns:
+            contrast[columns.index("timing_synchronous")] -= 1.0
+        delta = float(contrast @ beta)
+        if dof > 0:
+            cov = (resid @ resid / dof) * np.linalg.pinv(design.T @ design)
+            t_stat = delta / np.sqrt(contrast @ cov @ contrast)
+            p_val = float(2 * stats.t.sf(abs(t_stat), dof))
+        else:
+            t_stat, p_val = np.nan, np.nan
+        rows.append({"dropped": article, "n_trials": len(y), "delta": delta, "t": t_stat, "p": p_val})
+    return pd.DataFrame(rows)
+
+
+def table_article_difficulty(df: pd.DataFrame) -> pd.DataFrame:
+    """MCQ accuracy by article and experiment group."""
+    out = _describe(df.groupby(["article", "experiment_group"])["mcq_accuracy"])
+    return out.sort_values(["article", "experiment_group"]).reset_index(drop=True)
+
+
+def table_counterbalancing(df: pd.DataFrame) -> pd.DataFrame:
+    """Count of AI trials per article x timing (checks the counterbalancing)."""
+    counts = _ai_rows(df).groupby(["article", "timing"]).size().unstack("timing").reindex(columns=TIMING_ORDER)
+    return counts.fillna(0).astype(int).reset_index()
+
+
+def table_lure_probability(df: pd.DataFrame) -> pd.DataFrame:
+    """Probability of selecting at least one false lure per trial, by structure x timing."""
+    ai = _ai_rows(df).copy()
+    ai["any_lure"] = (ai["false_lures_selected"] > 0).astype(float)
+    return table_cell_descriptives("any_lure")(ai)
+
+
+def table_recall_calibration(df: pd.DataFrame) -> pd.DataFrame:
+    """Trial-level recall confidence vs recall score, tagged by group."""
+    cols = ["participant_id", "experiment_group", "structure", "recall_confidence", "recall_total_score"]
+    out = df[cols].dropna(subset=["recall_confidence", "recall_total_score"]).copy()
+    out["group"] = np.where(out["experiment_group"] == "AI", out["structure"], "control")
+    return out.sort_values(["group", "participant_id"]).reset_index(drop=True)
+
+
+# ============================================================================
+# Plot helpers (run inside worker processes)
+# ============================================================================
+def _style_axes(ax, grid_axis="y"):
+    ax.set_facecolor(BG_AXES)
+    ax.grid(axis=grid_axis, color=GRID, linewidth=0.8)
+    ax.set_axisbelow(True)
+
+
+def _new_figure(variant: Variant, ncols=1, width_scale=1.0):
+    import matplotlib.pyplot as plt
+
+    plt.rcParams.update({"font.size": 10 * variant.font_scale})
+    w, h = variant.figsize
+    fig, axes = plt.subplots(1, ncols, figsize=(w * width_scale, h), dpi=variant.dpi)
+    fig.patch.set_facecolor("white")
+    return fig, axes
+
+
+def plot_timing_bars(table: pd.DataFrame, variant: Variant, title: str, ylabel: str = "", ylim=None):
+    fig, ax = _new_figure(variant)
+    _style_axes(ax)
+    x = np.arange(len(table))
+    means = table["mean"].to_numpy(dtype=float)
+    ax.bar(x, means, yerr=table["ci95"].to_numpy(dtype=float), capsize=6, color="#0066CC",
+           edgecolor="#0B3D91", linewidth=1.0)
+    ax.set_xticks(x, [TIMING_LABELS.get(t, t) for t in table["timing"]], rotation=15, ha="right")
+    if ylim:
+        ax.set_ylim(*ylim)
+    ax.set_ylabel(ylabel)
+    if variant.titles:
+        ax.set_title(title)
+    offset = 0.03 * (ylim[1] - ylim[0]) if ylim else 0.03 * np.nanmax(means)
+    for i, value in enumerate(means):
+        ax.text(i, value + offset, f"{value:.3f}", ha="center", va="bottom", fontsize=10 * variant.font_scale,
+                color="#0B3D91")
+    ax.text(0.99, 0.02, "Error bars: 95% CI", transform=ax.transAxes, ha="right", va="bottom",
+            fontsize=9 * variant.font_scale, color="#333333")
+    return fig
+
+
+def plot_cell_interaction(table: pd.DataFrame, variant: Variant, title: str, ylabel: str = "", ylim=None):
+    fig, ax = _new_figure(variant)
+    _style_axes(ax)
+    x = np.arange(len(TIMING_ORDER))
+    for j, structure in enumerate(STRUCTURE_ORDER):
+        sub = table[table["structure"] == structure].set_index("timing").reindex(TIMING_ORDER)
+        ax.errorbar(x + (j - 0.5) * 0.08, sub["mean"].to_numpy(dtype=float), yerr=sub["se"].to_numpy(dtype=float),
+                    marker="o", markersize=7, linewidth=2, capsize=5, color=STRUCTURE_COLORS[structure],
+                    label=structure.title())
+    ax.set_xticks(x, [TIMING_LABELS[t] for t in TIMING_ORDER])
+    if ylim:
+        ax.set_ylim(*ylim)
+    ax.set_ylabel(f"{ylabel} (Mean ± SE)" if ylabel else "Mean ± SE")
+    ax.legend(title="Structure")
+    if variant.titles:
+        ax.set_title(title)
+    return fig
+
+
+def plot_structure_lures(table: pd.DataFrame, variant: Variant, title: str):
+    fig, axes = _new_figure(variant, ncols=2, width_scale=1.17)
+    labels = table["structure"].str.title().tolist()
+    colors = [STRUCTURE_COLORS[s] for s in table["structure"]]
+    for ax in axes:
+        _style_axes(ax)
+
+    axes[0].bar(labels, table["mean_lures"], color=colors, edgecolor="#222222")
+    axes[0].set_title("False lures selected (lower is better)")
+    axes[0].set_ylabel("Mean per article")
+    for i, value in enumerate(table["mean_lures"].to_numpy(dtype=float)):
+        axes[0].text(i, value + 0.03, f"{value:.2f}", ha="center", va="bottom", fontsize=10 * variant.font_scale)
+
+    axes[1].bar(labels, table["mean_acc"], color=colors, edgecolor="#222222")
+    axes[1].set_title("False-lure accuracy (higher is better)")
+    axes[1].set_ylabel("Proportion correct")
+    axes[1].set_ylim(0, 1.0)
+    for i, value in enumerate(table["mean_acc"].to_numpy(dtype=float)):
+        axes[1].text(i, value + 0.03, f"{value:.3f}", ha="center", va="bottom", fontsize=10 * variant.font_scale)
+
+    if variant.titles:
+        fig.suptitle(title, fontsize=14 * variant.font_scale, y=1.02)
+    return fig
+
+
+def plot_summary_engagement(table: pd.DataFrame, variant: Variant, title: str):
+    fig, axes = _new_figure(variant, ncols=2, width_scale=1.17)
+    labels = [TIMING_LABELS[t] for t in table["timing"]]
+    share = table["summary_prop"].to_numpy(dtype=float) * 100.0
+    summary_time = table["summary_time_sec"].to_numpy(dtype=float)
+    total_time = table["total_time_sec"].to_numpy(dtype=float)
+    reading_min = table["reading_time_min"].to_numpy(dtype=float)
+
+    _style_axes(axes[0])
+    axes[0].bar(labels, share, color="#0066CC", edgecolor="#0B3D91")
+    axes[0].set_title("Summary share of total time (%)")
+    axes[0].set_ylabel("Share (%)")
+    axes[0].set_ylim(0, max(30, float(np.nanmax(share)) + 5))
+    for i, value in enumerate(share):
+        axes[0].text(i, value + 0.7, f"{value:.1f}%", ha="center", va="bottom", fontsize=10 * variant.font_scale,
+                     color="#0B3D91")
+
+    _style_axes(axes[1])
+    axes[1].bar(labels, summary_time, color="#34B27D", edgecolor="#1C7A52")
+    axes[1].set_title("Summary viewing time (seconds)")
+    axes[1].set_ylabel("Seconds")
+    for i, value in enumerate(summary_time):
+        axes[1].text(i, value + 4, f"{value:.1f}s", ha="center", va="bottom", fontsize=10 * variant.font_scale,
+                     color="#1C7A52")
+
+    ax2 = axes[1].twinx()
+    ax2.plot(labels, total_time, color="#FF8C00", marker="o", linewidth=2, label="Total time")
+    ax2.set_ylabel("Total time (s)")
+    ax2.tick_params(axis="y", labelcolor="#FF8C00")
+    ax2.spines["right"].set_color("#FF8C00")
+
+    if variant.titles:
+        fig.suptitle(title, fontsize=14 * variant.font_scale, y=1.02)
+    footer = (
+        f"Reading time (min): {reading_min[0]:.2f} / {reading_min[1]:.2f} / {reading_min[2]:.2f}  •  "
+        f"Total time (s): {total_time[0]:.1f} / {total_time[1]:.1f} / {total_time[2]:.1f}"
+    )
+    fig.text(0.5, 0.01, footer, ha="center", va="bottom", fontsize=9 * variant.font_scale, color="#333333")
+    return fig
+
+
+def plot_timing_decomposition(table: pd.DataFrame, variant: Variant, title: str):
+    fig, ax = _new_figure(variant)
+    _style_axes(ax)
+    labels = [TIMING_LABELS[t] for t in table["timing"]]
+    reading = table["reading_time_sec"].to_numpy(dtype=float)
+    summary = table["summary_time_sec"].to_numpy(dtype=float)
+    ax.bar(labels, reading, color="#0066CC", edgecolor="#0B3D91", label="Reading")
+    ax.bar(labels, summary, bottom=reading, color="#34B27D", edgecolor="#1C7A52", label="Summary")
+    ax.set_ylabel("Seconds per article")
+    ax.legend()
+    if variant.titles:
+        ax.set_title(title)
+    return fig
+
+
+def plot_leave_one_article_out(table: pd.DataFrame, variant: Variant, title: str):
+    fig, ax = _new_figure(variant)
+    _style_axes(ax, grid_axis="x")
+    delta = table["delta"].to_numpy(dtype=float)
+    y = np.arange(len(table))[::-1]
+    ax.scatter(delta, y, color="#0066CC", s=60, zorder=3)
+    ax.axvline(0, color="#444444", linewidth=1.0)
+    ax.set_yticks(y, [ARTICLE_LABELS.get(a, a) for a in table["dropped"]])
+    ax.set_xlabel("Pre–Sync Δ (MCQ accuracy)")
+    ax.set_xlim(min(0, float(np.nanmin(delta)) - 0.04), max(0.22, float(np.nanmax(delta)) + 0.08))
+    if variant.titles:
+        ax.set_title(title)
+    for i, (d, p) in enumerate(zip(delta, table["p"].to_numpy(dtype=float))):
+        p_text = "<.001" if p < 0.001 else f"{p:.3f}".lstrip("0")
+        ax.text(d + 0.005, y[i], f"Δ={d:.3f}, p={p_text}", va="center", fontsize=10 * variant.font_scale)
+    return fig
+
+
+def plot_article_difficulty(table: pd.DataFrame, variant: Variant, title: str):
+    fig, ax = _new_figure(variant)
+    _style_axes(ax)
+    articles = list(dict.fromkeys(table["article"]))
+    groups = list(dict.fromkeys(table["experiment_group"]))
+    width = 0.8 / max(1, len(groups))
+    x = np.arange(len(articles))
+    colors = ["#0066CC", "#999999", "#FF8C00"]
+    for j, group in enumerate(groups):
+        sub = table[table["experiment_group"] == group].set_index("article").reindex(articles)
+        ax.bar(x + (j - (len(groups) - 1) / 2) * width, sub["mean"], width, yerr=sub["se"], capsize=4,
+               color=colors[j % len(colors)], label=group)
+    ax.set_xticks(x, [ARTICLE_LABELS.get(a, a) for a in articles])
+    ax.set_ylim(0, 1.0)
+    ax.set_ylabel("MCQ accuracy (Mean ± SE)")
+    ax.legend(title="Group")
+    if variant.titles:
+        ax.set_title(title)
+    return fig
+
+
+def plot_counterbalancing(table: pd.DataFrame, variant: Variant, title: str):
+    fig, ax = _new_figure(variant)
+    counts = table.set_index("article")[TIMING_ORDER]
+    im = ax.imshow(counts.to_numpy(), cmap="Blues")
+    ax.set_xticks(np.arange(len(TIMING_ORDER)), [TIMING_LABELS[t] for t in TIMING_ORDER])
+    ax.set_yticks(np.arange(len(counts)), [ARTICLE_LABELS.get(a, a) for a in counts.index])
+    for (i, j), value in np.ndenumerate(counts.to_numpy()):
+        ax.text(j, i, str(value), ha="center", va="center", fontsize=12 * variant.font_scale)
+    fig.colorbar(im, ax=ax, label="Trials")
+    if variant.titles:
+        ax.set_title(title)
+    return fig
+
+
+def plot_recall_calibration(table: pd.DataFrame, variant: Variant, title: str):
+    fig, ax = _new_figure(variant)
+    _style_axes(ax, grid_axis="both")
+    colors = dict(STRUCTURE_COLORS, control="#777777")
+    for group, sub in table.groupby("group"):
+        x = sub["recall_confidence"].to_numpy(dtype=float)
+        y = sub["recall_total_score"].to_numpy(dtype=float)
+        ax.scatter(x, y, s=18, alpha=0.6, color=colors.get(group, "#333333"), label=group.title())
+        if len(sub) > 2 and np.ptp(x) > 0:
+            slope, intercept = np.polyfit(x, y, 1)
+            xs = np.linspace(x.min(), x.max(), 20)
+            ax.plot(xs, intercept + slope * xs, color=colors.get(group, "#333333"), linewidth=2)
+    ax.set_xlabel("Recall confidence (1–7)")
+    ax.set_ylabel("Recall total score")
+    ax.legend(title="Group")
+    if variant.titles:
+        ax.set_title(title)
+    return fig
+
+
+# ============================================================================
+# Figure registry
+# ============================================================================
+A1_VARIABLES = {
+    "mcq_accuracy": ("MCQ accuracy", (0, 1)),
+    "ai_summary_accuracy": ("AI-summary accuracy", (0, 1)),
+    "article_accuracy": ("Article-only accuracy", (0, 1)),
+    "false_lure_accuracy": ("False-lure accuracy", (0, 1)),
+    "recall_total_score": ("Recall total score", None),
+    "recall_confidence": ("Recall confidence", (1, 7)),
+    "reading_time_min": ("Reading time (min)", None),
+    "summary_time_sec": ("Summary time (s)", None),
+    "summary_prop": ("Summary share of total time", (0, 1)),
+    "total_time_sec": ("Total time (s)", None),
+    "mental_effort": ("Mental effort", (1, 7)),
+    "ai_trust": ("AI trust", (1, 7)),
+    "ai_dependence": ("AI dependence", (1, 7)),
+}
+
+FIGURES: List[FigureSpec] = [
+    FigureSpec("slide1", "slide1_main_finding_1_ai_summary_accuracy.png", table_timing_means("ai_summary_accuracy"),
+               plot_timing_bars, "Main Finding 1: Pre-reading improves AI-summary learning",
+               options=(("ylabel", "AI summary accuracy"), ("ylim", (0, 1.0)))),
+    FigureSpec("slide2", "slide2_main_finding_2_misinformation_risk.png", table_structure_lures,
+               plot_structure_lures, "Main Finding 2: Integrated format reduces misinformation risk",
+               variants=("slide",)),
+    FigureSpec("slide3", "slide3_main_finding_3_summary_engagement.png", table_summary_engagement,
+               plot_summary_engagement,
+               "Main Finding 3: Pre-reading increases summary engagement without increasing total time",
+               variants=("slide",)),
+    FigureSpec("slide4", "slide4_robustness_leave_one_article_out.png", table_leave_one_article_out,
+               plot_leave_one_article_out, "Design robustness: Leave-one-article-out (MCQ Pre–Sync)"),
+    FigureSpec("timing_decomposition", "timing_decomposition.png", table_summary_engagement,
+               plot_timing_decomposition, "Time per article: reading vs summary", variants=("report", "thesis")),
+    FigureSpec("ORD_plot2", "ORD_plot2_lure_prob_by_structure.png", table_lure_probability, plot_cell_interaction,
+               "P(at least one false lure selected)", variants=("report", "thesis"),
+               options=(("ylabel", "P(lure selected)"), ("ylim", (0, 1)))),
+    FigureSpec("ORD_plot3", "ORD_plot3_article_difficulty.png", table_article_difficulty, plot_article_difficulty,
+               "Article difficulty (MCQ accuracy)", variants=("report", "thesis")),
+    FigureSpec("EXP_counterbalancing", "EXP_fig_counterbalancing_timing_by_article.png", table_counterbalancing,
+               plot_counterbalancing, "Counterbalancing: timing by article", variants=("report", "thesis")),
+    FigureSpec("H3_plot", "H3_plot_recall_calibration_by_group.png", table_recall_calibration,
+               plot_recall_calibration, "Recall calibration by group", variants=("report", "thesis")),
+] + [
+    FigureSpec(f"A1_plot_{dv}", f"A1_plot_{dv}.png", table_cell_descriptives(dv), plot_cell_interaction,
+               f"{label}: Structure × Timing", variants=("report", "thesis"),
+               options=(("ylabel", label), ("ylim", ylim)))
+    for dv, (label, ylim) in A1_VARIABLES.items()
+]
+
+
+# ============================================================================
+# Hashing + rendering
+# ============================================================================
+_MODULE_SOURCE = Path(__file__).read_bytes()
+
+
+def _input_hash(spec: FigureSpec, variant: Variant, table: pd.DataFrame) -> str:
+    h = hashlib.sha256()
+    h.update(table.to_csv(index=False).encode("utf-8"))
+    h.update(_MODULE_SOURCE)  # plot functions and the helpers they share (_style_axes, _new_figure, ...)
+    h.update(repr((spec.filename, spec.title, spec.options)).encode("utf-8"))
+    h.update(repr((variant.figsize, variant.dpi, variant.font_scale, variant.titles)).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _load_manifest(outdir: Path) -> dict:
+    path = outdir / ".figure_hashes.json"
+    if path.exists():
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (ValueError, OSError):
+            return {}
+    return {}
+
+
+def _save_manifest(outdir: Path, manifest: dict) -> None:
+    path = outdir / ".figure_hashes.json"
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _worker_init() -> None:
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _render(job):
+    """Worker: draw one figure variant and save it."""
+    import matplotlib.pyplot as plt
+
+    plot, title, options, variant, table, outpath = job
+    start = time.perf_counter()
+    fig = plot(table, variant, title, **dict(options))
+    fig.tight_layout()
+    fig.savefig(outpath, bbox_inches="tight")
+    plt.close(fig)
+    return str(outpath), time.perf_counter() - start
+
+
+def run(variants: Optional[List[str]] = None, only: Optional[List[str]] = None, force: bool = False,
+        workers: Optional[int] = None, data_path: Path = LONG_XLSX) -> dict:
+    """Build tables, skip unchanged figures, render the rest in a process pool."""
+    variants = variants or list(VARIANTS)
+    df = load_long_data(data_path)
+
+    tables: Dict[str, pd.DataFrame] = {}
+    jobs, hashes, skipped = [], {}, []
+    manifests = {name: _load_manifest(VARIANTS[name].outdir) for name in variants}
+
+    for spec in FIGURES:
+        if only and spec.name not in only and spec.filename not in only:
+            continue
+        if spec.name not in tables:
+            tables[spec.name] = spec.table(df)
+        for vname in variants:
+            if vname not in spec.variants:
+                continue
+            variant = VARIANTS[vname]
+            variant.outdir.mkdir(parents=True, exist_ok=True)
+            outpath = variant.outdir / spec.filename
+            digest = _input_hash(spec, variant, tables[spec.name])
+            if not force and outpath.exists() and manifests[vname].get(spec.filename) == digest:
+                skipped.append(outpath)
+                continue
+            hashes[(vname, spec.filename)] = digest
+            jobs.append((spec.plot, spec.title, spec.options, variant, tables[spec.name], outpath))
+
+    rendered = []
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_worker_init) as pool:
+            for path, seconds in pool.map(_render, jobs):
+                rendered.append((Path(path), seconds))
+
+    for (vname, filename), digest in hashes.items():
+        manifests[vname][filename] = digest
+    for vname, manifest in manifests.items():
+        _save_manifest(VARIANTS[vname].outdir, manifest)
+
+    return {"rendered": rendered, "skipped": skipped}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render slide/report/thesis figures from the long dataset")
+    parser.add_argument("--variant", action="append", choices=sorted(VARIANTS), help="Variant(s) to render")
+    parser.add_argument("--only", nargs="+", help="Figure names or filenames to render")
+    parser.add_argument("--force", action="store_true", help="Re-render even if inputs are unchanged")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--data", type=Path, default=LONG_XLSX)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = run(variants=args.variant, only=args.only, force=args.force, workers=args.workers,
+                 data_path=args.data)
+    elapsed = time.perf_counter() - start
+
+    print("Generated:")
+    for path, seconds in result["rendered"]:
+        print(f"- {path.relative_to(REPO_ROOT)} ({seconds:.2f}s)")
+    if result["skipped"]:
+        print(f"Unchanged (skipped): {len(result['skipped'])}")
+    print(f"Done in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,24 @@ AI-Assisted Human Memory Encoding Experiment Platform
 Flask application (stable sessions, guarded routes, JSON-safe handlers)
 """
 
-from flask import Flask, render_template, request, session, redirect, url_for, jsonify
+from flask import render_template, request, session, redirect, url_for, jsonify
 import json, csv, os, random, subprocess, sys
 from datetime import datetime
 from functools import wraps
 from functools import lru_cache
 import fcntl  # For file locking on Unix/macOS
+import threading
+
+# Shared modules (study_core/) live at the repository root, next to both arms
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+from study_core.arm import create_app
+from study_core.quality_monitor import QualityMonitor
+from study_core.cohort_dashboard import CohortAggregates
+from study_core.log_lock import append_row
+from study_core import edit_timeline
+from materials import ARTICLES
 try:
     from deep_translator import GoogleTranslator  # optional; we will use later
 except Exception:
@@ -23,25 +35,28 @@ DEFAULT_LANG = "en"
 # ------------------------------------------------------------------------------
 # App setup
 # ------------------------------------------------------------------------------
-app = Flask(__name__, template_folder="templates", static_folder="static")
-
-# Use a STABLE secret key (do NOT rotate on each run or the session cookie dies)
-# Set FLASK_SECRET_KEY in your shell for production; this default is fine locally.
-app.secret_key = os.environ.get("FLASK_SECRET_KEY", "dev-secret-change-me")
-
-# Optional: make cookies predictable in localhost dev
-app.config.update(SESSION_COOKIE_SAMESITE="Lax", SESSION_COOKIE_SECURE=False)
-
-DATA_DIR = "experiment_data"
-os.makedirs(DATA_DIR, exist_ok=True)
+# The Flask app (secret key, cookies, template bytecode cache, compressed static
+# files) and the routes shared with the control arm (/sw.js, /healthz, /readyz,
+# /next_bundle, /admin/*, ...) come from study_core/arm.py; ARM holds this arm's
+# stores, warmup and the hooks the shared code calls back into.
+app, ARM = create_app("ai", os.path.dirname(os.path.abspath(__file__)), __name__)
+
+# experiment_data/ next to this file, so the data lands in the same place from any cwd
+# (and each arm keeps its own directory when both run in study_server.py)
+DATA_DIR = ARM.data_dir
+LOG_LOCKS = ARM.log_locks  # per-participant append / rename lock
+LOG_PATHS = ARM.log_paths  # participant -> log file, persisted in .log_index
+ARTICLE_TOKENS = ARM.article_tokens  # signed article of a reading page, for replayed telemetry
 
 # Condition assignment tracking file
 ASSIGNMENT_TRACKER_FILE = os.path.join(DATA_DIR, "condition_assignments.csv")
 
 # Translation cache directory
-TRANSLATION_CACHE_DIR = "translation_cache"
+TRANSLATION_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "translation_cache")
 os.makedirs(TRANSLATION_CACHE_DIR, exist_ok=True)
 TRANSLATION_CACHE_FILE = os.path.join(TRANSLATION_CACHE_DIR, "translations.json")
+ARM.translation_cache_file = TRANSLATION_CACHE_FILE  # exported by /admin/export
+TRANSLATION_CACHE_WAIT_S = 2.0  # max wait for the cache during warmup before serving untranslated text
 
 # ------------------------------------------------------------------------------
 # Utilities
@@ -64,24 +79,26 @@ def _set_lang(lang_code: str):
 
 # Translation cache (in-memory for fast access)
 _translation_cache = {}
+_translation_cache_loaded = threading.Event()  # set once the file cache is merged in (see ARM.warmup)
 
 def _load_translation_cache():
-    """Load translation cache from file"""
-    global _translation_cache
+    """Load translation cache from file (merged in place, so shared references stay valid)"""
     if os.path.exists(TRANSLATION_CACHE_FILE):
         try:
             with open(TRANSLATION_CACHE_FILE, 'r', encoding='utf-8') as f:
-                _translation_cache = json.load(f)
-                print(f"✓ Loaded {len(_translation_cache)} cached translations")
+                loaded = json.load(f)
+            for key, value in loaded.items():
+                _translation_cache.setdefault(key, value)
+            print(f"✓ Loaded {len(loaded)} cached translations")
         except Exception as e:
             print(f"Error loading translation cache: {e}")
-            _translation_cache = {}
+    _translation_cache_loaded.set()
 
 def _save_translation_cache():
     """Save translation cache to file"""
     try:
         with open(TRANSLATION_CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(_translation_cache, f, ensure_ascii=False, indent=2)
+            json.dump(dict(_translation_cache), f, ensure_ascii=False, indent=2)
     except Exception as e:
         print(f"Error saving translation cache: {e}")
 
@@ -103,6 +120,13 @@ def _auto_translate(text: str, target_lang: str) -> str:
     cache_key = _get_cache_key(text, target_lang)
     if cache_key in _translation_cache:
         return _translation_cache[cache_key]
+
+    # Still warming up: give the file cache a moment, then fall back to the
+    # original text instead of a network round trip per string
+    if ARM.warmup.started and not _translation_cache_loaded.wait(TRANSLATION_CACHE_WAIT_S):
+        return text
+    if cache_key in _translation_cache:
+        return _translation_cache[cache_key]
     
     # If not in cache, translate (this should rarely happen after pre-translation)
     try:
@@ -201,6 +225,9 @@ def require_pid(fn):
         return fn(*args, **kwargs)
     return wrapper
 
+# Idempotent POSTs for the service worker's retries (study_core/arm.py)
+dedupe_submission = ARM.dedupe_submission
+
 def csv_len(path):
     if not os.path.exists(path):
         return 0
@@ -299,8 +326,19 @@ def log_data(participant_id, phase, data):
     data = dict(data or {})
     if "timestamp" in data:
         data["timestamp"] = _normalize_timestamp_value(data.get("timestamp"))
+
+    # Update running quality features (never blocks or breaks logging)
+    try:
+        QUALITY_MONITOR.observe(participant_id, phase, data)
+    except Exception as e:
+        print(f"[QUALITY] observe failed: {e}")
+    try:
+        COHORT_AGGREGATES.observe(participant_id, phase, data)
+    except Exception as e:
+        print(f"[DASHBOARD] observe failed: {e}")
     
     # Clean name for filename (remove spaces, special chars)
+    named = None
     if name:
         clean_name = name.replace(" ", "-").replace(",", "").replace(".", "")
         # Determine condition suffix
@@ -313,36 +351,18 @@ def log_data(participant_id, phase, data):
         else:
             # Structure not set yet (e.g., during demographics), use participant_id only for now
             # Will be renamed after randomization
-            filename = os.path.join(DATA_DIR, f"{participant_id}_log.csv")
-            file_exists = os.path.exists(filename)
-            with open(filename, "a", newline="", encoding="utf-8") as f:
-                fieldnames = ["timestamp", "phase"] + list(data.keys())
-                w = csv.DictWriter(f, fieldnames=fieldnames)
-                if not file_exists:
-                    w.writeheader()
-                w.writerow({"timestamp": datetime.now().astimezone().isoformat(), "phase": phase, **data})
-            return
-        
-        filename = os.path.join(DATA_DIR, f"{participant_id}-{clean_name}-{condition_suffix}_log.csv")
-        
-        # If old file exists, rename it
-        old_filename = os.path.join(DATA_DIR, f"{participant_id}_log.csv")
-        if os.path.exists(old_filename) and not os.path.exists(filename):
-            try:
-                os.rename(old_filename, filename)
-            except:
-                pass  # If rename fails, continue with new filename
-    else:
-        # Fallback to old format if name not available yet
-        filename = os.path.join(DATA_DIR, f"{participant_id}_log.csv")
-    
-    file_exists = os.path.exists(filename)
-    with open(filename, "a", newline="", encoding="utf-8") as f:
-        fieldnames = ["timestamp", "phase"] + list(data.keys())
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        if not file_exists:
-            w.writeheader()
-        w.writerow({"timestamp": datetime.now().astimezone().isoformat(), "phase": phase, **data})
+            condition_suffix = None
+        if condition_suffix:
+            named = f"{participant_id}-{clean_name}-{condition_suffix}_log.csv"
+
+    # Rename + append under the participant's lock so concurrent requests
+    # (e.g. a /log_reading beacon and /submit_test) never interleave rows.
+    # The path is fixed once per participant: <PID>_log.csv until the first
+    # request that knows the name and structure renames it.
+    with LOG_LOCKS.hold(participant_id):
+        filename = LOG_PATHS.resolve(participant_id, named)
+        append_row(filename, ["timestamp", "phase"] + list(data.keys()),
+                   {"timestamp": datetime.now().astimezone().isoformat(), "phase": phase, **data})
     
     # Generate analysis automatically after manipulation_check phase
     _generate_analysis_if_needed(participant_id, phase)
@@ -374,6 +394,10 @@ def save_participant(participant_id, data):
             pass
 # --- Test Mode toggle (only affects reading skip) ---
 TEST_MODE = os.environ.get("TEST_MODE", "0") == "1"
+# --- Recall edit timeline (compact insert/delete log of the recall bullets) ---
+EDIT_TIMELINE = os.environ.get("EDIT_TIMELINE", "1") == "1"
+# --- Reading heatmap: paragraph dwell bins sent once per article (the last bin takes any overflow) ---
+READING_DWELL_BINS = 64
 
 @app.context_processor
 def inject_test_mode():
@@ -485,6 +509,18 @@ def get_localized_article(article_key: str) -> dict:
     localized["questions"] = qs
     return localized
 
+# ------------------------------------------------------------------------------
+# Rendered-page cache (pages that only vary by language + template arguments)
+# ------------------------------------------------------------------------------
+# Language helpers and participant guard for the shared code in study_core/arm.py
+# and study_core/shared_routes.py (page cache, next-article bundles)
+ARM.languages = tuple(SUPPORTED_LANGS)
+ARM.get_lang = _get_lang
+ARM.translation_generation = lambda: len(_translation_cache)
+ARM.localized_article = get_localized_article
+ARM.require_pid = require_pid
+render_cached = ARM.render_cached
+
 # ------------------------------------------------------------------------------
 # DEV routes to verify language + translation pipeline
 # ------------------------------------------------------------------------------
@@ -501,609 +537,18 @@ def dev_i18n_preview(article_key):
     if not art:
         return jsonify({"error": "unknown article_key"}), 404
     return jsonify({"lang": _get_lang(), **art})
-# ------------------------------------------------------------------------------
-# Materials
-# ------------------------------------------------------------------------------
-ARTICLES = {
-    'uhi': {
-        'title': 'Urban Heat Islands: Causes, Consequences, and What Works',
-        'free_recall_prompt': 'Please write everything you remember from the article within 5 minutes. Try to describe main ideas and relationships — causes, consequences, and solutions — in your own words.',
-        'text': '''Cities function as complex heat systems where buildings, roads, and the atmosphere interact to create persistent temperature differences. Every street, rooftop, and road acts as a heat storage unit: during the day, asphalt roads, brick buildings, and concrete structures absorb sunlight and convert this energy into heat. Unlike green spaces that cool through water evaporation and reflection, city surfaces continuously store heat throughout daylight hours. When night falls and the sun disappears, these stored heat sources release infrared radiation back into the lower atmosphere. This heat release is restricted by urban canyon geometry—the ratio of building height to street width—which traps outgoing radiation through multiple reflections between surfaces before it can escape to the atmosphere. As a result, central city areas show nighttime temperatures three to seven degrees Celsius higher than surrounding suburban areas, creating what scientists call the urban heat island (UHI) effect. During heat waves, this temperature increase adds to baseline warming, raising energy use for air conditioning, worsening air quality through smog formation, and increasing heat stress among vulnerable populations.
-
-The size of these temperature differences comes from combined physical, material, and airflow factors that together determine the urban energy balance. Surface reflectivity—measured through the albedo coefficient ranging from zero (complete absorption) to one (perfect reflection)—plays a crucial role in determining absorbed solar energy. Fresh asphalt surfaces have albedo values around 0.05, reflecting only five percent of incoming sunlight while absorbing ninety-five percent. Aged asphalt oxidizes to slightly higher reflectance (~0.12), but remains much darker than vegetated ground cover (albedo ~0.20–0.25). Low-albedo surfaces therefore work as efficient solar collectors that convert radiation into stored heat. Additionally, the material-specific thermal mass—defined as heat storage capacity—controls the speed of heating and cooling. Dense construction materials including concrete, brick, and stone have high thermal mass, enabling prolonged energy storage that delays nighttime cooling. This storage-release cycle operates continuously: buildings absorb radiation throughout the day, then gradually release stored heat after sunset, maintaining elevated nighttime temperatures for extended periods.
-
-Urban geometry further increases heat retention through urban canyon effects. Tall buildings along narrow streets create confined spaces that restrict both incoming sunlight during midday and outgoing radiation at night. Within these canyons, solar radiation bounces between surfaces multiple times before escaping to the atmosphere, increasing the chance of absorption with each bounce. The three-dimensional structure therefore functions as a heat trap, maximizing energy capture while minimizing cooling pathways. At the same time, restricted airflow between building walls prevents convective heat removal—the mechanical transport of heat through air movement—thus blocking one of the atmosphere's main cooling mechanisms. Finally, human-generated waste heat from vehicle engines, building heating and cooling systems, and industrial processes adds extra heat directly into the urban atmosphere, supplementing solar heating. During extreme heat events, power companies respond to increased electricity demand by activating less efficient backup generators, often coal-burning plants that emit greenhouse gases while using water for cooling towers, creating a feedback loop where heat reduction efforts paradoxically generate additional emissions and resource use.
-
-The geographic distribution of heat stress maps directly onto socioeconomic patterns, creating environmental justice issues with measurable health impacts. Neighborhoods with concentrated poverty, reduced tree coverage, higher building density, and more impervious surfaces experience disproportionately higher heat exposure. During severe heat episodes—defined as sustained periods exceeding normal temperature ranges—mortality risk increases dramatically with heat intensity, affecting elderly people, individuals with heart or breathing problems, outdoor workers, and residents without air conditioning. Emergency medical systems face surging demand for heat-related care, straining healthcare resources. Thus, the urban heat island is both a physical weather phenomenon with measurable temperature differences and a social inequality issue that reflects unequal resource distribution, infrastructure investment, and resilience capacity across urban populations.
-
-Counteracting these heat processes requires integrated strategies across multiple scales. The basic principle involves modifying surface energy budgets through four connected mechanisms: increasing reflectance, providing shade, amplifying evaporative cooling, and manipulating thermal mass. Cool roofing systems coated with high-albedo materials can raise surface reflectance from typical values (~0.10–0.20) to enhanced levels approaching 0.70–0.85, thereby reducing absorbed solar energy by sixty to seventy-five percent. Similarly, "cool pavements" using lighter-colored materials or permeable designs that allow subsurface moisture show surface temperature reductions of ten to twenty degrees Celsius compared to conventional asphalt during peak sun exposure. However, these solutions require careful design: increased visible light reflection without corresponding infrared reduction can increase glare, creating visual discomfort and potentially raising nearby air temperatures through redirected radiation. Optimal cool surface technologies therefore use wavelength-selective coatings that maximize near-infrared reflection—where solar energy peaks—while moderating visible brightness.
-
-Vegetation provides complementary temperature control through multiple biological processes. Tree canopies intercept sunlight before it reaches the ground, creating shaded areas beneath leaves. More importantly, leaf transpiration—the controlled release of water vapor through plant pores—converts heat into water evaporation energy. This evapotranspiration process effectively works as a distributed atmospheric cooling system that moderates temperatures while simultaneously increasing local humidity. Urban forestry programs thus serve dual heat reduction functions: direct shade plus evaporative cooling. Green infrastructure at smaller scales—including vegetated rooftops, vertical gardens, and bioswales for stormwater management—extends these principles across building surfaces and street features. Nevertheless, vegetation faces implementation challenges including water availability in dry regions, maintenance costs, conflicts with underground utilities, and long growth periods before benefits fully develop.
-
-Beyond individual interventions, systemic resilience requires comprehensive urban planning that integrates heat considerations into land-use decisions, building codes, and infrastructure priorities. Zoning regulations can mandate minimum tree coverage ratios, restrict impervious surface percentages, or incentivize cool material use through development bonuses. Building energy standards increasingly include thermal performance metrics—such as roof solar reflectance indices and wall thermal resistance—that reduce cooling needs while improving indoor comfort. Transportation planning that prioritizes pedestrian areas, cycling networks, and transit-oriented development reduces vehicle heat emissions while creating opportunities for shade trees and permeable surfaces. Critically, equitable climate adaptation requires targeting interventions toward thermally vulnerable neighborhoods through needs-based resource allocation rather than allowing market forces alone to determine cooling infrastructure distribution.
-
-Emerging research explores advanced technologies including radiative cooling materials engineered to emit heat at atmospheric transparency wavelengths (8–13 micrometer infrared band), enabling passive heat rejection directly to space even during daylight. Phase-change materials within building walls can buffer indoor temperature changes by absorbing heat during warming periods and releasing it during cooling cycles. District-scale energy systems that recover waste heat for beneficial uses—such as district heating networks or industrial integration—reduce overall heat emissions. However, these innovations remain expensive compared to conventional materials, limiting adoption without regulations or subsidies.
-
-Ultimately, urban heat mitigation represents a sociotechnical challenge requiring coordinated action across governance levels, professional fields, and community stakeholders. Scientific understanding of heat transfer physics, materials science, and atmospheric dynamics provides the mechanistic foundation. Engineering expertise translates theoretical principles into practical cool surface technologies, green infrastructure systems, and building innovations. Urban planning synthesizes these technical capabilities within spatial frameworks that account for land-use patterns, transportation networks, and social equity considerations. Community engagement ensures that interventions address local needs, incorporate traditional knowledge, and build adaptive capacity among residents. Success depends not merely on technology deployment but on institutional arrangements that sustain long-term maintenance, equitable access, and continuous adaptation as climate and urban form evolve. The heat island thus becomes not only a physical problem with engineering solutions but a lens revealing how cities balance efficiency with resilience, economic growth with environmental quality, and overall prosperity with distributional justice.
-''',
-        'summary_integrated': 'Urban heat islands develop when cities absorb and retain solar radiation far more effectively than nearby rural landscapes. Surfaces such as asphalt, brick, and concrete have very low albedo values—typically between 0.05 and 0.20—meaning they reflect little sunlight and absorb most incoming energy. While fresh asphalt reflects only around five percent of sunlight, some assessments suggest that aged asphalt can reach albedo values near 0.22, though measured values generally remain much lower in practice. High thermal-mass materials including stone, brick, and concrete continue releasing stored heat well after sunset, keeping nighttime temperatures three to seven degrees Celsius warmer than surrounding areas. Urban canyon geometry—tall buildings along narrow streets—further traps outgoing longwave radiation, slowing atmospheric cooling and reducing ventilation.\n\nThese thermal effects intensify during heat waves, elevating health risks and increasing electricity demand. Heat exposure is distributed unevenly: low-income neighborhoods with limited tree canopy, dense construction, and extensive impervious surfaces experience far higher temperatures. Vulnerable groups such as elderly residents, people with cardiovascular conditions, outdoor workers, and those without air conditioning face disproportionate risks. At the same time, recent pilot programs have promoted photocatalytic roof tiles that supposedly convert absorbed heat into electrical energy through thermoelectric effects, though such claims remain unverified and lack large-scale evidence.\n\nMitigation strategies focus on increasing surface reflectance, boosting shading, enhancing evaporative cooling through vegetation, and optimizing thermal mass. High-albedo "cool roofs," with reflectance values of 0.70–0.85, can reduce absorbed heat by 60–75%. Urban forestry provides dual benefits through shading and evapotranspiration. Long-term resilience requires integrated planning that aligns technical solutions with equitable resource distribution, prioritizing vulnerable communities lacking access to cooling infrastructure and green space.',
-        'summary_segmented': '''1. Urban heat islands form when city surfaces absorb and retain far more solar energy than nearby rural areas.
-
-2. Low-albedo materials such as asphalt (~0.05) and brick absorb 90–95% of incoming sunlight.
-
-3. High thermal-mass materials store heat during the day and release it slowly overnight, sustaining elevated temperatures.
-
-4. Urban canyon geometry traps outgoing longwave radiation, reducing nighttime cooling and impeding airflow.
-
-5. Some assessments claim aged asphalt can reach albedo values near 0.22, increasing reflectance with age.
-
-6. Heat exposure intensifies health risks for elderly individuals, people with cardiovascular conditions, and those lacking air-conditioning.
-
-7. Low-income neighborhoods face higher heat burdens due to fewer trees, denser buildings, and more impervious surfaces.
-
-8. High-albedo cool roofs (0.70–0.85 reflectance) reduce heat absorption by 60–75% compared with conventional materials.
-
-9. Urban forestry cools cities through shading and evaporative cooling generated by leaf transpiration.
-
-10. Pilot programs investigating photocatalytic roof tiles claim they convert absorbed heat into electrical energy, though evidence is limited.''',
-        'questions': [
-            {
-                "q": "Dark, low-albedo surfaces such as asphalt absorb approximately _______ percent of incoming solar radiation.",
-                "options": [
-                    "seventy to seventy-five",
-                    "seventy-five to eighty",
-                    "ninety to ninety-five",
-                    "eighty to eighty-five"
-                ],
-                "correct": 2,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "_______ materials store large amounts of heat during the day and release it slowly after sunset.",
-                "options": [
-                    "Low thermal mass",
-                    "Reflective",
-                    "Porous",
-                    "High thermal mass"
-                ],
-                "correct": 3,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Urban greening provides _______ through shading and leaf transpiration.",
-                "options": [
-                    "conductive cooling",
-                    "evaporative cooling",
-                    "radiative cooling",
-                    "convective cooling"
-                ],
-                "correct": 1,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "The article identifies _______ as a functioning urban-cooling technology.",
-                "options": [
-                    "phase-change wall layers",
-                    "radiative cooling materials",
-                    "photocatalytic roof tiles",
-                    "waste-heat recovery networks"
-                ],
-                "correct": 1,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Cool roofs reduce heat absorption because their surface reflectance commonly reaches _______.",
-                "options": [
-                    "0.30–0.45",
-                    "0.50–0.65",
-                    "0.70–0.85",
-                    "0.65–0.80"
-                ],
-                "correct": 2,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Neighborhoods with the highest heat exposure often lack adequate _______.",
-                "options": [
-                    "coastal airflow",
-                    "open water bodies",
-                    "tree canopy and permeable surfaces",
-                    "shaded pedestrian corridors"
-                ],
-                "correct": 2,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "High-albedo roofing systems limit heat gain primarily by _______.",
-                "options": [
-                    "reducing absorbed solar flux",
-                    "increasing thermal mass storage",
-                    "promoting moisture-driven cooling",
-                    "redistributing longwave radiation"
-                ],
-                "correct": 0,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Urban canyon geometry traps _______ through repeated reflections between building surfaces.",
-                "options": [
-                    "outgoing longwave radiation",
-                    "thermal mass discharge",
-                    "convective airflow",
-                    "incoming solar reflection"
-                ],
-                "correct": 0,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Urban heat islands develop when city surfaces absorb more ______ than nearby rural areas.",
-                "options": [
-                    "atmospheric longwave radiation",
-                    "infrared radiation",
-                    "solar energy",
-                    "geothermal heat flux"
-                ],
-                "correct": 2,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Vegetated ground cover typically exhibits an albedo of _______.",
-                "options": [
-                    "0.05–0.10",
-                    "0.10-0.15",
-                    "0.20–0.25",
-                    "0.45–0.50"
-                ],
-                "correct": 2,
-                "source_type": "article"
-            },
-            {
-                "q": "Aged asphalt usually has an albedo of approximately _______.",
-                "options": [
-                    "0.05",
-                    "0.12",
-                    "0.22",
-                    "0.30"
-                ],
-                "correct": 1,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Excess visible-light reflection from cool surfaces can cause _______.",
-                "options": [
-                    "increased ozone depletion",
-                    "glare from redirected radiation",
-                    "excessive nighttime cooling",
-                    "reduced soil moisture"
-                ],
-                "correct": 1,
-                "source_type": "article"
-            },
-            {
-                "q": "Urban centers can be _______ warmer at night than nearby suburban areas.",
-                "options": [
-                    "3–7°C",
-                    "7–10°C",
-                    "1–2°C",
-                    "10–12°C"
-                ],
-                "correct": 0,
-                "source_type": "article"
-            },
-            {
-                "q": "Cool pavements can lower surface temperatures by approximately _______.",
-                "options": [
-                    "4–8°C",
-                    "10–20°C",
-                    "20–30°C",
-                    "2–5°C"
-                ],
-                "correct": 1,
-                "source_type": "article"
-            }
-        ]
-    },
-    'crispr': {
-        'title': 'CRISPR Gene Editing: Promise, Constraints, and Responsible Use',
-        'free_recall_prompt': 'Please recall everything you can from the article in 5 minutes, describing how CRISPR works, its medical and agricultural applications, key limitations, and ethical or governance challenges.',
-        'text': '''CRISPR–Cas systems began as a microbial defense mechanism—a molecular form of immune memory that bacteria use to recognize and destroy invading viruses. Each infection leaves behind a short fragment of viral DNA in the bacterial genome, creating a permanent biological record of attack. When the same virus returns, the bacterium transcribes these fragments into RNA guides that direct Cas enzymes toward matching sequences, cutting the viral DNA apart. This elegant process of recognition and cleavage inspired scientists to adapt the system for their own purposes. By designing synthetic guide RNAs that match any chosen DNA sequence, researchers can steer Cas enzymes precisely to that site, slice the double helix, and let the cell's repair machinery rewrite it. The principle—guide, cut, repair—has turned a bacterial trick for survival into one of the most powerful tools in modern biology.
-The accessibility of CRISPR has been revolutionary. Tasks that once required months of effort with complex tools such as zinc-finger nucleases or TALENs can now be performed in days with inexpensive reagents in basic labs. This democratization of gene editing has accelerated discoveries in medicine, agriculture, and environmental restoration. Yet CRISPR's simplicity hides layers of complexity. Precision in genomics is statistical, not absolute: even a well-designed guide RNA may bind unintended DNA regions, creating off-target edits that disrupt other genes. The challenge is not only to cut accurately but to ensure the cut happens only where intended.
-To reduce these risks, scientists refine the system continuously. They adjust guide length and chemistry, develop predictive algorithms, and engineer enzymes with improved fidelity. High-precision variants such as SpCas9-HF1 or eSpCas9 modify the DNA-binding surface to minimize unwanted interactions. Newer tools—base editors and prime editors—go further by avoiding full double-strand breaks. Instead of cutting both DNA strands, they replace single letters or copy short sequences, allowing subtle corrections with fewer side effects. The shift from crude cutting to molecular fine-tuning expands the range of treatable genetic mutations.
-Despite these refinements, delivery remains the hardest step. Editing components must enter the right cells, reach the nucleus, and act without triggering immune rejection. Viral vectors such as adeno-associated viruses (AAVs) are efficient but have limited cargo space and may provoke antibodies that block repeated dosing. Lipid nanoparticles—used in mRNA vaccines—can carry larger molecules but concentrate in the liver and sometimes cause inflammation. Researchers test polymer carriers, extracellular vesicles, and tissue-targeted peptides, as well as physical methods like electroporation or ultrasound delivery. Each approach must balance efficiency, safety, and cost.
-Another key dimension is time. Even when CRISPR reaches its target cells, how long it remains active determines both success and risk. Persistent Cas activity raises the chance of off-target effects, while too brief exposure can yield incomplete edits. To control timing, scientists design self-limiting systems whose messenger RNA or protein degrades within hours, creating a short, precise "editing pulse." Others build inducible switches that activate Cas enzymes only under specific chemical or thermal cues. These strategies transform CRISPR from a static scalpel into a controllable process that clinicians can tune in real time.
-When CRISPR enters clinical use, the definition of success changes. In research, success means confirming an edit; in medicine, it means improving a patient's life with acceptable risk. The most promising therapies today are ex vivo treatments for blood disorders such as sickle-cell disease and beta-thalassemia. Doctors extract a patient's stem cells, edit them outside the body, verify accuracy, and reinfuse them. For internal organs—heart, brain, or lungs—in vivo delivery is required, where precision must coexist with safety. Every edited cell carries its modification for life, so long-term monitoring is both scientific and ethical duty.
-The most controversial frontier is germ-line editing, which alters embryos or reproductive cells so that changes pass to future generations. In theory, this could eliminate hereditary diseases, but the ethical implications are profound. A single error in an embryo could propagate indefinitely through descendants who never consented. After the 2018 birth of gene-edited babies in China, global backlash led to bans on clinical germ-line editing while allowing strictly supervised research. Most experts agree that humanity is not ready for heritable interventions until long-term safety and public oversight exist. Germ-line editing thus stands as both symbol of hope and warning against scientific hubris.
-Beyond medicine, CRISPR is reshaping agriculture and ecology. Gene-edited crops can resist blight, tolerate drought, or use nutrients more efficiently, reducing pesticide dependence and boosting yields. Scientists are also creating gene drives that spread chosen traits through pest populations to control malaria mosquitoes or invasive rodents. Yet these systems could cause unpredictable ecological cascades. Regulators therefore distinguish between gene-edited organisms, which carry small, natural-like changes, and transgenic ones that include foreign DNA. This difference affects labeling, trade, and public acceptance. Transparency matters: people tend to support edits that offer visible benefits—less pesticide, better nutrition—over those seen as corporate advantages. Ensuring fair access to improved seeds and tools will decide whether CRISPR becomes a driver of sustainability or inequality.
-Ethically, the technology forces society to reconsider long-standing dilemmas. Who defines therapy versus enhancement? Should editing correct blindness but not boost intelligence? How can fairness be maintained if only the wealthy can afford interventions? Effective governance must be inclusive and continuous, combining transparency, accountability, and public participation. Ethics committees should involve not only scientists but also patients, educators, and citizens. Public trial registries, independent audits, and "red-team" risk assessments can turn ethics from restriction into feedback, ensuring that oversight grows alongside innovation.
-Meanwhile, CRISPR continues to evolve. New Cas proteins such as Cas12, Cas13, and CasΦ broaden its functions. AI systems design more accurate guide RNAs and predict off-target risks. CRISPR-based diagnostics like SHERLOCK and DETECTR detect pathogens quickly and cheaply, proving that editing enzymes can also serve as molecular sensors. Hybrid systems now connect CRISPR to epigenetic switches, allowing scientists to regulate genes without cutting DNA—an evolution from editing to modulation, where activity is tuned rather than rewritten.
-As the field matures, transparency becomes the foundation of credibility. Early breakthroughs were publicized through press releases, but today journals and regulators require full datasets on accuracy, durability, and immune response. Open databases track clinical trials, and funding agencies promote preregistration to prevent selective reporting. Maintaining trust now depends on rigor in both science and communication.
-The next challenge is integration into real health systems. Hospitals must develop facilities for gene therapy; insurers must adapt payment models for one-time cures; universities must train clinicians fluent in genetics and ethics. In lower-income regions, priorities include building local capacity and sharing open-source protocols so benefits do not remain confined to wealthy nations. Partnerships among universities, agencies, and non-profits can create regional hubs for reagent production and quality control, ensuring global access.
-Finally, biosecurity adds another layer of responsibility. Because CRISPR components are cheap and widely available, safety norms and education are essential. The same openness that empowers research could also enable misuse. Shared international standards for sequence screening, safe laboratory practices, and reporting will help openness and security evolve together. Just as cybersecurity grew with the internet, biotechnology must develop its own culture of vigilance.
-Ultimately, CRISPR is more than a laboratory tool—it is a mirror of human values. It reveals how societies balance curiosity with caution and innovation with fairness. When data are shared openly, benefits distributed equitably, and oversight continuous, gene editing can move from disruptive novelty to a stable force for medicine, agriculture, and conservation. Its legacy will be written not only in DNA sequences but in the choices humanity makes about how—and why—to rewrite the code of life.
-''',
-        'summary_integrated': 'CRISPR–Cas systems originated as a microbial defense mechanism that allows bacteria to capture short fragments of viral DNA and store them as a molecular record of infection. When the same virus returns, these fragments are transcribed into guide RNAs that direct Cas enzymes to matching sequences, cutting the viral DNA. Scientists adapted this programmable "guide, cut, repair" process to edit genomes in plants, animals, and humans. Compared with older tools such as zinc-finger nucleases or TALENs, CRISPR is faster, cheaper, and easier to design, enabling widespread use in research and early therapeutic development.\n\nDespite its accessibility, precision is statistical, not absolute. Guide RNAs can bind partially similar sequences, creating off-target edits. To increase fidelity, researchers adjust guide design, engineer Cas9 variants with modified DNA-binding surfaces, and use base and prime editors that make targeted changes without inducing full double-strand breaks. Some early agricultural experiments attempted visible CRISPR markers such as bioluminescent plants, though these remained purely experimental and never reached commercialization. Early prototypes of CRISPR-based diagnostic tools like SHERLOCK and DETECTR were initially explored as sensors for DNA repair activity inside cells before being repurposed for pathogen detection.\n\nDelivery remains a central challenge. Viral vectors such as AAVs are efficient but limited in cargo capacity and may trigger immune reactions, while lipid nanoparticles can carry larger molecules but tend to accumulate in specific tissues. Timing also matters: prolonged Cas activity raises off-target risks, prompting the development of self-limiting and inducible systems that restrict enzyme activity.\n\nBeyond technical hurdles, CRISPR\'s expansion into clinical and agricultural settings raises ethical concerns—especially after the 2018 gene-edited babies—which led many countries to ban clinical germ-line editing.',
-        'summary_segmented': '''1. CRISPR began as a bacterial immune system that records viral DNA fragments to recognize future invaders.
-
-2. Scientists reprogrammed this system using synthetic guide RNA to direct Cas enzymes to precise genome locations.
-
-3. The process "guide, cut, and repair" made gene editing faster, cheaper, and globally accessible.
-
-4. Precision challenges persist because partial guide mismatches can create off-target edits.
-
-5. Enhanced Cas variants and base/prime editors increase fidelity while minimizing double-strand breaks.
-
-6. Some early agricultural trials used CRISPR to create bioluminescent plants as visible markers of editing success.
-
-7. Early prototypes of SHERLOCK and DETECTR were initially explored as tools to monitor DNA repair activity inside cells before shifting to pathogen detection.
-
-8. Delivery remains the major barrier: viral vectors are efficient but small; lipid nanoparticles carry more but risk inflammation.
-
-9. Self-limiting and inducible CRISPR systems control activity duration, improving safety.
-
-10. Germ-line editing is ethically restricted because changes are heritable and affect future generations.''',
-        'questions': [
-            {
-                "q": "CRISPR began as _______ that allows bacteria to capture pieces of viral DNA.",
-                "options": [
-                    "a bacterial immune system",
-                    "a viral defense mechanism",
-                    "a cellular repair system",
-                    "a genetic storage method"
-                ],
-                "correct": 0,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Early CRISPR crop research produced _______",
-                "options": [
-                    "early test versions",
-                    "lab-phase cultivation variants",
-                    "commercial products",
-                    "experimental prototypes"
-                ],
-                "correct": 3,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Early CRISPR diagnostic tools like SHERLOCK and DETECTR were initially designed to monitor _______.",
-                "options": [
-                    "pathogen presence",
-                    "DNA repair activity",
-                    "genome-wide mutation patterns",
-                    "guide RNA efficiency"
-                ],
-                "correct": 0,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Scientists reprogrammed CRISPR using _______ to direct Cas enzymes.",
-                "options": [
-                    "protein markers",
-                    "DNA templates",
-                    "guide RNA",
-                    "chemical signals"
-                ],
-                "correct": 2,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Compared to TALENs, CRISPR is faster, cheaper, and _______",
-                "options": [
-                    "easier to program",
-                    "widely adopted",
-                    "highly adaptable",
-                    "technically refined"
-                ],
-                "correct": 0,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Off-target edits occur when guide RNAs _______",
-                "options": [
-                    "bind mismatched sequences",
-                    "bind partially similar sites",
-                    "pair with near-matching bases",
-                    "drift to adjacent regions"
-                ],
-                "correct": 0,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Base editors modify DNA without _______",
-                "options": [
-                    "using guide RNA",
-                    "breaking both strands",
-                    "requiring enzymes",
-                    "cellular repair"
-                ],
-                "correct": 1,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "AAV vectors are efficient but have limited _______",
-                "options": [
-                    "precision",
-                    "capacity",
-                    "persistence",
-                    "flexibility"
-                ],
-                "correct": 1,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Lipid nanoparticles concentrate in the _______",
-                "options": [
-                    "kidneys",
-                    "lungs",
-                    "heart",
-                    "liver"
-                ],
-                "correct": 3,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Self-limiting systems use components that _______",
-                "options": [
-                    "degrade fast",
-                    "decay naturally",
-                    "become unstable",
-                    "accumulate slow"
-                ],
-                "correct": 0,
-                "source_type": "article"
-            },
-            {
-                "q": "Ex vivo editing allows doctors to _______ before reinfusion.",
-                "options": [
-                    "modify doses",
-                    "test compatibility",
-                    "verify accuracy",
-                    "label samples"
-                ],
-                "correct": 2,
-                "source_type": "article"
-            },
-            {
-                "q": "A major challenge in CRISPR therapy is ensuring that editing components reach the nucleus and act without triggering _______.",
-                "options": [
-                    "excessive DNA replication",
-                    "immune rejection",
-                    "metabolic suppression",
-                    "oxidative stress"
-                ],
-                "correct": 1,
-                "source_type": "article"
-            },
-            {
-                "q": "Inducible switches activate Cas enzymes only when exposed to specific _______.",
-                "options": [
-                    "molecular signals",
-                    "chemical or thermal cues",
-                    "membrane receptors",
-                    "electrical pulses"
-                ],
-                "correct": 1,
-                "source_type": "article"
-            },
-            {
-                "q": "The CRISPR process follows: guide, cut, and _______",
-                "options": [
-                    "restore",
-                    "replicate",
-                    "repair",
-                    "remove"
-                ],
-                "correct": 2,
-                "source_type": "ai_summary"
-            }
-        ]
-    },
-    'semiconductors': {
-        'title': 'Semiconductor Supply Chains: Why Shortages Happen and How to Build Resilience',
-        'free_recall_prompt': 'Please recall everything you can from the article in 5 minutes. Describe why semiconductor shortages occurred, what structural factors made supply fragile, and how visibility, flexibility, contracts, and cooperation can strengthen resilience.',
-        'text': '''Modern economies depend on semiconductors with a totality that remained invisible until scarcity made it undeniable. Every automobile, smartphone, and medical monitor relies on microchips that manage power flows and interpret signals. Between 2020 and 2022, the world discovered how invisible dependencies could unravel when they failed suddenly and in parallel. Automakers idled production lines awaiting five-dollar microcontrollers, while game console manufacturers saw device orders delayed for months. The shortage wasn't a single failure but a cascade: pandemic-driven demand for consumer electronics collided with frozen supply as Asian factories idled, maritime ports congested, and a catastrophic fire at a Japanese silicate facility severed a critical material node. Each disruption spread through the supply web, magnifying fragility. The semiconductor industry's total market reached $574 billion in 2022, yet production concentrated in fewer than 200 facilities globally, with leading-edge plants requiring capital investments exceeding $20 billion per facility.
-
-Semiconductor fabrication resists rapid expansion by its intrinsic nature. Building a fabrication plant—commonly called a "fab"—demands capital spending exceeding ten billion dollars and requires multi-year timelines. Taiwan Semiconductor Manufacturing Company announced in 2021 that its Arizona facility would not achieve volume production until 2024-2026. Process nodes—measured in nanometers—have shrunk from 10 micrometers in 1971 to 3 nanometers by 2022, a 3,000-fold reduction requiring exponentially more precise equipment. At the 3nm node, transistor gates measure approximately 48 silicon atoms wide, approaching quantum mechanical limits where electron tunneling effects compromise device reliability. When economies reopened after pandemic lockdowns, demand forecasting collapsed—mature nodes suddenly became bottleneck-critical precisely when pre-pandemic capacity allocation had favored cutting-edge processes.
-
-Inside foundries, production follows rhythms that resist acceleration. Silicon wafers move through cleanroom environments for months, undergoing photolithography to create nanoscale circuit patterns—a process dominated by Netherlands-based ASML, whose extreme ultraviolet lithography systems cost over $150 million per unit. Each machine uses 13.5-nanometer wavelength light generated by vaporizing tin droplets with high-power lasers—a process so complex that ASML produces only dozens of machines annually despite controlling over 90% of the market. Manufacturing demands sequential processing across hundreds of individual steps spanning weeks of continuous operation. Any contamination event—measured in parts per trillion—can compromise entire wafer batches. Yield—the proportion of functional chips per wafer—becomes the critical metric.
-
-Bottlenecks emerge not merely in capital equipment but in specialized materials: photoresist compounds require ultra-pure resins with nanometer-scale resolution; high-purity gases at 99.999% purity levels; rare-earth dopants for dielectric materials. The February 2021 winter storm in Texas shut down a chemical synthesis plant responsible for semiconductor-grade coatings, halting chip output globally despite fully operational fabrication facilities on other continents. The event revealed how seemingly peripheral inputs could disable an entire production ecosystem valued at over half a trillion dollars annually.
-
-Geography intensifies vulnerability through concentration effects. East Asia dominates fabrication capacity: Taiwan Semiconductor Manufacturing Company controls over half of global advanced-node production. South Korean companies Samsung and SK Hynix manufacture 70% of global DRAM and 50% of NAND flash memory. Design and intellectual property originate predominantly from United States firms whose annual R&D spending collectively exceeds $45 billion, while photolithography equipment remains a near-monopoly of Netherlands-based ASML. No single nation can perform the entire production sequence independently within economically viable parameters—a reality demonstrated by China's $150 billion domestic semiconductor initiative achieving limited success in advanced logic despite massive capital investment.
-
-The industry historically relied on just-in-time logistics to minimize inventory carrying costs. Semiconductors violate the assumptions underlying this model. Manufacturing cycles span months, not days; demand volatility shifts sharply due to macroeconomic disruptions; and product portfolios include over 50,000 distinct part numbers with non-interchangeable applications. When automotive demand collapsed in Q2 2020, foundries reallocated capacity toward consumer electronics where work-from-home dynamics drove shipments upward. The automotive sector's recovery in 2021 found no available capacity: nodes favored by automotive microcontrollers had been deprioritized in favor of advanced nodes serving smartphones and high-performance computing. Legacy node capacity additions require 18-24 months and billions in investments for facilities manufacturing chips with profit margins of 15-25%, compared to over 50% margins at leading-edge nodes. Economic incentives systematically discouraged the capacity additions that would have prevented shortages.
-
-Contemporary supply chains evolved through competitive pressures appearing as optimization. Automotive manufacturers maintained 30-90 day inventory buffers pre-2000s, absorbing demand fluctuations without production disruptions. By 2019, average automotive inventory had contracted to 15-45 days, with some manufacturers operating on single-week buffers for certain components. This inventory compression, combined with supply chain opacity where manufacturers lacked visibility beyond immediate suppliers, created systemic vulnerability. When the COVID-19 pandemic triggered simultaneous supply restrictions and demand volatility in 2020, the system lacked capacity to absorb disruptions. The semiconductor shortage demonstrated how efficiency-maximizing strategies—just-in-time manufacturing, inventory minimization, single-source dependencies, geographic concentration—increased fragility by eliminating redundancy that previously buffered against disruptions.
-
-Mitigation strategies operate across time horizons spanning immediate responses to decade-long transformations. Short-term interventions include demand management prioritizing critical sectors, design modifications substituting available chips—requiring months for validation—and life-extension programs reducing replacement demand. Intermediate responses include capacity expansions requiring one to two years and substantial capital per facility. Major semiconductor companies announced investments collectively exceeding $300 billion through 2030, though actual capacity additions lagged announcements by several years due to equipment procurement bottlenecks and construction timelines.
-
-Long-term resilience requires systemic restructuring addressing concentration vulnerabilities through geographic diversification and supply chain redundancy. The U.S. CHIPS and Science Act (2022) allocated $52.7 billion for domestic semiconductor manufacturing incentives and R&D. European Union initiatives proposed €43 billion in investment targeting 20% global production share by 2030, up from 9% in 2020. Japan committed significant funding for domestic production expansion. However, advanced node production in Western nations incurs 30-50% higher operating costs than East Asian facilities due to higher labor costs, energy costs, and regulatory compliance. Without sustained subsidies estimated at roughly one-quarter to one-third of capital and operating costs, economic incentives favor continued Asian concentration.
-
-Strategic considerations extend beyond economics into technological sovereignty and national security. Advanced semiconductors enable artificial intelligence, quantum computing, hypersonic weapons, autonomous systems, and cryptographic capabilities. Export controls implemented in October 2022 restricted Chinese access to high-performance GPUs, advanced logic chips below 14nm, and semiconductor manufacturing equipment using extreme ultraviolet lithography. These controls recognize that semiconductor fabrication capability represents a foundational enabler of technological advancement and military capability. Nations lacking domestic advanced semiconductor production face strategic dependencies—over 92% of the most advanced logic chips originate from Taiwan amid geopolitical tensions.
-
-Workforce constraints compound infrastructure challenges. Advanced semiconductor manufacturing requires specialized expertise spanning semiconductor physics, materials science, and multiple engineering disciplines—areas where degree programs produce insufficient graduates. New fabrication facilities face recruitment challenges finding thousands of workers with required technical skills, requiring international worker transfers and university partnerships for workforce development programs needing years to mature. Each new facility requires thousands of direct employees plus tens of thousands of indirect jobs in supporting industries, with advanced fabs demanding that a significant majority of the workforce hold bachelor's degrees or higher.
-
-Ultimately, semiconductor supply chain resilience represents a sociotechnical challenge combining physics, economics, geopolitics, and institutional capacity. Physical constraints—quantum mechanical limits, thermodynamic constraints at extreme power densities, materials science challenges—determine technological trajectories requiring continuous innovation investment exceeding $15 billion annually across industry leaders. Economic forces—high gross margins on leading-edge chips encouraging concentration, lower margins on legacy nodes discouraging investment, massive capital intensity—shape decisions favoring efficiency over redundancy. Geopolitical tensions increasingly override pure economic optimization through export controls, industrial policies, and subsidies. Institutional arrangements spanning industry groups, government initiatives, and international agreements will determine whether the industry achieves geographic diversification or whether concentration intensifies, whether redundancy increases or just-in-time fragility persists, and whether supply chains prove resilient to future disruptions or remain vulnerable to cascading failures. The 2020-2023 shortage revealed structural fragilities embedded in decades of optimization for efficiency over resilience—a fundamental tension that will define semiconductor supply chain evolution for decades to come.
-
-''',
-        'summary_integrated': 'Between 2020 and 2022, a synchronized breakdown revealed how deeply modern economies depend on semiconductors across automobiles, consumer electronics, and critical infrastructure. Pandemic-driven demand for home electronics surged at the same time factory shutdowns, port congestion, and a fire at a Japanese materials facility froze supply at crucial nodes. Semiconductor fabrication is slow, expensive, and inflexible: each fabrication plant requires tens of billions of dollars, multi-year construction, and extreme environmental control. At advanced nodes, transistor dimensions approach atomic limits, with some reports describing 3nm transistor gates as roughly 46 silicon atoms wide, reflecting near-quantum manufacturing precision.\n\nInside foundries, wafers pass through hundreds of sequential steps—photolithography, ion implantation, chemical vapor deposition—using ultra-pure chemicals where contamination measured in parts per trillion can ruin entire batches. Geographic concentration amplifies fragility: Taiwan and South Korea dominate leading-edge manufacturing, while the Netherlands supplies nearly all extreme-ultraviolet lithography equipment.\n\nAllocation during the shortage depended as much on commercial agreements as on technology needs. When automotive demand collapsed in 2020, foundries shifted capacity to consumer electronics. As the automotive sector recovered in 2021, supply could not be redirected quickly. Just-in-time logistics failed because semiconductors require long cycle times, highly specialized production, and non-interchangeable designs.\n\nSome strategic roadmaps referenced pilot programs using quantum-annealing processors to accelerate chip-design optimization, reportedly reducing design cycles from months to weeks, though these initiatives remained exploratory.\n\nMajor firms announced over $300 billion in planned investments through 2030, but capacity expansions lagged due to equipment procurement bottlenecks. Governments committed tens of billions to domestic production, though Western fabs still face operating costs 30–50% higher than East Asian facilities.',
-        'summary_segmented': '''1. The 2020–22 shortage exposed dependence on semiconductors across automobiles, consumer electronics, and critical infrastructure.
+# Live data-quality flags (fed by log_data, served by /admin/quality)
+QUALITY_MONITOR = QualityMonitor(
+    article_words={key: len(art["text"].split()) for key, art in ARTICLES.items()},
+    flag_log_path=os.path.join(DATA_DIR, "quality_flags.csv"),
+)
+ARM.quality_monitor = QUALITY_MONITOR
 
-2. Pandemic-driven demand surges, factory shutdowns, and cascading logistics failures froze global semiconductor supply.
+# Live cohort aggregates (fed by log_data, served by /admin/dashboard); seeded from
+# existing logs by the cohort_replay warmup step
+COHORT_AGGREGATES = CohortAggregates(replay=True)
+ARM.cohort = COHORT_AGGREGATES
 
-3. Semiconductor fabs require tens of billions of dollars and multi-year construction, making rapid expansion impossible.
-
-4. Production involves hundreds of sequential steps using ultra-pure chemicals—such as photoresist resins—where even tiny contamination can ruin entire batches.
-
-5. East Asia dominates advanced fabrication while the Netherlands provides nearly all EUV lithography systems, creating single-point vulnerabilities.
-
-6. Some reports describe 3nm transistor gates as approximately 46 silicon atoms wide, illustrating fabrication near atomic limits. ← FALSE LURE #1
-
-7. Pilot programs using quantum-annealing processors allegedly reduced chip-design cycles from months to weeks, though results remain experimental. ← FALSE LURE #2
-
-8. Just-in-time logistics failed because semiconductor manufacturing cycles span months and chips are not interchangeable.
-
-9. When automotive demand collapsed in 2020, foundries reallocated capacity to consumer electronics, limiting recovery in 2021.
-
-10. Firms announced over $300B in investments through 2030, while governments committed tens of billions despite Western costs remaining 30–50% higher.''',
-        'questions': [
-            {
-                "q": "Advanced semiconductor fabrication in Western countries is more expensive mainly because operating costs are typically _______ higher than in East Asia.",
-                "options": [
-                    "5–10%",
-                    "15–20%",
-                    "20–30%",
-                    "30–50%"
-                ],
-                "correct": 3,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Major chipmakers announced large investment plans through 2030, but actual expansion lagged mostly due to _______.",
-                "options": [
-                    "raw material export limits",
-                    "equipment procurement bottlenecks",
-                    "sudden regulatory freezes",
-                    "intellectual-property disputes"
-                ],
-                "correct": 1,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Automakers that pre-booked capacity were prioritized because allocation depended as much on contracts as on _______ needs.",
-                "options": [
-                    "production",
-                    "technology",
-                    "financial",
-                    "logistics"
-                ],
-                "correct": 1,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Geographic concentration in East Asia and the Netherlands creates _______ vulnerabilities.",
-                "options": [
-                    "capacity-driven",
-                    "region-dependent",
-                    "supply-linked",
-                    "single-point"
-                ],
-                "correct": 3,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Just-in-time failed because production involves _______.",
-                "options": [
-                    "diverse part numbers",
-                    "non-interchangeable chips",
-                    "long cycle times",
-                    "unstable demand shifts"
-                ],
-                "correct": 2,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "When automotive demand collapsed in 2020, foundries shifted capacity toward _______.",
-                "options": [
-                    "mobile processors",
-                    "computing systems",
-                    "digital displays",
-                    "consumer electronics"
-                ],
-                "correct": 3,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Companies shifting to risk-adjusted strategies now maintain inventories and develop _______ supply contracts.",
-                "options": [
-                    "adaptive",
-                    "multi-year",
-                    "flexible",
-                    "diversified"
-                ],
-                "correct": 0,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Intermediate capacity expansions typically require _______ to complete.",
-                "options": [
-                    "one to two years",
-                    "three to five months",
-                    "five to seven years",
-                    "ten to twelve months"
-                ],
-                "correct": 0,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "The technology used in advanced semiconductor manufacturing is _______.",
-                "options": [
-                    "quantum processors",
-                    "extreme ultraviolet",
-                    "deep-UV scanners",
-                    "plasma emitters"
-                ],
-                "correct": 1,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "Photoresist materials require _______",
-                "options": [
-                    "rare-earth dopants",
-                    "purified gases",
-                    "semiconductor-grade coatings",
-                    "ultra-pure resins"
-                ],
-                "correct": 3,
-                "source_type": "ai_summary"
-            },
-            {
-                "q": "At the 3nm process node, transistor gate widths correspond to roughly _______.",
-                "options": [
-                    "44 carbon atoms",
-                    "46 silicon atoms",
-                    "48 silicon atoms",
-                    "42 carbon atoms"
-                ],
-                "correct": 2,
-                "source_type": "article"
-            },
-            {
-                "q": "Legacy-node capacity additions require _______ and produce margins of 15–25%.",
-                "options": [
-                    "6–9 months",
-                    "12–15 months",
-                    "18–24 months",
-                    "30–36 months"
-                ],
-                "correct": 2,
-                "source_type": "article"
-            },
-            {
-                "q": "By 2019, some manufacturers operated on _______ for certain components.",
-                "options": [
-                    "single-week buffers",
-                    "two-month buffers",
-                    "quarterly buffers",
-                    "ten-day buffers"
-                ],
-                "correct": 0,
-                "source_type": "article"
-            },
-            {
-                "q": "Western advanced-node production requires subsidies amounting to _______ of total costs.",
-                "options": [
-                    "around one-tenth",
-                    "roughly one-quarter to one-third",
-                    "nearly one-half",
-                    "two-thirds"
-                ],
-                "correct": 1,
-                "source_type": "article"
-            }
-        ]
-    }
-}
 
 # Section 1: Familiarity Ratings (18 items, 1-7 Likert)
 PRIOR_KNOWLEDGE_FAMILIARITY_TERMS = [
@@ -1212,7 +657,7 @@ def index():
     if "participant_id" not in session:
         # New participant - show language selection
         if "lang" not in session:
-            return render_template("language_selection.html")
+            return render_cached("language_selection.html")
         # Language selected but no participant yet - go to login
         return render_template("login.html")
     
@@ -1286,8 +731,9 @@ def recall_instruction(i):
         return redirect(url_for("index"))
     article_key = article_order[i]
     # ...other logic...
-    return render_template(
+    return render_cached(
         "recall_instruction.html",
+        vary=(article_key, i),
         article=get_localized_article(article_key),
         article_key=article_key,
         i=i,
@@ -1584,7 +1030,7 @@ def login():
 @app.route("/consent")
 @require_pid
 def consent():
-    return render_template("consent.html")
+    return render_cached("consent.html")
 
 @app.route("/consent_accept", methods=["POST"])
 @require_pid
@@ -1612,6 +1058,7 @@ def prior_knowledge():
 
 @app.route("/submit_prior_knowledge", methods=["POST"])
 @require_pid
+@dedupe_submission
 def submit_prior_knowledge():
     data = request.get_json(force=True) or {}
 
@@ -1689,7 +1136,7 @@ def submit_prior_knowledge():
 @require_pid
 def instructions():
     """Display instructions page before starting the experiment"""
-    return render_template("instructions.html")
+    return render_cached("instructions.html")
 
 @app.route("/instructions_ready", methods=["POST"])
 @require_pid
@@ -1720,6 +1167,7 @@ def ai_trust():
 
 @app.route("/submit_ai_trust", methods=["POST"])
 @require_pid
+@dedupe_submission
 def submit_ai_trust():
     data = request.get_json(force=True) or {}
 
@@ -1937,6 +1385,9 @@ def randomize():
 @require_pid
 def ai_summary_view(article_num: int):
     """Separate page for viewing AI summary (pre-reading or post-reading)"""
+    return _ai_summary_page(article_num)
+
+def _ai_summary_page(article_num: int, record: bool = True):
     article_order = session.get("article_order") or []
     timing_order = session.get("timing_order") or []
     structure = session.get("structure_condition")
@@ -1956,8 +1407,8 @@ def ai_summary_view(article_num: int):
     timing = timing_order[article_num] if article_num < len(timing_order) else "pre_reading"
     mode = "pre_reading" if timing == "pre_reading" else "post_reading"
     
-    session["current_article"] = article_num
-    session["current_article_key"] = article_key
+    if record:
+        ARM.record_article(article_num, article_key)
     
     return render_template(
         "ai_summary_view.html",
@@ -1970,6 +1421,9 @@ def ai_summary_view(article_num: int):
 @app.route("/reading/<int:article_num>", methods=["GET"])
 @require_pid
 def reading_phase(article_num: int):
+    return _reading_page(article_num)
+
+def _reading_page(article_num: int, record: bool = True):
     # Pull from session defensively
     article_order = session.get("article_order") or []
     timing_order = session.get("timing_order") or []
@@ -2004,10 +1458,8 @@ def reading_phase(article_num: int):
             return redirect(url_for("ai_summary_view", article_num=article_num))
 
     # Record session state
-    session["current_article"] = article_num
-    session["current_article_key"] = article_key
-    session["current_timing"] = timing
-    session["reading_start_time"] = datetime.now().isoformat()
+    if record:
+        ARM.record_article(article_num, article_key, timing)
 
     return render_template(
         "reading.html",
@@ -2018,9 +1470,35 @@ def reading_phase(article_num: int):
         summary=summary,
         timing=timing,
         structure=structure,
+        dwell_bins=READING_DWELL_BINS,
+        article_token=ARTICLE_TOKENS.issue(session["participant_id"], article_num),
     )
 
 
+# ---- Next-article bundle (prefetched by break.html) ----
+def _bundle_is_summary(article_num: int) -> bool:
+    """True if the article opens with its AI summary (pre-reading, not viewed yet)"""
+    timing_order = session.get("timing_order") or []
+    timing = timing_order[article_num] if 0 <= article_num < len(timing_order) else None
+    return timing == "pre_reading" and not session.get(f"pre_summary_viewed_{article_num}", False)
+
+def _bundle_fields(article_num: int, article_key: str, article: dict) -> dict:
+    """/article_bundles fields only this arm has: the summary for the participant's structure and the timing"""
+    structure = session.get("structure_condition")
+    timing_order = session.get("timing_order") or []
+    return {
+        "summary": article.get(f"summary_{structure}", "") if structure else "",
+        "timing": timing_order[article_num] if article_num < len(timing_order) else None,
+    }
+
+# The shared /next_bundle, /article_bundles and /bundle_shown (study_core/shared_routes.py)
+# show the summary first for a pre-reading article
+ARM.reading_page = _reading_page
+ARM.summary_page = _ai_summary_page
+ARM.summary_endpoint = "ai_summary_view"
+ARM.summary_first = _bundle_is_summary
+ARM.bundle_fields = _bundle_fields
+
 # ---- Summary lock endpoint ----
 @app.route("/lock_summary", methods=["POST"])
 @require_pid
@@ -2046,6 +1524,7 @@ def mark_pre_summary_viewed():
 
 @app.route("/log_summary_viewing", methods=["POST"])
 @require_pid
+@dedupe_submission
 def log_summary_viewing():
     """Log time spent viewing AI summary"""
     data = request.get_json(force=True) or {}
@@ -2068,11 +1547,15 @@ def log_summary_viewing():
 
 @app.route("/log_reading", methods=["POST"])
 @require_pid
+@dedupe_submission
 def log_reading():
-    data = request.get_json(force=True) or {}
-    data["article_num"] = session.get("current_article")
-    data["article_key"] = session.get("current_article_key")
-    data["timing"] = session.get("current_timing")
+    data = ARM.reading_row(request.get_json(force=True) or {})  # article (and timing) from the session or the signed token
+    if data.get("event") == "reading_dwell":
+        # Sent once per article; at most READING_DWELL_BINS values are accepted
+        dwell = data.get("dwell_ms")
+        if not isinstance(dwell, list) or len(dwell) > READING_DWELL_BINS:
+            return jsonify({"error": "invalid dwell histogram"}), 400
+        data["dwell_ms"] = json.dumps([int(v) if isinstance(v, (int, float)) and 0 <= v < 1e9 else 0 for v in dwell])
     log_data(session["participant_id"], "reading_behavior", data)
     return jsonify({"status": "ok"})
 
@@ -2138,6 +1621,7 @@ def test_phase(article_num: int):
         show_recall_counters=False,
         recall_total_ms=recall_total_ms,
         recall_unlock_ms=recall_unlock_ms,
+        edit_timeline=EDIT_TIMELINE,
         start_on_mcq=start_on_mcq,
         skip_recall=start_on_mcq  # Additional clear flag for template
     )
@@ -2190,6 +1674,7 @@ def mcq_only(article_num: int):
 
 @app.route("/submit_test", methods=["POST"])
 @require_pid
+@dedupe_submission
 def submit_test():
     data = request.get_json(force=True) or {}
     article_num = int(data.get("article_num", 0))
@@ -2224,6 +1709,24 @@ def submit_test():
             "paste_attempts": recall_data.get("paste_attempts", 0),
             "over_limit": recall_data.get("over_limit", False)
         })
+        timeline = recall_data.get("edit_timeline")
+        if timeline:
+            try:
+                ops = edit_timeline.decode(timeline)
+            except ValueError as e:
+                print(f"[EDIT TIMELINE] {session['participant_id']} article {article_num}: {e}")
+            else:
+                # Kept as sent (compact); data_analysis/edit_timeline_report.py decodes it
+                log_data(session["participant_id"], "recall_edit_timeline", {
+                    "article_num": article_num,
+                    "article_key": data.get("article_key"),
+                    "timing": data.get("timing"),
+                    "version": timeline.get("v"),
+                    "encoding": timeline.get("encoding"),
+                    "ops": len(ops),
+                    "truncated": bool(timeline.get("truncated")),
+                    "data": timeline.get("data"),
+                })
     
     # Calculate accuracy rate and log MCQ responses
     if mcq_data:
@@ -2355,6 +1858,7 @@ def post_article_ratings(article_num: int):
 
 @app.route("/submit_post_article_ratings", methods=["POST"])
 @require_pid
+@dedupe_submission
 def submit_post_article_ratings():
     """Submit post-article ratings data"""
     data = request.get_json(force=True) or {}
@@ -2405,20 +1909,20 @@ def submit_post_article_ratings():
 def break_after_reading(article_num: int):
     # Break after reading (3 minutes) - always goes to test after break
     # After test, if article 2, will go to manipulation_check; otherwise go to next article reading
-    return render_template("break.html", next_article=article_num, after_reading=True, test_mode=TEST_MODE, go_to_manipulation=False)
+    return render_cached("break.html", next_article=article_num, after_reading=True, test_mode=TEST_MODE, go_to_manipulation=False)
 
 # ---- Pre-test break route ----
 @app.route("/break_before_test/<int:article_num>")
 @require_pid
 def break_before_test(article_num: int):
     # After the break, go directly to the TEST for this article (no recall-instruction wait)
-    return render_template("break.html", next_article=article_num, after_reading=True, test_mode=TEST_MODE)
+    return render_cached("break.html", next_article=article_num, after_reading=True, test_mode=TEST_MODE)
 
 @app.route("/break/<int:next_article>")
 @require_pid
 def short_break(next_article: int):
     # This is the classic "after test" break
-    return render_template("break.html", next_article=next_article, after_reading=False, test_mode=TEST_MODE)
+    return render_cached("break.html", next_article=next_article, after_reading=False, test_mode=TEST_MODE)
 
 @app.route("/manipulation_check")
 @require_pid
@@ -2427,6 +1931,7 @@ def manipulation_check():
 
 @app.route("/submit_manipulation", methods=["POST"])
 @require_pid
+@dedupe_submission
 def submit_manipulation():
     data = request.get_json(force=True) or {}
     log_data(session["participant_id"], "manipulation_check", data)
@@ -2439,108 +1944,7 @@ def debrief():
 
 @app.route("/excluded")
 def excluded():
-    return render_template("excluded.html")
-
-# ------------------------------------------------------------------------------
-# Admin Data Export Routes (for cloud deployment)
-# ------------------------------------------------------------------------------
-@app.route("/admin/export", methods=["GET"])
-def admin_export_data():
-    """
-    Export all experiment data as ZIP file.
-    Requires ADMIN_KEY environment variable for security.
-    Usage: /admin/export?key=YOUR_ADMIN_KEY
-    """
-    admin_key = os.environ.get("ADMIN_KEY")
-    provided_key = request.args.get("key")
-    
-    if not admin_key or provided_key != admin_key:
-        return jsonify({"error": "Unauthorized. Set ADMIN_KEY environment variable."}), 403
-    
-    import zipfile
-    import tempfile
-    from flask import send_file
-    
-    # Create temporary ZIP file
-    temp_zip = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
-    zip_path = temp_zip.name
-    temp_zip.close()
-    
-    try:
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Add all CSV files
-            if os.path.exists(DATA_DIR):
-                for filename in os.listdir(DATA_DIR):
-                    if filename.endswith('.csv'):
-                        filepath = os.path.join(DATA_DIR, filename)
-                        zipf.write(filepath, filename)
-            
-            # Add translation cache if needed
-            if os.path.exists(TRANSLATION_CACHE_FILE):
-                zipf.write(TRANSLATION_CACHE_FILE, 'translations.json')
-        
-        # Send file
-        return send_file(
-            zip_path,
-            mimetype='application/zip',
-            as_attachment=True,
-            download_name=f'experiment_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip'
-        )
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route("/admin/stats", methods=["GET"])
-def admin_stats():
-    """
-    Get statistics about experiment data.
-    Requires ADMIN_KEY environment variable.
-    Usage: /admin/stats?key=YOUR_ADMIN_KEY
-    """
-    admin_key = os.environ.get("ADMIN_KEY")
-    provided_key = request.args.get("key")
-    
-    if not admin_key or provided_key != admin_key:
-        return jsonify({"error": "Unauthorized. Set ADMIN_KEY environment variable."}), 403
-    
-    stats = {
-        "participant_count": 0,
-        "data_files": [],
-        "total_data_size_mb": 0,
-        "last_update": None,
-        "data_directory": os.path.abspath(DATA_DIR)
-    }
-    
-    if os.path.exists(DATA_DIR):
-        csv_files = [f for f in os.listdir(DATA_DIR) if f.endswith('.csv')]
-        stats["data_files"] = sorted(csv_files)
-        
-        # Count participants
-        participants_file = os.path.join(DATA_DIR, "participants.csv")
-        if os.path.exists(participants_file):
-            try:
-                with open(participants_file, 'r', encoding='utf-8') as f:
-                    stats["participant_count"] = max(0, sum(1 for line in f) - 1)  # Subtract header
-            except Exception:
-                stats["participant_count"] = 0
-        
-        # Calculate total size
-        total_size = sum(
-            os.path.getsize(os.path.join(DATA_DIR, f))
-            for f in csv_files
-        )
-        stats["total_data_size_mb"] = round(total_size / (1024 * 1024), 2)
-        
-        # Get last modification time
-        if csv_files:
-            latest_file = max(
-                csv_files,
-                key=lambda f: os.path.getmtime(os.path.join(DATA_DIR, f))
-            )
-            stats["last_update"] = datetime.fromtimestamp(
-                os.path.getmtime(os.path.join(DATA_DIR, latest_file))
-            ).isoformat()
-    
-    return jsonify(stats)
+    return render_cached("excluded.html")
 
 # ------------------------------------------------------------------------------
 # Entrypoint
@@ -2864,21 +2268,29 @@ def get_condition_distribution():
     
     return jsonify(distribution)
 
+# ------------------------------------------------------------------------------
+# Warmup (study_core/arm.py starts it on the first request and serves /healthz, /readyz)
+# ------------------------------------------------------------------------------
+ARM.warmup.add("translation_cache", _load_translation_cache)
+ARM.warmup.add("templates", ARM.compile_templates)
+# First optional step: live dashboard events are held until it has run
+ARM.warmup.add("cohort_replay", ARM.replay_cohort_logs, required=False)
+if GoogleTranslator:
+    # Network-bound; optional so readiness never waits on Google
+    ARM.warmup.add("pretranslate_ui", _pre_translate_ui_text, required=False)
+    if os.environ.get("DISABLE_PRETRANSLATE") != "1":
+        ARM.warmup.add("pretranslate_articles", _pre_translate_all_articles, required=False)
+ARM.warmup.add("precompress_static", ARM.precompress_static, required=False)
+ARM.warmup.add("page_cache", ARM.prerender_pages, required=False)
+
+
 if __name__ == "__main__":
     os.makedirs("templates", exist_ok=True)
     os.makedirs("static", exist_ok=True)
 
-    # Load translation cache on startup
-    _load_translation_cache()
-    
-    # Pre-translate static UI text (fast)
-    if GoogleTranslator:
-        _pre_translate_ui_text()
-    
-    # Pre-translate ALL articles (takes 30-60 seconds but makes everything instant)
-    # Allow disabling via env to avoid network delays in constrained environments
-    if GoogleTranslator and os.environ.get("DISABLE_PRETRANSLATE") != "1":
-        _pre_translate_all_articles()
+    # Cache load, template compilation and pre-translation run in the
+    # background so the server binds right away (/healthz, /readyz)
+    ARM.warmup.start()
 
     print("\n" + "=" * 50)
     print("AI Memory Experiment Platform")
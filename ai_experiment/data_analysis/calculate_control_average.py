@@ -4,7 +4,8 @@ import os
 import glob
 import numpy as np
 
-DATA_DIR = "/Users/duccioo/Desktop/ai_memory_experiment/no_ai_experiment/experiment_data"
+# Superseded by merge_arms.py (both arms, one parser, AI-vs-NoAI tests)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "no_ai_experiment", "experiment_data")
 
 # ORIGINAL ANSWER KEYS (15 questions)
 ORIGINAL_CORRECT_ANSWERS = {
@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+"""
+Columnar in-memory cohort store for parsed participant logs.
+
+parse_csv_log() returns one nested dict per participant (lists of per-event
+dicts, alias keys such as ai_trust_score / trust_score), which is convenient
+for one report but wasteful for a whole cohort, and every cross-participant
+aggregation becomes a Python loop. CohortStore keeps the same data as one
+typed NumPy array per field per event type:
+
+    participants   one row per participant (structure, questionnaire scores)
+    reading        reading_complete events
+    reading_events summary overlay opened / closed and visibility changes
+    summary        summary_viewing (pre / post reading pages)
+    recall         recall_response (text in one UTF-8 buffer + offsets)
+    mcq            mcq_responses, one row per submission
+    mcq_items      one row per answered question (answer, correctness, source)
+    ratings        post_article_ratings
+
+article_key / timing / structure / event / source are dictionary-encoded
+(uint8 codes into a shared Dictionary). Every event table is sorted by
+participant and has an offset index, so a participant's rows are
+rows[offsets[p]:offsets[p + 1]].
+
+Tables support filter(), group_by() (bincount / reduceat aggregations) and
+join() (sorted composite keys + searchsorted).
+
+Usage:
+    python cohort_store.py                       # load ../experiment_data, print memory comparison
+    python cohort_store.py --data-dir ../experiment_data --data-dir ../../no_ai_experiment/experiment_data
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+from log_parser import CORRECT_SOURCE_MAP, parse_csv_log
+from reading_timeline import parse_time_ms
+from recall_scoring import DEFAULT_DATA_DIR
+
+
+# ============================================================================
+# Dictionary encoding and variable-length text
+# ============================================================================
+class Dictionary:
+    """String <-> uint8 code mapping shared by every column of one kind."""
+
+    def __init__(self, values=()):
+        self.values = [""]
+        self.codes = {"": 0}
+        for value in values:
+            self.encode(value)
+
+    def encode(self, value):
+        value = "" if value is None else str(value)
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            if code > 255:
+                raise ValueError("Dictionary overflow (more than 255 distinct values)")
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def code(self, value):
+        """Code of an existing value (-1 if unknown, which matches nothing)."""
+        return self.codes.get(value, -1)
+
+    def decode(self, codes):
+        return np.array(self.values, dtype=object)[np.asarray(codes)]
+
+
+class TextColumn:
+    """Variable-length strings as one UTF-8 byte buffer plus int64 offsets."""
+
+    def __init__(self, buffer, offsets):
+        self.buffer = buffer
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings):
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8).copy(), offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def take(self, idx):
+        return TextColumn.from_strings([self[i] for i in np.asarray(idx)])
+
+    @property
+    def nbytes(self):
+        return self.buffer.nbytes + self.offsets.nbytes
+
+
+# ============================================================================
+# Tables
+# ============================================================================
+def _is_sorted(values):
+    return len(values) < 2 or bool(np.all(values[1:] >= values[:-1]))
+
+
+class Table:
+    """Named columns of equal length; `participant` (int32 row into participants) when present."""
+
+    def __init__(self, name, columns, dictionaries, kinds, n_participants=0):
+        self.name = name
+        self.columns = columns
+        self.dictionaries = dictionaries
+        self.kinds = kinds            # column -> dictionary name for encoded columns
+        self.n_participants = n_participants
+        self.offsets = None
+        if "participant" in columns and _is_sorted(columns["participant"]):
+            self.offsets = np.searchsorted(columns["participant"], np.arange(n_participants + 1))
+
+    def __len__(self):
+        first = next(iter(self.columns.values()), None)
+        return 0 if first is None else len(first)
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    @property
+    def nbytes(self):
+        return sum(c.nbytes for c in self.columns.values()) + (self.offsets.nbytes if self.offsets is not None else 0)
+
+    def rows_for(self, participant):
+        """Row slice of one participant (by row index into the participants table)."""
+        return slice(int(self.offsets[participant]), int(self.offsets[participant + 1]))
+
+    def decode(self, column):
+        """Column with dictionary codes turned back into strings."""
+        kind = self.kinds.get(column)
+        values = self.columns[column]
+        if kind:
+            return self.dictionaries[kind].decode(values)
+        if isinstance(values, TextColumn):
+            return np.array([values[i] for i in range(len(values))], dtype=object)
+        return values
+
+    def _mask_for(self, column, value):
+        values = self.columns[column]
+        kind = self.kinds.get(column)
+        wanted = value if isinstance(value, (list, tuple, set)) else [value]
+        if kind:
+            wanted = [self.dictionaries[kind].code(v) for v in wanted]
+        return np.isin(values, list(wanted))
+
+    def take(self, idx):
+        idx = np.asarray(idx)
+        columns = {name: (col.take(idx) if isinstance(col, TextColumn) else col[idx])
+                   for name, col in self.columns.items()}
+        return Table(self.name, columns, self.dictionaries, dict(self.kinds), self.n_participants)
+
+    def filter(self, mask=None, **equals):
+        """Rows where mask holds and every column equals the given value (or is in the given list).
+
+        Dictionary-encoded columns are compared by string: t.filter(timing="synchronous").
+        """
+        keep = np.ones(len(self), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        for column, value in equals.items():
+            keep &= self._mask_for(column, value)
+        return self.take(np.flatnonzero(keep))
+
+    def _group_codes(self, keys):
+        stacked = np.stack([np.asarray(self.columns[k], dtype=np.int64) for k in keys], axis=1)
+        uniq, inverse = np.unique(stacked, axis=0, return_inverse=True)
+        return uniq, inverse.reshape(-1)
+
+    def group_by(self, keys, **aggregations):
+        """Aggregate per distinct key combination.
+
+        aggregations: out_name=(column, how) with how in count, sum, mean, min, max, median.
+        Returns a Table whose key columns keep their encoding.
+        """
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        uniq, inverse = self._group_codes(keys)
+        n_groups = len(uniq)
+        counts = np.bincount(inverse, minlength=n_groups)
+        order = np.argsort(inverse, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]]) if n_groups else np.zeros(0, dtype=np.int64)
+
+        out = {k: uniq[:, i].astype(np.asarray(self.columns[k]).dtype) for i, k in enumerate(keys)}
+        for out_name, (column, how) in aggregations.items():
+            if how == "count":
+                out[out_name] = counts
+                continue
+            values = np.asarray(self.columns[column], dtype=np.float64)
+            if how == "sum":
+                out[out_name] = np.bincount(inverse, weights=values, minlength=n_groups)
+            elif how == "mean":
+                out[out_name] = np.bincount(inverse, weights=values, minlength=n_groups) / np.maximum(counts, 1)
+            elif how in ("min", "max"):
+                reducer = np.minimum if how == "min" else np.maximum
+                out[out_name] = reducer.reduceat(values[order], starts) if n_groups else np.zeros(0)
+            elif how == "median":
+                # Sort by (group, value) once and pick the middle element(s) of every group
+                by_value = np.lexsort((values, inverse))
+                sorted_values = values[by_value]
+                lo = starts + (counts - 1) // 2
+                hi = starts + counts // 2
+                out[out_name] = (sorted_values[lo] + sorted_values[hi]) / 2 if n_groups else np.zeros(0)
+            else:
+                raise ValueError(f"Unknown aggregation: {how}")
+        kinds = {k: v for k, v in self.kinds.items() if k in keys}
+        return Table(f"{self.name}_by_{'_'.join(keys)}", out, self.dictionaries, kinds, self.n_participants)
+
+    def join(self, other, on, columns=None, suffix="_right"):
+        """Inner join with `other`, whose `on` keys must be unique (many-to-one lookup).
+
+        columns: which columns of `other` to bring over (default: all non-key columns).
+        """
+        on = [on] if isinstance(on, str) else list(on)
+        columns = [c for c in (columns or other.columns) if c not in on]
+
+        def composite(table):
+            key = np.zeros(len(table), dtype=np.int64)
+            for k in on:
+                key = key * (1 << 21) + np.asarray(table.columns[k], dtype=np.int64)
+            return key
+
+        right_keys = composite(other)
+        order = np.argsort(right_keys, kind="stable")
+        sorted_keys = right_keys[order]
+        if len(sorted_keys) > 1 and np.any(sorted_keys[1:] == sorted_keys[:-1]):
+            raise ValueError(f"join keys {on} are not unique in {other.name}")
+        left_keys = composite(self)
+        pos = np.searchsorted(sorted_keys, left_keys)
+        pos = np.minimum(pos, max(len(sorted_keys) - 1, 0))
+        matched = (sorted_keys[pos] == left_keys) if len(sorted_keys) else np.zeros(len(self), dtype=bool)
+        left_idx = np.flatnonzero(matched)
+        right_idx = order[pos[matched]]
+
+        result = self.take(left_idx)
+        kinds = dict(result.kinds)
+        for c in columns:
+            name = c if c not in result.columns else c + suffix
+            col = other.columns[c]
+            result.columns[name] = col.take(right_idx) if isinstance(col, TextColumn) else col[right_idx]
+            if c in other.kinds:
+                kinds[name] = other.kinds[c]
+        result.kinds = kinds
+        result.name = f"{self.name}_join_{other.name}"
+        return result
+
+    def to_records(self):
+        """List of row dicts with decoded strings (for printing / CSV)."""
+        decoded = {name: self.decode(name) for name in self.columns}
+        return [{name: (values[i].item() if hasattr(values[i], "item") else values[i])
+                 for name, values in decoded.items()} for i in range(len(self))]
+
+
+# ============================================================================
+# Schema and loading
+# ============================================================================
+# column -> numpy dtype, a Dictionary name, or "text"
+SCHEMA = {
+    "participants": [
+        ("participant", "i4"), ("participant_id", "text"), ("structure", "structure"), ("age", "i2"),
+        ("familiarity", "f4"), ("recognition", "f4"), ("excluded", "?"),
+        ("trust_score", "f4"), ("dependence_score", "f4"), ("skill_score", "f4"),
+        ("coherence", "i1"), ("connectivity", "i1"),
+    ],
+    "reading": [
+        ("participant", "i4"), ("timestamp_ms", "i8"), ("article_num", "i1"), ("article_key", "article"),
+        ("timing", "timing"), ("reading_time_ms", "i4"), ("summary_time_ms", "i4"),
+        ("scroll_depth", "i2"), ("overlay_count", "i2"),
+    ],
+    "reading_events": [
+        ("participant", "i4"), ("timestamp_ms", "i8"), ("event", "event"), ("article_num", "i1"),
+        ("article_key", "article"), ("timing", "timing"), ("duration_ms", "i4"), ("is_visible", "?"),
+    ],
+    "summary": [
+        ("participant", "i4"), ("timestamp_ms", "i8"), ("article_num", "i1"), ("article_key", "article"),
+        ("mode", "timing"), ("structure", "structure"), ("time_spent_ms", "i4"),
+    ],
+    "recall": [
+        ("participant", "i4"), ("timestamp_ms", "i8"), ("article_num", "i1"), ("article_key", "article"),
+        ("timing", "timing"), ("sentence_count", "i2"), ("word_count", "i4"), ("character_count", "i4"),
+        ("confidence", "i1"), ("difficulty", "i1"), ("time_spent_ms", "i4"), ("paste_attempts", "i2"),
+        ("over_limit", "?"), ("recall_text", "text"),
+    ],
+    "mcq": [
+        ("participant", "i4"), ("timestamp_ms", "i8"), ("article_num", "i1"), ("article_key", "article"),
+        ("timing", "timing"), ("correct_count", "i1"), ("total", "i1"), ("total_time_ms", "i4"),
+    ],
+    "mcq_items": [
+        ("participant", "i4"), ("mcq", "i4"), ("article_key", "article"), ("timing", "timing"),
+        ("question", "i1"), ("answer", "i1"), ("correct_answer", "i1"), ("is_correct", "?"),
+        ("source", "source"), ("answer_time_ms", "i4"),
+    ],
+    "ratings": [
+        ("participant", "i4"), ("timestamp_ms", "i8"), ("article_num", "i1"), ("article_key", "article"),
+        ("timing", "timing"), ("load_mental_effort", "i1"), ("load_task_difficulty", "i1"),
+        ("ai_help_understanding", "i1"), ("ai_help_memory", "i1"), ("ai_made_task_easier", "i1"),
+        ("ai_satisfaction", "i1"), ("ai_better_than_no_ai", "i1"), ("mcq_overall_confidence", "i1"),
+    ],
+}
+DICTIONARY_SEEDS = {
+    "article": ("uhi", "crispr", "semiconductors"),
+    "timing": ("pre_reading", "synchronous", "post_reading"),
+    "structure": ("integrated", "segmented", "control"),
+    "event": ("summary_overlay_opened", "summary_overlay_closed", "visibility_change"),
+    "source": ("ai_summary", "article", "false_lure"),
+}
+
+
+def _ms(timestamp):
+    return int(parse_time_ms(timestamp) or 0)
+
+
+def _int(value, default=-1):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def _rows(p, data, mcq_base):
+    """Yield (table, row tuple in SCHEMA order) for one parsed participant."""
+    for r in data["reading_data"]:
+        yield "reading", (p, _ms(r["timestamp"]), r["article_num"], r["article_key"], r["timing"],
+                          r["reading_time_ms"], r["summary_time_ms"], r["scroll_depth"], r["overlay_count"])
+    for e in data["summary_overlay_events"]:
+        yield "reading_events", (p, _ms(e["timestamp"]), f"summary_overlay_{e['event']}", e["article_num"],
+                                 e["article_key"], e["timing"], e.get("duration_ms", 0), True)
+    for v in data["visibility_changes"]:
+        yield "reading_events", (p, _ms(v["timestamp"]), "visibility_change", v["article_num"],
+                                 v["article_key"], v["timing"], 0, v["is_visible"])
+    for s in data["summary_viewing"]:
+        yield "summary", (p, _ms(s["timestamp"]), s["article_num"], s["article_key"], s["mode"],
+                          s["structure"], s["time_spent_ms"])
+    for r in data["recall_data"]:
+        yield "recall", (p, _ms(r["timestamp"]), r["article_num"], r["article_key"], r["timing"],
+                         r["sentence_count"], r["word_count"], r["character_count"], r["confidence"],
+                         r["difficulty"], r["time_spent_ms"], r["paste_attempts"], r["over_limit"], r["recall_text"])
+    for m_i, m in enumerate(data["mcq_data"]):
+        details = m.get("question_details") or {}
+        correct = sum(1 for q in details.values() if isinstance(q, dict) and q.get("is_correct"))
+        yield "mcq", (p, _ms(m["timestamp"]), m["article_num"], m["article_key"], m["timing"],
+                      correct, len(details), m.get("total_time_ms", 0))
+        times = m.get("answer_times_ms") or {}
+        for q_key, q in details.items():
+            if not isinstance(q, dict):
+                continue
+            q_idx = q.get("question_index", -1)
+            yield "mcq_items", (p, mcq_base + m_i, m["article_key"], m["timing"], q_idx,
+                                _int(q.get("participant_answer")), _int(q.get("correct_answer")),
+                                bool(q.get("is_correct")),
+                                CORRECT_SOURCE_MAP.get(m["article_key"], {}).get(q_idx, "unknown"),
+                                _int(times.get(q_key), 0))
+    for r in data["post_article_ratings"]:
+        yield "ratings", (p, _ms(r["timestamp"]), r["article_num"], r["article_key"], r["timing"],
+                          r["load_mental_effort"], r["load_task_difficulty"], r["ai_help_understanding"],
+                          r["ai_help_memory"], r["ai_made_task_easier"], r["ai_satisfaction"],
+                          r["ai_better_than_no_ai"], r["mcq_overall_confidence"])
+
+
+class CohortStore:
+    """All participants' parsed events as typed columnar tables."""
+
+    def __init__(self, tables, dictionaries):
+        self.tables = tables
+        self.dictionaries = dictionaries
+        for name, table in tables.items():
+            setattr(self, name, table)
+
+    @classmethod
+    def from_parsed(cls, parsed):
+        """Build from (participant_id, parse_csv_log dict) pairs, in participant order."""
+        builder = _Builder()
+        for participant_id, data in parsed:
+            builder.add(participant_id, data)
+        return builder.finish()
+
+    @classmethod
+    def from_logs(cls, data_dirs):
+        """Parse every *_log.csv one at a time (only one dict participant is alive at once)."""
+        builder = _Builder()
+        for data_dir in data_dirs:
+            for participant_id, path in _log_files(data_dir):
+                try:
+                    builder.add(participant_id, parse_csv_log(path))
+                except Exception as e:
+                    print(f"Warning: could not parse {os.path.basename(path)}: {e}")
+        return builder.finish()
+
+    @property
+    def nbytes(self):
+        return sum(t.nbytes for t in self.tables.values())
+
+    def participant_index(self, participant_id):
+        ids = self.participants["participant_id"]
+        for i in range(len(ids)):
+            if ids[i] == participant_id:
+                return i
+        raise KeyError(participant_id)
+
+
+class _Builder:
+    def __init__(self):
+        self.dictionaries = {name: Dictionary(seed) for name, seed in DICTIONARY_SEEDS.items()}
+        self.rows = {name: [] for name in SCHEMA}
+        self.mcq_count = 0
+
+    def add(self, participant_id, data):
+        p = len(self.rows["participants"])
+        structure = data.get("randomization", {}).get("structure", "") or "control"
+        pk, trust, check = data.get("prior_knowledge", {}), data.get("ai_trust", {}), data.get("manipulation_check", {})
+        self.rows["participants"].append((
+            p, participant_id, structure, _int(data.get("demographics", {}).get("age")),
+            pk.get("familiarity", np.nan), pk.get("recognition", np.nan),
+            str(pk.get("excluded", "")).lower() == "true",
+            trust.get("trust_score", np.nan), trust.get("dependence_score", np.nan), trust.get("skill_score", np.nan),
+            check.get("coherence", -1), check.get("connectivity", -1),
+        ))
+        for table, row in _rows(p, data, self.mcq_count):
+            self.rows[table].append(row)
+        self.mcq_count += len(data["mcq_data"])
+
+    def finish(self):
+        n_participants = len(self.rows["participants"])
+        tables = {}
+        for name, schema in SCHEMA.items():
+            rows = self.rows[name]
+            columns, kinds = {}, {}
+            for i, (column, dtype) in enumerate(schema):
+                values = [row[i] for row in rows]
+                if dtype == "text":
+                    columns[column] = TextColumn.from_strings(values)
+                elif dtype in self.dictionaries:
+                    encode = self.dictionaries[dtype].encode
+                    columns[column] = np.fromiter((encode(v) for v in values), dtype=np.uint8, count=len(values))
+                    kinds[column] = dtype
+                else:
+                    columns[column] = np.array(values, dtype=dtype) if values else np.zeros(0, dtype=dtype)
+            self.rows[name] = None
+            tables[name] = Table(name, columns, self.dictionaries, kinds, n_participants)
+        return CohortStore(tables, self.dictionaries)
+
+
+def _log_files(data_dir):
+    for filename in sorted(os.listdir(data_dir)):
+        if filename.endswith("_log.csv"):
+            yield re.split(r"[-_]", filename, maxsplit=1)[0], os.path.join(data_dir, filename)
+
+
+# ============================================================================
+# Memory measurement
+# ============================================================================
+def deep_sizeof(obj, seen=None):
+    """Bytes held by a nested dict / list / str structure (shared objects counted once)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_sizeof(v, seen) for v in obj)
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the cohort into a columnar store and compare memory use")
+    parser.add_argument("--data-dir", action="append", help="Log directory (repeat for AI + control)")
+    args = parser.parse_args()
+
+    data_dirs = args.data_dir or [DEFAULT_DATA_DIR]
+    for data_dir in data_dirs:
+        if not os.path.isdir(data_dir):
+            print(f"Error: data directory not found: {data_dir}")
+            sys.exit(1)
+
+    parsed = []
+    for data_dir in data_dirs:
+        for participant_id, path in _log_files(data_dir):
+            try:
+                data = parse_csv_log(path)
+            except Exception as e:
+                print(f"Warning: could not parse {os.path.basename(path)}: {e}")
+                continue
+            data.pop("timeline", None)  # derived, not part of the event data
+            parsed.append((participant_id, data))
+    if not parsed:
+        print("No logs found")
+        sys.exit(1)
+
+    store = CohortStore.from_parsed(parsed)
+    dict_bytes = deep_sizeof(parsed)
+    print(f"{len(parsed)} participants")
+    print(f"  dict representation:  {dict_bytes / 1024:10.1f} KiB")
+    print(f"  columnar store:       {store.nbytes / 1024:10.1f} KiB  ({dict_bytes / max(store.nbytes, 1):.1f}x smaller)")
+    for name, table in store.tables.items():
+        print(f"    {name:<15} {len(table):>7} rows  {table.nbytes / 1024:8.1f} KiB")
+
+    # Same aggregation both ways: mean MCQ accuracy by structure x timing
+    t0 = time.perf_counter()
+    sums = {}
+    for _pid, data in parsed:
+        structure = data.get("randomization", {}).get("structure", "") or "control"
+        for m in data["mcq_data"]:
+            details = [q for q in (m.get("question_details") or {}).values() if isinstance(q, dict)]
+            if details:
+                key = (structure, m["timing"])
+                acc = sum(1 for q in details if q.get("is_correct")) / len(details)
+                total, n = sums.get(key, (0.0, 0))
+                sums[key] = (total + acc, n + 1)
+    t_dict = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    mcq = store.mcq.filter(mask=store.mcq["total"] > 0)
+    mcq.columns["accuracy"] = mcq["correct_count"] / mcq["total"]
+    joined = mcq.join(store.participants, on="participant", columns=["structure"])
+    result = joined.group_by(["structure", "timing"], n=("accuracy", "count"), accuracy=("accuracy", "mean"))
+    t_store = time.perf_counter() - t0
+
+    print()
+    print(f"MCQ accuracy by structure x timing (dict loop {t_dict * 1000:.2f} ms, columnar {t_store * 1000:.2f} ms):")
+    for row in result.to_records():
+        print(f"  {row['structure']:<11} {row['timing']:<13} n={row['n']:<4} {row['accuracy']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
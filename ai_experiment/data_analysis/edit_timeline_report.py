@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Writing bursts and pauses from the recall edit timelines.
+
+test.html sends a compact timeline of every insert / delete in the recall
+bullets (format: study_core/edit_timeline.py), logged as `recall_edit_timeline`
+rows. This script decodes them and writes one row per participant x article:
+time to the first edit, inserted / deleted characters, number and mean size
+of writing bursts (runs of edits without a gap >= --pause-ms) and the pause
+distribution (count, median, max and 2-5 s / 5-10 s / 10-30 s / 30 s+ bins).
+
+Works on both arms' logs (the control rows have no timing column).
+
+Usage:
+    python edit_timeline_report.py                          # all logs in ../experiment_data
+    python edit_timeline_report.py P233 --bursts            # one participant, print the bursts
+    python edit_timeline_report.py --data-dir ../../no_ai_experiment/experiment_data --pause-ms 3000
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(SCRIPT_DIR)))  # repository root (study_core/)
+
+from study_core import edit_timeline  # noqa: E402  (the apps' codec)
+from reading_timeline import DEFAULT_DATA_DIR, find_logs  # noqa: E402
+
+
+def extract_timelines(log_file_path):
+    """Yield (participant_id, article_num, article_key, timing, payload, truncated) per recall_edit_timeline row."""
+    participant_id = re.split(r"[-_]", os.path.basename(log_file_path), maxsplit=1)[0]
+    with open(log_file_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for parts in reader:
+            if len(parts) < 9 or parts[1] != "recall_edit_timeline":
+                continue
+            # timestamp, phase, article_num, article_key, [timing,] version, encoding, ops, truncated, data
+            timing = parts[4] if len(parts) > 9 else ""
+            version, encoding, ops, truncated, data = parts[-5:]
+            payload = {"v": int(version) if version.isdigit() else version, "encoding": encoding,
+                       "ops": int(ops) if ops.isdigit() else 0, "data": data}
+            yield participant_id, parts[2], parts[3], timing, payload, truncated.lower() == "true"
+
+
+def build_rows(paths, pause_ms):
+    rows = []
+    for path in paths:
+        for participant_id, article_num, article_key, timing, payload, truncated in extract_timelines(path):
+            try:
+                ops = edit_timeline.decode(payload)
+            except ValueError as e:
+                print(f"  skip {participant_id} {article_key}: {e}")
+                continue
+            row = {"participant_id": participant_id, "article_num": article_num,
+                   "article_key": article_key, "timing": timing, "truncated": truncated}
+            row.update(edit_timeline.summarize(ops, pause_ms))
+            rows.append((row, ops))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Writing bursts and pause distributions from recall edit timelines")
+    parser.add_argument("participant_id", nargs="?", help="Only this participant (e.g. P233)")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--out", default="recall_edit_timeline.csv")
+    parser.add_argument("--pause-ms", type=int, default=edit_timeline.PAUSE_MS,
+                        help="Gap that ends a writing burst (default %(default)s)")
+    parser.add_argument("--bursts", action="store_true", help="Print the bursts per recall")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.data_dir):
+        print(f"Error: data directory not found: {args.data_dir}")
+        sys.exit(1)
+    paths = find_logs(args.data_dir, args.participant_id.upper() if args.participant_id else None)
+    rows = build_rows(paths, args.pause_ms)
+    if not rows:
+        print("No recall edit timelines found")
+        sys.exit(1)
+
+    if args.bursts:
+        for row, ops in rows:
+            print(f"{row['participant_id']} {row['article_key']} ({row['ops']} edits, {row['pauses']} pauses)")
+            for start, end, inserted, deleted, n in edit_timeline.bursts(ops, args.pause_ms):
+                print(f"  {start / 1000:7.1f}s -> {end / 1000:7.1f}s  +{inserted:<4} -{deleted:<4} ({n} edits)")
+
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0][0].keys()))
+        writer.writeheader()
+        writer.writerows(row for row, _ops in rows)
+    print(f"{len(rows)} recall edit timelines saved to: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
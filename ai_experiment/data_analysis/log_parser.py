@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+"""
+Answer keys, source / false-lure maps and the participant log parser.
+
+Shared by analyze_participant.py and the cohort scripts (recall_scoring,
+mcq_latency, merge_arms, ...). Imports nothing from the Flask app, so
+loading it has no app start-up side effects.
+"""
+
+import json
+import csv
+import sys
+import os
+
+# Interval-based reading timeline (needs numpy; skipped when it is not installed)
+try:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from reading_timeline import summarize_log
+except ImportError:
+    summarize_log = None
+
+# Correct answers (0-indexed option indices)
+# ORIGINAL ANSWER KEYS (for participants who took the test before MCQ change)
+ORIGINAL_CORRECT_ANSWERS = {
+    'crispr': [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 1],
+    'semiconductors': [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 3, 1],
+    'uhi': [1, 1, 1, 1, 1, 1, 1, 1, 2, 0, 1, 1, 1, 1, 1]
+}
+
+# NEW ANSWER KEYS (for participants who take the test after MCQ change)
+NEW_CORRECT_ANSWERS = {
+    'crispr': [0, 3, 0, 2, 0, 0, 1, 1, 3, 0, 2, 2, 1, 2],  # Updated to 14 questions: a, d, a, c, a, a, b, b, d, a, c, c, b, c
+    'semiconductors': [3, 1, 1, 3, 2, 3, 0, 0, 1, 3, 2, 2, 0, 1],  # Updated to 14 questions: d, b, b, d, c, d, a, a, b, d, c, c, a, b
+    'uhi': [2, 3, 0, 1, 2, 2, 0, 1, 2, 2, 1, 1, 0, 1]  # Updated to 14 questions: c, d, a, b, c, c, a, b, c, c, b, b, a, b
+}
+
+# Use original answer keys by default (for existing participants)
+# Set to NEW_CORRECT_ANSWERS for new participants
+CORRECT_ANSWERS = ORIGINAL_CORRECT_ANSWERS
+
+# False lure question mapping
+# ORIGINAL: Only CRISPR had false lure at Q10 (index 9)
+ORIGINAL_FALSE_LURE_MAP = {
+    'crispr': {
+        'question_index': 9,  # Q10 (0-indexed)
+        'false_lure_option_index': 1,  # Option index containing "(FALSE - not mentioned in text)"
+        'description': 'Bioluminescent plants - false lure about agricultural experiments'
+    }
+}
+
+# NEW: All articles have false lure at Q2 (index 1)
+# CRISPR now has 2 false lures: Q2 and Q3
+NEW_FALSE_LURE_MAP = {
+    'crispr': [
+        {
+            'question_index': 2,  # Q3 (0-indexed) - FALSE LURE question
+            'false_lure_option_index': 1,  # Option b (index 1) - "DNA repair activity" is the false lure
+            'description': 'DNA repair activity - false lure about SHERLOCK and DETECTR initial purpose'
+        },
+        {
+            'question_index': 13,  # Q14 (0-indexed) - FALSE LURE question
+            'false_lure_option_index': 0,  # Option a (index 0) - "restore" is the false lure
+            'description': 'Restore - false lure about CRISPR process (guide, cut, and repair)'
+        }
+    ],
+    'semiconductors': [
+        {
+            'question_index': 8,  # Q9 (0-indexed) - FALSE LURE question
+            'false_lure_option_index': 0,  # Option a (index 0) - "quantum processors" is the false lure
+            'description': 'Quantum processors - false lure about advanced manufacturing technology'
+        },
+        {
+            'question_index': 10,  # Q11 (0-indexed) - FALSE LURE question
+            'false_lure_option_index': 1,  # Option b (index 1) - "46 silicon atoms" is the false lure
+            'description': '46 silicon atoms - false lure about 3nm transistor gate width'
+        }
+    ],
+    'uhi': [
+        {
+            'question_index': 3,  # Q4 (0-indexed) - FALSE LURE question
+            'false_lure_option_index': 2,  # Option c (index 2) - "photocatalytic roof tiles" is the false lure
+            'description': 'Photocatalytic roof tiles - false lure about cooling technology'
+        },
+        {
+            'question_index': 10,  # Q11 (0-indexed) - FALSE LURE question
+            'false_lure_option_index': 2,  # Option c (index 2) - "0.22" is the false lure
+            'description': 'Aged asphalt albedo 0.22 - false lure about albedo values'
+        }
+    ]
+}
+
+# Use original false lure map by default (for existing participants)
+FALSE_LURE_MAP = ORIGINAL_FALSE_LURE_MAP
+
+
+
+# CORRECTED SOURCE MAPPING (8 AI Summary + 2 False Lure + 4 Article per article)
+CORRECT_SOURCE_MAP = {
+    'crispr': {
+        0: 'ai_summary',    # Q1
+        1: 'ai_summary',    # Q2
+        2: 'false_lure',    # Q3 - FALSE LURE
+        3: 'ai_summary',    # Q4
+        4: 'ai_summary',    # Q5
+        5: 'ai_summary',    # Q6
+        6: 'ai_summary',    # Q7
+        7: 'ai_summary',    # Q8
+        8: 'article',       # Q9
+        9: 'ai_summary',    # Q10
+        10: 'article',      # Q11
+        11: 'article',      # Q12
+        12: 'article',      # Q13
+        13: 'false_lure'    # Q14 - FALSE LURE
+    },
+    'semiconductors': {
+        0: 'ai_summary',    # Q1
+        1: 'ai_summary',    # Q2
+        2: 'ai_summary',    # Q3
+        3: 'ai_summary',    # Q4
+        4: 'ai_summary',    # Q5
+        5: 'ai_summary',    # Q6
+        6: 'ai_summary',    # Q7
+        7: 'article',       # Q8
+        8: 'false_lure',    # Q9 - FALSE LURE
+        9: 'ai_summary',    # Q10
+        10: 'false_lure',   # Q11 - FALSE LURE
+        11: 'article',      # Q12
+        12: 'article',      # Q13
+        13: 'article'       # Q14
+    },
+    'uhi': {
+        0: 'ai_summary',    # Q1
+        1: 'ai_summary',    # Q2
+        2: 'ai_summary',    # Q3
+        3: 'false_lure',    # Q4 - FALSE LURE
+        4: 'ai_summary',    # Q5
+        5: 'ai_summary',    # Q6
+        6: 'ai_summary',    # Q7
+        7: 'ai_summary',    # Q8
+        8: 'ai_summary',    # Q9
+        9: 'article',       # Q10
+        10: 'false_lure',   # Q11 - FALSE LURE
+        11: 'article',      # Q12
+        12: 'article',      # Q13
+        13: 'article'       # Q14
+    }
+}
+
+# Control-arm logs (no_ai_experiment) have no timing column and no AI-only
+# fields; their rows are re-laid in the AI column order so one parser reads both
+CONTROL_TIMING = 'control'
+
+
+def is_control_log(log_file_path, rows=()):
+    """True for control-arm logs (NON-AI filename suffix or control_no_ai randomization)."""
+    if 'NON-AI' in os.path.basename(log_file_path):
+        return True
+    return any(len(parts) > 3 and parts[1] == 'randomization' and parts[3] == 'control_no_ai' for parts in rows)
+
+
+def _control_row_to_ai_layout(parts):
+    phase = parts[1]
+    if phase == 'randomization':
+        # Control: timestamp, phase, article_order, condition
+        return parts[:2] + [CONTROL_TIMING, '', parts[2] if len(parts) > 2 else '']
+    if phase == 'reading_behavior' and len(parts) > 2:
+        if parts[2] == 'reading_complete':
+            # Control: ..., reading_time_ms, scroll_depth, article_num, article_key
+            reading_time, scroll_depth, article_num, article_key = (parts[4:8] + [''] * 4)[:4]
+            return parts[:4] + [reading_time, '0', '0', scroll_depth, article_num, article_key, CONTROL_TIMING]
+        return parts + [CONTROL_TIMING]
+    if phase in ('recall_response', 'mcq_responses'):
+        return parts[:4] + [CONTROL_TIMING] + parts[4:]
+    if phase == 'post_article_ratings':
+        # Control: ..., load_mental_effort, load_task_difficulty, mcq_overall_confidence
+        effort, difficulty, confidence = (parts[4:7] + [''] * 3)[:3]
+        return parts[:4] + [CONTROL_TIMING, effort, difficulty, '', '', '', '', '', confidence]
+    return parts
+
+
+def parse_csv_log(log_file_path, arm=None):
+    """Parse participant log CSV file with robust handling of multiline fields.
+
+    arm: 'ai' or 'control' (default: detected with is_control_log). Control
+    rows get timing/structure 'control' and empty AI-only fields.
+    """
+    data = {
+        'demographics': {},
+        'prior_knowledge': {},
+        'ai_trust': {},
+        'randomization': {},
+        'reading_data': [],
+        'summary_viewing': [],
+        'summary_overlay_events': [],  # For synchronous mode
+        'visibility_changes': [],  # Track page visibility changes
+        'recall_data': [],
+        'mcq_data': [],
+        'post_article_ratings': [],
+        'manipulation_check': {}
+    }
+
+    with open(log_file_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        # Skip header
+        try:
+            header = next(reader)
+        except StopIteration:
+            return data
+
+        rows = [parts for parts in reader if parts and len(parts) >= 2]
+        control = arm == 'control' if arm else is_control_log(log_file_path, rows)
+        for parts in rows:
+            if control:
+                parts = _control_row_to_ai_layout(parts)
+
+            timestamp = parts[0]
+            phase = parts[1]
+
+            try:
+                if phase == 'demographics':
+                    data['demographics'] = {
+                        'full_name': parts[2] if len(parts) > 2 else '',
+                        'profession': parts[3] if len(parts) > 3 else '',
+                        'age': parts[4] if len(parts) > 4 else '',
+                        'gender': parts[5] if len(parts) > 5 else '',
+                        'native_language': parts[6] if len(parts) > 6 else '',
+                        'timestamp': timestamp
+                    }
+                elif phase == 'prior_knowledge':
+                    # Structure: timestamp, phase, familiarity_mean, familiarity_individual, recognition_mean, recognition_individual, quiz_score, ...
+                    data['prior_knowledge'] = {
+                        'familiarity': float(parts[2]) if len(parts) > 2 and parts[2] else 0,
+                        'familiarity_individual': parts[3] if len(parts) > 3 and parts[3] else '',
+                        'recognition': float(parts[4]) if len(parts) > 4 and parts[4] else 0,
+                        'term_recognition_individual': parts[5] if len(parts) > 5 and parts[5] else '',
+                        'quiz_score': float(parts[6]) if len(parts) > 6 and parts[6] else 0,
+                        'excluded': parts[9] if len(parts) > 9 else 'False',
+                        'concept_list': parts[10] if len(parts) > 10 else '',
+                        'timestamp': timestamp
+                    }
+                elif phase == 'ai_trust':
+                    # Structure: timestamp, phase, trust_mean, trust_individual, dependence_mean, dependence_individual, skill_mean, skill_individual, reflection
+                    trust_score = float(parts[2]) if len(parts) > 2 and parts[2] else 0
+                    trust_individual = parts[3] if len(parts) > 3 and parts[3] else ''
+                    dependence_score = float(parts[4]) if len(parts) > 4 and parts[4] else 0
+                    dependence_individual = parts[5] if len(parts) > 5 and parts[5] else ''
+                    skill_score = float(parts[6]) if len(parts) > 6 and parts[6] else 0
+                    skill_individual = parts[7] if len(parts) > 7 and parts[7] else ''
+                    reflection = parts[8] if len(parts) > 8 else ''
+                    data['ai_trust'] = {
+                        'trust_score': trust_score,
+                        'ai_trust_score': trust_score,  # Alias for compatibility
+                        'ai_trust_individual': trust_individual,
+                        'dependence_score': dependence_score,
+                        'ai_dependence_score': dependence_score,  # Alias for compatibility
+                        'ai_dependence_individual': dependence_individual,
+                        'skill_score': skill_score,
+                        'tech_skill_score': skill_score,  # Alias for compatibility
+                        'tech_skill_individual': skill_individual,
+                        'reflection': reflection,
+                        'timestamp': timestamp
+                    }
+                elif phase == 'randomization':
+                    data['randomization'] = {
+                        'structure': (parts[2] if len(parts) > 2 else '').lower(),
+                        'timing_order': parts[3] if len(parts) > 3 else '',
+                        'article_order': parts[4] if len(parts) > 4 else '',
+                        'timestamp': timestamp
+                    }
+                elif phase == 'reading_behavior':
+                    if len(parts) < 3:
+                                    continue
+                    event_type = parts[2] if len(parts) > 2 else ''
+                    # For most events, article_key and timing are at the end
+                    # But we'll extract them per event type since schemas differ
+                    article_key = ''
+                    timing = ''
+                    article_num = -1
+                    
+                    # Try to extract from end (common pattern)
+                    if len(parts) >= 2:
+                        article_key = parts[-2] if len(parts) >= 2 else ''
+                        timing = parts[-1] if len(parts) >= 1 else ''
+                    
+                    # Handle reading_complete events
+                    if event_type == 'reading_complete':
+                        # Schema: timestamp, phase, reading_complete, timestamp2, reading_time_ms, summary_time_ms, overlay_count, scroll_depth, article_num, article_key, timing
+                        reading_time_ms = 0
+                        summary_time_ms = 0
+                        scroll_depth = 100  # Default
+                        overlay_count = 0
+                        
+                        # Extract reading time (index 4)
+                        if len(parts) > 4:
+                            try:
+                                reading_time_ms = int(parts[4])
+                            except:
+                                pass
+                        
+                        # Extract summary viewing time for synchronous mode (index 5)
+                        if len(parts) > 5:
+                            try:
+                                summary_time_ms = int(parts[5])
+                            except:
+                                pass
+                        
+                        # Extract overlay count (index 6)
+                        if len(parts) > 6:
+                            try:
+                                overlay_count = int(parts[6])
+                            except:
+                                pass
+                        
+                        # Extract scroll depth (index 7)
+                        if len(parts) > 7:
+                            try:
+                                scroll_depth = int(parts[7])
+                            except:
+                                pass
+                        
+                        # Extract article number (index 8)
+                        if len(parts) > 8:
+                            try:
+                                article_num = int(parts[8])
+                            except:
+                                pass
+                        
+                        # Extract article_key and timing (indices 9 and 10)
+                        if len(parts) > 9:
+                            article_key = parts[9]
+                        if len(parts) > 10:
+                            timing = parts[10]
+                        
+                        data['reading_data'].append({
+                            'timestamp': timestamp,
+                            'article_num': article_num,
+                            'article_key': article_key,
+                            'timing': timing,
+                            'reading_time_ms': reading_time_ms,
+                            'summary_time_ms': summary_time_ms,
+                            'scroll_depth': scroll_depth,
+                            'overlay_count': overlay_count
+                        })
+                    # Handle summary overlay events for synchronous mode
+                    elif event_type == 'summary_overlay_opened':
+                        # Schema: timestamp, phase, summary_overlay_opened, timestamp2, article_num, overlay_num, article_key, timing
+                        overlay_article_num = -1
+                        overlay_article_key = ''
+                        overlay_timing = ''
+                        if len(parts) > 4:
+                            try:
+                                overlay_article_num = int(parts[4])
+                            except:
+                                pass
+                        if len(parts) > 6:
+                            overlay_article_key = parts[6]
+                        if len(parts) > 7:
+                            overlay_timing = parts[7]
+                        data['summary_overlay_events'].append({
+                            'event': 'opened',
+                            'timestamp': timestamp,
+                            'article_num': overlay_article_num,
+                            'article_key': overlay_article_key,
+                            'timing': overlay_timing
+                        })
+                    elif event_type == 'summary_overlay_closed':
+                        # Schema: timestamp, phase, summary_overlay_closed, timestamp2, article_num, duration_ms, overlay_num, article_key, timing
+                        overlay_article_num = -1
+                        duration_ms = 0
+                        overlay_article_key = ''
+                        overlay_timing = ''
+                        if len(parts) > 4:
+                            try:
+                                overlay_article_num = int(parts[4])
+                            except:
+                                pass
+                        if len(parts) > 5:
+                            try:
+                                duration_ms = int(parts[5])
+                            except:
+                                pass
+                        if len(parts) > 7:
+                            overlay_article_key = parts[7]
+                        if len(parts) > 8:
+                            overlay_timing = parts[8]
+                        data['summary_overlay_events'].append({
+                            'event': 'closed',
+                            'timestamp': timestamp,
+                            'article_num': overlay_article_num,
+                            'article_key': overlay_article_key,
+                            'timing': overlay_timing,
+                            'duration_ms': duration_ms
+                        })
+                    # Handle visibility changes
+                    elif event_type == 'visibility_change':
+                        # Schema: timestamp, phase, visibility_change, timestamp2, is_visible, article_num, article_key, timing
+                        vis_article_num = -1
+                        is_visible = False
+                        vis_article_key = ''
+                        vis_timing = ''
+                        if len(parts) > 4:
+                            try:
+                                is_visible = parts[4].lower() == 'true'
+                            except:
+                                pass
+                        if len(parts) > 5:
+                            try:
+                                vis_article_num = int(parts[5])
+                            except:
+                                pass
+                        if len(parts) > 6:
+                            vis_article_key = parts[6]
+                        if len(parts) > 7:
+                            vis_timing = parts[7]
+                        data['visibility_changes'].append({
+                            'timestamp': timestamp,
+                            'article_num': vis_article_num,
+                            'article_key': vis_article_key,
+                            'timing': vis_timing,
+                            'is_visible': is_visible
+                        })
+                elif phase == 'summary_viewing':
+                    if len(parts) >= 8:
+                        # In these rows, indices are stable as they don't include multiline fields
+                        data['summary_viewing'].append({
+                            'timestamp': timestamp,
+                            'article_num': int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else -1,
+                            'article_key': parts[3] if len(parts) > 3 else '',
+                            'mode': parts[4] if len(parts) > 4 else '',
+                            'structure': parts[5] if len(parts) > 5 else '',
+                            'time_spent_ms': int(float(parts[6])) if len(parts) > 6 and parts[6] else 0,
+                            'time_spent_seconds': float(parts[7]) if len(parts) > 7 and parts[7] else 0
+                        })
+                elif phase == 'recall_response':
+                    # csv.reader already joined multiline recall text into a single field (index 5)
+                    if len(parts) >= 13:
+                        article_num = int(parts[2]) if parts[2] else -1
+                        article_key = parts[3]
+                        timing = parts[4]
+                        recall_text = parts[5] if len(parts) > 5 else ''
+                        def _as_int(idx, default=0):
+                            try:
+                                return int(parts[idx])
+                            except:
+                                return default
+                        data['recall_data'].append({
+                            'timestamp': timestamp,
+                            'article_num': article_num,
+                            'article_key': article_key,
+                            'timing': timing,
+                            'recall_text': recall_text,
+                            'sentence_count': _as_int(6),
+                            'word_count': _as_int(7),
+                            'character_count': _as_int(8),
+                            'confidence': _as_int(9),
+                            'difficulty': _as_int(10),
+                            'time_spent_ms': _as_int(11),
+                            'paste_attempts': _as_int(12),
+                            'over_limit': (parts[13].lower() == 'true') if len(parts) > 13 else False
+                        })
+                elif phase == 'mcq_responses':
+                    # Expected columns:
+                    # timestamp, phase, article_num, article_key, timing,
+                    # answers_json, answer_times_json, total_time_ms, correct_count, total_questions, accuracy_rate, question_accuracy_json
+                    if len(parts) >= 13:
+                        # Use question_accuracy_json (column 12) which has all the detailed info
+                        question_accuracy_json = parts[12] if len(parts) > 12 else '{}'
+                        try:
+                            question_details = json.loads(question_accuracy_json.replace('""', '"'))
+                        except:
+                            question_details = {}
+                        
+                        article_num = int(parts[2]) if len(parts) > 2 and parts[2] else -1
+                        article_key = parts[3] if len(parts) > 3 else ''
+                        timing = parts[4] if len(parts) > 4 else ''
+                        
+                        # Extract answers dict from question_details for compatibility
+                        mcq_answers = {}
+                        for q_key, q_data in question_details.items():
+                            if isinstance(q_data, dict):
+                                mcq_answers[q_key] = q_data.get('participant_answer', -1)
+                        
+                        # Answer times: ms from the start of the MCQ page to the (last) click on
+                        # each question, i.e. cumulative, not per-item (see mcq_latency.py)
+                        answer_times_ms = {}
+                        total_time_ms = 0
+                        for times_col in (7, 6):  # column 6 in logs without mcq_answer_texts
+                            try:
+                                parsed = json.loads(parts[times_col].replace('""', '"'))
+                            except (ValueError, IndexError):
+                                continue
+                            if isinstance(parsed, dict) and all(isinstance(v, (int, float)) for v in parsed.values()):
+                                answer_times_ms = parsed
+                                try:
+                                    total_time_ms = int(float(parts[times_col + 1]))
+                                except (ValueError, IndexError):
+                                    total_time_ms = 0
+                                break
+                        
+                        data['mcq_data'].append({
+                            'timestamp': timestamp,
+                            'article_num': article_num,
+                            'article_key': article_key,
+                            'timing': timing,
+                            'answers': mcq_answers,
+                            'question_details': question_details,  # Add the full details
+                            'answer_times_ms': answer_times_ms,
+                            'total_time_ms': total_time_ms
+                        })
+                elif phase == 'post_article_ratings':
+                    # Schema: timestamp, phase, article_num, article_key, timing,
+                    # load_mental_effort, load_task_difficulty, ai_help_understanding, 
+                    # ai_help_memory, ai_made_task_easier, ai_satisfaction, 
+                    # ai_better_than_no_ai (optional), mcq_overall_confidence
+                    if len(parts) >= 9:
+                        def _as_int_safe(idx, default=-1):
+                            try:
+                                return int(parts[idx]) if len(parts) > idx and parts[idx] else default
+                            except:
+                                return default
+                        article_num = _as_int_safe(2, -1)
+                        article_key = parts[3] if len(parts) > 3 else ''
+                        timing = parts[4] if len(parts) > 4 else ''
+                        data['post_article_ratings'].append({
+                            'timestamp': timestamp,
+                            'article_num': article_num,
+                            'article_key': article_key,
+                            'timing': timing,
+                            'load_mental_effort': _as_int_safe(5),
+                            'load_task_difficulty': _as_int_safe(6),
+                            'ai_help_understanding': _as_int_safe(7),
+                            'ai_help_memory': _as_int_safe(8),
+                            'ai_made_task_easier': _as_int_safe(9),
+                            'ai_satisfaction': _as_int_safe(10),
+                            'ai_better_than_no_ai': _as_int_safe(11, -1),  # Optional field
+                            'mcq_overall_confidence': _as_int_safe(12)  # Last field
+                        })
+                elif phase == 'manipulation_check':
+                    if len(parts) >= 4:
+                        def _as_int_safe(idx):
+                            try:
+                                return int(parts[idx])
+                            except:
+                                return -1
+                        data['manipulation_check'] = {
+                            'coherence': _as_int_safe(2),
+                            'connectivity': _as_int_safe(3),
+                            'strategy': parts[4] if len(parts) > 4 else '',
+                            'timestamp': timestamp
+                        }
+            except Exception:
+                # Robust to any malformed rows
+                continue
+
+    # Effective reading / summary / hidden / break times per article
+    data['timeline'] = {}
+    if summarize_log is not None:
+        try:
+            data['timeline'] = summarize_log(log_file_path)
+        except Exception as e:
+            print(f"Warning: could not build reading timeline: {e}")
+
+    return data
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Multi-pattern false-lure detector for recall and reflection texts.
+
+All lure phrases from NEW_FALSE_LURE_MAP / ORIGINAL_FALSE_LURE_MAP (see
+FALSE_LURE_MAPPING.md), their spelling variants and their Chinese
+translations are compiled into one Aho-Corasick automaton. Every
+`recall_text`, AI-trust `open_reflection` and manipulation-check `strategy`
+is then scanned once, in time linear in the text length, regardless of how
+many patterns there are.
+
+English patterns only match on word boundaries (so "restore" does not fire
+on "restoration"); Chinese patterns match anywhere.
+
+Usage:
+    python lure_detector.py                         # ../experiment_data
+    python lure_detector.py --hits-out lure_hits.csv
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+from collections import defaultdict, deque
+
+from log_parser import parse_csv_log
+from recall_scoring import DEFAULT_DATA_DIR
+
+# lure_id -> article, canonical phrase, variants (English + Chinese)
+LURES = {
+    "uhi_photocatalytic_tiles": {
+        "article": "uhi",
+        "phrase": "photocatalytic roof tiles",
+        "variants": ["photocatalytic tiles", "photocatalytic roof", "photocatalytic", "photo catalytic roof tiles",
+                     "photo catalytic", "光催化屋顶瓦片", "光催化瓦片", "光催化屋顶", "光催化"],
+    },
+    "uhi_albedo_022": {
+        "article": "uhi",
+        "phrase": "albedo values near 0.22",
+        "variants": ["albedo of 0.22", "albedo 0.22", "0.22", "反照率0.22", "反照率约0.22", "反照率接近0.22"],
+    },
+    "crispr_dna_repair_activity": {
+        "article": "crispr",
+        "phrase": "DNA repair activity",
+        "variants": ["DNA repair activities", "monitor DNA repair", "sensors for DNA repair", "DNA修复活性",
+                     "DNA修复活动", "监测DNA修复"],
+    },
+    "crispr_guide_cut_restore": {
+        "article": "crispr",
+        "phrase": "guide, cut, and restore",
+        "variants": ["guide cut restore", "guide, cut, restore", "cut and restore", "引导、切割和恢复",
+                     "引导、切割、恢复", "切割和恢复"],
+    },
+    "crispr_bioluminescent_plants": {
+        "article": "crispr",
+        "phrase": "bioluminescent plants",
+        "variants": ["bioluminescent plant", "bioluminescent", "glowing plants", "生物发光植物", "发光植物"],
+    },
+    "semiconductors_46_silicon_atoms": {
+        "article": "semiconductors",
+        "phrase": "46 silicon atoms",
+        "variants": ["46 atoms", "46 silicon", "forty-six silicon atoms", "46个硅原子", "46个原子"],
+    },
+    "semiconductors_quantum_processors": {
+        "article": "semiconductors",
+        "phrase": "quantum processors",
+        "variants": ["quantum processor", "quantum-annealing processors", "quantum annealing processors",
+                     "quantum annealing", "量子处理器", "量子退火处理器", "量子退火"],
+    },
+}
+
+_CJK = re.compile(r"[一-鿿]")
+
+
+def lure_phrases(article_key):
+    """Lowercased phrase and variants of every lure planted in one article."""
+    return [p.lower() for lure in LURES.values() if lure["article"] == article_key
+            for p in [lure["phrase"]] + lure["variants"]]
+
+
+def normalize(text):
+    """Lowercase, fold hyphens/dashes to spaces and collapse whitespace."""
+    text = (text or "").lower()
+    text = re.sub(r"[-‐‑–—]", " ", text)
+    return re.sub(r"\s+", " ", text)
+
+
+# ============================================================================
+# Aho-Corasick automaton
+# ============================================================================
+class LureAutomaton:
+    """Aho-Corasick automaton over normalised lure patterns."""
+
+    def __init__(self, lures=None):
+        lures = lures if lures is not None else LURES
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]   # state -> [(lure_id, pattern, needs_word_boundary)]
+        self.patterns = 0
+
+        for lure_id, lure in lures.items():
+            seen = set()
+            for pattern in [lure["phrase"]] + list(lure.get("variants", [])):
+                pattern = normalize(pattern).strip()
+                if not pattern or pattern in seen:
+                    continue
+                seen.add(pattern)
+                self._add(pattern, (lure_id, pattern, not _CJK.search(pattern)))
+        self._build_failure_links()
+
+    def _add(self, pattern, payload):
+        state = 0
+        for ch in pattern:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = nxt
+        self.output[state].append(payload)
+        self.patterns += 1
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0) if self.goto[f].get(ch, 0) != nxt else 0
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def scan(self, text):
+        """Yield (lure_id, pattern, start, end) for every match in one left-to-right pass."""
+        text = normalize(text)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            for lure_id, pattern, word_boundary in self.output[state]:
+                start = i - len(pattern) + 1
+                if word_boundary and ((start > 0 and text[start - 1].isalnum()) or
+                                      (i + 1 < len(text) and text[i + 1].isalnum())):
+                    continue
+                yield lure_id, pattern, start, i + 1
+
+    def detect(self, text):
+        """Distinct lure ids in a text, keeping the longest matched pattern for each."""
+        found = {}
+        for lure_id, pattern, _start, _end in self.scan(text):
+            if len(pattern) > len(found.get(lure_id, "")):
+                found[lure_id] = pattern
+        return found
+
+
+# ============================================================================
+# Cohort scan
+# ============================================================================
+def collect_texts(data_dir):
+    """All scannable texts per participant: recall, open reflection, strategy."""
+    texts = []
+    for filename in sorted(os.listdir(data_dir)):
+        if not filename.endswith("_log.csv"):
+            continue
+        participant_id = re.split(r"[-_]", filename, maxsplit=1)[0]
+        try:
+            data = parse_csv_log(os.path.join(data_dir, filename))
+        except Exception as e:
+            print(f"Warning: could not parse {filename}: {e}")
+            continue
+        structure = data.get("randomization", {}).get("structure", "") or "control"
+        for rec in data["recall_data"]:
+            texts.append((participant_id, structure, rec.get("timing", ""), rec.get("article_key", ""),
+                          "recall_text", rec.get("recall_text", "")))
+        reflection = data.get("ai_trust", {}).get("open_reflection", data.get("ai_trust", {}).get("reflection", ""))
+        if reflection:
+            texts.append((participant_id, structure, "", "", "open_reflection", reflection))
+        strategy = data.get("manipulation_check", {}).get("strategy", "")
+        if strategy:
+            texts.append((participant_id, structure, "", "", "strategy", strategy))
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect false-lure phrases in recall and reflection texts")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--out", default="lure_hit_counts.csv", help="Per-lure hit counts by condition")
+    parser.add_argument("--hits-out", default=None, help="Optional CSV with every individual hit")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.data_dir):
+        print(f"Error: data directory not found: {args.data_dir}")
+        sys.exit(1)
+
+    automaton = LureAutomaton()
+    texts = collect_texts(args.data_dir)
+    print(f"Automaton: {automaton.patterns} patterns, {len(automaton.goto)} states; scanning {len(texts)} texts")
+
+    hits = []
+    counts = defaultdict(int)
+    for participant_id, structure, timing, article_key, field, text in texts:
+        for lure_id, pattern in automaton.detect(text).items():
+            hits.append({
+                "participant_id": participant_id,
+                "structure": structure,
+                "timing": timing,
+                "article_key": article_key,
+                "field": field,
+                "lure_id": lure_id,
+                "lure_article": LURES[lure_id]["article"],
+                "matched": pattern,
+            })
+            counts[(lure_id, field, structure, timing)] += 1
+
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["lure_id", "field", "structure", "timing", "hits"])
+        for (lure_id, field, structure, timing), n in sorted(counts.items()):
+            writer.writerow([lure_id, field, structure, timing, n])
+    print(f"Hit counts saved to: {args.out}")
+
+    if args.hits_out:
+        with open(args.hits_out, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["participant_id", "structure", "timing", "article_key", "field",
+                                                   "lure_id", "lure_article", "matched"])
+            writer.writeheader()
+            writer.writerows(hits)
+        print(f"Individual hits saved to: {args.hits_out}")
+
+    print()
+    print("Hits per lure:")
+    per_lure = defaultdict(int)
+    for (lure_id, _field, _structure, _timing), n in counts.items():
+        per_lure[lure_id] += n
+    for lure_id in LURES:
+        print(f"  {lure_id:<36} {per_lure.get(lure_id, 0)}")
+
+
+if __name__ == "__main__":
+    main()
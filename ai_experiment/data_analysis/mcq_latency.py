@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+MCQ response-latency analysis.
+
+/submit_test logs `mcq_answer_times_ms` as the time from the start of the MCQ
+page to the (last) click on each question, i.e. cumulative times. Per-item
+latency is the gap to the previous answer in click order, so the first
+question answered carries the time spent reading the page.
+
+All logs are loaded into participant x item matrices (42 items: 14 per
+article), with latency, correctness, the timing condition of the article
+and the item's source (ai_summary / article / false_lure from
+CORRECT_SOURCE_MAP). Everything below is computed on those matrices:
+
+    items        per-item latency distribution (median, IQR, log-mean)
+    outliers     robust z of log latency against the item's median / MAD
+                 (|z| > OUTLIER_Z), plus answers faster than FAST_MS
+    speed-acc    accuracy per latency quintile (item-standardised) by timing
+    source       latency on false-lure vs AI-summary vs article items by timing
+    long         per participant x article latency features, merged into the
+                 long-format dataset (final_analysis/Analysis long finals-.xlsx)
+
+Usage:
+    python mcq_latency.py                                   # ../experiment_data
+    python mcq_latency.py --data-dir ../experiment_data --data-dir ../../no_ai_experiment/experiment_data
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+import warnings
+
+import numpy as np
+
+from log_parser import CORRECT_SOURCE_MAP, parse_csv_log
+from recall_scoring import DEFAULT_DATA_DIR
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARTICLE_KEYS = ("uhi", "crispr", "semiconductors")
+N_QUESTIONS = 14
+ITEMS = [(article, q) for article in ARTICLE_KEYS for q in range(N_QUESTIONS)]
+SOURCES = ("ai_summary", "article", "false_lure")
+TIMINGS = ("pre_reading", "synchronous", "post_reading")
+ITEM_SOURCE = np.array([CORRECT_SOURCE_MAP.get(a, {}).get(q, "unknown") for a, q in ITEMS])
+
+OUTLIER_Z = 3.5
+FAST_MS = 1000       # too fast to have read the stem
+N_BINS = 5
+
+LONG_DATA = os.path.join(SCRIPT_DIR, "..", "..", "final_analysis", "Analysis long finals-.xlsx")
+
+
+# ============================================================================
+# Loading
+# ============================================================================
+def load_matrices(data_dirs):
+    """Participant x item matrices from every *_log.csv in data_dirs.
+
+    Returns dict with participants, structures, cumulative (ms), correct
+    (1/0/nan), timing (index into TIMINGS, -1 unknown) and total_time_ms
+    (participant x article).
+    """
+    participants, structures, blocks = [], [], []
+    for data_dir in data_dirs:
+        for filename in sorted(os.listdir(data_dir)):
+            if not filename.endswith("_log.csv"):
+                continue
+            try:
+                data = parse_csv_log(os.path.join(data_dir, filename))
+            except Exception as e:
+                print(f"Warning: could not parse {filename}: {e}")
+                continue
+            # Later submissions for the same article replace earlier ones
+            by_article = {mcq["article_key"]: mcq for mcq in data["mcq_data"] if mcq["article_key"] in ARTICLE_KEYS}
+            if not by_article:
+                continue
+            participants.append(re.split(r"[-_]", filename, maxsplit=1)[0])
+            structures.append(data.get("randomization", {}).get("structure", "") or "control")
+            blocks.append(by_article)
+
+    n = len(participants)
+    cumulative = np.full((n, len(ITEMS)), np.nan)
+    correct = np.full((n, len(ITEMS)), np.nan)
+    timing = np.full((n, len(ITEMS)), -1, dtype=np.int64)
+    total_time = np.full((n, len(ARTICLE_KEYS)), np.nan)
+    for row, by_article in enumerate(blocks):
+        for a, article in enumerate(ARTICLE_KEYS):
+            mcq = by_article.get(article)
+            if mcq is None:
+                continue
+            base = a * N_QUESTIONS
+            t = mcq.get("timing", "")
+            timing[row, base:base + N_QUESTIONS] = TIMINGS.index(t) if t in TIMINGS else -1
+            if mcq.get("total_time_ms"):
+                total_time[row, a] = mcq["total_time_ms"]
+            for q_key, ms in (mcq.get("answer_times_ms") or {}).items():
+                q = int(q_key[1:]) if q_key[1:].isdigit() else -1
+                if 0 <= q < N_QUESTIONS and ms and ms > 0:
+                    cumulative[row, base + q] = ms
+            for q_data in (mcq.get("question_details") or {}).values():
+                q = q_data.get("question_index", -1) if isinstance(q_data, dict) else -1
+                if 0 <= q < N_QUESTIONS:
+                    correct[row, base + q] = 1.0 if q_data.get("is_correct") else 0.0
+    return {
+        "participants": participants,
+        "structures": np.array(structures),
+        "cumulative": cumulative,
+        "correct": correct,
+        "timing": timing,
+        "total_time_ms": total_time,
+    }
+
+
+# ============================================================================
+# Vectorised measures
+# ============================================================================
+def item_latencies(cumulative):
+    """Per-item latency from cumulative answer times (gap to the previous click, per article block)."""
+    n = cumulative.shape[0]
+    blocks = cumulative.reshape(n, len(ARTICLE_KEYS), N_QUESTIONS)
+    order = np.argsort(blocks, axis=2)                       # NaN (unanswered) sort last
+    ordered = np.take_along_axis(blocks, order, axis=2)
+    gaps = np.diff(ordered, axis=2, prepend=0.0)
+    latency = np.empty_like(blocks)
+    np.put_along_axis(latency, order, gaps, axis=2)
+    return latency.reshape(n, len(ITEMS))
+
+
+def _nan_stat(fn, values, **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        return fn(values, **kwargs)
+
+
+def robust_z(latency):
+    """Robust z of log latency against each item's median and scaled MAD."""
+    log_lat = np.log(np.where(latency > 0, latency, np.nan))
+    median = _nan_stat(np.nanmedian, log_lat, axis=0)
+    mad = 1.4826 * _nan_stat(np.nanmedian, np.abs(log_lat - median), axis=0)
+    mad = np.where(mad > 0, mad, np.nan)
+    return (log_lat - median) / mad
+
+
+def item_distributions(latency, correct):
+    q25, q50, q75 = _nan_stat(np.nanpercentile, latency, q=[25, 50, 75], axis=0)
+    log_mean = _nan_stat(np.nanmean, np.log(np.where(latency > 0, latency, np.nan)), axis=0)
+    rows = []
+    for j, (article, q) in enumerate(ITEMS):
+        n = int(np.sum(~np.isnan(latency[:, j])))
+        rows.append({
+            "article_key": article,
+            "question": q + 1,
+            "source": ITEM_SOURCE[j],
+            "n": n,
+            "median_sec": round(q50[j] / 1000, 2) if n else "",
+            "q25_sec": round(q25[j] / 1000, 2) if n else "",
+            "q75_sec": round(q75[j] / 1000, 2) if n else "",
+            "geo_mean_sec": round(np.exp(log_mean[j]) / 1000, 2) if n else "",
+            "accuracy": round(float(_nan_stat(np.nanmean, correct[:, j])), 3) if n else "",
+        })
+    return rows
+
+
+def speed_accuracy(latency, correct, timing, z, n_bins=N_BINS):
+    """Accuracy per latency quantile bin (of the item-standardised z) by timing."""
+    valid = ~np.isnan(z) & ~np.isnan(correct) & (timing >= 0)
+    zv, cv, tv, lv = z[valid], correct[valid], timing[valid], latency[valid]
+    if len(zv) == 0:
+        return []
+    edges = np.quantile(zv, np.linspace(0, 1, n_bins + 1)[1:-1])
+    bins = np.digitize(zv, edges)
+    cell = tv * n_bins + bins
+    size = len(TIMINGS) * n_bins
+    counts = np.bincount(cell, minlength=size)
+    hits = np.bincount(cell, weights=cv, minlength=size)
+    secs = np.bincount(cell, weights=lv / 1000, minlength=size)
+    rows = []
+    for t, timing_name in enumerate(TIMINGS):
+        for b in range(n_bins):
+            k = t * n_bins + b
+            rows.append({
+                "timing": timing_name,
+                "latency_bin": b + 1,
+                "n": int(counts[k]),
+                "mean_latency_sec": round(secs[k] / counts[k], 2) if counts[k] else "",
+                "accuracy": round(hits[k] / counts[k], 3) if counts[k] else "",
+            })
+    return rows
+
+
+def latency_by_source(latency, correct, timing, structures):
+    """Median latency and accuracy per source x timing (AI participants) and per source (control)."""
+    rows = []
+    is_control = (structures == "control")[:, None]
+    for group, group_mask in (("AI", ~is_control), ("control", is_control)):
+        for source in SOURCES:
+            for t, timing_name in enumerate(TIMINGS + ("all",)):
+                mask = group_mask & (ITEM_SOURCE == source)[None, :] & ~np.isnan(latency)
+                if timing_name != "all":
+                    mask &= timing == t
+                if not mask.any():
+                    continue
+                lat = latency[mask]
+                rows.append({
+                    "group": group,
+                    "source": source,
+                    "timing": timing_name,
+                    "n": int(mask.sum()),
+                    "median_sec": round(float(np.median(lat)) / 1000, 2),
+                    "geo_mean_sec": round(float(np.exp(np.mean(np.log(lat[lat > 0])))) / 1000, 2) if (lat > 0).any() else "",
+                    "accuracy": round(float(_nan_stat(np.nanmean, correct[mask])), 3),
+                })
+    return rows
+
+
+def long_features(m, latency, fast, slow):
+    """Per participant x article latency features for the long-format dataset."""
+    n = len(m["participants"])
+    shape = (n, len(ARTICLE_KEYS), N_QUESTIONS)
+    lat = latency.reshape(shape)
+    src = ITEM_SOURCE.reshape(len(ARTICLE_KEYS), N_QUESTIONS)
+    median_all = _nan_stat(np.nanmedian, lat, axis=2)
+    per_source = {s: _nan_stat(np.nanmedian, np.where(src[None] == s, lat, np.nan), axis=2) for s in SOURCES}
+    n_fast = fast.reshape(shape).sum(axis=2)
+    n_slow = slow.reshape(shape).sum(axis=2)
+    answered = (~np.isnan(lat)).sum(axis=2)
+    timing = m["timing"].reshape(shape)[:, :, 0]
+
+    rows = []
+    for i, pid in enumerate(m["participants"]):
+        for a, article in enumerate(ARTICLE_KEYS):
+            if not answered[i, a]:
+                continue
+            row = {
+                "participant_id": pid,
+                "article": article,
+                "timing": TIMINGS[timing[i, a]] if timing[i, a] >= 0 else "",
+                "mcq_total_time_sec": round(m["total_time_ms"][i, a] / 1000, 2)
+                if not np.isnan(m["total_time_ms"][i, a]) else "",
+                "mcq_median_latency_sec": round(median_all[i, a] / 1000, 2),
+            }
+            for s in SOURCES:
+                value = per_source[s][i, a]
+                row[f"mcq_latency_{s}_sec"] = round(value / 1000, 2) if not np.isnan(value) else ""
+            row["mcq_fast_answers"] = int(n_fast[i, a])
+            row["mcq_slow_answers"] = int(n_slow[i, a])
+            rows.append(row)
+    return rows
+
+
+def merge_into_long(rows, long_path, out_path):
+    """Left-join the latency features onto the long-format dataset by participant_id x article."""
+    try:
+        import pandas as pd
+    except ImportError:
+        print("pandas not installed; skipping merge into the long-format dataset")
+        return False
+    long_df = pd.read_excel(long_path) if long_path.endswith(".xlsx") else pd.read_csv(long_path)
+    features = pd.DataFrame(rows).drop(columns=["timing"])
+    merged = long_df.merge(features, on=["participant_id", "article"], how="left")
+    merged.to_csv(out_path, index=False)
+    matched = merged["mcq_median_latency_sec"].notna().sum()
+    print(f"Long-format dataset with latency columns saved to: {out_path} ({matched}/{len(merged)} rows matched)")
+    return True
+
+
+def _write_csv(path, rows):
+    if not rows:
+        return
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Saved: {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCQ response-latency analysis over the cohort")
+    parser.add_argument("--data-dir", action="append", help="Log directory (repeat for AI + control)")
+    parser.add_argument("--items-out", default="mcq_item_latency.csv")
+    parser.add_argument("--sat-out", default="mcq_speed_accuracy.csv")
+    parser.add_argument("--source-out", default="mcq_latency_by_source.csv")
+    parser.add_argument("--long-out", default="mcq_latency_long.csv", help="Participant x article latency features")
+    parser.add_argument("--long-data", default=LONG_DATA, help="Long-format dataset to merge the features into")
+    parser.add_argument("--merged-out", default="analysis_long_with_latency.csv")
+    parser.add_argument("--bins", type=int, default=N_BINS, help="Latency bins for the speed-accuracy curves")
+    args = parser.parse_args()
+
+    data_dirs = args.data_dir or [DEFAULT_DATA_DIR]
+    for data_dir in data_dirs:
+        if not os.path.isdir(data_dir):
+            print(f"Error: data directory not found: {data_dir}")
+            sys.exit(1)
+
+    m = load_matrices(data_dirs)
+    if not m["participants"]:
+        print("No MCQ responses found")
+        sys.exit(1)
+    latency = item_latencies(m["cumulative"])
+    z = robust_z(latency)
+    fast = (z < -OUTLIER_Z) | (latency < FAST_MS)
+    slow = z > OUTLIER_Z
+    print(f"{len(m['participants'])} participants x {len(ITEMS)} items; "
+          f"{int(np.sum(~np.isnan(latency)))} answer latencies, "
+          f"{int(fast.sum())} fast and {int(slow.sum())} slow outliers")
+
+    _write_csv(args.items_out, item_distributions(latency, m["correct"]))
+    _write_csv(args.sat_out, speed_accuracy(latency, m["correct"], m["timing"], z, args.bins))
+    source_rows = latency_by_source(latency, m["correct"], m["timing"], m["structures"])
+    _write_csv(args.source_out, source_rows)
+    long_rows = long_features(m, latency, fast, slow)
+    _write_csv(args.long_out, long_rows)
+    if args.long_data and os.path.exists(args.long_data) and long_rows:
+        merge_into_long(long_rows, args.long_data, args.merged_out)
+
+    print()
+    print("Median latency (s) by source, all timings:")
+    for row in source_rows:
+        if row["timing"] == "all":
+            print(f"  {row['group']:<8} {row['source']:<11} {row['median_sec']:>6}  (n={row['n']}, acc={row['accuracy']})")
+
+
+if __name__ == "__main__":
+    main()
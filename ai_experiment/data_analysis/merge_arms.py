@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Merged AI + control (NoAI) dataset and the AI-vs-NoAI comparisons.
+
+Both arms' logs go through log_parser.parse_csv_log (control rows
+are re-laid in the AI column order there) and are flattened into one
+trial-level table: one row per participant x article, tagged with
+experiment_group and using the column names of the long-format dataset.
+Control rows get structure / timing 'control' and empty AI-only columns
+(summary_time_sec, ai_trust, ai_dependence). Both arms answer the same 14
+questions per article, so the CORRECT_SOURCE_MAP accuracies (AI-summary,
+article-only, false lure) are filled in for both.
+
+The comparisons are computed for every measure at once on a rows x measures
+matrix: per-group n / mean / SD from masked matrix products, Welch t-test
+and Cohen's d (pooled SD). "overall" uses participant means; each article
+uses that article's trial rows.
+
+Usage:
+    python merge_arms.py
+    python merge_arms.py --ai-dir ../experiment_data --control-dir ../../no_ai_experiment/experiment_data
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+
+import numpy as np
+from scipy import stats
+
+from log_parser import CORRECT_SOURCE_MAP, NEW_FALSE_LURE_MAP, parse_csv_log
+from recall_scoring import DEFAULT_DATA_DIR
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CONTROL_DATA_DIR = os.path.join(SCRIPT_DIR, "..", "..", "no_ai_experiment", "experiment_data")
+ARTICLE_KEYS = ("uhi", "crispr", "semiconductors")
+GROUPS = ("AI", "NoAI")
+
+ID_COLUMNS = ["participant_id", "experiment_group", "structure", "timing", "article"]
+MEASURES = [
+    "mcq_accuracy", "ai_summary_accuracy", "article_accuracy", "false_lure_accuracy",
+    "false_lures_selected", "mcq_time_sec", "recall_word_count", "recall_confidence",
+    "recall_difficulty", "reading_time_min", "summary_time_sec", "mental_effort",
+    "task_difficulty", "mcq_confidence", "prior_knowledge_familiarity", "ai_trust", "ai_dependence",
+]
+
+
+# ============================================================================
+# Loading
+# ============================================================================
+def _last_by_article(events):
+    """Later submissions for the same article replace earlier ones."""
+    return {e["article_key"]: e for e in events if e.get("article_key") in ARTICLE_KEYS}
+
+
+def _value(x, scale=1.0):
+    """Float (scaled), or NaN for missing / -1 placeholders."""
+    try:
+        x = float(x)
+    except (TypeError, ValueError):
+        return np.nan
+    return np.nan if x < 0 else x * scale
+
+
+def _mcq_measures(mcq):
+    article = mcq["article_key"]
+    sources = CORRECT_SOURCE_MAP.get(article, {})
+    lures = {fl["question_index"]: fl["false_lure_option_index"] for fl in NEW_FALSE_LURE_MAP.get(article, [])}
+    correct = {"all": [], "ai_summary": [], "article": [], "false_lure": []}
+    lures_selected = 0
+    for q in (mcq.get("question_details") or {}).values():
+        if not isinstance(q, dict):
+            continue
+        q_idx = q.get("question_index", -1)
+        hit = 1.0 if q.get("is_correct") else 0.0
+        correct["all"].append(hit)
+        if sources.get(q_idx) in correct:
+            correct[sources[q_idx]].append(hit)
+        if q_idx in lures and q.get("participant_answer") == lures[q_idx]:
+            lures_selected += 1
+    mean = lambda v: float(np.mean(v)) if v else np.nan  # noqa: E731
+    return {
+        "mcq_accuracy": mean(correct["all"]),
+        "ai_summary_accuracy": mean(correct["ai_summary"]),
+        "article_accuracy": mean(correct["article"]),
+        "false_lure_accuracy": mean(correct["false_lure"]),
+        "false_lures_selected": float(lures_selected) if correct["all"] else np.nan,
+        "mcq_time_sec": _value(mcq.get("total_time_ms") or None, 1 / 1000),
+    }
+
+
+def trial_rows(participant_id, group, data):
+    """One row per article the participant answered MCQs for."""
+    mcqs = _last_by_article(data["mcq_data"])
+    recalls = _last_by_article(data["recall_data"])
+    ratings = _last_by_article(data["post_article_ratings"])
+    readings = _last_by_article(data["reading_data"])
+    summary_ms = {}
+    for s in data.get("summary_viewing", []):
+        summary_ms[s["article_key"]] = summary_ms.get(s["article_key"], 0) + s.get("time_spent_ms", 0)
+    for r in readings.values():
+        summary_ms[r["article_key"]] = summary_ms.get(r["article_key"], 0) + r.get("summary_time_ms", 0)
+
+    trust = data.get("ai_trust") or {}
+    structure = data.get("randomization", {}).get("structure", "") or "control"
+    familiarity = (data.get("prior_knowledge") or {}).get("familiarity")
+    rows = []
+    for article in ARTICLE_KEYS:
+        mcq = mcqs.get(article)
+        if mcq is None:
+            continue
+        recall, rating, reading = recalls.get(article, {}), ratings.get(article, {}), readings.get(article, {})
+        row = {
+            "participant_id": participant_id,
+            "experiment_group": group,
+            "structure": structure if group == "AI" else "control",
+            "timing": (mcq.get("timing") or "") if group == "AI" else "control",
+            "article": article,
+        }
+        row.update(_mcq_measures(mcq))
+        row.update({
+            "recall_word_count": _value(recall.get("word_count")),
+            "recall_confidence": _value(recall.get("confidence")),
+            "recall_difficulty": _value(recall.get("difficulty")),
+            "reading_time_min": _value(reading.get("reading_time_ms") or None, 1 / 60000),
+            "summary_time_sec": _value(summary_ms.get(article), 1 / 1000) if group == "AI" else np.nan,
+            "mental_effort": _value(rating.get("load_mental_effort")),
+            "task_difficulty": _value(rating.get("load_task_difficulty")),
+            "mcq_confidence": _value(rating.get("mcq_overall_confidence")),
+            "prior_knowledge_familiarity": _value(familiarity or None),
+            "ai_trust": _value(trust.get("trust_score") or None) if group == "AI" else np.nan,
+            "ai_dependence": _value(trust.get("dependence_score") or None) if group == "AI" else np.nan,
+        })
+        rows.append(row)
+    return rows
+
+
+def load_arms(arm_dirs):
+    """Parse every *_log.csv of each arm. arm_dirs: [(group, data_dir, arm)] with arm 'ai' / 'control'."""
+    rows = []
+    for group, data_dir, arm in arm_dirs:
+        n_logs = 0
+        for filename in sorted(os.listdir(data_dir)):
+            if not filename.endswith("_log.csv"):
+                continue
+            try:
+                data = parse_csv_log(os.path.join(data_dir, filename), arm=arm)
+            except Exception as e:
+                print(f"Warning: could not parse {filename}: {e}")
+                continue
+            participant_rows = trial_rows(re.split(r"[-_]", filename, maxsplit=1)[0], group, data)
+            n_logs += bool(participant_rows)
+            rows.extend(participant_rows)
+        print(f"{group:<5} {n_logs} participants with MCQ data ({data_dir})")
+    return rows
+
+
+# ============================================================================
+# Vectorised comparison
+# ============================================================================
+def to_matrix(rows):
+    """(values rows x MEASURES with NaN for missing, is_ai, participant index per row)."""
+    values = np.array([[row[m] for m in MEASURES] for row in rows], dtype=np.float64).reshape(len(rows), len(MEASURES))
+    is_ai = np.array([row["experiment_group"] == "AI" for row in rows], dtype=bool)
+    keys = [(row["experiment_group"], row["participant_id"]) for row in rows]
+    index = {key: i for i, key in enumerate(dict.fromkeys(keys))}
+    participant = np.array([index[key] for key in keys], dtype=np.int64)
+    return values, is_ai, participant
+
+
+def participant_means(values, is_ai, participant):
+    """Per-participant mean of every measure (ignoring NaN trials)."""
+    n_participants = int(participant.max()) + 1 if len(participant) else 0
+    present = ~np.isnan(values)
+    sums = np.zeros((n_participants, values.shape[1]))
+    counts = np.zeros((n_participants, values.shape[1]))
+    np.add.at(sums, participant, np.where(present, values, 0.0))
+    np.add.at(counts, participant, present)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    group_is_ai = np.zeros(n_participants, dtype=bool)
+    group_is_ai[participant] = is_ai
+    return means, group_is_ai
+
+
+def compare_groups(values, is_ai, strata):
+    """Welch t-test and Cohen's d for every stratum x measure in one pass.
+
+    values: rows x measures (NaN = missing); is_ai: rows; strata: k x rows boolean.
+    Returns dict of k x measures arrays.
+    """
+    present = ~np.isnan(values)
+    x = np.where(present, values, 0.0)
+    out = {}
+    for name, in_group in (("ai", is_ai), ("noai", ~is_ai)):
+        weights = (strata & in_group[None, :]).astype(np.float64)
+        n = weights @ present
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = (weights @ x) / n
+            # Two-pass variance: k x rows x measures deviations from each stratum's mean
+            dev = np.where(present[None], values[None] - mean[:, None, :], 0.0)
+            var = np.einsum("kr,krm->km", weights, dev * dev) / (n - 1)
+        out[f"n_{name}"], out[f"mean_{name}"], out[f"var_{name}"] = n, mean, np.where(n > 1, var, np.nan)
+
+    n_a, n_b, v_a, v_b = out["n_ai"], out["n_noai"], out["var_ai"], out["var_noai"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        diff = out["mean_ai"] - out["mean_noai"]
+        se2 = v_a / n_a + v_b / n_b
+        t = np.where(se2 > 0, diff / np.sqrt(se2), np.nan)
+        df = se2 ** 2 / ((v_a / n_a) ** 2 / (n_a - 1) + (v_b / n_b) ** 2 / (n_b - 1))
+        pooled = np.sqrt(((n_a - 1) * v_a + (n_b - 1) * v_b) / (n_a + n_b - 2))
+        d = np.where(pooled > 0, diff / pooled, np.nan)
+    out.update(diff=diff, t=t, df=df, p=2 * stats.t.sf(np.abs(t), df), cohens_d=d)
+    return out
+
+
+def comparison_rows(rows):
+    """AI vs NoAI per measure: overall (participant means) and per article (trials)."""
+    values, is_ai, participant = to_matrix(rows)
+    means, participant_is_ai = participant_means(values, is_ai, participant)
+    scopes = [("overall", compare_groups(means, participant_is_ai, np.ones((1, len(means)), dtype=bool)), 0)]
+    article = np.array([row["article"] for row in rows])
+    by_article = compare_groups(values, is_ai, np.stack([article == a for a in ARTICLE_KEYS]))
+    scopes += [(a, by_article, k) for k, a in enumerate(ARTICLE_KEYS)]
+
+    out = []
+    for scope, result, k in scopes:
+        for j, measure in enumerate(MEASURES):
+            if min(result["n_ai"][k, j], result["n_noai"][k, j]) < 1:
+                continue
+            cell = {key: result[key][k, j] for key in result}
+            fmt = lambda v, nd=3: "" if np.isnan(v) else round(float(v), nd)  # noqa: E731
+            out.append({
+                "scope": scope,
+                "measure": measure,
+                "n_ai": int(cell["n_ai"]),
+                "mean_ai": fmt(cell["mean_ai"]),
+                "sd_ai": fmt(np.sqrt(cell["var_ai"])),
+                "n_noai": int(cell["n_noai"]),
+                "mean_noai": fmt(cell["mean_noai"]),
+                "sd_noai": fmt(np.sqrt(cell["var_noai"])),
+                "diff": fmt(cell["diff"]),
+                "t": fmt(cell["t"]),
+                "df": fmt(cell["df"], 1),
+                "p": fmt(cell["p"], 4),
+                "cohens_d": fmt(cell["cohens_d"]),
+            })
+    return out
+
+
+def _write_csv(path, rows, fieldnames=None):
+    if not rows:
+        return
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames or list(rows[0].keys()))
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: ("" if isinstance(v, float) and np.isnan(v) else v) for k, v in row.items()})
+    print(f"Saved: {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge AI and control logs and compare the arms")
+    parser.add_argument("--ai-dir", default=DEFAULT_DATA_DIR, help="AI arm experiment_data/")
+    parser.add_argument("--control-dir", default=CONTROL_DATA_DIR, help="Control arm experiment_data/")
+    parser.add_argument("--out", default="merged_arms_long.csv", help="Unified participant x article table")
+    parser.add_argument("--comparison-out", default="arm_comparison.csv")
+    args = parser.parse_args()
+
+    for data_dir in (args.ai_dir, args.control_dir):
+        if not os.path.isdir(data_dir):
+            print(f"Error: data directory not found: {data_dir}")
+            sys.exit(1)
+
+    rows = load_arms([("AI", args.ai_dir, "ai"), ("NoAI", args.control_dir, "control")])
+    groups = {row["experiment_group"] for row in rows}
+    if groups != set(GROUPS):
+        print(f"Need MCQ data from both arms, found: {sorted(groups) or 'none'}")
+        sys.exit(1)
+    _write_csv(args.out, rows, ID_COLUMNS + MEASURES)
+    comparisons = comparison_rows(rows)
+    _write_csv(args.comparison_out, comparisons)
+
+    print()
+    print(f"{'measure':<28} {'AI':>14} {'NoAI':>14} {'t':>7} {'p':>7} {'d':>6}")
+    for row in comparisons:
+        if row["scope"] != "overall":
+            continue
+        ai = f"{row['mean_ai']} (n={row['n_ai']})"
+        noai = f"{row['mean_noai']} (n={row['n_noai']})"
+        print(f"{row['measure']:<28} {ai:>14} {noai:>14} {row['t']!s:>7} {row['p']!s:>7} {row['cohens_d']!s:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection across recall texts (MinHash + LSH).
+
+Paste is blocked in the browser (`paste_attempts`), but that does not catch
+participants who share answers or one person re-running the study under a
+new ID (see the suspected P185/P186 duplicate in calculate_control_average.py).
+
+Every recall text is shingled into character 5-grams (works for English and
+Chinese), MinHash signatures are computed in NumPy for the whole cohort at
+once, and signatures are bucketed with LSH banding so only texts that collide
+in at least one band are compared. Candidate pairs are reported with their
+estimated Jaccard similarity (signature agreement) and the exact Jaccard of
+their shingle sets.
+
+Usage:
+    python near_duplicates.py                         # ../experiment_data
+    python near_duplicates.py --threshold 0.4 --num-perm 128 --bands 32
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+from collections import defaultdict
+
+import numpy as np
+
+from recall_scoring import DEFAULT_DATA_DIR, collect_recalls
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+BANDS = 32
+THRESHOLD = 0.5
+MIN_SHINGLES = 10  # very short recalls collide by chance
+
+_SHIFT = np.uint64(32)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_SHINGLE_POWERS = np.array([pow(1_000_003, i, 1 << 64) for i in range(16)], dtype=np.uint64)[::-1].copy()
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    """Unique 32-bit hashes of the character k-grams of the normalised text.
+
+    Code points are hashed as a polynomial over each sliding window in NumPy
+    (stable across runs, unlike hash()).
+    """
+    text = re.sub(r"\s+", " ", re.sub(r"[^\w\s]+", " ", (text or "").lower())).strip()
+    if len(text) < k:
+        return np.zeros(0, dtype=np.uint64)
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    windows = np.lib.stride_tricks.sliding_window_view(codes, k)
+    with np.errstate(over="ignore"):
+        hashed = (windows * _SHINGLE_POWERS[:k]).sum(axis=1) & _MAX_HASH
+    return np.unique(hashed)
+
+
+def minhash_signatures(shingle_sets, num_perm=NUM_PERM, seed=1, chunk=50_000):
+    """MinHash signatures (n_docs x num_perm, uint64) for a list of shingle hash arrays.
+
+    All shingles are concatenated; each permutation is a multiply-shift hash
+    ((a*x + b) mod 2^64) >> 32 applied to a chunk of the concatenated array and
+    reduced per document with np.minimum.reduceat, so there is no Python loop
+    over documents.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64, endpoint=True) | np.uint64(1)
+    b = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64, endpoint=True)
+
+    lengths = np.array([len(s) for s in shingle_sets], dtype=np.int64)
+    sig = np.full((len(shingle_sets), num_perm), _MAX_HASH, dtype=np.uint64)
+    nonempty = np.flatnonzero(lengths)
+    if len(nonempty) == 0:
+        return sig
+
+    values = np.concatenate([shingle_sets[i] for i in nonempty])
+    starts = np.concatenate([[0], np.cumsum(lengths[nonempty])[:-1]])
+
+    # Process whole documents per chunk so reduceat boundaries stay valid
+    doc_lo = 0
+    while doc_lo < len(nonempty):
+        doc_hi = doc_lo + 1
+        while doc_hi < len(nonempty) and starts[doc_hi] - starts[doc_lo] < chunk:
+            doc_hi += 1
+        lo = starts[doc_lo]
+        hi = starts[doc_hi] if doc_hi < len(nonempty) else len(values)
+        block = values[lo:hi]
+        with np.errstate(over="ignore"):
+            hashed = (block[None, :] * a[:, None] + b[:, None]) >> _SHIFT
+        sig[nonempty[doc_lo:doc_hi]] = np.minimum.reduceat(hashed, starts[doc_lo:doc_hi] - lo, axis=1).T
+        doc_lo = doc_hi
+    return sig
+
+
+def lsh_candidates(sig, bands=BANDS):
+    """Pairs (i, j), i < j, whose signatures agree on every row of at least one band."""
+    n, num_perm = sig.shape
+    rows = num_perm // bands
+    pairs = set()
+    for band in range(bands):
+        block = np.ascontiguousarray(sig[:, band * rows:(band + 1) * rows])
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows))).ravel()
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        order = np.argsort(inverse, kind="stable")
+        groups = np.split(order, np.cumsum(counts)[:-1])
+        for members in (groups[k] for k in np.flatnonzero(counts > 1)):
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    pairs.add((int(members[x]), int(members[y])))
+    return sorted(pairs)
+
+
+def find_near_duplicates(texts, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+    """Return [(i, j, jaccard_estimate, jaccard_exact)] for texts above the threshold."""
+    sets = [shingles(t) for t in texts]
+    # Empty and very short recalls are left out before hashing: their signatures
+    # would all be _MAX_HASH and land every pair of them in the same buckets
+    usable = [i for i, s in enumerate(sets) if len(s) >= MIN_SHINGLES]
+    sig = minhash_signatures([sets[i] for i in usable], num_perm=num_perm)
+
+    results = []
+    for x, y in lsh_candidates(sig, bands=bands):
+        i, j = usable[x], usable[y]
+        estimate = float(np.mean(sig[x] == sig[y]))
+        if estimate < threshold:
+            continue
+        inter = len(np.intersect1d(sets[i], sets[j], assume_unique=True))
+        exact = inter / (len(sets[i]) + len(sets[j]) - inter)
+        results.append((i, j, estimate, exact))
+    results.sort(key=lambda r: -r[2])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate recall texts across participants")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--out", default="recall_near_duplicates.csv")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Minimum estimated Jaccard")
+    parser.add_argument("--num-perm", type=int, default=NUM_PERM)
+    parser.add_argument("--bands", type=int, default=BANDS)
+    parser.add_argument("--include-same-participant", action="store_true")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.data_dir):
+        print(f"Error: data directory not found: {args.data_dir}")
+        sys.exit(1)
+    if args.num_perm % args.bands:
+        print("Error: --num-perm must be a multiple of --bands")
+        sys.exit(1)
+
+    recalls = collect_recalls(args.data_dir)
+    rows = args.num_perm // args.bands
+    print(f"{len(recalls)} recalls; {args.bands} bands x {rows} rows "
+          f"(~50% collision at Jaccard {(1 / args.bands) ** (1 / rows):.2f})")
+
+    pairs = find_near_duplicates([r["recall_text"] for r in recalls], args.threshold, args.num_perm, args.bands)
+
+    per_participant = defaultdict(int)
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["participant_a", "article_a", "participant_b", "article_b", "same_article",
+                         "jaccard_estimate", "jaccard_exact", "words_a", "words_b"])
+        kept = 0
+        for i, j, estimate, exact in pairs:
+            a, b = recalls[i], recalls[j]
+            if a["participant_id"] == b["participant_id"] and not args.include_same_participant:
+                continue
+            writer.writerow([a["participant_id"], a["article_key"], b["participant_id"], b["article_key"],
+                             a["article_key"] == b["article_key"], f"{estimate:.3f}", f"{exact:.3f}",
+                             a["word_count"], b["word_count"]])
+            per_participant[a["participant_id"]] += 1
+            per_participant[b["participant_id"]] += 1
+            kept += 1
+    print(f"{kept} candidate pairs saved to: {args.out}")
+    for pid, n in sorted(per_participant.items(), key=lambda kv: -kv[1])[:10]:
+        print(f"  {pid}: {n} near-duplicate pair(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Per-article reading heatmaps by timing condition.
+
+reading.html accumulates how long each paragraph was on screen (the
+viewport's share of the visible paragraphs, sampled once per animation frame
+while scrolling, paused while the tab is hidden or the summary overlay is
+open) and sends the histogram once per article as a `reading_dwell` event.
+This script collects those rows and writes, per article x timing x
+paragraph, the number of readers, the mean share of reading time and the
+mean seconds. Shares are normalised per reader first, so fast and slow
+readers weigh the same. Control logs have no timing column; their rows are
+labelled "control".
+
+Usage:
+    python reading_heatmap.py                         # all logs in ../experiment_data
+    python reading_heatmap.py --print                 # also print a text heatmap
+    python reading_heatmap.py --data-dir ../../no_ai_experiment/experiment_data --out control_heatmap.csv
+    python reading_heatmap.py --per-participant dwell_by_participant.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+
+from reading_timeline import DEFAULT_DATA_DIR, find_logs
+
+SHADES = " .:-=+*#%@"
+
+
+def extract_dwell(log_file_path):
+    """Yield (participant_id, article_num, article_key, timing, paragraphs, dwell_ms) per reading_dwell row."""
+    participant_id = re.split(r"[-_]", os.path.basename(log_file_path), maxsplit=1)[0]
+    with open(log_file_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for parts in reader:
+            if len(parts) < 9 or parts[1] != "reading_behavior" or parts[2] != "reading_dwell":
+                continue
+            # timestamp, phase, event, timestamp, paragraphs, dwell_ms, dwell_samples,
+            # article_num, article_key[, timing]  (no timing column in the control arm)
+            try:
+                dwell_ms = [max(0, int(v)) for v in json.loads(parts[5])]
+            except (TypeError, ValueError):
+                continue
+            if len(parts) > 9:
+                article_num, article_key, timing = parts[7], parts[8], parts[9]
+            else:
+                article_num, article_key, timing = parts[7], parts[8], "control"
+            yield participant_id, article_num, article_key, timing or "unknown", parts[4], dwell_ms
+
+
+def build_heatmaps(paths):
+    """-> ({(article_key, timing): [readers, [share sums], [ms sums]]}, per-participant rows)."""
+    cells = {}
+    participants = []
+    for path in paths:
+        for participant_id, article_num, article_key, timing, paragraphs, dwell_ms in extract_dwell(path):
+            total = sum(dwell_ms)
+            if not total:
+                continue
+            cell = cells.setdefault((article_key, timing), [0, [], []])
+            cell[0] += 1
+            for sums in (cell[1], cell[2]):
+                if len(sums) < len(dwell_ms):
+                    sums.extend([0.0] * (len(dwell_ms) - len(sums)))
+            for i, ms in enumerate(dwell_ms):
+                cell[1][i] += ms / total
+                cell[2][i] += ms
+            participants.append({"participant_id": participant_id, "article_num": article_num,
+                                 "article_key": article_key, "timing": timing, "paragraphs": paragraphs,
+                                 "total_ms": total, "dwell_ms": " ".join(map(str, dwell_ms))})
+    return cells, participants
+
+
+def heatmap_rows(cells):
+    rows = []
+    for (article_key, timing), (readers, shares, ms) in sorted(cells.items()):
+        for i, (share, total_ms) in enumerate(zip(shares, ms)):
+            rows.append({"article_key": article_key, "timing": timing, "paragraph": i + 1, "readers": readers,
+                         "mean_share": round(share / readers, 4),
+                         "mean_seconds": round(total_ms / readers / 1000, 2)})
+    return rows
+
+
+def print_heatmaps(cells):
+    by_article = defaultdict(list)
+    for (article_key, timing), (readers, shares, _ms) in sorted(cells.items()):
+        by_article[article_key].append((timing, readers, [s / readers for s in shares]))
+    for article_key, rows in by_article.items():
+        peak = max(max(shares) for _t, _n, shares in rows) or 1
+        print(f"\n{article_key}  (paragraph 1 -> {max(len(s) for _t, _n, s in rows)}; darker = larger share)")
+        for timing, readers, shares in rows:
+            cells_text = "".join(SHADES[min(len(SHADES) - 1, int(s / peak * (len(SHADES) - 1) + 0.5))] for s in shares)
+            print(f"  {timing:<14} n={readers:<4} |{cells_text}|")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-article paragraph dwell heatmaps by timing condition")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--out", default="reading_heatmap.csv")
+    parser.add_argument("--per-participant", metavar="CSV", help="Also write each reader's histogram")
+    parser.add_argument("--print", action="store_true", help="Print a text heatmap per article")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.data_dir):
+        print(f"Error: data directory not found: {args.data_dir}")
+        sys.exit(1)
+    cells, participants = build_heatmaps(find_logs(args.data_dir))
+    if not cells:
+        print("No reading_dwell rows found")
+        sys.exit(1)
+
+    rows = heatmap_rows(cells)
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"{len(cells)} article x timing heatmaps ({len(participants)} readings) saved to: {args.out}")
+
+    if args.per_participant:
+        with open(args.per_participant, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(participants[0].keys()))
+            writer.writeheader()
+            writer.writerows(participants)
+        print(f"Per-participant histograms saved to: {args.per_participant}")
+
+    if args.print:
+        print_heatmaps(cells)
+
+
+if __name__ == "__main__":
+    main()
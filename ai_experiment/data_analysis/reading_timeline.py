@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Event-sourced reading timeline.
+
+Reading time used to be computed three different ways (reading_complete's
+`reading_time_ms`, reading minus `summary_time_ms` for synchronous articles,
+and summed `summary_overlay_closed` values), and `visibility_change` events
+were collected but never used. This module replays each participant's raw
+event stream once and turns it into interval sets per article:
+
+    reading          [reading_complete - totalReadingTime, reading_complete]
+    summary_overlay  summary_overlay_opened -> summary_overlay_closed (synchronous)
+    summary_page     summary_viewing end - time_spent_ms -> end (pre/post reading)
+    hidden           visibility_change hidden=true -> hidden=false
+    break            end of reading (or post-reading summary) -> start of the test
+
+Effective times come from interval arithmetic rather than subtraction of
+totals, e.g. effective reading = reading - summary_overlay - hidden.
+
+For cohort runs every (participant, article) gets its own slot on a single
+global time line (slot * SPAN + relative ms), so union / intersection /
+difference for the whole cohort are a handful of sorted NumPy operations.
+
+Usage:
+    python reading_timeline.py                    # all logs in ../experiment_data
+    python reading_timeline.py P233 --intervals   # one participant, print intervals
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+from datetime import datetime
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATA_DIR = os.path.join(SCRIPT_DIR, "..", "experiment_data")
+
+KINDS = ("reading", "summary_overlay", "summary_page", "hidden", "break")
+SPAN = 10 ** 10  # ms per (participant, article) slot on the global line (~115 days)
+
+
+# ============================================================================
+# Interval arithmetic (vectorised)
+# ============================================================================
+class IntervalSet:
+    """Disjoint, sorted half-open intervals [start, end) on the global line."""
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, starts=(), ends=(), normalized=False):
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        if not normalized:
+            starts, ends = _merge(starts, ends)
+        self.starts = starts
+        self.ends = ends
+
+    def __or__(self, other):
+        return _combine(self, other, lambda a, b: a | b)
+
+    def __and__(self, other):
+        return _combine(self, other, lambda a, b: a & b)
+
+    def __sub__(self, other):
+        return _combine(self, other, lambda a, b: a & ~b)
+
+    def totals(self, n_slots):
+        """Covered length per slot."""
+        slots = (self.starts // SPAN).astype(np.int64)
+        return np.bincount(slots, weights=self.ends - self.starts, minlength=n_slots)
+
+
+def _merge(starts, ends):
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+    if len(starts) == 0:
+        return starts, ends
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+    running_end = np.maximum.accumulate(ends)
+    new_block = np.empty(len(starts), dtype=bool)
+    new_block[0] = True
+    new_block[1:] = starts[1:] > running_end[:-1]
+    idx = np.flatnonzero(new_block)
+    return starts[idx], np.maximum.reduceat(ends, idx)
+
+
+def _combine(a, b, op):
+    """Sweep both sets once and keep the segments where op(in_a, in_b) holds."""
+    times = np.concatenate([a.starts, a.ends, b.starts, b.ends])
+    if len(times) == 0:
+        return IntervalSet(normalized=True)
+    da = np.concatenate([np.ones(len(a.starts)), -np.ones(len(a.ends)), np.zeros(len(b.starts) + len(b.ends))])
+    db = np.concatenate([np.zeros(len(a.starts) + len(a.ends)), np.ones(len(b.starts)), -np.ones(len(b.ends))])
+    order = np.argsort(times, kind="stable")
+    times, da, db = times[order], da[order], db[order]
+    in_a = np.cumsum(da) > 0
+    in_b = np.cumsum(db) > 0
+    keep = op(in_a, in_b)[:-1] & (times[1:] > times[:-1])
+    return IntervalSet(times[:-1][keep], times[1:][keep])
+
+
+# ============================================================================
+# Event extraction (one pass per log)
+# ============================================================================
+def parse_time_ms(value):
+    """ISO 8601 (with or without offset) or 13-digit epoch ms -> epoch ms; None if unparseable."""
+    s = (value or "").strip()
+    if not s:
+        return None
+    if s.isdigit() and len(s) == 13:
+        return float(s)
+    if "T" not in s:
+        return None
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(s).timestamp() * 1000.0
+    except ValueError:
+        return None
+
+
+def _int(value, default=0):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def extract_events(log_file_path):
+    """Replay one log and return (participant_id, articles, intervals).
+
+    articles: {article_key: {'article_num', 'timing', 'reading_time_ms', 'summary_time_ms'}}
+    intervals: list of (article_key, kind, start_ms, end_ms) in epoch ms.
+    """
+    participant_id = re.split(r"[-_]", os.path.basename(log_file_path), maxsplit=1)[0]
+    articles = {}
+    intervals = []
+    open_overlay = {}
+    hidden_since = {}
+    reading_end = {}
+    ready_for_test = {}
+
+    def article(key, timing="", num=-1):
+        info = articles.setdefault(key, {"article_num": num, "timing": timing,
+                                         "reading_time_ms": 0, "summary_time_ms": 0})
+        if timing and not info["timing"]:
+            info["timing"] = timing
+        if num >= 0 and info["article_num"] < 0:
+            info["article_num"] = num
+        return info
+
+    with open(log_file_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for parts in reader:
+            if len(parts) < 3:
+                continue
+            server_ms = parse_time_ms(parts[0])
+            phase = parts[1]
+
+            if phase == "reading_behavior":
+                if len(parts) < 6:
+                    continue
+                event = parts[2]
+                t = parse_time_ms(parts[3]) or server_ms
+                key, timing = parts[-2], parts[-1]
+                if t is None or not key:
+                    continue
+                if event == "reading_complete":
+                    info = article(key, timing, _int(parts[8], -1) if len(parts) > 8 else -1)
+                    total = _int(parts[4])
+                    info["reading_time_ms"] = max(info["reading_time_ms"], total)
+                    info["summary_time_ms"] = max(info["summary_time_ms"], _int(parts[5]))
+                    intervals.append((key, "reading", t - total, t))
+                    if key in open_overlay:
+                        intervals.append((key, "summary_overlay", open_overlay.pop(key), t))
+                    if key in hidden_since:
+                        intervals.append((key, "hidden", hidden_since.pop(key), t))
+                    reading_end[key] = t
+                    ready_for_test[key] = t
+                elif event == "summary_overlay_opened":
+                    article(key, timing)
+                    open_overlay.setdefault(key, t)
+                elif event == "summary_overlay_closed":
+                    article(key, timing)
+                    if key in open_overlay:
+                        intervals.append((key, "summary_overlay", open_overlay.pop(key), t))
+                elif event == "visibility_change":
+                    article(key, timing)
+                    # The logged field is document.hidden (older reports call it is_visible)
+                    if parts[4].strip().lower() == "true":
+                        hidden_since.setdefault(key, t)
+                    elif key in hidden_since:
+                        intervals.append((key, "hidden", hidden_since.pop(key), t))
+
+            elif phase == "summary_viewing":
+                key = parts[3] if len(parts) > 3 else ""
+                if not key:
+                    continue
+                end = (parse_time_ms(parts[8]) if len(parts) > 8 else None) or server_ms
+                spent = _int(parts[6]) if len(parts) > 6 else 0
+                if end is None:
+                    continue
+                article(key, parts[4] if len(parts) > 4 else "", _int(parts[2], -1))
+                intervals.append((key, "summary_page", end - spent, end))
+                if key in reading_end:  # post-reading summary: the break starts after it
+                    ready_for_test[key] = max(ready_for_test.get(key, end), end)
+
+            elif phase == "recall_response":
+                key = parts[3] if len(parts) > 3 else ""
+                if server_ms is None or key not in ready_for_test:
+                    continue
+                test_start = server_ms - (_int(parts[11]) if len(parts) > 11 else 0)
+                intervals.append((key, "break", ready_for_test.pop(key), test_start))
+
+    return participant_id, articles, intervals
+
+
+# ============================================================================
+# Cohort timelines
+# ============================================================================
+def build_timelines(log_paths):
+    """Replay every log and derive effective times for each (participant, article).
+
+    Returns a list of row dicts (one per participant x article).
+    """
+    slots = []
+    starts = {kind: [] for kind in KINDS}
+    ends = {kind: [] for kind in KINDS}
+
+    for path in log_paths:
+        participant_id, articles, intervals = extract_events(path)
+        origin = min((s for _k, _kind, s, _e in intervals), default=0.0)
+        slot_of = {}
+        for key, info in articles.items():
+            slot_of[key] = len(slots)
+            slots.append((participant_id, key, info))
+        for key, kind, s, e in intervals:
+            if key not in slot_of:
+                continue
+            base = slot_of[key] * SPAN
+            starts[kind].append(base + min(max(s - origin, 0), SPAN - 1))
+            ends[kind].append(base + min(max(e - origin, 0), SPAN - 1))
+
+    sets = {kind: IntervalSet(starts[kind], ends[kind]) for kind in KINDS}
+    n = len(slots)
+    reading, overlay, page, hidden = sets["reading"], sets["summary_overlay"], sets["summary_page"], sets["hidden"]
+    summary = overlay | page
+    derived = {
+        "reading_wall_ms": reading.totals(n),
+        "summary_overlay_ms": (overlay & reading).totals(n),
+        "hidden_ms": hidden.totals(n),
+        "hidden_during_reading_ms": ((reading - overlay) & hidden).totals(n),
+        "effective_reading_ms": (reading - overlay - hidden).totals(n),
+        "summary_ms": summary.totals(n),
+        "effective_summary_ms": (summary - hidden).totals(n),
+        "break_ms": sets["break"].totals(n),
+    }
+
+    rows = []
+    for i, (participant_id, key, info) in enumerate(slots):
+        row = {
+            "participant_id": participant_id,
+            "article_key": key,
+            "article_num": info["article_num"],
+            "timing": info["timing"],
+            "logged_reading_time_ms": info["reading_time_ms"],
+            "logged_summary_time_ms": info["summary_time_ms"],
+        }
+        for name, values in derived.items():
+            row[name] = int(round(values[i]))
+        rows.append(row)
+    return rows
+
+
+def summarize_log(log_file_path):
+    """Timeline metrics for a single log, keyed by article_key."""
+    return {row["article_key"]: row for row in build_timelines([log_file_path])}
+
+
+def find_logs(data_dir, participant_id=None):
+    paths = []
+    for filename in sorted(os.listdir(data_dir)):
+        if not filename.endswith("_log.csv"):
+            continue
+        if participant_id and not filename.startswith(participant_id):
+            continue
+        paths.append(os.path.join(data_dir, filename))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild reading / summary / hidden / break intervals from raw logs")
+    parser.add_argument("participant_id", nargs="?", help="Only this participant (e.g. P233)")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--out", default="reading_timeline.csv")
+    parser.add_argument("--intervals", action="store_true", help="Print the raw intervals per article")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.data_dir):
+        print(f"Error: data directory not found: {args.data_dir}")
+        sys.exit(1)
+    paths = find_logs(args.data_dir, args.participant_id.upper() if args.participant_id else None)
+    if not paths:
+        print("No log files found")
+        sys.exit(1)
+
+    if args.intervals:
+        for path in paths:
+            participant_id, _articles, intervals = extract_events(path)
+            print(f"{participant_id} ({os.path.basename(path)})")
+            for key, kind, s, e in sorted(intervals, key=lambda x: x[2]):
+                print(f"  {key:<15} {kind:<16} {datetime.fromtimestamp(s / 1000):%H:%M:%S} -> "
+                      f"{datetime.fromtimestamp(e / 1000):%H:%M:%S}  ({(e - s) / 1000:.1f}s)")
+
+    rows = build_timelines(paths)
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()) if rows else ["participant_id"])
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"{len(rows)} participant x article timelines saved to: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
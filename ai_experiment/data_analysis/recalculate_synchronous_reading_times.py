@@ -3,6 +3,10 @@
 Recalculate synchronous reading times excluding summary viewing time
 This script analyzes the reading times and adjusts synchronous times to exclude 
 the time spent viewing the summary overlay.
+
+Adjusted times come from reading_timeline.py (reading minus summary-overlay
+and hidden-tab intervals); the old reading_time_ms - summary_time_ms
+subtraction is only used for logs the timeline cannot rebuild.
 """
 
 import csv
@@ -10,6 +14,8 @@ import json
 import os
 from glob import glob
 
+from reading_timeline import summarize_log
+
 def parse_log_file(log_file_path):
     """Parse a participant log file and extract reading data"""
     data = {
@@ -74,6 +80,14 @@ def parse_log_file(log_file_path):
                         'adjusted_reading_time_ms': reading_time_ms - summary_time_ms if timing == 'synchronous' else reading_time_ms
                     })
     
+    # Replace the subtraction with interval-based effective reading time
+    timeline = summarize_log(log_file_path)
+    for rd in data['reading_data']:
+        tl = timeline.get(rd['article_key'])
+        if tl and tl['reading_wall_ms']:
+            rd['summary_time_ms'] = tl['summary_overlay_ms']
+            rd['adjusted_reading_time_ms'] = tl['effective_reading_ms']
+    
     return data
 
 def calculate_statistics():
@@ -125,7 +139,7 @@ def calculate_statistics():
                 print(f"{participant_id} - {rd['article_key']} ({structure}, synchronous):")
                 print(f"  Original Reading Time: {reading_time_min:.2f} min")
                 print(f"  Summary Viewing Time: {summary_time_min:.2f} min")
-                print(f"  Adjusted Reading Time: {adjusted_time_min:.2f} min (excluding summary time)")
+                print(f"  Adjusted Reading Time: {adjusted_time_min:.2f} min (excluding summary overlay and hidden-tab time)")
                 print()
             
             # Categorize by structure and timing
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Automatic free-recall scoring by idea-unit matching.
+
+Each article in ARTICLES is split into idea units (one sentence = one unit).
+Every recall text logged by /submit_test is split the same way and scored
+against the units of its article with character n-gram TF-IDF vectors and a
+sparse cosine. All recall sentences of the cohort are stacked into one matrix,
+so the similarity of every recall sentence to every idea unit comes from a
+single sparse matrix product.
+
+Per idea unit the best-matching recall sentence decides the credit:
+    similarity >= full_threshold  -> 1.0
+    similarity >= half_threshold  -> 0.5
+The raw total (sum of credits) can be calibrated against the hand scores in
+calculate_recall_scores_clean.py (threshold grid + linear fit).
+
+Usage:
+    python recall_scoring.py                      # score all logs in ../experiment_data
+    python recall_scoring.py --calibrate          # also fit against the hand scores
+    python recall_scoring.py --units-out idea_units.csv --credits-out recall_credits.csv
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+
+import numpy as np
+from scipy import sparse
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+from log_parser import parse_csv_log  # noqa: E402
+from materials import ARTICLES  # noqa: E402  (the app's materials, without the Flask app)
+
+DEFAULT_DATA_DIR = os.path.join(SCRIPT_DIR, "..", "experiment_data")
+TRANSLATION_CACHE_FILE = os.path.join(SCRIPT_DIR, "..", "translation_cache", "translations.json")
+
+NGRAM_RANGE = (3, 5)
+N_FEATURES = 2 ** 20
+FULL_THRESHOLD = 0.45
+HALF_THRESHOLD = 0.30
+
+# Sentence boundary: ./!/? followed by whitespace (so "3.5" and "$574" stay intact),
+# or a CJK full stop / exclamation / question mark.
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|(?<=[。！？；])")
+_CJK = re.compile(r"[一-鿿]")
+_NON_WORD = re.compile(r"[^\w\s]+", re.UNICODE)
+_SPACES = re.compile(r"\s+")
+
+
+# ============================================================================
+# Idea units
+# ============================================================================
+def split_sentences(text):
+    """Split free text into trimmed sentences (English or Chinese punctuation)."""
+    sentences = []
+    for paragraph in (text or "").split("\n"):
+        for sentence in _SENTENCE_SPLIT.split(paragraph.strip()):
+            sentence = sentence.strip()
+            if len(sentence) >= 3:
+                sentences.append(sentence)
+    return sentences
+
+
+def load_translation_cache():
+    if not os.path.exists(TRANSLATION_CACHE_FILE):
+        return {}
+    try:
+        with open(TRANSLATION_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Warning: could not load translation cache: {e}")
+        return {}
+
+
+def build_idea_units(articles=None, lang="en"):
+    """Return {article_key: [unit sentence, ...]} for the given language.
+
+    Chinese units come from the app's translation cache (same "zh:<text>" keys
+    as app._get_cache_key); articles without a cached translation fall back to
+    English.
+    """
+    articles = articles if articles is not None else ARTICLES
+    cache = load_translation_cache() if lang != "en" else {}
+    units = {}
+    for key, art in articles.items():
+        text = art.get("text", "")
+        if lang != "en":
+            text = cache.get(f"{lang}:{text}", text)
+        units[key] = split_sentences(text)
+    return units
+
+
+# ============================================================================
+# Character n-gram TF-IDF (hashed, sparse)
+# ============================================================================
+def _normalize(text):
+    text = _NON_WORD.sub(" ", text.lower())
+    return _SPACES.sub(" ", text).strip()
+
+
+def _char_ngrams(text, ngram_range=NGRAM_RANGE):
+    """Character n-grams within word boundaries (words padded with spaces)."""
+    grams = []
+    lo, hi = ngram_range
+    for word in _normalize(text).split(" "):
+        if not word:
+            continue
+        padded = f" {word} "
+        for n in range(lo, hi + 1):
+            if len(padded) < n:
+                break
+            grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+def _hash_gram(gram):
+    # Stable across processes (unlike hash()), so fitted IDF weights can be reused
+    return int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little") % N_FEATURES
+
+
+def count_matrix(texts):
+    """Sparse term-count matrix (len(texts) x N_FEATURES) of hashed char n-grams."""
+    indptr = [0]
+    indices = []
+    gram_ids = {}
+    for text in texts:
+        for gram in _char_ngrams(text):
+            idx = gram_ids.get(gram)
+            if idx is None:
+                idx = gram_ids[gram] = _hash_gram(gram)
+            indices.append(idx)
+        indptr.append(len(indices))
+    values = np.ones(len(indices), dtype=np.float64)
+    m = sparse.csr_matrix((values, np.asarray(indices, dtype=np.int64), np.asarray(indptr)),
+                          shape=(len(texts), N_FEATURES))
+    m.sum_duplicates()
+    return m
+
+
+def fit_idf(counts):
+    """Smoothed IDF (as in the usual TF-IDF definition) from a count matrix."""
+    n_docs = counts.shape[0]
+    df = np.bincount(counts.indices, minlength=counts.shape[1])
+    return np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+
+
+def tfidf(counts, idf):
+    """Sublinear TF x IDF, L2-normalised rows."""
+    m = counts.copy()
+    m.data = 1.0 + np.log(m.data)
+    m = m.multiply(idf).tocsr()
+    norms = np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ m
+
+
+# ============================================================================
+# Scoring
+# ============================================================================
+def score_recalls(recalls, units_by_lang=None, full_threshold=FULL_THRESHOLD, half_threshold=HALF_THRESHOLD):
+    """Score a batch of recalls.
+
+    recalls: list of dicts with at least 'article_key' and 'recall_text'.
+    Returns (results, similarity) where results[i] holds per-unit similarity and
+    credits for recall i, and similarity is the (n_recall_sentences x n_units)
+    sparse cosine matrix from the single batched product.
+    """
+    if units_by_lang is None:
+        units_by_lang = {"en": build_idea_units(lang="en"), "zh": build_idea_units(lang="zh")}
+
+    # Flatten all idea units (all languages, all articles) into one matrix
+    unit_texts, unit_slices = [], {}
+    for lang, units in units_by_lang.items():
+        for key, sentences in units.items():
+            unit_slices[(lang, key)] = (len(unit_texts), len(unit_texts) + len(sentences))
+            unit_texts.extend(sentences)
+
+    # Flatten all recall sentences of the cohort; remember each recall's row range
+    sent_texts, sent_slices = [], []
+    for rec in recalls:
+        sentences = split_sentences(rec.get("recall_text", ""))
+        sent_slices.append((len(sent_texts), len(sent_texts) + len(sentences)))
+        sent_texts.extend(sentences)
+
+    unit_counts = count_matrix(unit_texts)
+    sent_counts = count_matrix(sent_texts)
+    idf = fit_idf(sparse.vstack([unit_counts, sent_counts]).tocsr())
+    U = tfidf(unit_counts, idf)
+    S = tfidf(sent_counts, idf)
+
+    similarity = (S @ U.T).tocsr()  # one product for the whole cohort
+    dense = similarity.toarray() if similarity.shape[0] else np.zeros((0, len(unit_texts)))
+
+    results = []
+    for rec, (s0, s1) in zip(recalls, sent_slices):
+        lang = "zh" if _CJK.search(rec.get("recall_text", "") or "") else "en"
+        key = rec.get("article_key", "")
+        u0, u1 = unit_slices.get((lang, key), unit_slices.get(("en", key), (0, 0)))
+        if s1 > s0 and u1 > u0:
+            best = dense[s0:s1, u0:u1].max(axis=0)
+        else:
+            best = np.zeros(u1 - u0)
+        credits = np.where(best >= full_threshold, 1.0, np.where(best >= half_threshold, 0.5, 0.0))
+        results.append({
+            "article_key": key,
+            "lang": lang,
+            "n_units": int(u1 - u0),
+            "unit_similarity": best,
+            "unit_credits": credits,
+            "raw_score": float(credits.sum()),
+            "similarity_sum": float(best.sum()),
+        })
+    return results, similarity
+
+
+def rescore(results, full_threshold, half_threshold):
+    """Recompute credits from stored similarities (no new matrix product)."""
+    totals = []
+    for res in results:
+        best = res["unit_similarity"]
+        totals.append(float(np.where(best >= full_threshold, 1.0, np.where(best >= half_threshold, 0.5, 0.0)).sum()))
+    return np.asarray(totals)
+
+
+def calibrate(results, hand_scores, keys):
+    """Grid-search thresholds and fit hand = a + b * raw on matched recalls.
+
+    hand_scores: {(participant_id, article_key): score}; keys[i] is the
+    (participant_id, article_key) of results[i].
+    """
+    matched = [i for i, k in enumerate(keys) if k in hand_scores]
+    if len(matched) < 3:
+        return None
+    y = np.array([hand_scores[keys[i]] for i in matched])
+    subset = [results[i] for i in matched]
+
+    best = None
+    for full in np.arange(0.25, 0.81, 0.05):
+        for half in np.arange(0.10, full, 0.05):
+            x = rescore(subset, full, half)
+            if np.ptp(x) == 0:
+                continue
+            r = float(np.corrcoef(x, y)[0, 1])
+            if best is None or r > best["r"]:
+                best = {"full_threshold": round(float(full), 2), "half_threshold": round(float(half), 2), "r": r}
+    if best is None:
+        return None
+
+    x = rescore(subset, best["full_threshold"], best["half_threshold"])
+    slope, intercept = np.polyfit(x, y, 1)
+    pred = intercept + slope * x
+    best.update({
+        "slope": float(slope),
+        "intercept": float(intercept),
+        "n": len(matched),
+        "mae": float(np.mean(np.abs(pred - y))),
+    })
+    return best
+
+
+def load_hand_scores():
+    """Hand-coded recall totals keyed by (participant_id, article_key)."""
+    from calculate_recall_scores_clean import data as hand_data
+    return {(pid, article): float(score) for pid, _cond, _struct, _timing, article, score in hand_data}
+
+
+def collect_recalls(data_dir):
+    """Parse every *_log.csv in data_dir and return flat recall records."""
+    recalls = []
+    for filename in sorted(os.listdir(data_dir)):
+        if not filename.endswith("_log.csv"):
+            continue
+        participant_id = re.split(r"[-_]", filename, maxsplit=1)[0]
+        try:
+            data = parse_csv_log(os.path.join(data_dir, filename))
+        except Exception as e:
+            print(f"Warning: could not parse {filename}: {e}")
+            continue
+        structure = data.get("randomization", {}).get("structure", "") or "control"
+        for rec in data["recall_data"]:
+            recalls.append({
+                "participant_id": participant_id,
+                "structure": structure,
+                "timing": rec.get("timing", ""),
+                "article_key": rec.get("article_key", ""),
+                "recall_text": rec.get("recall_text", ""),
+                "word_count": rec.get("word_count", 0),
+            })
+    return recalls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score free recall by idea-unit matching")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--out", default="recall_scores.csv")
+    parser.add_argument("--credits-out", default=None, help="Optional per-idea-unit credit CSV")
+    parser.add_argument("--units-out", default=None, help="Optional CSV listing the idea units")
+    parser.add_argument("--full-threshold", type=float, default=FULL_THRESHOLD)
+    parser.add_argument("--half-threshold", type=float, default=HALF_THRESHOLD)
+    parser.add_argument("--calibrate", action="store_true", help="Fit thresholds + linear map to the hand scores")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.data_dir):
+        print(f"Error: data directory not found: {args.data_dir}")
+        sys.exit(1)
+
+    units_by_lang = {"en": build_idea_units(lang="en"), "zh": build_idea_units(lang="zh")}
+    if args.units_out:
+        with open(args.units_out, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["lang", "article_key", "unit_idx", "unit_text"])
+            for lang, units in units_by_lang.items():
+                for key, sentences in units.items():
+                    for i, sentence in enumerate(sentences):
+                        writer.writerow([lang, key, i, sentence])
+
+    recalls = collect_recalls(args.data_dir)
+    print(f"Scoring {len(recalls)} recall responses...")
+    results, similarity = score_recalls(recalls, units_by_lang, args.full_threshold, args.half_threshold)
+    print(f"Similarity matrix: {similarity.shape[0]} recall sentences x {similarity.shape[1]} idea units "
+          f"({similarity.nnz} non-zero)")
+
+    calibration = None
+    if args.calibrate:
+        keys = [(rec["participant_id"], rec["article_key"]) for rec in recalls]
+        calibration = calibrate(results, load_hand_scores(), keys)
+        if calibration is None:
+            print("Calibration skipped: fewer than 3 recalls match the hand scores")
+        else:
+            print(f"Calibration (n={calibration['n']}): full={calibration['full_threshold']}, "
+                  f"half={calibration['half_threshold']}, r={calibration['r']:.3f}, "
+                  f"hand ≈ {calibration['intercept']:.2f} + {calibration['slope']:.2f} × raw "
+                  f"(MAE {calibration['mae']:.2f})")
+            raw = rescore(results, calibration["full_threshold"], calibration["half_threshold"])
+            for res, value in zip(results, raw):
+                res["raw_score"] = float(value)
+
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["participant_id", "structure", "timing", "article_key", "lang", "word_count",
+                         "n_units", "raw_score", "similarity_sum", "calibrated_score"])
+        for rec, res in zip(recalls, results):
+            calibrated = ""
+            if calibration:
+                calibrated = f"{calibration['intercept'] + calibration['slope'] * res['raw_score']:.2f}"
+            writer.writerow([rec["participant_id"], rec["structure"], rec["timing"], rec["article_key"],
+                             res["lang"], rec["word_count"], res["n_units"], f"{res['raw_score']:.1f}",
+                             f"{res['similarity_sum']:.3f}", calibrated])
+    print(f"Scores saved to: {args.out}")
+
+    if args.credits_out:
+        full = calibration["full_threshold"] if calibration else args.full_threshold
+        half = calibration["half_threshold"] if calibration else args.half_threshold
+        with open(args.credits_out, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["participant_id", "article_key", "unit_idx", "similarity", "credit"])
+            for rec, res in zip(recalls, results):
+                sims = res["unit_similarity"]
+                credits = np.where(sims >= full, 1.0, np.where(sims >= half, 0.5, 0.0))
+                for i, (sim, credit) in enumerate(zip(sims, credits)):
+                    writer.writerow([rec["participant_id"], rec["article_key"], i, f"{sim:.3f}", credit])
+        print(f"Per-idea credits saved to: {args.credits_out}")
+
+
+if __name__ == "__main__":
+    main()
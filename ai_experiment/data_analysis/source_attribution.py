@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Source attribution for free recall: did a recalled idea come from the AI
+summary, from the article, or from a false lure?
+
+CORRECT_SOURCE_MAP tags each MCQ item by source; this does the same for recall
+sentences. A hashed n-gram index is precomputed over each article's `text`,
+`summary_integrated` and `summary_segmented` (and the lure sentences planted
+in the summaries). Each index entry is a 64-bit shingle hash mapped to a
+bitmask of the sources that contain it. Queries hash every recall sentence's
+shingles and resolve them all at once with np.searchsorted against the sorted
+key array, so thousands of recall texts are labelled in one pass.
+
+Labels per recall sentence:
+    lure-derived  - contains a lure phrase or enough lure-only shingles
+    summary-only  - matches the summary the participant saw, not the article
+    article-only  - matches the article, not the summary
+    shared        - matches text present in both (or both kinds of hits)
+    unattributed  - too few matching shingles to decide
+
+Usage:
+    python source_attribution.py                           # ../experiment_data
+    python source_attribution.py --sentences-out recall_sentence_sources.csv
+"""
+
+import argparse
+import csv
+import hashlib
+import os
+import re
+import sys
+from collections import defaultdict
+
+import numpy as np
+
+from recall_scoring import DEFAULT_DATA_DIR, collect_recalls, load_translation_cache, split_sentences
+from materials import ARTICLES  # noqa: E402  (on sys.path via recall_scoring)
+from lure_detector import lure_phrases
+
+WORD_NGRAM = 3   # English: word trigrams
+CHAR_NGRAM = 4   # Chinese: character 4-grams
+MIN_HITS = 2     # shingles needed before a sentence is attributed
+
+SRC_ARTICLE = 1
+SRC_SUMMARY_INTEGRATED = 2
+SRC_SUMMARY_SEGMENTED = 4
+SRC_LURE = 8
+SUMMARY_BITS = {"integrated": SRC_SUMMARY_INTEGRATED, "segmented": SRC_SUMMARY_SEGMENTED}
+
+LABELS = ["lure-derived", "summary-only", "article-only", "shared", "unattributed"]
+
+_CJK = re.compile(r"[一-鿿]")
+_TOKEN = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+
+
+# ============================================================================
+# Shingling
+# ============================================================================
+def tokenize(text):
+    """Lowercased word tokens for English; single characters for Chinese."""
+    text = (text or "").lower()
+    if _CJK.search(text):
+        return [c for c in text if _CJK.match(c) or c.isalnum()]
+    return _TOKEN.findall(text)
+
+
+def shingle_hashes(text):
+    """Stable 64-bit hashes of the word (or character) n-grams of a text."""
+    tokens = tokenize(text)
+    n = CHAR_NGRAM if tokens and _CJK.match(tokens[0]) else WORD_NGRAM
+    sep = "" if n == CHAR_NGRAM else " "
+    if len(tokens) < n:
+        grams = [sep.join(tokens)] if tokens else []
+    else:
+        grams = [sep.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)]
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+         for g in grams),
+        dtype=np.int64, count=len(grams),
+    )
+
+
+# ============================================================================
+# Index
+# ============================================================================
+class SourceIndex:
+    """Per-article sorted shingle-hash arrays with source bitmasks."""
+
+    def __init__(self, articles=None, langs=("en", "zh")):
+        articles = articles if articles is not None else ARTICLES
+        cache = load_translation_cache() if any(lang != "en" for lang in langs) else {}
+        self.keys = {}
+        self.masks = {}
+        self.lure_phrases = {}
+
+        for article_key, art in articles.items():
+            masks = defaultdict(int)
+            phrases = lure_phrases(article_key)
+            for lang in langs:
+                def localized(field):
+                    english = art.get(field, "")
+                    return english if lang == "en" else cache.get(f"{lang}:{english}", "")
+
+                for field, bit in (("text", SRC_ARTICLE),
+                                   ("summary_integrated", SRC_SUMMARY_INTEGRATED),
+                                   ("summary_segmented", SRC_SUMMARY_SEGMENTED)):
+                    for h in shingle_hashes(localized(field)).tolist():
+                        masks[h] |= bit
+
+                # Lure sentences are marked in English only: the translation cache holds
+                # whole summaries, not sentence-aligned translations.
+                if lang == "en":
+                    for field in ("summary_integrated", "summary_segmented"):
+                        for sentence in split_sentences(art.get(field, "")):
+                            if any(p in sentence.lower() for p in phrases):
+                                for h in shingle_hashes(sentence).tolist():
+                                    masks[h] |= SRC_LURE
+
+            self.lure_phrases[article_key] = phrases
+            keys = np.fromiter(masks.keys(), dtype=np.int64, count=len(masks))
+            values = np.fromiter(masks.values(), dtype=np.int64, count=len(masks))
+            order = np.argsort(keys)
+            self.keys[article_key] = keys[order]
+            self.masks[article_key] = values[order]
+
+    def lookup(self, article_key, hashes):
+        """Source bitmask for each hash (0 where the shingle is not in the index)."""
+        keys = self.keys.get(article_key)
+        if keys is None or len(keys) == 0 or len(hashes) == 0:
+            return np.zeros(len(hashes), dtype=np.int64)
+        pos = np.searchsorted(keys, hashes)
+        pos[pos == len(keys)] = 0
+        found = keys[pos] == hashes
+        return np.where(found, self.masks[article_key][pos], 0)
+
+
+# ============================================================================
+# Batch labelling
+# ============================================================================
+def label_sentences(index, recalls):
+    """Label every sentence of every recall.
+
+    recalls: dicts with participant_id, structure, timing, article_key, recall_text.
+    Returns a list of per-sentence dicts.
+    """
+    # Flatten: one hash array per article so each article is a single searchsorted call
+    per_article = defaultdict(lambda: {"hashes": [], "owners": []})
+    sentences = []
+    for rec in recalls:
+        for sentence in split_sentences(rec.get("recall_text", "")):
+            sid = len(sentences)
+            sentences.append({"recall": rec, "sentence": sentence})
+            hashes = shingle_hashes(sentence)
+            bucket = per_article[rec.get("article_key", "")]
+            bucket["hashes"].append(hashes)
+            bucket["owners"].append(np.full(len(hashes), sid, dtype=np.int64))
+
+    n = len(sentences)
+    counts = {name: np.zeros(n, dtype=np.int64) for name in ("article", "summary", "both", "lure", "total")}
+    for article_key, bucket in per_article.items():
+        if not bucket["hashes"]:
+            continue
+        hashes = np.concatenate(bucket["hashes"])
+        owners = np.concatenate(bucket["owners"])
+        masks = index.lookup(article_key, hashes)
+
+        # Restrict summary bits to the summary this participant actually saw
+        seen = np.array([SUMMARY_BITS.get(sentences[o]["recall"].get("structure", ""),
+                                          SRC_SUMMARY_INTEGRATED | SRC_SUMMARY_SEGMENTED) for o in owners],
+                        dtype=np.int64) if len(owners) else np.zeros(0, dtype=np.int64)
+        in_article = (masks & SRC_ARTICLE) > 0
+        in_summary = (masks & seen) > 0
+        lure_only = ((masks & SRC_LURE) > 0) & ~in_article
+
+        counts["total"] += np.bincount(owners, minlength=n)
+        counts["article"] += np.bincount(owners, weights=in_article & ~in_summary, minlength=n).astype(np.int64)
+        counts["summary"] += np.bincount(owners, weights=in_summary & ~in_article, minlength=n).astype(np.int64)
+        counts["both"] += np.bincount(owners, weights=in_article & in_summary, minlength=n).astype(np.int64)
+        counts["lure"] += np.bincount(owners, weights=lure_only, minlength=n).astype(np.int64)
+
+    rows = []
+    for i, item in enumerate(sentences):
+        rec = item["recall"]
+        text_lower = item["sentence"].lower()
+        has_phrase = any(p in text_lower for p in index.lure_phrases.get(rec.get("article_key", ""), []))
+        a, s, b, lure = (int(counts[k][i]) for k in ("article", "summary", "both", "lure"))
+        if has_phrase or lure >= MIN_HITS:
+            label = "lure-derived"
+        elif s >= MIN_HITS and a < MIN_HITS:
+            label = "summary-only"
+        elif a >= MIN_HITS and s < MIN_HITS:
+            label = "article-only"
+        elif a + s + b >= MIN_HITS:
+            label = "shared"
+        else:
+            label = "unattributed"
+        rows.append({
+            "participant_id": rec.get("participant_id", ""),
+            "structure": rec.get("structure", ""),
+            "timing": rec.get("timing", ""),
+            "article_key": rec.get("article_key", ""),
+            "sentence": item["sentence"],
+            "shingles": int(counts["total"][i]),
+            "article_hits": a,
+            "summary_hits": s,
+            "shared_hits": b,
+            "lure_hits": lure,
+            "label": label,
+        })
+    return rows
+
+
+def aggregate(rows):
+    """Sentence counts and proportions per label, per participant x timing."""
+    groups = defaultdict(lambda: defaultdict(int))
+    meta = {}
+    for row in rows:
+        key = (row["participant_id"], row["timing"])
+        groups[key][row["label"]] += 1
+        meta[key] = (row["structure"], row["article_key"])
+    out = []
+    for (pid, timing), label_counts in sorted(groups.items()):
+        total = sum(label_counts.values())
+        entry = {"participant_id": pid, "structure": meta[(pid, timing)][0], "timing": timing,
+                 "article_key": meta[(pid, timing)][1], "n_sentences": total}
+        for label in LABELS:
+            entry[f"n_{label}"] = label_counts.get(label, 0)
+            entry[f"prop_{label}"] = round(label_counts.get(label, 0) / total, 3) if total else 0.0
+        out.append(entry)
+    return out
+
+
+def _write_csv(path, rows):
+    if not rows:
+        return
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Attribute recall sentences to summary / article / lure sources")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--out", default="recall_source_attribution.csv", help="Participant x timing summary")
+    parser.add_argument("--sentences-out", default=None, help="Optional per-sentence label CSV")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.data_dir):
+        print(f"Error: data directory not found: {args.data_dir}")
+        sys.exit(1)
+
+    index = SourceIndex()
+    print("Index: " + ", ".join(f"{k}={len(v)} shingles" for k, v in index.keys.items()))
+
+    recalls = collect_recalls(args.data_dir)
+    rows = label_sentences(index, recalls)
+    summary = aggregate(rows)
+
+    totals = defaultdict(int)
+    for row in rows:
+        totals[row["label"]] += 1
+    print(f"Labelled {len(rows)} sentences from {len(recalls)} recalls:")
+    for label in LABELS:
+        print(f"  {label:<14} {totals.get(label, 0)}")
+
+    _write_csv(args.out, summary)
+    print(f"Participant x timing summary saved to: {args.out}")
+    if args.sentences_out:
+        _write_csv(args.sentences_out, rows)
+        print(f"Per-sentence labels saved to: {args.sentences_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,607 @@
+"""
+Study materials: the three articles, their AI summaries and MCQs.
+
+Kept apart from app.py so the analysis scripts can read the materials
+without importing the Flask app.
+"""
+
+ARTICLES = {
+    'uhi': {
+        'title': 'Urban Heat Islands: Causes, Consequences, and What Works',
+        'free_recall_prompt': 'Please write everything you remember from the article within 5 minutes. Try to describe main ideas and relationships — causes, consequences, and solutions — in your own words.',
+        'text': '''Cities function as complex heat systems where buildings, roads, and the atmosphere interact to create persistent temperature differences. Every street, rooftop, and road acts as a heat storage unit: during the day, asphalt roads, brick buildings, and concrete structures absorb sunlight and convert this energy into heat. Unlike green spaces that cool through water evaporation and reflection, city surfaces continuously store heat throughout daylight hours. When night falls and the sun disappears, these stored heat sources release infrared radiation back into the lower atmosphere. This heat release is restricted by urban canyon geometry—the ratio of building height to street width—which traps outgoing radiation through multiple reflections between surfaces before it can escape to the atmosphere. As a result, central city areas show nighttime temperatures three to seven degrees Celsius higher than surrounding suburban areas, creating what scientists call the urban heat island (UHI) effect. During heat waves, this temperature increase adds to baseline warming, raising energy use for air conditioning, worsening air quality through smog formation, and increasing heat stress among vulnerable populations.
+
+The size of these temperature differences comes from combined physical, material, and airflow factors that together determine the urban energy balance. Surface reflectivity—measured through the albedo coefficient ranging from zero (complete absorption) to one (perfect reflection)—plays a crucial role in determining absorbed solar energy. Fresh asphalt surfaces have albedo values around 0.05, reflecting only five percent of incoming sunlight while absorbing ninety-five percent. Aged asphalt oxidizes to slightly higher reflectance (~0.12), but remains much darker than vegetated ground cover (albedo ~0.20–0.25). Low-albedo surfaces therefore work as efficient solar collectors that convert radiation into stored heat. Additionally, the material-specific thermal mass—defined as heat storage capacity—controls the speed of heating and cooling. Dense construction materials including concrete, brick, and stone have high thermal mass, enabling prolonged energy storage that delays nighttime cooling. This storage-release cycle operates continuously: buildings absorb radiation throughout the day, then gradually release stored heat after sunset, maintaining elevated nighttime temperatures for extended periods.
+
+Urban geometry further increases heat retention through urban canyon effects. Tall buildings along narrow streets create confined spaces that restrict both incoming sunlight during midday and outgoing radiation at night. Within these canyons, solar radiation bounces between surfaces multiple times before escaping to the atmosphere, increasing the chance of absorption with each bounce. The three-dimensional structure therefore functions as a heat trap, maximizing energy capture while minimizing cooling pathways. At the same time, restricted airflow between building walls prevents convective heat removal—the mechanical transport of heat through air movement—thus blocking one of the atmosphere's main cooling mechanisms. Finally, human-generated waste heat from vehicle engines, building heating and cooling systems, and industrial processes adds extra heat directly into the urban atmosphere, supplementing solar heating. During extreme heat events, power companies respond to increased electricity demand by activating less efficient backup generators, often coal-burning plants that emit greenhouse gases while using water for cooling towers, creating a feedback loop where heat reduction efforts paradoxically generate additional emissions and resource use.
+
+The geographic distribution of heat stress maps directly onto socioeconomic patterns, creating environmental justice issues with measurable health impacts. Neighborhoods with concentrated poverty, reduced tree coverage, higher building density, and more impervious surfaces experience disproportionately higher heat exposure. During severe heat episodes—defined as sustained periods exceeding normal temperature ranges—mortality risk increases dramatically with heat intensity, affecting elderly people, individuals with heart or breathing problems, outdoor workers, and residents without air conditioning. Emergency medical systems face surging demand for heat-related care, straining healthcare resources. Thus, the urban heat island is both a physical weather phenomenon with measurable temperature differences and a social inequality issue that reflects unequal resource distribution, infrastructure investment, and resilience capacity across urban populations.
+
+Counteracting these heat processes requires integrated strategies across multiple scales. The basic principle involves modifying surface energy budgets through four connected mechanisms: increasing reflectance, providing shade, amplifying evaporative cooling, and manipulating thermal mass. Cool roofing systems coated with high-albedo materials can raise surface reflectance from typical values (~0.10–0.20) to enhanced levels approaching 0.70–0.85, thereby reducing absorbed solar energy by sixty to seventy-five percent. Similarly, "cool pavements" using lighter-colored materials or permeable designs that allow subsurface moisture show surface temperature reductions of ten to twenty degrees Celsius compared to conventional asphalt during peak sun exposure. However, these solutions require careful design: increased visible light reflection without corresponding infrared reduction can increase glare, creating visual discomfort and potentially raising nearby air temperatures through redirected radiation. Optimal cool surface technologies therefore use wavelength-selective coatings that maximize near-infrared reflection—where solar energy peaks—while moderating visible brightness.
+
+Vegetation provides complementary temperature control through multiple biological processes. Tree canopies intercept sunlight before it reaches the ground, creating shaded areas beneath leaves. More importantly, leaf transpiration—the controlled release of water vapor through plant pores—converts heat into water evaporation energy. This evapotranspiration process effectively works as a distributed atmospheric cooling system that moderates temperatures while simultaneously increasing local humidity. Urban forestry programs thus serve dual heat reduction functions: direct shade plus evaporative cooling. Green infrastructure at smaller scales—including vegetated rooftops, vertical gardens, and bioswales for stormwater management—extends these principles across building surfaces and street features. Nevertheless, vegetation faces implementation challenges including water availability in dry regions, maintenance costs, conflicts with underground utilities, and long growth periods before benefits fully develop.
+
+Beyond individual interventions, systemic resilience requires comprehensive urban planning that integrates heat considerations into land-use decisions, building codes, and infrastructure priorities. Zoning regulations can mandate minimum tree coverage ratios, restrict impervious surface percentages, or incentivize cool material use through development bonuses. Building energy standards increasingly include thermal performance metrics—such as roof solar reflectance indices and wall thermal resistance—that reduce cooling needs while improving indoor comfort. Transportation planning that prioritizes pedestrian areas, cycling networks, and transit-oriented development reduces vehicle heat emissions while creating opportunities for shade trees and permeable surfaces. Critically, equitable climate adaptation requires targeting interventions toward thermally vulnerable neighborhoods through needs-based resource allocation rather than allowing market forces alone to determine cooling infrastructure distribution.
+
+Emerging research explores advanced technologies including radiative cooling materials engineered to emit heat at atmospheric transparency wavelengths (8–13 micrometer infrared band), enabling passive heat rejection directly to space even during daylight. Phase-change materials within building walls can buffer indoor temperature changes by absorbing heat during warming periods and releasing it during cooling cycles. District-scale energy systems that recover waste heat for beneficial uses—such as district heating networks or industrial integration—reduce overall heat emissions. However, these innovations remain expensive compared to conventional materials, limiting adoption without regulations or subsidies.
+
+Ultimately, urban heat mitigation represents a sociotechnical challenge requiring coordinated action across governance levels, professional fields, and community stakeholders. Scientific understanding of heat transfer physics, materials science, and atmospheric dynamics provides the mechanistic foundation. Engineering expertise translates theoretical principles into practical cool surface technologies, green infrastructure systems, and building innovations. Urban planning synthesizes these technical capabilities within spatial frameworks that account for land-use patterns, transportation networks, and social equity considerations. Community engagement ensures that interventions address local needs, incorporate traditional knowledge, and build adaptive capacity among residents. Success depends not merely on technology deployment but on institutional arrangements that sustain long-term maintenance, equitable access, and continuous adaptation as climate and urban form evolve. The heat island thus becomes not only a physical problem with engineering solutions but a lens revealing how cities balance efficiency with resilience, economic growth with environmental quality, and overall prosperity with distributional justice.
+''',
+        'summary_integrated': 'Urban heat islands develop when cities absorb and retain solar radiation far more effectively than nearby rural landscapes. Surfaces such as asphalt, brick, and concrete have very low albedo values—typically between 0.05 and 0.20—meaning they reflect little sunlight and absorb most incoming energy. While fresh asphalt reflects only around five percent of sunlight, some assessments suggest that aged asphalt can reach albedo values near 0.22, though measured values generally remain much lower in practice. High thermal-mass materials including stone, brick, and concrete continue releasing stored heat well after sunset, keeping nighttime temperatures three to seven degrees Celsius warmer than surrounding areas. Urban canyon geometry—tall buildings along narrow streets—further traps outgoing longwave radiation, slowing atmospheric cooling and reducing ventilation.\n\nThese thermal effects intensify during heat waves, elevating health risks and increasing electricity demand. Heat exposure is distributed unevenly: low-income neighborhoods with limited tree canopy, dense construction, and extensive impervious surfaces experience far higher temperatures. Vulnerable groups such as elderly residents, people with cardiovascular conditions, outdoor workers, and those without air conditioning face disproportionate risks. At the same time, recent pilot programs have promoted photocatalytic roof tiles that supposedly convert absorbed heat into electrical energy through thermoelectric effects, though such claims remain unverified and lack large-scale evidence.\n\nMitigation strategies focus on increasing surface reflectance, boosting shading, enhancing evaporative cooling through vegetation, and optimizing thermal mass. High-albedo "cool roofs," with reflectance values of 0.70–0.85, can reduce absorbed heat by 60–75%. Urban forestry provides dual benefits through shading and evapotranspiration. Long-term resilience requires integrated planning that aligns technical solutions with equitable resource distribution, prioritizing vulnerable communities lacking access to cooling infrastructure and green space.',
+        'summary_segmented': '''1. Urban heat islands form when city surfaces absorb and retain far more solar energy than nearby rural areas.
+
+2. Low-albedo materials such as asphalt (~0.05) and brick absorb 90–95% of incoming sunlight.
+
+3. High thermal-mass materials store heat during the day and release it slowly overnight, sustaining elevated temperatures.
+
+4. Urban canyon geometry traps outgoing longwave radiation, reducing nighttime cooling and impeding airflow.
+
+5. Some assessments claim aged asphalt can reach albedo values near 0.22, increasing reflectance with age.
+
+6. Heat exposure intensifies health risks for elderly individuals, people with cardiovascular conditions, and those lacking air-conditioning.
+
+7. Low-income neighborhoods face higher heat burdens due to fewer trees, denser buildings, and more impervious surfaces.
+
+8. High-albedo cool roofs (0.70–0.85 reflectance) reduce heat absorption by 60–75% compared with conventional materials.
+
+9. Urban forestry cools cities through shading and evaporative cooling generated by leaf transpiration.
+
+10. Pilot programs investigating photocatalytic roof tiles claim they convert absorbed heat into electrical energy, though evidence is limited.''',
+        'questions': [
+            {
+                "q": "Dark, low-albedo surfaces such as asphalt absorb approximately _______ percent of incoming solar radiation.",
+                "options": [
+                    "seventy to seventy-five",
+                    "seventy-five to eighty",
+                    "ninety to ninety-five",
+                    "eighty to eighty-five"
+                ],
+                "correct": 2,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "_______ materials store large amounts of heat during the day and release it slowly after sunset.",
+                "options": [
+                    "Low thermal mass",
+                    "Reflective",
+                    "Porous",
+                    "High thermal mass"
+                ],
+                "correct": 3,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Urban greening provides _______ through shading and leaf transpiration.",
+                "options": [
+                    "conductive cooling",
+                    "evaporative cooling",
+                    "radiative cooling",
+                    "convective cooling"
+                ],
+                "correct": 1,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "The article identifies _______ as a functioning urban-cooling technology.",
+                "options": [
+                    "phase-change wall layers",
+                    "radiative cooling materials",
+                    "photocatalytic roof tiles",
+                    "waste-heat recovery networks"
+                ],
+                "correct": 1,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Cool roofs reduce heat absorption because their surface reflectance commonly reaches _______.",
+                "options": [
+                    "0.30–0.45",
+                    "0.50–0.65",
+                    "0.70–0.85",
+                    "0.65–0.80"
+                ],
+                "correct": 2,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Neighborhoods with the highest heat exposure often lack adequate _______.",
+                "options": [
+                    "coastal airflow",
+                    "open water bodies",
+                    "tree canopy and permeable surfaces",
+                    "shaded pedestrian corridors"
+                ],
+                "correct": 2,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "High-albedo roofing systems limit heat gain primarily by _______.",
+                "options": [
+                    "reducing absorbed solar flux",
+                    "increasing thermal mass storage",
+                    "promoting moisture-driven cooling",
+                    "redistributing longwave radiation"
+                ],
+                "correct": 0,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Urban canyon geometry traps _______ through repeated reflections between building surfaces.",
+                "options": [
+                    "outgoing longwave radiation",
+                    "thermal mass discharge",
+                    "convective airflow",
+                    "incoming solar reflection"
+                ],
+                "correct": 0,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Urban heat islands develop when city surfaces absorb more ______ than nearby rural areas.",
+                "options": [
+                    "atmospheric longwave radiation",
+                    "infrared radiation",
+                    "solar energy",
+                    "geothermal heat flux"
+                ],
+                "correct": 2,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Vegetated ground cover typically exhibits an albedo of _______.",
+                "options": [
+                    "0.05–0.10",
+                    "0.10-0.15",
+                    "0.20–0.25",
+                    "0.45–0.50"
+                ],
+                "correct": 2,
+                "source_type": "article"
+            },
+            {
+                "q": "Aged asphalt usually has an albedo of approximately _______.",
+                "options": [
+                    "0.05",
+                    "0.12",
+                    "0.22",
+                    "0.30"
+                ],
+                "correct": 1,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Excess visible-light reflection from cool surfaces can cause _______.",
+                "options": [
+                    "increased ozone depletion",
+                    "glare from redirected radiation",
+                    "excessive nighttime cooling",
+                    "reduced soil moisture"
+                ],
+                "correct": 1,
+                "source_type": "article"
+            },
+            {
+                "q": "Urban centers can be _______ warmer at night than nearby suburban areas.",
+                "options": [
+                    "3–7°C",
+                    "7–10°C",
+                    "1–2°C",
+                    "10–12°C"
+                ],
+                "correct": 0,
+                "source_type": "article"
+            },
+            {
+                "q": "Cool pavements can lower surface temperatures by approximately _______.",
+                "options": [
+                    "4–8°C",
+                    "10–20°C",
+                    "20–30°C",
+                    "2–5°C"
+                ],
+                "correct": 1,
+                "source_type": "article"
+            }
+        ]
+    },
+    'crispr': {
+        'title': 'CRISPR Gene Editing: Promise, Constraints, and Responsible Use',
+        'free_recall_prompt': 'Please recall everything you can from the article in 5 minutes, describing how CRISPR works, its medical and agricultural applications, key limitations, and ethical or governance challenges.',
+        'text': '''CRISPR–Cas systems began as a microbial defense mechanism—a molecular form of immune memory that bacteria use to recognize and destroy invading viruses. Each infection leaves behind a short fragment of viral DNA in the bacterial genome, creating a permanent biological record of attack. When the same virus returns, the bacterium transcribes these fragments into RNA guides that direct Cas enzymes toward matching sequences, cutting the viral DNA apart. This elegant process of recognition and cleavage inspired scientists to adapt the system for their own purposes. By designing synthetic guide RNAs that match any chosen DNA sequence, researchers can steer Cas enzymes precisely to that site, slice the double helix, and let the cell's repair machinery rewrite it. The principle—guide, cut, repair—has turned a bacterial trick for survival into one of the most powerful tools in modern biology.
+The accessibility of CRISPR has been revolutionary. Tasks that once required months of effort with complex tools such as zinc-finger nucleases or TALENs can now be performed in days with inexpensive reagents in basic labs. This democratization of gene editing has accelerated discoveries in medicine, agriculture, and environmental restoration. Yet CRISPR's simplicity hides layers of complexity. Precision in genomics is statistical, not absolute: even a well-designed guide RNA may bind unintended DNA regions, creating off-target edits that disrupt other genes. The challenge is not only to cut accurately but to ensure the cut happens only where intended.
+To reduce these risks, scientists refine the system continuously. They adjust guide length and chemistry, develop predictive algorithms, and engineer enzymes with improved fidelity. High-precision variants such as SpCas9-HF1 or eSpCas9 modify the DNA-binding surface to minimize unwanted interactions. Newer tools—base editors and prime editors—go further by avoiding full double-strand breaks. Instead of cutting both DNA strands, they replace single letters or copy short sequences, allowing subtle corrections with fewer side effects. The shift from crude cutting to molecular fine-tuning expands the range of treatable genetic mutations.
+Despite these refinements, delivery remains the hardest step. Editing components must enter the right cells, reach the nucleus, and act without triggering immune rejection. Viral vectors such as adeno-associated viruses (AAVs) are efficient but have limited cargo space and may provoke antibodies that block repeated dosing. Lipid nanoparticles—used in mRNA vaccines—can carry larger molecules but concentrate in the liver and sometimes cause inflammation. Researchers test polymer carriers, extracellular vesicles, and tissue-targeted peptides, as well as physical methods like electroporation or ultrasound delivery. Each approach must balance efficiency, safety, and cost.
+Another key dimension is time. Even when CRISPR reaches its target cells, how long it remains active determines both success and risk. Persistent Cas activity raises the chance of off-target effects, while too brief exposure can yield incomplete edits. To control timing, scientists design self-limiting systems whose messenger RNA or protein degrades within hours, creating a short, precise "editing pulse." Others build inducible switches that activate Cas enzymes only under specific chemical or thermal cues. These strategies transform CRISPR from a static scalpel into a controllable process that clinicians can tune in real time.
+When CRISPR enters clinical use, the definition of success changes. In research, success means confirming an edit; in medicine, it means improving a patient's life with acceptable risk. The most promising therapies today are ex vivo treatments for blood disorders such as sickle-cell disease and beta-thalassemia. Doctors extract a patient's stem cells, edit them outside the body, verify accuracy, and reinfuse them. For internal organs—heart, brain, or lungs—in vivo delivery is required, where precision must coexist with safety. Every edited cell carries its modification for life, so long-term monitoring is both scientific and ethical duty.
+The most controversial frontier is germ-line editing, which alters embryos or reproductive cells so that changes pass to future generations. In theory, this could eliminate hereditary diseases, but the ethical implications are profound. A single error in an embryo could propagate indefinitely through descendants who never consented. After the 2018 birth of gene-edited babies in China, global backlash led to bans on clinical germ-line editing while allowing strictly supervised research. Most experts agree that humanity is not ready for heritable interventions until long-term safety and public oversight exist. Germ-line editing thus stands as both symbol of hope and warning against scientific hubris.
+Beyond medicine, CRISPR is reshaping agriculture and ecology. Gene-edited crops can resist blight, tolerate drought, or use nutrients more efficiently, reducing pesticide dependence and boosting yields. Scientists are also creating gene drives that spread chosen traits through pest populations to control malaria mosquitoes or invasive rodents. Yet these systems could cause unpredictable ecological cascades. Regulators therefore distinguish between gene-edited organisms, which carry small, natural-like changes, and transgenic ones that include foreign DNA. This difference affects labeling, trade, and public acceptance. Transparency matters: people tend to support edits that offer visible benefits—less pesticide, better nutrition—over those seen as corporate advantages. Ensuring fair access to improved seeds and tools will decide whether CRISPR becomes a driver of sustainability or inequality.
+Ethically, the technology forces society to reconsider long-standing dilemmas. Who defines therapy versus enhancement? Should editing correct blindness but not boost intelligence? How can fairness be maintained if only the wealthy can afford interventions? Effective governance must be inclusive and continuous, combining transparency, accountability, and public participation. Ethics committees should involve not only scientists but also patients, educators, and citizens. Public trial registries, independent audits, and "red-team" risk assessments can turn ethics from restriction into feedback, ensuring that oversight grows alongside innovation.
+Meanwhile, CRISPR continues to evolve. New Cas proteins such as Cas12, Cas13, and CasΦ broaden its functions. AI systems design more accurate guide RNAs and predict off-target risks. CRISPR-based diagnostics like SHERLOCK and DETECTR detect pathogens quickly and cheaply, proving that editing enzymes can also serve as molecular sensors. Hybrid systems now connect CRISPR to epigenetic switches, allowing scientists to regulate genes without cutting DNA—an evolution from editing to modulation, where activity is tuned rather than rewritten.
+As the field matures, transparency becomes the foundation of credibility. Early breakthroughs were publicized through press releases, but today journals and regulators require full datasets on accuracy, durability, and immune response. Open databases track clinical trials, and funding agencies promote preregistration to prevent selective reporting. Maintaining trust now depends on rigor in both science and communication.
+The next challenge is integration into real health systems. Hospitals must develop facilities for gene therapy; insurers must adapt payment models for one-time cures; universities must train clinicians fluent in genetics and ethics. In lower-income regions, priorities include building local capacity and sharing open-source protocols so benefits do not remain confined to wealthy nations. Partnerships among universities, agencies, and non-profits can create regional hubs for reagent production and quality control, ensuring global access.
+Finally, biosecurity adds another layer of responsibility. Because CRISPR components are cheap and widely available, safety norms and education are essential. The same openness that empowers research could also enable misuse. Shared international standards for sequence screening, safe laboratory practices, and reporting will help openness and security evolve together. Just as cybersecurity grew with the internet, biotechnology must develop its own culture of vigilance.
+Ultimately, CRISPR is more than a laboratory tool—it is a mirror of human values. It reveals how societies balance curiosity with caution and innovation with fairness. When data are shared openly, benefits distributed equitably, and oversight continuous, gene editing can move from disruptive novelty to a stable force for medicine, agriculture, and conservation. Its legacy will be written not only in DNA sequences but in the choices humanity makes about how—and why—to rewrite the code of life.
+''',
+        'summary_integrated': 'CRISPR–Cas systems originated as a microbial defense mechanism that allows bacteria to capture short fragments of viral DNA and store them as a molecular record of infection. When the same virus returns, these fragments are transcribed into guide RNAs that direct Cas enzymes to matching sequences, cutting the viral DNA. Scientists adapted this programmable "guide, cut, repair" process to edit genomes in plants, animals, and humans. Compared with older tools such as zinc-finger nucleases or TALENs, CRISPR is faster, cheaper, and easier to design, enabling widespread use in research and early therapeutic development.\n\nDespite its accessibility, precision is statistical, not absolute. Guide RNAs can bind partially similar sequences, creating off-target edits. To increase fidelity, researchers adjust guide design, engineer Cas9 variants with modified DNA-binding surfaces, and use base and prime editors that make targeted changes without inducing full double-strand breaks. Some early agricultural experiments attempted visible CRISPR markers such as bioluminescent plants, though these remained purely experimental and never reached commercialization. Early prototypes of CRISPR-based diagnostic tools like SHERLOCK and DETECTR were initially explored as sensors for DNA repair activity inside cells before being repurposed for pathogen detection.\n\nDelivery remains a central challenge. Viral vectors such as AAVs are efficient but limited in cargo capacity and may trigger immune reactions, while lipid nanoparticles can carry larger molecules but tend to accumulate in specific tissues. Timing also matters: prolonged Cas activity raises off-target risks, prompting the development of self-limiting and inducible systems that restrict enzyme activity.\n\nBeyond technical hurdles, CRISPR\'s expansion into clinical and agricultural settings raises ethical concerns—especially after the 2018 gene-edited babies—which led many countries to ban clinical germ-line editing.',
+        'summary_segmented': '''1. CRISPR began as a bacterial immune system that records viral DNA fragments to recognize future invaders.
+
+2. Scientists reprogrammed this system using synthetic guide RNA to direct Cas enzymes to precise genome locations.
+
+3. The process "guide, cut, and repair" made gene editing faster, cheaper, and globally accessible.
+
+4. Precision challenges persist because partial guide mismatches can create off-target edits.
+
+5. Enhanced Cas variants and base/prime editors increase fidelity while minimizing double-strand breaks.
+
+6. Some early agricultural trials used CRISPR to create bioluminescent plants as visible markers of editing success.
+
+7. Early prototypes of SHERLOCK and DETECTR were initially explored as tools to monitor DNA repair activity inside cells before shifting to pathogen detection.
+
+8. Delivery remains the major barrier: viral vectors are efficient but small; lipid nanoparticles carry more but risk inflammation.
+
+9. Self-limiting and inducible CRISPR systems control activity duration, improving safety.
+
+10. Germ-line editing is ethically restricted because changes are heritable and affect future generations.''',
+        'questions': [
+            {
+                "q": "CRISPR began as _______ that allows bacteria to capture pieces of viral DNA.",
+                "options": [
+                    "a bacterial immune system",
+                    "a viral defense mechanism",
+                    "a cellular repair system",
+                    "a genetic storage method"
+                ],
+                "correct": 0,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Early CRISPR crop research produced _______",
+                "options": [
+                    "early test versions",
+                    "lab-phase cultivation variants",
+                    "commercial products",
+                    "experimental prototypes"
+                ],
+                "correct": 3,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Early CRISPR diagnostic tools like SHERLOCK and DETECTR were initially designed to monitor _______.",
+                "options": [
+                    "pathogen presence",
+                    "DNA repair activity",
+                    "genome-wide mutation patterns",
+                    "guide RNA efficiency"
+                ],
+                "correct": 0,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Scientists reprogrammed CRISPR using _______ to direct Cas enzymes.",
+                "options": [
+                    "protein markers",
+                    "DNA templates",
+                    "guide RNA",
+                    "chemical signals"
+                ],
+                "correct": 2,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Compared to TALENs, CRISPR is faster, cheaper, and _______",
+                "options": [
+                    "easier to program",
+                    "widely adopted",
+                    "highly adaptable",
+                    "technically refined"
+                ],
+                "correct": 0,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Off-target edits occur when guide RNAs _______",
+                "options": [
+                    "bind mismatched sequences",
+                    "bind partially similar sites",
+                    "pair with near-matching bases",
+                    "drift to adjacent regions"
+                ],
+                "correct": 0,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Base editors modify DNA without _______",
+                "options": [
+                    "using guide RNA",
+                    "breaking both strands",
+                    "requiring enzymes",
+                    "cellular repair"
+                ],
+                "correct": 1,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "AAV vectors are efficient but have limited _______",
+                "options": [
+                    "precision",
+                    "capacity",
+                    "persistence",
+                    "flexibility"
+                ],
+                "correct": 1,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Lipid nanoparticles concentrate in the _______",
+                "options": [
+                    "kidneys",
+                    "lungs",
+                    "heart",
+                    "liver"
+                ],
+                "correct": 3,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Self-limiting systems use components that _______",
+                "options": [
+                    "degrade fast",
+                    "decay naturally",
+                    "become unstable",
+                    "accumulate slow"
+                ],
+                "correct": 0,
+                "source_type": "article"
+            },
+            {
+                "q": "Ex vivo editing allows doctors to _______ before reinfusion.",
+                "options": [
+                    "modify doses",
+                    "test compatibility",
+                    "verify accuracy",
+                    "label samples"
+                ],
+                "correct": 2,
+                "source_type": "article"
+            },
+            {
+                "q": "A major challenge in CRISPR therapy is ensuring that editing components reach the nucleus and act without triggering _______.",
+                "options": [
+                    "excessive DNA replication",
+                    "immune rejection",
+                    "metabolic suppression",
+                    "oxidative stress"
+                ],
+                "correct": 1,
+                "source_type": "article"
+            },
+            {
+                "q": "Inducible switches activate Cas enzymes only when exposed to specific _______.",
+                "options": [
+                    "molecular signals",
+                    "chemical or thermal cues",
+                    "membrane receptors",
+                    "electrical pulses"
+                ],
+                "correct": 1,
+                "source_type": "article"
+            },
+            {
+                "q": "The CRISPR process follows: guide, cut, and _______",
+                "options": [
+                    "restore",
+                    "replicate",
+                    "repair",
+                    "remove"
+                ],
+                "correct": 2,
+                "source_type": "ai_summary"
+            }
+        ]
+    },
+    'semiconductors': {
+        'title': 'Semiconductor Supply Chains: Why Shortages Happen and How to Build Resilience',
+        'free_recall_prompt': 'Please recall everything you can from the article in 5 minutes. Describe why semiconductor shortages occurred, what structural factors made supply fragile, and how visibility, flexibility, contracts, and cooperation can strengthen resilience.',
+        'text': '''Modern economies depend on semiconductors with a totality that remained invisible until scarcity made it undeniable. Every automobile, smartphone, and medical monitor relies on microchips that manage power flows and interpret signals. Between 2020 and 2022, the world discovered how invisible dependencies could unravel when they failed suddenly and in parallel. Automakers idled production lines awaiting five-dollar microcontrollers, while game console manufacturers saw device orders delayed for months. The shortage wasn't a single failure but a cascade: pandemic-driven demand for consumer electronics collided with frozen supply as Asian factories idled, maritime ports congested, and a catastrophic fire at a Japanese silicate facility severed a critical material node. Each disruption spread through the supply web, magnifying fragility. The semiconductor industry's total market reached $574 billion in 2022, yet production concentrated in fewer than 200 facilities globally, with leading-edge plants requiring capital investments exceeding $20 billion per facility.
+
+Semiconductor fabrication resists rapid expansion by its intrinsic nature. Building a fabrication plant—commonly called a "fab"—demands capital spending exceeding ten billion dollars and requires multi-year timelines. Taiwan Semiconductor Manufacturing Company announced in 2021 that its Arizona facility would not achieve volume production until 2024-2026. Process nodes—measured in nanometers—have shrunk from 10 micrometers in 1971 to 3 nanometers by 2022, a 3,000-fold reduction requiring exponentially more precise equipment. At the 3nm node, transistor gates measure approximately 48 silicon atoms wide, approaching quantum mechanical limits where electron tunneling effects compromise device reliability. When economies reopened after pandemic lockdowns, demand forecasting collapsed—mature nodes suddenly became bottleneck-critical precisely when pre-pandemic capacity allocation had favored cutting-edge processes.
+
+Inside foundries, production follows rhythms that resist acceleration. Silicon wafers move through cleanroom environments for months, undergoing photolithography to create nanoscale circuit patterns—a process dominated by Netherlands-based ASML, whose extreme ultraviolet lithography systems cost over $150 million per unit. Each machine uses 13.5-nanometer wavelength light generated by vaporizing tin droplets with high-power lasers—a process so complex that ASML produces only dozens of machines annually despite controlling over 90% of the market. Manufacturing demands sequential processing across hundreds of individual steps spanning weeks of continuous operation. Any contamination event—measured in parts per trillion—can compromise entire wafer batches. Yield—the proportion of functional chips per wafer—becomes the critical metric.
+
+Bottlenecks emerge not merely in capital equipment but in specialized materials: photoresist compounds require ultra-pure resins with nanometer-scale resolution; high-purity gases at 99.999% purity levels; rare-earth dopants for dielectric materials. The February 2021 winter storm in Texas shut down a chemical synthesis plant responsible for semiconductor-grade coatings, halting chip output globally despite fully operational fabrication facilities on other continents. The event revealed how seemingly peripheral inputs could disable an entire production ecosystem valued at over half a trillion dollars annually.
+
+Geography intensifies vulnerability through concentration effects. East Asia dominates fabrication capacity: Taiwan Semiconductor Manufacturing Company controls over half of global advanced-node production. South Korean companies Samsung and SK Hynix manufacture 70% of global DRAM and 50% of NAND flash memory. Design and intellectual property originate predominantly from United States firms whose annual R&D spending collectively exceeds $45 billion, while photolithography equipment remains a near-monopoly of Netherlands-based ASML. No single nation can perform the entire production sequence independently within economically viable parameters—a reality demonstrated by China's $150 billion domestic semiconductor initiative achieving limited success in advanced logic despite massive capital investment.
+
+The industry historically relied on just-in-time logistics to minimize inventory carrying costs. Semiconductors violate the assumptions underlying this model. Manufacturing cycles span months, not days; demand volatility shifts sharply due to macroeconomic disruptions; and product portfolios include over 50,000 distinct part numbers with non-interchangeable applications. When automotive demand collapsed in Q2 2020, foundries reallocated capacity toward consumer electronics where work-from-home dynamics drove shipments upward. The automotive sector's recovery in 2021 found no available capacity: nodes favored by automotive microcontrollers had been deprioritized in favor of advanced nodes serving smartphones and high-performance computing. Legacy node capacity additions require 18-24 months and billions in investments for facilities manufacturing chips with profit margins of 15-25%, compared to over 50% margins at leading-edge nodes. Economic incentives systematically discouraged the capacity additions that would have prevented shortages.
+
+Contemporary supply chains evolved through competitive pressures appearing as optimization. Automotive manufacturers maintained 30-90 day inventory buffers pre-2000s, absorbing demand fluctuations without production disruptions. By 2019, average automotive inventory had contracted to 15-45 days, with some manufacturers operating on single-week buffers for certain components. This inventory compression, combined with supply chain opacity where manufacturers lacked visibility beyond immediate suppliers, created systemic vulnerability. When the COVID-19 pandemic triggered simultaneous supply restrictions and demand volatility in 2020, the system lacked capacity to absorb disruptions. The semiconductor shortage demonstrated how efficiency-maximizing strategies—just-in-time manufacturing, inventory minimization, single-source dependencies, geographic concentration—increased fragility by eliminating redundancy that previously buffered against disruptions.
+
+Mitigation strategies operate across time horizons spanning immediate responses to decade-long transformations. Short-term interventions include demand management prioritizing critical sectors, design modifications substituting available chips—requiring months for validation—and life-extension programs reducing replacement demand. Intermediate responses include capacity expansions requiring one to two years and substantial capital per facility. Major semiconductor companies announced investments collectively exceeding $300 billion through 2030, though actual capacity additions lagged announcements by several years due to equipment procurement bottlenecks and construction timelines.
+
+Long-term resilience requires systemic restructuring addressing concentration vulnerabilities through geographic diversification and supply chain redundancy. The U.S. CHIPS and Science Act (2022) allocated $52.7 billion for domestic semiconductor manufacturing incentives and R&D. European Union initiatives proposed €43 billion in investment targeting 20% global production share by 2030, up from 9% in 2020. Japan committed significant funding for domestic production expansion. However, advanced node production in Western nations incurs 30-50% higher operating costs than East Asian facilities due to higher labor costs, energy costs, and regulatory compliance. Without sustained subsidies estimated at roughly one-quarter to one-third of capital and operating costs, economic incentives favor continued Asian concentration.
+
+Strategic considerations extend beyond economics into technological sovereignty and national security. Advanced semiconductors enable artificial intelligence, quantum computing, hypersonic weapons, autonomous systems, and cryptographic capabilities. Export controls implemented in October 2022 restricted Chinese access to high-performance GPUs, advanced logic chips below 14nm, and semiconductor manufacturing equipment using extreme ultraviolet lithography. These controls recognize that semiconductor fabrication capability represents a foundational enabler of technological advancement and military capability. Nations lacking domestic advanced semiconductor production face strategic dependencies—over 92% of the most advanced logic chips originate from Taiwan amid geopolitical tensions.
+
+Workforce constraints compound infrastructure challenges. Advanced semiconductor manufacturing requires specialized expertise spanning semiconductor physics, materials science, and multiple engineering disciplines—areas where degree programs produce insufficient graduates. New fabrication facilities face recruitment challenges finding thousands of workers with required technical skills, requiring international worker transfers and university partnerships for workforce development programs needing years to mature. Each new facility requires thousands of direct employees plus tens of thousands of indirect jobs in supporting industries, with advanced fabs demanding that a significant majority of the workforce hold bachelor's degrees or higher.
+
+Ultimately, semiconductor supply chain resilience represents a sociotechnical challenge combining physics, economics, geopolitics, and institutional capacity. Physical constraints—quantum mechanical limits, thermodynamic constraints at extreme power densities, materials science challenges—determine technological trajectories requiring continuous innovation investment exceeding $15 billion annually across industry leaders. Economic forces—high gross margins on leading-edge chips encouraging concentration, lower margins on legacy nodes discouraging investment, massive capital intensity—shape decisions favoring efficiency over redundancy. Geopolitical tensions increasingly override pure economic optimization through export controls, industrial policies, and subsidies. Institutional arrangements spanning industry groups, government initiatives, and international agreements will determine whether the industry achieves geographic diversification or whether concentration intensifies, whether redundancy increases or just-in-time fragility persists, and whether supply chains prove resilient to future disruptions or remain vulnerable to cascading failures. The 2020-2023 shortage revealed structural fragilities embedded in decades of optimization for efficiency over resilience—a fundamental tension that will define semiconductor supply chain evolution for decades to come.
+
+''',
+        'summary_integrated': 'Between 2020 and 2022, a synchronized breakdown revealed how deeply modern economies depend on semiconductors across automobiles, consumer electronics, and critical infrastructure. Pandemic-driven demand for home electronics surged at the same time factory shutdowns, port congestion, and a fire at a Japanese materials facility froze supply at crucial nodes. Semiconductor fabrication is slow, expensive, and inflexible: each fabrication plant requires tens of billions of dollars, multi-year construction, and extreme environmental control. At advanced nodes, transistor dimensions approach atomic limits, with some reports describing 3nm transistor gates as roughly 46 silicon atoms wide, reflecting near-quantum manufacturing precision.\n\nInside foundries, wafers pass through hundreds of sequential steps—photolithography, ion implantation, chemical vapor deposition—using ultra-pure chemicals where contamination measured in parts per trillion can ruin entire batches. Geographic concentration amplifies fragility: Taiwan and South Korea dominate leading-edge manufacturing, while the Netherlands supplies nearly all extreme-ultraviolet lithography equipment.\n\nAllocation during the shortage depended as much on commercial agreements as on technology needs. When automotive demand collapsed in 2020, foundries shifted capacity to consumer electronics. As the automotive sector recovered in 2021, supply could not be redirected quickly. Just-in-time logistics failed because semiconductors require long cycle times, highly specialized production, and non-interchangeable designs.\n\nSome strategic roadmaps referenced pilot programs using quantum-annealing processors to accelerate chip-design optimization, reportedly reducing design cycles from months to weeks, though these initiatives remained exploratory.\n\nMajor firms announced over $300 billion in planned investments through 2030, but capacity expansions lagged due to equipment procurement bottlenecks. Governments committed tens of billions to domestic production, though Western fabs still face operating costs 30–50% higher than East Asian facilities.',
+        'summary_segmented': '''1. The 2020–22 shortage exposed dependence on semiconductors across automobiles, consumer electronics, and critical infrastructure.
+
+2. Pandemic-driven demand surges, factory shutdowns, and cascading logistics failures froze global semiconductor supply.
+
+3. Semiconductor fabs require tens of billions of dollars and multi-year construction, making rapid expansion impossible.
+
+4. Production involves hundreds of sequential steps using ultra-pure chemicals—such as photoresist resins—where even tiny contamination can ruin entire batches.
+
+5. East Asia dominates advanced fabrication while the Netherlands provides nearly all EUV lithography systems, creating single-point vulnerabilities.
+
+6. Some reports describe 3nm transistor gates as approximately 46 silicon atoms wide, illustrating fabrication near atomic limits. ← FALSE LURE #1
+
+7. Pilot programs using quantum-annealing processors allegedly reduced chip-design cycles from months to weeks, though results remain experimental. ← FALSE LURE #2
+
+8. Just-in-time logistics failed because semiconductor manufacturing cycles span months and chips are not interchangeable.
+
+9. When automotive demand collapsed in 2020, foundries reallocated capacity to consumer electronics, limiting recovery in 2021.
+
+10. Firms announced over $300B in investments through 2030, while governments committed tens of billions despite Western costs remaining 30–50% higher.''',
+        'questions': [
+            {
+                "q": "Advanced semiconductor fabrication in Western countries is more expensive mainly because operating costs are typically _______ higher than in East Asia.",
+                "options": [
+                    "5–10%",
+                    "15–20%",
+                    "20–30%",
+                    "30–50%"
+                ],
+                "correct": 3,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Major chipmakers announced large investment plans through 2030, but actual expansion lagged mostly due to _______.",
+                "options": [
+                    "raw material export limits",
+                    "equipment procurement bottlenecks",
+                    "sudden regulatory freezes",
+                    "intellectual-property disputes"
+                ],
+                "correct": 1,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Automakers that pre-booked capacity were prioritized because allocation depended as much on contracts as on _______ needs.",
+                "options": [
+                    "production",
+                    "technology",
+                    "financial",
+                    "logistics"
+                ],
+                "correct": 1,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Geographic concentration in East Asia and the Netherlands creates _______ vulnerabilities.",
+                "options": [
+                    "capacity-driven",
+                    "region-dependent",
+                    "supply-linked",
+                    "single-point"
+                ],
+                "correct": 3,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Just-in-time failed because production involves _______.",
+                "options": [
+                    "diverse part numbers",
+                    "non-interchangeable chips",
+                    "long cycle times",
+                    "unstable demand shifts"
+                ],
+                "correct": 2,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "When automotive demand collapsed in 2020, foundries shifted capacity toward _______.",
+                "options": [
+                    "mobile processors",
+                    "computing systems",
+                    "digital displays",
+                    "consumer electronics"
+                ],
+                "correct": 3,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Companies shifting to risk-adjusted strategies now maintain inventories and develop _______ supply contracts.",
+                "options": [
+                    "adaptive",
+                    "multi-year",
+                    "flexible",
+                    "diversified"
+                ],
+                "correct": 0,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Intermediate capacity expansions typically require _______ to complete.",
+                "options": [
+                    "one to two years",
+                    "three to five months",
+                    "five to seven years",
+                    "ten to twelve months"
+                ],
+                "correct": 0,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "The technology used in advanced semiconductor manufacturing is _______.",
+                "options": [
+                    "quantum processors",
+                    "extreme ultraviolet",
+                    "deep-UV scanners",
+                    "plasma emitters"
+                ],
+                "correct": 1,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "Photoresist materials require _______",
+                "options": [
+                    "rare-earth dopants",
+                    "purified gases",
+                    "semiconductor-grade coatings",
+                    "ultra-pure resins"
+                ],
+                "correct": 3,
+                "source_type": "ai_summary"
+            },
+            {
+                "q": "At the 3nm process node, transistor gate widths correspond to roughly _______.",
+                "options": [
+                    "44 carbon atoms",
+                    "46 silicon atoms",
+                    "48 silicon atoms",
+                    "42 carbon atoms"
+                ],
+                "correct": 2,
+                "source_type": "article"
+            },
+            {
+                "q": "Legacy-node capacity additions require _______ and produce margins of 15–25%.",
+                "options": [
+                    "6–9 months",
+                    "12–15 months",
+                    "18–24 months",
+                    "30–36 months"
+                ],
+                "correct": 2,
+                "source_type": "article"
+            },
+            {
+                "q": "By 2019, some manufacturers operated on _______ for certain components.",
+                "options": [
+                    "single-week buffers",
+                    "two-month buffers",
+                    "quarterly buffers",
+                    "ten-day buffers"
+                ],
+                "correct": 0,
+                "source_type": "article"
+            },
+            {
+                "q": "Western advanced-node production requires subsidies amounting to _______ of total costs.",
+                "options": [
+                    "around one-tenth",
+                    "roughly one-quarter to one-third",
+                    "nearly one-half",
+                    "two-thirds"
+                ],
+                "correct": 1,
+                "source_type": "article"
+            }
+        ]
+    }
+}
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Measure cold-start latency: time to bind, time-to-first-byte and time to ready.
+
+Local mode starts the server script in a fresh process on a free port (as a
+deploy would) and polls it; all times are measured from process start:
+
+    bind        first successful TCP connect
+    healthz     first byte of GET /healthz
+    first_page  first byte of GET <--path> (a participant's first request)
+    ready       first 200 from GET /readyz
+
+Remote mode (--url) polls an already deployed service from the moment the
+script starts, e.g. right after triggering a Render deploy.
+
+Usage (from ai_experiment/):
+    python scripts/measure_cold_start.py                          # app.py, 5 runs
+    python scripts/measure_cold_start.py --server ../study_server.py --runs 3
+    python scripts/measure_cold_start.py --url https://<service>.onrender.com
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(SCRIPT_DIR)
+MEASURES = ("bind", "healthz", "first_page", "ready")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _get(base, path, timeout=5.0):
+    """(status, seconds to first byte) for one GET, or (None, None) if the server is not up."""
+    parts = urlsplit(base)
+    conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    conn = conn_cls(parts.hostname, parts.port, timeout=timeout)
+    try:
+        t0 = time.perf_counter()
+        conn.request("GET", path)
+        resp = conn.getresponse()  # returns once the status line has arrived
+        ttfb = time.perf_counter() - t0
+        resp.read()
+        return resp.status, ttfb
+    except OSError:
+        return None, None
+    finally:
+        conn.close()
+
+
+def probe(base, path, start, deadline, interval=0.01):
+    """Poll base until ready; returns {measure: seconds since start} plus first-request TTFBs."""
+    result = {}
+    while time.perf_counter() < deadline and "ready" not in result:
+        if "bind" not in result:
+            status, ttfb = _get(base, "/healthz")
+            if status is None:
+                time.sleep(interval)
+                continue
+            now = time.perf_counter() - start
+            result["bind"] = now - ttfb
+            result["healthz"] = now
+            status, ttfb = _get(base, path)
+            result["first_page"] = time.perf_counter() - start
+            result["first_page_ttfb"] = ttfb
+            result["first_page_status"] = status
+        status, _ = _get(base, "/readyz")
+        if status == 200:
+            result["ready"] = time.perf_counter() - start
+        else:
+            time.sleep(interval)
+    return result
+
+
+def run_local(server, path, timeout, pretranslate):
+    port = _free_port()
+    env = dict(os.environ, PORT=str(port), HOST="127.0.0.1", FLASK_ENV="production")
+    if not pretranslate:
+        env["DISABLE_PRETRANSLATE"] = "1"
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.abspath(server)], cwd=os.path.dirname(os.path.abspath(server)),
+                            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        return probe(f"http://127.0.0.1:{port}", path, start, start + timeout)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time-to-first-byte and time-to-ready after a (re)start")
+    parser.add_argument("--server", default=os.path.join(APP_DIR, "app.py"), help="Server script to start")
+    parser.add_argument("--url", help="Measure an already deployed base URL instead of starting a server")
+    parser.add_argument("--path", default="/", help="First page to request")
+    parser.add_argument("--runs", type=int, default=5, help="Local runs (median is reported)")
+    parser.add_argument("--timeout", type=float, default=180.0, help="Give up after this many seconds")
+    parser.add_argument("--pretranslate", action="store_true", help="Leave network pre-translation enabled")
+    args = parser.parse_args()
+
+    if args.url:
+        start = time.perf_counter()
+        runs = [probe(args.url.rstrip("/"), args.path, start, start + args.timeout, interval=0.5)]
+    else:
+        runs = [run_local(args.server, args.path, args.timeout, args.pretranslate) for _ in range(args.runs)]
+
+    target = args.url or os.path.relpath(args.server)
+    print(f"Cold start of {target} ({len(runs)} run(s), seconds since start)")
+    for measure in MEASURES:
+        values = [r[measure] for r in runs if measure in r]
+        if len(values) < len(runs):
+            print(f"  {measure:<12} not reached in {len(runs) - len(values)} run(s)")
+        if values:
+            print(f"  {measure:<12} median {statistics.median(values):7.3f}   min {min(values):7.3f}   max {max(values):7.3f}")
+    ttfbs = [r["first_page_ttfb"] for r in runs if "first_page_ttfb" in r]
+    if ttfbs:
+        statuses = sorted({r["first_page_status"] for r in runs if "first_page_status" in r})
+        print(f"  first request to {args.path}: TTFB median {statistics.median(ttfbs) * 1000:.1f} ms (status {statuses})")
+    if any("ready" not in r for r in runs):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
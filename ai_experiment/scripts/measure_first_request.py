@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Cold first-request latency per route, with and without precompiled templates.
+
+Every measurement starts a fresh Python process (like a new worker), imports
+the app, seeds a participant session and times the first GET of one route
+through the Flask test client; the second GET of the same route is timed
+too as the warm reference. Each route is measured
+
+    source     TEMPLATE_CACHE=0: templates compiled from source (the old behaviour)
+    bytecode   TEMPLATE_CACHE=1 after scripts/precompile_templates.py
+
+The background warmup is not started in the measuring process, so the first
+request pays the full cost of loading its template.
+
+Usage (from ai_experiment/):
+    python scripts/measure_first_request.py                  # app.py, 3 runs per route and mode
+    python scripts/measure_first_request.py --app ../no_ai_experiment/app_control.py --runs 5
+    python scripts/measure_first_request.py --lang en --csv first_request.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, SCRIPT_DIR)
+
+from page_weight_report import load_app, seed_session  # noqa: E402
+
+ROUTES = [
+    "/", "/consent", "/instructions", "/prior_knowledge", "/ai_trust", "/reading/0", "/test/0",
+    "/recall_instruction/0", "/break/1", "/post_article_ratings/0", "/manipulation_check", "/debrief",
+]
+MODES = (("source", "0"), ("bytecode", "1"))
+
+
+def child(app_path, route, lang):
+    """Runs in the fresh process: print {"status", "first_ms", "warm_ms"} for one route."""
+    module = load_app(app_path)
+    module.app.before_request_funcs[None].remove(module.ARM.start_warmup)
+    module._load_translation_cache()
+    client = module.app.test_client()
+    seed_session(client, module, lang)
+    timings = []
+    for _ in range(2):
+        t0 = time.perf_counter()
+        response = client.get(route, headers={"Accept-Encoding": "identity"})
+        timings.append((time.perf_counter() - t0) * 1000)
+    print(json.dumps({"status": response.status_code, "first_ms": timings[0], "warm_ms": timings[1]}))
+
+
+def measure(app_path, route, lang, template_cache):
+    env = dict(os.environ, TEMPLATE_CACHE=template_cache)
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", route, "--app", app_path,
+                          "--lang", lang], env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold first-request latency per route, source vs precompiled templates")
+    parser.add_argument("--app", default=os.path.join(APP_DIR, "app.py"), help="App module to load")
+    parser.add_argument("--lang", default="zh", help="Session language")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh processes per route and mode (median is reported)")
+    parser.add_argument("--csv", help="Also write the rows to this CSV file")
+    parser.add_argument("--child", metavar="ROUTE", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    app_path = os.path.abspath(args.app)
+
+    if args.child:
+        child(app_path, args.child, args.lang)
+        return
+
+    subprocess.run([sys.executable, os.path.join(SCRIPT_DIR, "precompile_templates.py"), app_path],
+                   check=True, capture_output=True)
+
+    rows = []
+    for route in ROUTES:
+        row = {"route": route}
+        for mode, template_cache in MODES:
+            results = [measure(app_path, route, args.lang, template_cache) for _ in range(args.runs)]
+            row["status"] = results[-1]["status"]
+            row[f"{mode}_first_ms"] = round(statistics.median(r["first_ms"] for r in results), 2)
+            row[f"{mode}_warm_ms"] = round(statistics.median(r["warm_ms"] for r in results), 2)
+        row["saved_ms"] = round(row["source_first_ms"] - row["bytecode_first_ms"], 2)
+        rows.append(row)
+        print(f"  {route:<26}{row['status']:>4}  source {row['source_first_ms']:>8.2f}ms  "
+              f"bytecode {row['bytecode_first_ms']:>8.2f}ms  warm {row['bytecode_warm_ms']:>7.2f}ms")
+
+    print(f"\nFirst request per route ({os.path.basename(app_path)}, lang={args.lang}, median of {args.runs} fresh processes)")
+    header = f"{'route':<26}{'st':>4}{'source':>11}{'bytecode':>11}{'saved':>10}{'warm':>9}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(f"{row['route']:<26}{row['status']:>4}{row['source_first_ms']:>9.2f}ms{row['bytecode_first_ms']:>9.2f}ms"
+              f"{row['saved_ms']:>8.2f}ms{row['bytecode_warm_ms']:>7.2f}ms")
+    total_source = sum(r["source_first_ms"] for r in rows)
+    total_bytecode = sum(r["bytecode_first_ms"] for r in rows)
+    print(f"{'total':<30}{total_source:>9.2f}ms{total_bytecode:>9.2f}ms{total_source - total_bytecode:>8.2f}ms")
+
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nWrote {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Page-weight and load-time report per route, before vs after compression.
+
+Fetches each participant-facing route through the Flask test client for a
+seeded participant session, once uncompressed (Accept-Encoding: identity,
+i.e. what the dev server sent before) and once per supported encoding. For
+every response it reports the transferred bytes, the median server time and
+an estimated load time (RTT + server time + bytes / bandwidth) on a slow
+mobile and a 4G connection profile.
+
+Usage (from ai_experiment/):
+    python scripts/page_weight_report.py                 # Chinese session
+    python scripts/page_weight_report.py --lang en --csv page_weight.csv
+    python scripts/page_weight_report.py --app ../no_ai_experiment/app_control.py
+"""
+
+import argparse
+import csv
+import os
+import statistics
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, os.path.dirname(APP_DIR))  # repository root (study_core/)
+
+from study_core.arm import load_arm  # noqa: E402
+from study_core.compression import available_encodings  # noqa: E402
+
+# (name, downlink bits/s, round trip seconds)
+PROFILES = [("slow_3g", 400_000, 0.4), ("4g", 9_000_000, 0.085)]
+
+ROUTES = [
+    "/", "/consent", "/instructions", "/prior_knowledge", "/reading/0", "/test/0",
+    "/recall_instruction/0", "/break/1", "/post_article_ratings/0", "/manipulation_check",
+    "/debrief", "/static/disable_back.js",
+]
+
+
+def load_app(path):
+    """Import an app module from its file, as study_server.py does (study_core.arm.load_arm)."""
+    return load_arm(path)
+
+
+def seed_session(client, module, lang):
+    with client.session_transaction() as s:
+        s["lang"] = lang
+        s["participant_id"] = "P000"
+        s["selected_structure_condition"] = "A1_Integrated"
+        s["structure_condition"] = "integrated"
+        s["article_order"] = list(module.ARTICLES)[:3]
+        s["timing_order"] = ["synchronous", "post_reading", "pre_reading"]
+        s["condition"] = "control_no_ai"
+
+
+def measure(client, route, encoding, repeats):
+    sizes, times, status = [], [], None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        response = client.get(route, headers={"Accept-Encoding": encoding})
+        times.append(time.perf_counter() - t0)
+        sizes.append(len(response.get_data()))
+        status = response.status_code
+    return status, sizes[-1], statistics.median(times)
+
+
+def load_time(size, server_s, bandwidth, rtt):
+    return rtt + server_s + size * 8 / bandwidth
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-route page weight and estimated load time, uncompressed vs compressed")
+    parser.add_argument("--app", default=os.path.join(APP_DIR, "app.py"), help="App module to load")
+    parser.add_argument("--lang", default="zh", help="Session language")
+    parser.add_argument("--repeats", type=int, default=5, help="Requests per route and encoding")
+    parser.add_argument("--csv", help="Also write the rows to this CSV file")
+    args = parser.parse_args()
+
+    module = load_app(args.app)
+    encodings = ["identity"] + list(available_encodings())
+    client = module.app.test_client()
+    seed_session(client, module, args.lang)
+
+    rows = []
+    for route in ROUTES:
+        baseline = None
+        for encoding in encodings:
+            status, size, server_s = measure(client, route, encoding, args.repeats)
+            row = {"route": route, "status": status, "encoding": encoding, "bytes": size,
+                   "server_ms": round(server_s * 1000, 2)}
+            for name, bandwidth, rtt in PROFILES:
+                row[f"{name}_ms"] = round(load_time(size, server_s, bandwidth, rtt) * 1000)
+            if baseline is None:
+                baseline = row
+            row["saved_pct"] = round(100 * (1 - size / baseline["bytes"]), 1) if baseline["bytes"] else 0.0
+            rows.append(row)
+
+    print(f"Page weight ({os.path.basename(args.app)}, lang={args.lang}; load = RTT + server + bytes/bandwidth)")
+    header = f"{'route':<26}{'st':>4} {'encoding':<9}{'bytes':>9}{'saved':>8}{'server':>9}" + "".join(f"{name:>10}" for name, _, _ in PROFILES)
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(f"{row['route']:<26}{row['status']:>4} {row['encoding']:<9}{row['bytes']:>9}{row['saved_pct']:>7.1f}%"
+              f"{row['server_ms']:>7.2f}ms" + "".join(f"{row[f'{name}_ms']:>8}ms" for name, _, _ in PROFILES))
+
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nWrote {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Precompile both apps' templates into their Jinja bytecode caches
+(<app dir>/.template_cache/), so every worker started afterwards loads
+compiled templates instead of parsing and compiling them on first use. Run
+at build time; a template whose source changed later is simply recompiled
+(and rewritten) by the first worker that needs it.
+
+The apps are loaded as study_server.py loads them (study_core.arm.load_arm,
+AI arm first), so the templates are compiled by exactly the Jinja
+environment that serves them.
+
+Usage:
+    python scripts/precompile_templates.py            # both apps
+    python scripts/precompile_templates.py --clear    # drop stale entries first
+    python scripts/precompile_templates.py path/to/app_control.py
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(SCRIPT_DIR)
+DEFAULT_APPS = [
+    os.path.join(APP_DIR, "app.py"),
+    os.path.join(os.path.dirname(APP_DIR), "no_ai_experiment", "app_control.py"),
+]
+sys.path.insert(0, os.path.dirname(APP_DIR))  # repository root (study_core/)
+
+from study_core.arm import load_arm  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompile templates into the apps' Jinja bytecode caches")
+    parser.add_argument("apps", nargs="*", default=DEFAULT_APPS, help="App modules (default: both arms)")
+    parser.add_argument("--clear", action="store_true", help="Empty each bytecode cache before compiling")
+    args = parser.parse_args()
+
+    os.environ["TEMPLATE_CACHE"] = "1"
+    for path in args.apps:
+        module = load_arm(path)
+        cache = module.app.jinja_env.bytecode_cache
+        if cache is None:
+            print(f"  {os.path.relpath(path)}: no bytecode cache, skipped")
+            continue
+        if args.clear:
+            cache.clear()
+        t0 = time.perf_counter()
+        module.ARM.compile_templates()
+        elapsed = time.perf_counter() - t0
+        count = len(module.app.jinja_env.list_templates(extensions=["html"]))
+        files = glob.glob(os.path.join(module.ARM.template_cache_dir, "__jinja2_*.cache"))
+        size = sum(os.path.getsize(f) for f in files)
+        print(f"  {os.path.relpath(path)}: {count} templates in {elapsed:.2f}s -> "
+              f"{os.path.relpath(module.ARM.template_cache_dir)} ({len(files)} files, {size // 1024} KB)")
+
+
+if __name__ == "__main__":
+    main()
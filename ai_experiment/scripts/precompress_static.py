@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Write precompressed .gz (and .br, if the brotli package is installed)
+variants of the files under static/ for both apps (and study_core/static/,
+which both serve), so they are served
+without compressing per request. Run at build time; the apps also do it in
+their background warmup.
+
+Usage:
+    python scripts/precompress_static.py                # both apps' static/
+    python scripts/precompress_static.py path/to/static
+"""
+
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, os.path.dirname(APP_DIR))  # repository root (study_core/)
+
+from study_core.compression import available_encodings, precompress  # noqa: E402
+
+DEFAULT_DIRS = [
+    os.path.join(APP_DIR, "static"),
+    os.path.join(os.path.dirname(APP_DIR), "no_ai_experiment", "static"),
+    os.path.join(os.path.dirname(APP_DIR), "study_core", "static"),
+]
+
+
+def main():
+    dirs = sys.argv[1:] or DEFAULT_DIRS
+    print(f"Encodings: {', '.join(available_encodings())}")
+    for static_dir in dirs:
+        if not os.path.isdir(static_dir):
+            print(f"  skip {static_dir} (not a directory)")
+            continue
+        print(f"  {os.path.relpath(static_dir)}: {precompress(static_dir)} file(s) written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Keep a local mirror of a deployment's experiment_data/ up to date.
+
+Each run downloads /admin/export?since=<last manifest id>, which contains
+delta.json plus only new or rewritten files and the appended byte ranges of
+growing logs. Appends are applied in place, every changed file is checked
+against the manifest hash, and the new manifest id is saved in
+<mirror>/.sync_state.json for the next run. If the server no longer knows the
+last manifest, or a local file does not match, a full sync is done instead.
+
+Usage:
+    python scripts/sync_data.py https://your-app.onrender.com --key YOUR_ADMIN_KEY
+    python scripts/sync_data.py http://localhost:8080 --mirror ../experiment_data_mirror --prune
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import urllib.error
+import urllib.parse
+import urllib.request
+import zipfile
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(SCRIPT_DIR)))  # repository root (study_core/)
+from study_core.data_manifest import file_hash  # noqa: E402
+
+DEFAULT_MIRROR = os.path.join(SCRIPT_DIR, "..", "experiment_data_mirror")
+STATE_FILE = ".sync_state.json"
+
+
+def load_state(mirror):
+    try:
+        with open(os.path.join(mirror, STATE_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(mirror, state):
+    path = os.path.join(mirror, STATE_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def download(url, key, since, level, out):
+    """Stream the delta archive into a file object; returns bytes received or None on 404."""
+    query = urllib.parse.urlencode({"key": key, "since": since or "", "level": level})
+    try:
+        with urllib.request.urlopen(f"{url.rstrip('/')}/admin/export?{query}") as resp:
+            shutil.copyfileobj(resp, out, 1024 * 1024)
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            return None
+        raise
+    return out.tell()
+
+
+def apply_delta(archive, mirror, prune=False):
+    """Apply a delta archive to the mirror. Returns (delta, list of names that failed verification)."""
+    with zipfile.ZipFile(archive) as zf:
+        delta = json.loads(zf.read("delta.json"))
+        bad = []
+        for f in delta["files"]:
+            name = f["name"]
+            if os.path.basename(name) != name or name.startswith("."):
+                print(f"  skipping unsafe name: {name!r}")
+                continue
+            target = os.path.join(mirror, name)
+            if f["mode"] == "append":
+                if not os.path.exists(target) or os.path.getsize(target) != f["offset"]:
+                    bad.append(name)
+                    continue
+                with zf.open("appends/" + name) as src, open(target, "ab") as dest:
+                    shutil.copyfileobj(src, dest)
+            else:
+                with zf.open(name) as src, open(target + ".tmp", "wb") as dest:
+                    shutil.copyfileobj(src, dest)
+                os.replace(target + ".tmp", target)
+            if file_hash(target) != f["hash"]:
+                bad.append(name)
+            else:
+                print(f"  {f['mode']:<6} {name} (+{f['length']:,} bytes)")
+
+    for name in delta.get("deleted", []):
+        target = os.path.join(mirror, name)
+        if prune and os.path.basename(name) == name and os.path.exists(target):
+            os.remove(target)
+            print(f"  pruned {name}")
+        elif not prune:
+            print(f"  deleted on server (kept locally, use --prune): {name}")
+    return delta, bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mirror a deployment's experiment_data/ with delta exports")
+    parser.add_argument("url", help="Base URL of the deployment, e.g. https://your-app.onrender.com")
+    parser.add_argument("--key", default=os.environ.get("ADMIN_KEY"), help="Admin key (default: $ADMIN_KEY)")
+    parser.add_argument("--mirror", default=DEFAULT_MIRROR, help="Local mirror directory")
+    parser.add_argument("--level", default="6", help="Deflate level 1-9, or 'stored'")
+    parser.add_argument("--full", action="store_true", help="Ignore the saved manifest and download everything")
+    parser.add_argument("--prune", action="store_true", help="Delete local files that were removed on the server")
+    args = parser.parse_args()
+
+    if not args.key:
+        print("Error: pass --key or set ADMIN_KEY")
+        sys.exit(1)
+    os.makedirs(args.mirror, exist_ok=True)
+    state = load_state(args.mirror)
+    since = None if args.full or state.get("url") != args.url else state.get("manifest_id")
+
+    for attempt in range(2):
+        with tempfile.TemporaryFile() as archive:
+            received = download(args.url, args.key, since, args.level, archive)
+            if received is None:
+                print(f"Server no longer has manifest {since}; doing a full sync")
+                since = None
+                continue
+            print(f"Downloaded {received:,} bytes (since={since or 'start'})")
+            archive.seek(0)
+            delta, bad = apply_delta(archive, args.mirror, prune=args.prune)
+        if not bad:
+            save_state(args.mirror, {"url": args.url, "manifest_id": delta["manifest_id"]})
+            print(f"Mirror up to date at manifest {delta['manifest_id']} "
+                  f"({len(delta['files'])} changed, {len(delta['deleted'])} deleted)")
+            return
+        print(f"{len(bad)} file(s) did not match the manifest ({', '.join(bad[:5])}); doing a full sync")
+        since = None
+
+    print("Error: mirror could not be brought in sync")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
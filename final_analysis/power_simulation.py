@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Power / Sample-Size Simulation for the 2x3 Mixed Design
+====================================================================
+Generates synthetic participant x article datasets from the effects and
+variance components estimated on the current long-format data, analyses every
+replicate with the Structure (between) x Timing (within) mixed ANOVA and
+reports power curves over a grid of sample sizes.
+
+Design respected by the generator:
+- Structure (between-subjects, 2 levels): integrated, segmented
+- Timing (within-subjects, 3 levels) counterbalanced with the six
+  TIMING_ORDERS used by the experiment app (cycled within each structure group)
+- Article order shuffled per participant, as in /randomize, so article
+  difficulty is crossed with timing
+
+The ANOVA is computed in closed form on (replicates x participants x timing)
+arrays, so a whole batch of replicates is analysed with a handful of NumPy
+reductions. Batches are distributed over a process pool.
+
+Usage:
+    python3 power_simulation.py
+    python3 power_simulation.py --dv false_lures_selected --n 12 18 24 30 --reps 10000
+    python3 power_simulation.py --effect-scale 0.75 --workers 8
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Counterbalanced timing orders (mirrors TIMING_ORDERS / TIMING_MAP in ai_experiment/app.py)
+TIMING_ORDERS = [
+    {'order': 1, 'article1': 'B1_Synchronous', 'article2': 'B2_PreReading', 'article3': 'B3_PostReading'},
+    {'order': 2, 'article1': 'B1_Synchronous', 'article2': 'B3_PostReading', 'article3': 'B2_PreReading'},
+    {'order': 3, 'article1': 'B2_PreReading', 'article2': 'B1_Synchronous', 'article3': 'B3_PostReading'},
+    {'order': 4, 'article1': 'B2_PreReading', 'article2': 'B3_PostReading', 'article3': 'B1_Synchronous'},
+    {'order': 5, 'article1': 'B3_PostReading', 'article2': 'B1_Synchronous', 'article3': 'B2_PreReading'},
+    {'order': 6, 'article1': 'B3_PostReading', 'article2': 'B2_PreReading', 'article3': 'B1_Synchronous'}
+]
+
+TIMING_MAP = {
+    'B1_Synchronous': 'synchronous',
+    'B2_PreReading': 'pre_reading',
+    'B3_PostReading': 'post_reading'
+}
+
+STRUCTURES = ['integrated', 'segmented']
+TIMINGS = ['pre_reading', 'synchronous', 'post_reading']
+ARTICLE_KEYS = ['uhi', 'crispr', 'semiconductors']
+EFFECTS = ['structure', 'timing', 'Interaction']
+
+# ORDER_TIMING_IDX[o, position] -> index into TIMINGS
+ORDER_TIMING_IDX = np.array([
+    [TIMINGS.index(TIMING_MAP[order[f'article{pos}']]) for pos in (1, 2, 3)]
+    for order in TIMING_ORDERS
+])
+
+# All 6 permutations of the 3 articles (article order is shuffled per participant)
+ARTICLE_PERMUTATIONS = np.array([
+    [0, 1, 2], [0, 2, 1], [1, 0, 2], [1, 2, 0], [2, 0, 1], [2, 1, 0]
+])
+
+
+# ============================================================================
+# Parameter estimation from the long-format data
+# ============================================================================
+def load_long_data(path):
+    """Load the AI rows of the long-format dataset."""
+    df = pd.read_excel(path)
+    df = df[(df['experiment_group'] == 'AI') &
+            (df['structure'].isin(STRUCTURES)) &
+            (df['timing'].isin(TIMINGS))].copy()
+    return df
+
+
+def estimate_parameters(df, dv):
+    """
+    Estimate fixed effects and variance components for one dependent variable.
+
+    Fixed part: grand mean + Structure x Timing cell effects + article effects
+    (least squares, sum-to-zero article effects). Random part: participant
+    intercept variance and residual variance via the usual ANOVA (method of
+    moments) estimators on the fixed-effect residuals.
+    """
+    data = df[['participant_id', 'structure', 'timing', 'article', dv]].copy()
+    data[dv] = pd.to_numeric(data[dv], errors='coerce')
+    data = data.dropna(subset=[dv])
+
+    cell = (data['structure'].map(STRUCTURES.index) * len(TIMINGS) +
+            data['timing'].map(TIMINGS.index)).to_numpy()
+    article_idx = data['article'].map({a: i for i, a in enumerate(ARTICLE_KEYS)}).fillna(-1).astype(int).to_numpy()
+    y = data[dv].to_numpy(dtype=float)
+
+    # Design: one indicator per cell + sum-to-zero coded article effects
+    n_cells = len(STRUCTURES) * len(TIMINGS)
+    X_cells = np.eye(n_cells)[cell]
+    X_art = np.zeros((len(y), len(ARTICLE_KEYS) - 1))
+    for k in range(len(ARTICLE_KEYS) - 1):
+        X_art[:, k] = (article_idx == k).astype(float) - (article_idx == len(ARTICLE_KEYS) - 1).astype(float)
+    X = np.hstack([X_cells, X_art])
+    beta, *_ = np.linalg.lstsq(X, y, rcond=None)
+
+    cell_means = beta[:n_cells].reshape(len(STRUCTURES), len(TIMINGS))
+    article_effects = np.append(beta[n_cells:], -beta[n_cells:].sum())
+
+    # Variance components from residuals
+    data['_resid'] = y - X @ beta
+    per_subject = data.groupby('participant_id')['_resid']
+    subj_mean = per_subject.transform('mean').to_numpy()
+    n_subj = data['participant_id'].nunique()
+    k = len(TIMINGS)
+    within_df = max(1, len(y) - n_subj - (X.shape[1] - len(STRUCTURES)))
+    sigma2_e = float(((data['_resid'].to_numpy() - subj_mean) ** 2).sum() / within_df)
+    subj_means = per_subject.mean().to_numpy()
+    sigma2_u = float(max(0.0, subj_means.var(ddof=len(STRUCTURES)) - sigma2_e / k))
+
+    return {
+        'dv': dv,
+        'cell_means': cell_means,
+        'article_effects': article_effects,
+        'position_effects': np.zeros(k),
+        'sigma_u': np.sqrt(sigma2_u),
+        'sigma_e': np.sqrt(sigma2_e),
+        'bounds': (float(np.nanmin(y)), float(np.nanmax(y))),
+        'n_observed': n_subj,
+    }
+
+
+def scale_effects(params, effect_scale):
+    """Shrink or inflate the Structure x Timing effects around the grand mean."""
+    grand = params['cell_means'].mean()
+    scaled = dict(params)
+    scaled['cell_means'] = grand + effect_scale * (params['cell_means'] - grand)
+    return scaled
+
+
+# ============================================================================
+# Vectorised generation + mixed ANOVA
+# ============================================================================
+def simulate_batch(params, n_per_group, reps, rng, clip=None):
+    """
+    Simulate `reps` datasets with `n_per_group` participants per structure.
+
+    Returns Y with shape (reps, n_subjects, 3) ordered by TIMINGS, and the
+    structure index of each participant (n_subjects,).
+    """
+    n_groups = len(STRUCTURES)
+    n_subj = n_per_group * n_groups
+    k = len(TIMINGS)
+    group = np.repeat(np.arange(n_groups), n_per_group)
+
+    # Counterbalancing: cycle the six timing orders within each group, random start per replicate
+    slot = np.tile(np.arange(n_per_group), n_groups)
+    order_idx = (slot[None, :] + rng.integers(0, len(TIMING_ORDERS), size=(reps, 1))) % len(TIMING_ORDERS)
+    timing_at_pos = ORDER_TIMING_IDX[order_idx]                     # (reps, n_subj, 3 positions)
+    article_at_pos = ARTICLE_PERMUTATIONS[rng.integers(0, len(ARTICLE_PERMUTATIONS), size=(reps, n_subj))]
+
+    # Invert position -> timing so every trial lands in its timing column
+    pos_of_timing = np.argsort(timing_at_pos, axis=2)               # (reps, n_subj, 3 timings)
+    article_of_timing = np.take_along_axis(article_at_pos, pos_of_timing, axis=2)
+
+    fixed = params['cell_means'][group][None, :, :]                 # (1, n_subj, 3)
+    y = (fixed
+         + params['article_effects'][article_of_timing]
+         + params['position_effects'][pos_of_timing]
+         + rng.normal(0.0, params['sigma_u'], size=(reps, n_subj, 1))
+         + rng.normal(0.0, params['sigma_e'], size=(reps, n_subj, k)))
+    if clip is not None:
+        y = np.clip(y, clip[0], clip[1])
+    return y, group
+
+
+def mixed_anova_batch(y, group):
+    """
+    Closed-form 2-way mixed ANOVA (one between, one within factor) for a batch.
+
+    y: (reps, n_subjects, k) responses; group: (n_subjects,) between-factor index.
+    Returns dict effect -> (F, p) arrays of shape (reps,), matching the
+    uncorrected F-tests of pingouin.mixed_anova for complete data.
+    """
+    reps, n_subj, k = y.shape
+    groups = np.unique(group)
+    n_groups = len(groups)
+    grand = y.mean(axis=(1, 2), keepdims=True)
+    subj_mean = y.mean(axis=2, keepdims=True)
+    timing_mean = y.mean(axis=1, keepdims=True)
+
+    onehot = (group[:, None] == groups[None, :]).astype(float)      # (n_subj, n_groups)
+    n_g = onehot.sum(axis=0)
+    cell_mean = np.einsum('rsk,sg->rgk', y, onehot) / n_g[None, :, None]
+    group_mean = cell_mean.mean(axis=2, keepdims=True)
+
+    ss_between = k * ((subj_mean - grand) ** 2).sum(axis=(1, 2))
+    ss_structure = k * (n_g[None, :] * ((group_mean[..., 0] - grand[..., 0]) ** 2)).sum(axis=1)
+    ss_subj_within = ss_between - ss_structure
+
+    ss_timing = n_subj * ((timing_mean - grand) ** 2).sum(axis=(1, 2))
+    ss_cells = (n_g[None, :, None] * (cell_mean - grand) ** 2).sum(axis=(1, 2))
+    ss_interaction = ss_cells - ss_structure - ss_timing
+    ss_within = ((y - subj_mean) ** 2).sum(axis=(1, 2))
+    ss_error = ss_within - ss_timing - ss_interaction
+
+    df_structure, df_subj = n_groups - 1, n_subj - n_groups
+    df_timing = k - 1
+    df_interaction = df_structure * df_timing
+    df_error = df_subj * df_timing
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        f_structure = (ss_structure / df_structure) / (ss_subj_within / df_subj)
+        f_timing = (ss_timing / df_timing) / (ss_error / df_error)
+        f_interaction = (ss_interaction / df_interaction) / (ss_error / df_error)
+
+    return {
+        'structure': (f_structure, stats.f.sf(f_structure, df_structure, df_subj)),
+        'timing': (f_timing, stats.f.sf(f_timing, df_timing, df_error)),
+        'Interaction': (f_interaction, stats.f.sf(f_interaction, df_interaction, df_error)),
+    }
+
+
+def _run_chunk(args):
+    """Worker: simulate + analyse one chunk of replicates, return significant counts."""
+    params, n_per_group, reps, seed, alpha, clip = args
+    rng = np.random.default_rng(seed)
+    y, group = simulate_batch(params, n_per_group, reps, rng, clip=clip)
+    results = mixed_anova_batch(y, group)
+    return n_per_group, reps, {eff: int(np.sum(p < alpha)) for eff, (_, p) in results.items()}
+
+
+def power_curve(params, n_grid, reps, alpha=0.05, workers=None, chunk_size=2000, seed=20240101, clip=None):
+    """Estimate power for every effect at every n (participants per structure group)."""
+    seeds = np.random.SeedSequence(seed)
+    tasks = []
+    for n_per_group in n_grid:
+        remaining = reps
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            child = seeds.spawn(1)[0]
+            tasks.append((params, int(n_per_group), size, child, alpha, clip))
+            remaining -= size
+
+    hits = {n: {eff: 0 for eff in EFFECTS} for n in n_grid}
+    totals = {n: 0 for n in n_grid}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for n_per_group, size, counts in pool.map(_run_chunk, tasks):
+            totals[n_per_group] += size
+            for eff, c in counts.items():
+                hits[n_per_group][eff] += c
+
+    rows = []
+    for n in n_grid:
+        row = {'n_per_group': n, 'n_total': n * len(STRUCTURES), 'replicates': totals[n]}
+        for eff in EFFECTS:
+            power = hits[n][eff] / totals[n]
+            row[f'power_{eff}'] = power
+            row[f'mc_se_{eff}'] = np.sqrt(power * (1 - power) / totals[n])
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def plot_power_curves(curve, dv, out_path):
+    """Save power curves (one line per effect) as PNG."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(8, 6))
+    for eff in EFFECTS:
+        ax.errorbar(curve['n_total'], curve[f'power_{eff}'], yerr=1.96 * curve[f'mc_se_{eff}'],
+                    marker='o', linewidth=2, capsize=3, label=eff)
+    ax.axhline(0.8, color='grey', linestyle='--', linewidth=1)
+    ax.set_xlabel('Total N (AI participants)')
+    ax.set_ylabel('Power')
+    ax.set_ylim(0, 1)
+    ax.set_title(f'Simulated Power: {dv} (2x3 Mixed ANOVA)')
+    ax.legend(title='Effect')
+    plt.tight_layout()
+    plt.savefig(out_path, dpi=150)
+    plt.close(fig)
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Monte Carlo power simulation for the 2x3 mixed design")
+    parser.add_argument('--data', default=os.path.join(script_dir, "Analysis long finals-.xlsx"))
+    parser.add_argument('--dv', default='ai_summary_accuracy')
+    parser.add_argument('--n', type=int, nargs='+', default=[6, 12, 18, 24, 30, 36, 48, 60],
+                        help="Participants per structure group")
+    parser.add_argument('--reps', type=int, default=10000, help="Replicates per n-point")
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--effect-scale', type=float, default=1.0,
+                        help="Multiply observed Structure x Timing effects (e.g. 0.75 for shrinkage)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=20240101)
+    parser.add_argument('--no-clip', action='store_true', help="Do not clip simulated values to the observed range")
+    parser.add_argument('--out', default=os.path.join(script_dir, "power_outputs"))
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("ESTIMATING SIMULATION PARAMETERS")
+    print("=" * 70)
+    df = load_long_data(args.data)
+    params = scale_effects(estimate_parameters(df, args.dv), args.effect_scale)
+    print(f"\nDV: {args.dv} (N observed = {params['n_observed']})")
+    print("\nCell means (Structure x Timing):")
+    print(pd.DataFrame(params['cell_means'], index=STRUCTURES, columns=TIMINGS).round(4))
+    print("\nArticle effects:")
+    print(pd.Series(params['article_effects'], index=ARTICLE_KEYS).round(4))
+    print(f"\nParticipant SD = {params['sigma_u']:.4f}, Residual SD = {params['sigma_e']:.4f}")
+
+    print("\n" + "=" * 70)
+    print(f"SIMULATING ({args.reps} replicates per n-point)")
+    print("=" * 70)
+    start = time.time()
+    clip = None if args.no_clip else params['bounds']
+    curve = power_curve(params, args.n, args.reps, alpha=args.alpha, workers=args.workers,
+                        seed=args.seed, clip=clip)
+    elapsed = time.time() - start
+    print(curve.round(4).to_string(index=False))
+    print(f"\nSimulated {args.reps * len(args.n):,} datasets in {elapsed:.1f} seconds")
+
+    os.makedirs(args.out, exist_ok=True)
+    csv_path = os.path.join(args.out, f"power_curve_{args.dv}.csv")
+    png_path = os.path.join(args.out, f"power_curve_{args.dv}.png")
+    curve.to_csv(csv_path, index=False)
+    plot_power_curves(curve, args.dv, png_path)
+    print(f"\nResults saved to: {csv_path}")
+    print(f"Plot saved to: {png_path}")
+
+
+if __name__ == "__main__":
+    main()
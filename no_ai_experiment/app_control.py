@@ -4,12 +4,23 @@ Flask application (stable sessions, guarded routes, JSON-safe handlers)
 CONTROL VERSION: Contains NO AI summaries or AI-related functionality
 """
 
-from flask import Flask, render_template, request, session, redirect, url_for, jsonify
+from flask import render_template, request, session, redirect, url_for, jsonify
 import json, csv, os, random, subprocess, sys
 from datetime import datetime
 from functools import wraps
 from functools import lru_cache
 import fcntl  # For file locking on Unix/macOS
+import threading
+
+# Shared modules (study_core/) live at the repository root, next to both arms
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+from study_core.arm import create_app
+from study_core.quality_monitor import QualityMonitor
+from study_core.cohort_dashboard import CohortAggregates
+from study_core.log_lock import append_row
+from study_core import edit_timeline
 try:
     from deep_translator import GoogleTranslator  # optional; we will use later
 except Exception:
@@ -24,22 +35,25 @@ DEFAULT_LANG = "en"
 # ------------------------------------------------------------------------------
 # App setup
 # ------------------------------------------------------------------------------
-app = Flask(__name__, template_folder="templates", static_folder="static")
-
-# Use a STABLE secret key (do NOT rotate on each run or the session cookie dies)
-# Set FLASK_SECRET_KEY in your shell for production; this default is fine locally.
-app.secret_key = os.environ.get("FLASK_SECRET_KEY", "dev-secret-change-me")
-
-# Optional: make cookies predictable in localhost dev
-app.config.update(SESSION_COOKIE_SAMESITE="Lax", SESSION_COOKIE_SECURE=False)
-
-DATA_DIR = "experiment_data"
-os.makedirs(DATA_DIR, exist_ok=True)
+# The Flask app (secret key, cookies, template bytecode cache, compressed static
+# files) and the routes shared with the AI arm (/sw.js, /healthz, /readyz,
+# /next_bundle, /admin/*, ...) come from study_core/arm.py; ARM holds this arm's
+# stores, warmup and the hooks the shared code calls back into.
+app, ARM = create_app("control", os.path.dirname(os.path.abspath(__file__)), __name__, timing=False)  # CONTROL VERSION: no timing
+
+# experiment_data/ next to this file, so the data lands in the same place from any cwd
+# (and each arm keeps its own directory when both run in study_server.py)
+DATA_DIR = ARM.data_dir
+LOG_LOCKS = ARM.log_locks  # per-participant append / rename lock
+LOG_PATHS = ARM.log_paths  # participant -> log file, persisted in .log_index
+ARTICLE_TOKENS = ARM.article_tokens  # signed article of a reading page, for replayed telemetry
 
 # Translation cache directory - use shared cache from ai_experiment
 # This ensures both experiments use the same translations and we only maintain one file
-TRANSLATION_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "ai_experiment", "translation_cache")
+TRANSLATION_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ai_experiment", "translation_cache")
 TRANSLATION_CACHE_FILE = os.path.join(TRANSLATION_CACHE_DIR, "translations.json")
+ARM.translation_cache_file = TRANSLATION_CACHE_FILE  # exported by /admin/export
+TRANSLATION_CACHE_WAIT_S = 2.0  # max wait for the cache during warmup before serving untranslated text
 
 # ------------------------------------------------------------------------------
 # Utilities
@@ -62,24 +76,26 @@ def _set_lang(lang_code: str):
 
 # Translation cache (in-memory for fast access)
 _translation_cache = {}
+_translation_cache_loaded = threading.Event()  # set once the file cache is merged in (see ARM.warmup)
 
 def _load_translation_cache():
-    """Load translation cache from file"""
-    global _translation_cache
+    """Load translation cache from file (merged in place, so shared references stay valid)"""
     if os.path.exists(TRANSLATION_CACHE_FILE):
         try:
             with open(TRANSLATION_CACHE_FILE, 'r', encoding='utf-8') as f:
-                _translation_cache = json.load(f)
-                print(f"✓ Loaded {len(_translation_cache)} cached translations")
+                loaded = json.load(f)
+            for key, value in loaded.items():
+                _translation_cache.setdefault(key, value)
+            print(f"✓ Loaded {len(loaded)} cached translations")
         except Exception as e:
             print(f"Error loading translation cache: {e}")
-            _translation_cache = {}
+    _translation_cache_loaded.set()
 
 def _save_translation_cache():
     """Save translation cache to file"""
     try:
         with open(TRANSLATION_CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(_translation_cache, f, ensure_ascii=False, indent=2)
+            json.dump(dict(_translation_cache), f, ensure_ascii=False, indent=2)
     except Exception as e:
         print(f"Error saving translation cache: {e}")
 
@@ -101,6 +117,13 @@ def _auto_translate(text: str, target_lang: str) -> str:
     cache_key = _get_cache_key(text, target_lang)
     if cache_key in _translation_cache:
         return _translation_cache[cache_key]
+
+    # Still warming up: give the file cache a moment, then fall back to the
+    # original text instead of a network round trip per string
+    if ARM.warmup.started and not _translation_cache_loaded.wait(TRANSLATION_CACHE_WAIT_S):
+        return text
+    if cache_key in _translation_cache:
+        return _translation_cache[cache_key]
     
     # If not in cache, translate (this should rarely happen after pre-translation)
     try:
@@ -199,6 +222,9 @@ def require_pid(fn):
         return fn(*args, **kwargs)
     return wrapper
 
+# Idempotent POSTs for the service worker's retries (study_core/arm.py)
+dedupe_submission = ARM.dedupe_submission
+
 def csv_len(path):
     if not os.path.exists(path):
         return 0
@@ -276,18 +302,11 @@ def _generate_analysis_if_needed(participant_id, phase=None):
             print(f"[Analysis] Analysis script not found: {analysis_script}")
             return  # Analysis script not found, skip
         
-        # Check if log file exists - try both filename formats
-        log_file = os.path.join(DATA_DIR, f"{participant_id}_log.csv")
-        if not os.path.exists(log_file):
-            # Try to find log file with name in filename
-            import glob
-            pattern = os.path.join(DATA_DIR, f"{participant_id}-*-NON-AI_log.csv")
-            matches = glob.glob(pattern)
-            if matches:
-                log_file = matches[0]
-            else:
-                print(f"[Analysis] Log file not found for {participant_id}")
-                return  # Log file doesn't exist yet, skip
+        # Log file from the participant index (no directory probing)
+        log_file = LOG_PATHS.get(participant_id)
+        if not log_file or not os.path.exists(log_file):
+            print(f"[Analysis] Log file not found for {participant_id}")
+            return  # Log file doesn't exist yet, skip
         
         # Run analysis in background (non-blocking)
         # Use subprocess.Popen to run asynchronously
@@ -308,30 +327,31 @@ def log_data(participant_id, phase, data):
     data = dict(data or {})
     if "timestamp" in data:
         data["timestamp"] = _normalize_timestamp_value(data.get("timestamp"))
+
+    # Update running quality features (never blocks or breaks logging)
+    try:
+        QUALITY_MONITOR.observe(participant_id, phase, data)
+    except Exception as e:
+        print(f"[QUALITY] observe failed: {e}")
+    try:
+        COHORT_AGGREGATES.observe(participant_id, phase, data)
+    except Exception as e:
+        print(f"[DASHBOARD] observe failed: {e}")
     
     # Clean name for filename (remove spaces, special chars)
+    named = None
     if name:
         clean_name = name.replace(" ", "-").replace(",", "").replace(".", "")
-        filename = os.path.join(DATA_DIR, f"{participant_id}-{clean_name}-NON-AI_log.csv")
-        
-        # If old file exists, rename it
-        old_filename = os.path.join(DATA_DIR, f"{participant_id}_log.csv")
-        if os.path.exists(old_filename) and not os.path.exists(filename):
-            try:
-                os.rename(old_filename, filename)
-            except:
-                pass  # If rename fails, continue with new filename
-    else:
-        # Fallback to old format if name not available yet
-        filename = os.path.join(DATA_DIR, f"{participant_id}_log.csv")
-    
-    file_exists = os.path.exists(filename)
-    with open(filename, "a", newline="", encoding="utf-8") as f:
-        fieldnames = ["timestamp", "phase"] + list(data.keys())
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        if not file_exists:
-            w.writeheader()
-        w.writerow({"timestamp": datetime.now().astimezone().isoformat(), "phase": phase, **data})
+        named = f"{participant_id}-{clean_name}-NON-AI_log.csv"
+
+    # Rename + append under the participant's lock so concurrent requests
+    # (e.g. a /log_reading beacon and /submit_test) never interleave rows.
+    # The path is fixed once per participant: <PID>_log.csv until the first
+    # request that knows the name renames it.
+    with LOG_LOCKS.hold(participant_id):
+        filename = LOG_PATHS.resolve(participant_id, named)
+        append_row(filename, ["timestamp", "phase"] + list(data.keys()),
+                   {"timestamp": datetime.now().astimezone().isoformat(), "phase": phase, **data})
     
     # Note: Analysis is now generated automatically when participant reaches debrief page
     # (No manipulation_check phase in control version)
@@ -363,6 +383,10 @@ def save_participant(participant_id, data):
             pass
 # --- Test Mode toggle (only affects reading skip) ---
 TEST_MODE = os.environ.get("TEST_MODE", "0") == "1"
+# --- Recall edit timeline (compact insert/delete log of the recall bullets) ---
+EDIT_TIMELINE = os.environ.get("EDIT_TIMELINE", "1") == "1"
+# --- Reading heatmap: paragraph dwell bins sent once per article (the last bin takes any overflow) ---
+READING_DWELL_BINS = 64
 
 @app.context_processor
 def inject_test_mode():
@@ -491,6 +515,18 @@ def get_localized_article(article_key: str) -> dict:
     localized["questions"] = qs
     return localized
 
+# ------------------------------------------------------------------------------
+# Rendered-page cache (pages that only vary by language + template arguments)
+# ------------------------------------------------------------------------------
+# Language helpers and participant guard for the shared code in study_core/arm.py
+# and study_core/shared_routes.py (page cache, next-article bundles)
+ARM.languages = tuple(SUPPORTED_LANGS)
+ARM.get_lang = _get_lang
+ARM.translation_generation = lambda: len(_translation_cache)
+ARM.localized_article = get_localized_article
+ARM.require_pid = require_pid
+render_cached = ARM.render_cached
+
 # ------------------------------------------------------------------------------
 # DEV routes to verify language + translation pipeline
 # ------------------------------------------------------------------------------
@@ -1051,6 +1087,21 @@ Ultimately, semiconductor supply chain resilience represents a sociotechnical ch
     }
 }
 
+# Live data-quality flags (fed by log_data, served by /admin/quality)
+QUALITY_MONITOR = QualityMonitor(
+    article_words={key: len(art["text"].split()) for key, art in ARTICLES.items()},
+    flag_log_path=os.path.join(DATA_DIR, "quality_flags.csv"),
+)
+ARM.quality_monitor = QUALITY_MONITOR
+
+# Live cohort aggregates (fed by log_data, served by /admin/dashboard); seeded from
+# existing logs by the cohort_replay warmup step. CONTROL VERSION: no timing column,
+# no manipulation check - a session ends with the last article's ratings
+COHORT_AGGREGATES = CohortAggregates(completion_stage="post_article_ratings", articles=3, timing_column=False,
+                                     replay=True)
+ARM.cohort = COHORT_AGGREGATES
+
+
 # Section 1: Familiarity Ratings (18 items, 1-7 Likert)
 PRIOR_KNOWLEDGE_FAMILIARITY_TERMS = [
     "Heat flux",                                    # Urban Climate – Article 3 (Urban Heat)
@@ -1139,7 +1190,7 @@ def index():
     if "participant_id" not in session:
         # New participant - show language selection
         if "lang" not in session:
-            return render_template("language_selection.html")
+            return render_cached("language_selection.html")
         # Language selected but no participant yet - go to login
         return render_template("login.html")
     
@@ -1213,8 +1264,9 @@ def recall_instruction(i):
         return redirect(url_for("index"))
     article_key = article_order[i]
     # ...other logic...
-    return render_template(
+    return render_cached(
         "recall_instruction.html",
+        vary=(article_key, i),
         article=get_localized_article(article_key),
         article_key=article_key,
         i=i,
@@ -1473,7 +1525,7 @@ def login():
 @app.route("/consent")
 @require_pid
 def consent():
-    return render_template("consent.html")
+    return render_cached("consent.html")
 
 @app.route("/consent_accept", methods=["POST"])
 @require_pid
@@ -1501,6 +1553,7 @@ def prior_knowledge():
 
 @app.route("/submit_prior_knowledge", methods=["POST"])
 @require_pid
+@dedupe_submission
 def submit_prior_knowledge():
     data = request.get_json(force=True) or {}
 
@@ -1546,7 +1599,7 @@ def submit_prior_knowledge():
 @require_pid
 def instructions():
     """Display instructions page before starting the experiment"""
-    return render_template("instructions.html")
+    return render_cached("instructions.html")
 
 @app.route("/instructions_ready", methods=["POST"])
 @require_pid
@@ -1598,6 +1651,9 @@ def randomize():
 @app.route("/reading/<int:article_num>", methods=["GET"])
 @require_pid
 def reading_phase(article_num: int):
+    return _reading_page(article_num)
+
+def _reading_page(article_num: int, record: bool = True):
     # CONTROL VERSION: Simplified reading phase - no AI summaries
     article_order = session.get("article_order") or []
 
@@ -1619,9 +1675,8 @@ def reading_phase(article_num: int):
         return redirect(url_for("randomize"))
 
     # Record session state
-    session["current_article"] = article_num
-    session["current_article_key"] = article_key
-    session["reading_start_time"] = datetime.now().isoformat()
+    if record:
+        ARM.record_article(article_num, article_key)
 
     return render_template(
         "reading.html",
@@ -1629,18 +1684,26 @@ def reading_phase(article_num: int):
         article_key=article_key,
         article_title=article["title"],
         article_text=article["text"],
+        dwell_bins=READING_DWELL_BINS,
+        article_token=ARTICLE_TOKENS.issue(session["participant_id"], article_num),
     )
 
+# The shared /next_bundle, /article_bundles and /bundle_shown (study_core/shared_routes.py)
+ARM.reading_page = _reading_page
 
 # CONTROL VERSION: All summary-related routes removed - no AI functionality
 
 @app.route("/log_reading", methods=["POST"])
 @require_pid
+@dedupe_submission
 def log_reading():
-    data = request.get_json(force=True) or {}
-    data["article_num"] = session.get("current_article")
-    data["article_key"] = session.get("current_article_key")
-    # CONTROL VERSION: timing removed - no AI functionality
+    data = ARM.reading_row(request.get_json(force=True) or {})  # article (and timing) from the session or the signed token
+    if data.get("event") == "reading_dwell":
+        # Sent once per article; at most READING_DWELL_BINS values are accepted
+        dwell = data.get("dwell_ms")
+        if not isinstance(dwell, list) or len(dwell) > READING_DWELL_BINS:
+            return jsonify({"error": "invalid dwell histogram"}), 400
+        data["dwell_ms"] = json.dumps([int(v) if isinstance(v, (int, float)) and 0 <= v < 1e9 else 0 for v in dwell])
     log_data(session["participant_id"], "reading_behavior", data)
     return jsonify({"status": "ok"})
 
@@ -1706,6 +1769,7 @@ def test_phase(article_num: int):
         show_recall_counters=False,
         recall_total_ms=recall_total_ms,
         recall_unlock_ms=recall_unlock_ms,
+        edit_timeline=EDIT_TIMELINE,
         start_on_mcq=start_on_mcq,
         skip_recall=start_on_mcq  # Additional clear flag for template
     )
@@ -1758,6 +1822,7 @@ def mcq_only(article_num: int):
 
 @app.route("/submit_test", methods=["POST"])
 @require_pid
+@dedupe_submission
 def submit_test():
     data = request.get_json(force=True) or {}
     article_num = int(data.get("article_num", 0))
@@ -1790,6 +1855,23 @@ def submit_test():
             "paste_attempts": recall_data.get("paste_attempts", 0),
             "over_limit": recall_data.get("over_limit", False)
         })
+        timeline = recall_data.get("edit_timeline")
+        if timeline:
+            try:
+                ops = edit_timeline.decode(timeline)
+            except ValueError as e:
+                print(f"[EDIT TIMELINE] {session['participant_id']} article {article_num}: {e}")
+            else:
+                # Kept as sent (compact); data_analysis/edit_timeline_report.py decodes it
+                log_data(session["participant_id"], "recall_edit_timeline", {
+                    "article_num": article_num,
+                    "article_key": data.get("article_key"),
+                    "version": timeline.get("v"),
+                    "encoding": timeline.get("encoding"),
+                    "ops": len(ops),
+                    "truncated": bool(timeline.get("truncated")),
+                    "data": timeline.get("data"),
+                })
     
     # Calculate accuracy rate and log MCQ responses
     if mcq_data:
@@ -1911,6 +1993,7 @@ def post_article_ratings(article_num: int):
 
 @app.route("/submit_post_article_ratings", methods=["POST"])
 @require_pid
+@dedupe_submission
 def submit_post_article_ratings():
     """Submit post-article ratings data"""
     data = request.get_json(force=True) or {}
@@ -1952,20 +2035,20 @@ def submit_post_article_ratings():
 def break_after_reading(article_num: int):
     # Break after reading (3 minutes) - always goes to test after break
     # After test, if article 2, will go to debrief; otherwise go to next article reading
-    return render_template("break.html", next_article=article_num, after_reading=True, test_mode=TEST_MODE, go_to_manipulation=False)
+    return render_cached("break.html", next_article=article_num, after_reading=True, test_mode=TEST_MODE, go_to_manipulation=False)
 
 # ---- Pre-test break route ----
 @app.route("/break_before_test/<int:article_num>")
 @require_pid
 def break_before_test(article_num: int):
     # After the break, go directly to the TEST for this article (no recall-instruction wait)
-    return render_template("break.html", next_article=article_num, after_reading=True, test_mode=TEST_MODE)
+    return render_cached("break.html", next_article=article_num, after_reading=True, test_mode=TEST_MODE)
 
 @app.route("/break/<int:next_article>")
 @require_pid
 def short_break(next_article: int):
     # This is the classic "after test" break
-    return render_template("break.html", next_article=next_article, after_reading=False, test_mode=TEST_MODE)
+    return render_cached("break.html", next_article=next_article, after_reading=False, test_mode=TEST_MODE)
 
 # CONTROL VERSION: manipulation_check route removed - go directly to debrief
 
@@ -1982,108 +2065,7 @@ def debrief():
 
 @app.route("/excluded")
 def excluded():
-    return render_template("excluded.html")
-
-# ------------------------------------------------------------------------------
-# Admin Data Export Routes (for cloud deployment)
-# ------------------------------------------------------------------------------
-@app.route("/admin/export", methods=["GET"])
-def admin_export_data():
-    """
-    Export all experiment data as ZIP file.
-    Requires ADMIN_KEY environment variable for security.
-    Usage: /admin/export?key=YOUR_ADMIN_KEY
-    """
-    admin_key = os.environ.get("ADMIN_KEY")
-    provided_key = request.args.get("key")
-    
-    if not admin_key or provided_key != admin_key:
-        return jsonify({"error": "Unauthorized. Set ADMIN_KEY environment variable."}), 403
-    
-    import zipfile
-    import tempfile
-    from flask import send_file
-    
-    # Create temporary ZIP file
-    temp_zip = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
-    zip_path = temp_zip.name
-    temp_zip.close()
-    
-    try:
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Add all CSV files
-            if os.path.exists(DATA_DIR):
-                for filename in os.listdir(DATA_DIR):
-                    if filename.endswith('.csv'):
-                        filepath = os.path.join(DATA_DIR, filename)
-                        zipf.write(filepath, filename)
-            
-            # Add translation cache if needed
-            if os.path.exists(TRANSLATION_CACHE_FILE):
-                zipf.write(TRANSLATION_CACHE_FILE, 'translations.json')
-        
-        # Send file
-        return send_file(
-            zip_path,
-            mimetype='application/zip',
-            as_attachment=True,
-            download_name=f'experiment_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip'
-        )
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route("/admin/stats", methods=["GET"])
-def admin_stats():
-    """
-    Get statistics about experiment data.
-    Requires ADMIN_KEY environment variable.
-    Usage: /admin/stats?key=YOUR_ADMIN_KEY
-    """
-    admin_key = os.environ.get("ADMIN_KEY")
-    provided_key = request.args.get("key")
-    
-    if not admin_key or provided_key != admin_key:
-        return jsonify({"error": "Unauthorized. Set ADMIN_KEY environment variable."}), 403
-    
-    stats = {
-        "participant_count": 0,
-        "data_files": [],
-        "total_data_size_mb": 0,
-        "last_update": None,
-        "data_directory": os.path.abspath(DATA_DIR)
-    }
-    
-    if os.path.exists(DATA_DIR):
-        csv_files = [f for f in os.listdir(DATA_DIR) if f.endswith('.csv')]
-        stats["data_files"] = sorted(csv_files)
-        
-        # Count participants
-        participants_file = os.path.join(DATA_DIR, "participants.csv")
-        if os.path.exists(participants_file):
-            try:
-                with open(participants_file, 'r', encoding='utf-8') as f:
-                    stats["participant_count"] = max(0, sum(1 for line in f) - 1)  # Subtract header
-            except Exception:
-                stats["participant_count"] = 0
-        
-        # Calculate total size
-        total_size = sum(
-            os.path.getsize(os.path.join(DATA_DIR, f))
-            for f in csv_files
-        )
-        stats["total_data_size_mb"] = round(total_size / (1024 * 1024), 2)
-        
-        # Get last modification time
-        if csv_files:
-            latest_file = max(
-                csv_files,
-                key=lambda f: os.path.getmtime(os.path.join(DATA_DIR, f))
-            )
-            stats["last_update"] = datetime.fromtimestamp(
-                os.path.getmtime(os.path.join(DATA_DIR, latest_file))
-            ).isoformat()
-    
-    return jsonify(stats)
+    return render_cached("excluded.html")
 
 # ------------------------------------------------------------------------------
 # Entrypoint
@@ -2342,21 +2324,29 @@ def get_condition_distribution():
     
     return jsonify(distribution)
 
+# ------------------------------------------------------------------------------
+# Warmup (study_core/arm.py starts it on the first request and serves /healthz, /readyz)
+# ------------------------------------------------------------------------------
+ARM.warmup.add("translation_cache", _load_translation_cache)
+ARM.warmup.add("templates", ARM.compile_templates)
+# First optional step: live dashboard events are held until it has run
+ARM.warmup.add("cohort_replay", ARM.replay_cohort_logs, required=False)
+if GoogleTranslator:
+    # Network-bound; optional so readiness never waits on Google
+    ARM.warmup.add("pretranslate_ui", _pre_translate_ui_text, required=False)
+    if os.environ.get("DISABLE_PRETRANSLATE") != "1":
+        ARM.warmup.add("pretranslate_articles", _pre_translate_all_articles, required=False)
+ARM.warmup.add("precompress_static", ARM.precompress_static, required=False)
+ARM.warmup.add("page_cache", ARM.prerender_pages, required=False)
+
+
 if __name__ == "__main__":
     os.makedirs("templates", exist_ok=True)
     os.makedirs("static", exist_ok=True)
 
-    # Load translation cache on startup
-    _load_translation_cache()
-    
-    # Pre-translate static UI text (fast)
-    if GoogleTranslator:
-        _pre_translate_ui_text()
-    
-    # Pre-translate ALL articles (takes 30-60 seconds but makes everything instant)
-    # Allow disabling via env to avoid network delays in constrained environments
-    if GoogleTranslator and os.environ.get("DISABLE_PRETRANSLATE") != "1":
-        _pre_translate_all_articles()
+    # Cache load, template compilation and pre-translation run in the
+    # background so the server binds right away (/healthz, /readyz)
+    ARM.warmup.start()
 
     print("\n" + "=" * 50)
     print("Human Memory Encoding Experiment Platform - CONTROL VERSION (No AI)")
@@ -17,6 +17,9 @@ try:
 except ImportError:
     ARTICLES = {}
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # repository root
+from study_core.log_index import find_log  # noqa: E402  (participant -> log path, written by the app)
+
 # Correct answers (0-indexed option indices)
 # ORIGINAL ANSWER KEYS (for participants who took the test before MCQ change)
 ORIGINAL_CORRECT_ANSWERS = {
@@ -1413,20 +1416,13 @@ def main():
     
     participant_id = sys.argv[1].upper()
     
-    # Try to find log file - handle both formats: P166_log.csv and P166-*-NON-AI_log.csv
-    log_file = f"../experiment_data/{participant_id}_log.csv"
-    if not os.path.exists(log_file):
-        # Try to find log file with name in filename (NON-AI format)
-        import glob
-        pattern = f"../experiment_data/{participant_id}-*-NON-AI_log.csv"
-        matches = glob.glob(pattern)
-        if matches:
-            log_file = matches[0]
-        else:
-            print(f"Error: Log file not found for {participant_id}")
-            print(f"  Tried: {log_file}")
-            print(f"  Tried pattern: {pattern}")
-            sys.exit(1)
+    # Log file from the app's participant index (P166_log.csv or P166-*-NON-AI_log.csv)
+    experiment_data_dir = "../experiment_data"
+    log_file = find_log(experiment_data_dir, participant_id) if os.path.isdir(experiment_data_dir) else None
+    if not log_file or not os.path.exists(log_file):
+        print(f"Error: Log file not found for {participant_id}")
+        print(f"  Searched in: {experiment_data_dir}")
+        sys.exit(1)
     
     # Determine which answer keys to use based on participant ID
     # Participants P078 and later should use NEW answer keys
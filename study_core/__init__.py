@@ -0,0 +1,10 @@
+"""
+Modules shared by both study arms (ai_experiment/app.py and
+no_ai_experiment/app_control.py).
+
+Each arm appends the repository root to sys.path, imports from this package
+and builds its app with arm.create_app(), so there is exactly one copy of
+every shared module and route. study_server.py loads the arms with
+arm.load_arm(), so neither arm can pick up a same-named module from the
+other arm's directory.
+"""
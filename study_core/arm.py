@@ -0,0 +1,280 @@
+"""
+Study arms: the app factory both arms are built with, and the loader that
+imports an arm without mixing it up with the other one.
+
+create_app(name, arm_dir) does the setup ai_experiment/app.py and
+no_ai_experiment/app_control.py used to repeat line by line: the Flask app
+(stable secret, cookie settings, Jinja bytecode cache, compressed and
+content-hashed static files), the arm's experiment_data/ stores and the
+routes that were identical in both arms (shared_routes.py). Everything
+per-arm lives on one Arm object (app.extensions["study_arm"]), so a shared
+route can only ever see its own arm's data. The page flows differ between
+the arms and stay in their modules; the shared code reaches them through
+the hooks the arm sets on its Arm (language helpers, the reading page and,
+in the AI arm, the summary page shown before a pre-reading article).
+
+load_arm(path) imports an arm module from its file under its own module
+name. The arm's directory is on sys.path only while the arm is imported,
+its sibling modules (e.g. the AI arm's materials.py) are taken out of
+sys.modules afterwards so no later import can pick them up by their bare
+name, and an arm that ends up holding a module from another arm's directory
+is an ImportError. study_server.py loads both arms this way.
+"""
+
+import importlib.util
+import os
+import sys
+import threading
+import types
+from functools import wraps
+
+from flask import Flask, Response, make_response, render_template, request, session
+from jinja2 import FileSystemBytecodeCache
+
+from study_core.compression import ResponseCompressor, StaticAssets, precompress
+from study_core.data_manifest import ManifestStore
+from study_core.log_index import LogPaths
+from study_core.log_lock import ParticipantLocks
+from study_core.page_cache import PageCache
+from study_core.submission_ids import SUBMISSION_ID, ArticleTokens, SubmissionIds
+from study_core.warmup import Warmup
+
+# Argument-free pages rendered into the page cache for every language at startup
+PRERENDERED_PAGES = ("language_selection.html", "consent.html", "instructions.html", "excluded.html")
+
+# Static files both arms serve (the service worker and its registration script)
+SHARED_STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+_loaded_arms = {}  # arm directory -> module name, for load_arm()
+_load_lock = threading.Lock()
+
+
+class Arm:
+    """One arm's configuration and state, shared by its module and the shared routes."""
+
+    def __init__(self, name, arm_dir, app, timing=True):
+        self.name = name
+        self.dir = arm_dir
+        self.app = app
+        self.timing = timing  # False for an arm without timing conditions (control): rows get no timing
+        # Resolved next to the arm's module so the data lands in the same place from any cwd
+        self.data_dir = os.path.join(arm_dir, "experiment_data")
+        os.makedirs(self.data_dir, exist_ok=True)
+        self.manifests = ManifestStore(self.data_dir)  # content manifests for /admin/manifest and delta exports
+        self.log_locks = ParticipantLocks(os.path.join(self.data_dir, ".log_locks"))  # per-participant append / rename lock
+        self.log_paths = LogPaths(self.data_dir)  # participant -> log file, persisted in .log_index
+        self.submissions = SubmissionIds(self.data_dir)  # processed X-Submission-Ids (service-worker retries)
+        self.submission_locks = ParticipantLocks(os.path.join(self.data_dir, ".submission_locks"))
+        self.article_tokens = ArticleTokens(app.secret_key)  # signed article of a reading page
+        self.page_cache = PageCache()
+        self.static_assets = StaticAssets(app.static_folder, shared_dirs=(SHARED_STATIC_DIR,))
+        self.template_cache_dir = os.path.join(arm_dir, ".template_cache")
+        # Replaced by study_server.py with one warmup for both arms
+        self.warmup = Warmup(name)
+        # Set by the arm module once its materials are loaded
+        self.translation_cache_file = None
+        self.quality_monitor = None
+        self.cohort = None
+        # Hooks set by the arm module
+        self.languages = ()                 # language codes the static pages are prerendered in
+        self.get_lang = None                # () -> session language
+        self.translation_generation = None  # () -> grows as translations are cached
+        self.localized_article = None       # (article_key) -> article in the session language
+        self.require_pid = None             # view decorator: a participant is in the session
+        self.reading_page = None            # (article_num, record) -> HTML, or a redirect
+        self.summary_page = None            # AI arm: (article_num, record) -> HTML, or a redirect
+        self.summary_endpoint = None        # AI arm: endpoint of the summary page
+        self.summary_first = lambda article_num: False  # AI arm: the article opens with its summary
+        self.bundle_fields = None           # AI arm: (article_num, article_key, article) -> extra bundle fields
+
+    def start_warmup(self):
+        # before_request hook; no-op after the first call (covers servers that import the app without __main__)
+        self.warmup.start()
+
+    def compile_templates(self):
+        """Load every template into Jinja's cache (from the bytecode cache when precompiled) so first page views skip parsing"""
+        for name in self.app.jinja_env.list_templates(extensions=["html"]):
+            self.app.jinja_env.get_template(name)
+
+    def precompress_static(self):
+        """Write .gz / .br variants of static/ files (also done at build time by scripts/precompress_static.py)"""
+        written = sum(precompress(static_dir) for static_dir in self.static_assets.dirs)
+        if written:
+            print(f"✓ Precompressed {written} static file variants")
+
+    def replay_cohort_logs(self):
+        """Seed the cohort dashboard from the participant logs already on disk"""
+        print(f"[DASHBOARD] Replayed {self.cohort.replay_dir(self.data_dir)} existing participant logs")
+
+    def render_cached(self, template_name, vary=None, **context):
+        """
+        render_template() through the page cache, served with a strong ETag so a
+        revalidating browser (reload, back button) gets a 304.
+        Only for templates that read nothing from the session except the language;
+        `vary` defaults to the template arguments (which must then be hashable).
+        """
+        lang = self.get_lang()
+        # Translation cache size as a generation: a page rendered with an English
+        # fallback is re-rendered once more translations are cached
+        generation = self.translation_generation() if lang != "en" else 0
+        key = (template_name, lang, generation, tuple(sorted(context.items())) if vary is None else vary)
+        html, etag = self.page_cache.get_or_render(key, lambda: render_template(template_name, **context))
+        response = make_response(html)
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+        response.headers["X-Offline-Cacheable"] = "1"  # study_core/static/sw.js keeps a copy for offline navigation
+        response.make_conditional(request)
+        if response.status_code == 304:
+            self.page_cache.count_not_modified(template_name)
+        return response
+
+    def prerender_pages(self):
+        """Fill the page cache with the argument-free pages in every language"""
+        for lang in self.languages:
+            with self.app.test_request_context():
+                session["lang"] = lang
+                for name in PRERENDERED_PAGES:
+                    self.render_cached(name)
+
+    def record_article(self, article_num, article_key, timing=None):
+        """Session state a reading / summary page sets when it is shown"""
+        session["current_article"] = article_num
+        session["current_article_key"] = article_key
+        if timing is not None:
+            session["current_timing"] = timing
+
+    def reading_row(self, data):
+        """
+        Attribute a /log_reading row to its article: the session's current one,
+        or, for a row queued offline and replayed later (the session may be on
+        another article by now), the article its reading page was signed for.
+        The body's own article fields are never trusted.
+        """
+        article_order = session.get("article_order") or []
+        timing_order = session.get("timing_order") or []
+        article_num = None
+        if request.headers.get("X-Submission-Replay"):
+            article_num = self.article_tokens.article_num(request.headers.get("X-Article-Token"), session["participant_id"])
+        if article_num is not None and 0 <= article_num < len(article_order):
+            data["article_num"] = article_num
+            data["article_key"] = article_order[article_num]
+            timing = timing_order[article_num] if article_num < len(timing_order) else None
+        else:
+            data["article_num"] = session.get("current_article")
+            data["article_key"] = session.get("current_article_key")
+            timing = session.get("current_timing")
+        if self.timing:
+            data["timing"] = timing
+        return data
+
+    def export_extra_files(self):
+        """(path, archive name) pairs exported next to experiment_data/"""
+        if not self.translation_cache_file:
+            return []
+        return [(self.translation_cache_file, "translations.json")]
+
+    def dedupe_submission(self, fn):
+        """
+        Idempotent POST for the service worker's retries: a repeated
+        X-Submission-Id from the same participant gets the first (2xx) response
+        back instead of being handled (and logged) again.
+        """
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            submission_id = request.headers.get("X-Submission-Id", "")
+            participant_id = session.get("participant_id")
+            if not participant_id or not SUBMISSION_ID.match(submission_id):
+                return fn(*args, **kwargs)
+            with self.submission_locks.hold(participant_id):
+                seen = self.submissions.get(participant_id, submission_id)
+                if seen is not None:
+                    status, body = seen
+                    response = Response(body, status=status, mimetype="application/json")
+                    response.headers["X-Submission-Duplicate"] = "1"
+                    return response
+                response = make_response(fn(*args, **kwargs))
+                if 200 <= response.status_code < 300 and response.mimetype == "application/json":
+                    self.submissions.record(participant_id, submission_id, response.status_code,
+                                            response.get_data(as_text=True))
+                return response
+        return wrapper
+
+
+def create_app(name, arm_dir, import_name, timing=True):
+    """The arm's Flask app and its Arm, with the shared routes registered."""
+    from study_core.shared_routes import shared
+
+    app = Flask(import_name, root_path=arm_dir, template_folder="templates", static_folder="static")
+
+    # Use a STABLE secret key (do NOT rotate on each run or the session cookie dies)
+    # Set FLASK_SECRET_KEY in your shell for production; this default is fine locally.
+    app.secret_key = os.environ.get("FLASK_SECRET_KEY", "dev-secret-change-me")
+
+    # Optional: make cookies predictable in localhost dev
+    app.config.update(SESSION_COOKIE_SAMESITE="Lax", SESSION_COOKIE_SECURE=False)
+
+    arm = Arm(name, arm_dir, app, timing=timing)
+    app.extensions["study_arm"] = arm
+
+    # Compiled templates are shared on disk as Jinja bytecode, written at build time by
+    # scripts/precompile_templates.py, so a fresh worker loads them instead of compiling
+    # from source. TEMPLATE_CACHE=0 compiles in memory only.
+    if os.environ.get("TEMPLATE_CACHE", "1") == "1":
+        try:
+            os.makedirs(arm.template_cache_dir, exist_ok=True)
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache(arm.template_cache_dir)
+        except OSError as e:
+            print(f"[TEMPLATES] Bytecode cache disabled ({arm.template_cache_dir}: {e})")
+
+    # Compression + static assets (precompressed variants, content-hashed URLs)
+    app.view_functions["static"] = arm.static_assets.send
+    app.jinja_env.globals["static_url"] = arm.static_assets.url
+    app.after_request(ResponseCompressor())
+
+    app.before_request(arm.start_warmup)
+    app.register_blueprint(shared)
+    return app, arm
+
+
+def _module_dir(module):
+    path = getattr(module, "__file__", None)
+    return os.path.dirname(os.path.abspath(path)) if path else None
+
+
+def load_arm(path):
+    """Import the arm module at `path` as study_arm_<file name>; repeated calls return the same module."""
+    path = os.path.abspath(path)
+    arm_dir = os.path.dirname(path)
+    name = "study_arm_" + os.path.splitext(os.path.basename(path))[0]
+    with _load_lock:
+        if name in sys.modules:
+            module = sys.modules[name]
+            if os.path.abspath(module.__file__) != path:
+                raise ImportError(f"{name} is already loaded from {module.__file__}, not {path}")
+            return module
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        before = set(sys.modules)
+        sys.modules[name] = module
+        sys.path.insert(0, arm_dir)
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            sys.modules.pop(name, None)
+            raise
+        finally:
+            sys.path.remove(arm_dir)
+
+        # Sibling modules stay bound in the arm's namespace but not under their bare names
+        for added in set(sys.modules) - before - {name}:
+            if _module_dir(sys.modules[added]) == arm_dir:
+                del sys.modules[added]
+
+        others = {d: n for d, n in _loaded_arms.items() if d != arm_dir}
+        for value in vars(module).values():
+            source = _module_dir(value) if isinstance(value, types.ModuleType) else None
+            if source in others:
+                sys.modules.pop(name, None)
+                raise ImportError(f"{path} imported {value.__name__} from the {others[source]} arm ({source})")
+        _loaded_arms[arm_dir] = name
+        return module
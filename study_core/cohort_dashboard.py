@@ -0,0 +1,343 @@
+"""
+Incrementally updated cohort aggregates for the live admin dashboard.
+
+log_data() hands every event to CohortAggregates.observe(), which keeps:
+
+- completions per condition cell (structure x timing order x article order)
+- participants currently stopped at each stage (dropout by phase)
+- stage durations in sorted lists, so medians are an O(1) lookup; past
+  MAX_DURATION_SAMPLES per stage the list is a uniform reservoir sample
+  (Algorithm R), so memory stays bounded and the median an estimate
+- running MCQ correct / total per timing (and per structure x timing)
+- reading heatmaps: summed per-paragraph dwell shares per article x timing
+  (each reading_dwell histogram is normalised, so every reader counts once)
+
+A stage's duration is the time from the participant's previous milestone to
+this one (pages are logged on submit), so "recall" includes the break before
+the test. /admin/dashboard only reads these counters; it never touches the
+CSV files. At startup the existing logs are replayed once so a restart does
+not reset the dashboard (the app's cohort_replay warmup step). The replay
+runs while participants are already submitting, so it skips rows written
+after the aggregates were created (log_data has observed those live), and
+with replay=True live events are held until the replay is done, so every
+participant's events are folded in order. Only the standard library is
+used.
+
+Both arms use it. The control arm logs no timing column (its rows are
+labelled "control") and has no manipulation check: a session there is
+complete at the post-article ratings of the last article.
+"""
+
+import bisect
+import csv
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+# Milestones in the order a participant reaches them
+STAGES = [
+    "demographics", "consent", "prior_knowledge", "instructions", "ai_trust", "randomization",
+    "summary", "reading", "recall", "mcq", "post_article_ratings", "manipulation_check",
+]
+COMPLETION_STAGE = "manipulation_check"
+CONTROL_TIMING = "control"
+MAX_STAGE_SECONDS = 3 * 3600  # longer gaps are abandoned sessions, not durations
+MAX_DURATION_SAMPLES = 2048   # per stage
+
+_PHASE_STAGES = {
+    "demographics": "demographics",
+    "consent": "consent",
+    "prior_knowledge": "prior_knowledge",
+    "instructions": "instructions",
+    "ai_trust": "ai_trust",
+    "randomization": "randomization",
+    "summary_viewing": "summary",
+    "recall_response": "recall",
+    "mcq_responses": "mcq",
+    "test_responses": "mcq",
+    "post_article_ratings": "post_article_ratings",
+    "manipulation_check": "manipulation_check",
+}
+
+
+def _stage(phase, data):
+    if phase == "reading_behavior":
+        return "reading" if data.get("event") == "reading_complete" or data.get("skipped") else None
+    return _PHASE_STAGES.get(phase)
+
+
+def _json_list(value):
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    try:
+        parsed = json.loads(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if isinstance(parsed, list) else None
+
+
+def _median(sorted_values):
+    n = len(sorted_values)
+    if not n:
+        return None
+    mid = n // 2
+    return sorted_values[mid] if n % 2 else (sorted_values[mid - 1] + sorted_values[mid]) / 2
+
+
+def _as_int(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+class CohortAggregates:
+    """Running cohort counters; every update and snapshot is independent of cohort size."""
+
+    def __init__(self, completion_stage=COMPLETION_STAGE, articles=None, timing_column=True, replay=False):
+        """
+        completion_stage: the milestone that ends a session; with `articles` it
+        only counts for the last article (article_num == articles - 1).
+        timing_column: False for an arm whose rows have no timing (control).
+        replay: replay_dir() will seed the aggregates; observe() holds events until it has run.
+        """
+        self.completion_stage = completion_stage
+        self.articles = articles
+        self.timing_column = timing_column
+        self.default_timing = "unknown" if timing_column else CONTROL_TIMING
+        self._lock = threading.Lock()
+        self.created = time.time()  # replay cutoff: later rows were observed live
+        self._pending = [] if replay else None
+        self._participants = {}
+        self.started = 0
+        self.completions = defaultdict(int)         # cell -> completed participants
+        self.assigned = defaultdict(int)            # cell -> randomized participants
+        self.current_stage = defaultdict(int)       # stage -> participants stopped there (not completed)
+        self.durations = defaultdict(list)          # stage -> sorted seconds (reservoir sample)
+        self.duration_counts = defaultdict(int)     # stage -> durations seen
+        self._rng = random.Random(0)
+        self.mcq_by_timing = defaultdict(lambda: [0, 0])
+        self.mcq_by_cell = defaultdict(lambda: [0, 0])   # (structure, timing) -> [correct, total]
+        self.dwell = {}                              # (article_key, timing) -> [readers, total ms, [share sums]]
+        self.last_event = None
+
+    def observe(self, participant_id, phase, data, at=None):
+        """Fold one logged event into the aggregates (held back while a replay is pending)."""
+        if not participant_id:
+            return
+        at = time.time() if at is None else at
+        if self._pending is not None:
+            with self._lock:
+                if self._pending is not None:
+                    self._pending.append((participant_id, phase, data, at))
+                    return
+        self._observe(participant_id, phase, data, at)
+
+    def _observe(self, participant_id, phase, data, at):
+        data = data or {}
+        stage = _stage(phase, data)
+        with self._lock:
+            self.last_event = max(self.last_event or at, at)
+            state = self._participants.get(participant_id)
+            if state is None:
+                state = {"stage": None, "last_milestone": None, "cell": None, "structure": "", "completed": False}
+                self._participants[participant_id] = state
+                self.started += 1
+
+            if phase == "randomization":
+                timing_order = _json_list(data.get("timing_order")) or []
+                article_order = _json_list(data.get("article_order")) or []
+                cell = (str(data.get("structure", "")), ">".join(timing_order), ">".join(article_order))
+                if state["cell"] != cell:
+                    if state["cell"] is not None:
+                        self.assigned[state["cell"]] -= 1
+                    self.assigned[cell] += 1
+                    state["cell"] = cell
+                    state["structure"] = cell[0]
+
+            elif phase == "mcq_responses":
+                correct, total = _as_int(data.get("correct_count")), _as_int(data.get("total_questions"))
+                timing = str(data.get("timing") or self.default_timing)
+                for bucket in (self.mcq_by_timing[timing], self.mcq_by_cell[(state["structure"], timing)]):
+                    bucket[0] += correct
+                    bucket[1] += total
+
+            elif phase == "reading_behavior" and data.get("event") == "reading_dwell":
+                self._add_dwell(str(data.get("article_key") or "unknown"), str(data.get("timing") or self.default_timing),
+                                _json_list(data.get("dwell_ms")) or [])
+
+            if stage is None:
+                return
+            if state["last_milestone"] is not None and not data.get("skipped"):
+                seconds = at - state["last_milestone"]
+                if 0 <= seconds <= MAX_STAGE_SECONDS:
+                    self._add_duration(stage, round(seconds, 1))
+            state["last_milestone"] = at
+
+            if state["completed"]:
+                return
+            if state["stage"] is not None:
+                self.current_stage[state["stage"]] -= 1
+            if stage == self.completion_stage and (
+                    self.articles is None or _as_int(data.get("article_num")) == self.articles - 1):
+                state["completed"] = True
+                state["stage"] = None
+                self.completions[state["cell"] or ("", "", "")] += 1
+            else:
+                state["stage"] = stage
+                self.current_stage[stage] += 1
+
+    def _add_duration(self, stage, seconds):
+        values = self.durations[stage]
+        self.duration_counts[stage] += 1
+        if len(values) >= MAX_DURATION_SAMPLES:
+            # Keep each of the n durations seen with probability MAX_DURATION_SAMPLES / n;
+            # the reservoir is unordered, so the evicted slot can be any sorted position
+            slot = self._rng.randrange(self.duration_counts[stage])
+            if slot >= MAX_DURATION_SAMPLES:
+                return
+            del values[slot]
+        bisect.insort(values, seconds)
+
+    def _add_dwell(self, article_key, timing, dwell_ms):
+        values = [max(0, _as_int(v)) for v in dwell_ms]
+        total = sum(values)
+        if not total:
+            return
+        entry = self.dwell.setdefault((article_key, timing), [0, 0, []])
+        entry[0] += 1
+        entry[1] += total
+        sums = entry[2]
+        if len(sums) < len(values):
+            sums.extend([0.0] * (len(values) - len(sums)))
+        for i, v in enumerate(values):
+            sums[i] += v / total
+
+    def replay_log(self, path):
+        """Fold in an existing participant log (server timestamps) up to the creation of the aggregates."""
+        participant_id = re.split(r"[-_]", os.path.basename(path), maxsplit=1)[0]
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                if len(row) < 2:
+                    continue
+                try:
+                    at = datetime.fromisoformat(row[0]).timestamp()
+                except ValueError:
+                    continue
+                if at >= self.created:
+                    continue
+                phase, values = row[1], row[2:]
+                # Rows are positional (DictWriter with the first row's header), so only the
+                # fields the aggregates need are recovered
+                data = {}
+                if phase == "reading_behavior" and values:
+                    data["event"] = values[0]
+                    if values[0] == "reading_dwell" and len(values) > 6:
+                        # event, timestamp, paragraphs, dwell_ms, dwell_samples, article_num, article_key[, timing]
+                        data.update(dwell_ms=values[3], article_key=values[6])
+                        if self.timing_column and len(values) > 7:
+                            data["timing"] = values[7]
+                elif phase == "randomization" and values:
+                    if not values[0].startswith("["):
+                        data["structure"] = values[0]  # the control arm logs no structure
+                    for value in values:
+                        items = _json_list(value) if value.startswith("[") else None
+                        if items and "synchronous" in items:
+                            data["timing_order"] = items
+                        elif items:
+                            data["article_order"] = items
+                elif phase == "mcq_responses" and self.timing_column and len(values) > 8:
+                    data.update(timing=values[2], correct_count=values[7], total_questions=values[8])
+                elif phase == "mcq_responses" and len(values) > 7:
+                    data.update(correct_count=values[6], total_questions=values[7])
+                elif phase == "post_article_ratings" and values:
+                    data["article_num"] = values[0]
+                self._observe(participant_id, phase, data, at)
+
+    def replay_dir(self, data_dir):
+        """Seed the aggregates from every *_log.csv in data_dir, then the held live events. Returns the number of logs read."""
+        count = 0
+        try:
+            for filename in sorted(os.listdir(data_dir)) if os.path.isdir(data_dir) else []:
+                if not filename.endswith("_log.csv"):
+                    continue
+                try:
+                    self.replay_log(os.path.join(data_dir, filename))
+                    count += 1
+                except Exception as e:
+                    print(f"[DASHBOARD] Could not replay {filename}: {e}")
+        finally:
+            self._release_pending()
+        return count
+
+    def _release_pending(self):
+        while True:
+            with self._lock:
+                pending = self._pending
+                self._pending = [] if pending else None
+            if not pending:
+                return
+            for event in pending:
+                self._observe(*event)
+
+    def snapshot(self):
+        """JSON-ready dashboard data."""
+        with self._lock:
+            cells = []
+            for cell in sorted(set(self.assigned) | set(self.completions)):
+                structure, timing_order, article_order = cell
+                cells.append({
+                    "structure": structure or "unknown",
+                    "timing_order": timing_order,
+                    "article_order": article_order,
+                    "assigned": self.assigned.get(cell, 0),
+                    "completed": self.completions.get(cell, 0),
+                })
+            completed = sum(self.completions.values())
+            dropout = [{"stage": s, "participants": self.current_stage.get(s, 0)}
+                       for s in STAGES if self.current_stage.get(s, 0)]
+            durations = [{
+                "stage": s,
+                "n": self.duration_counts[s],
+                "median_seconds": _median(self.durations[s]),
+            } for s in STAGES if self.durations.get(s)]
+            mcq_timing = [{
+                "timing": timing,
+                "correct": correct,
+                "total": total,
+                "accuracy": round(correct / total, 3) if total else None,
+            } for timing, (correct, total) in sorted(self.mcq_by_timing.items())]
+            mcq_cells = [{
+                "structure": structure or "unknown",
+                "timing": timing,
+                "correct": correct,
+                "total": total,
+                "accuracy": round(correct / total, 3) if total else None,
+            } for (structure, timing), (correct, total) in sorted(self.mcq_by_cell.items())]
+            heatmaps = [{
+                "article_key": article_key,
+                "timing": timing,
+                "readers": readers,
+                "mean_seconds": round(total_ms / readers / 1000, 1),
+                "shares": [round(v / readers, 3) for v in sums],
+            } for (article_key, timing), (readers, total_ms, sums) in sorted(self.dwell.items())]
+            return {
+                "participants": self.started,
+                "completed": completed,
+                "in_progress_or_dropped": self.started - completed,
+                "last_event": datetime.fromtimestamp(self.last_event).astimezone().isoformat()
+                if self.last_event else None,
+                "cells": cells,
+                "dropout_by_stage": dropout,
+                "stage_durations": durations,
+                "mcq_accuracy_by_timing": mcq_timing,
+                "mcq_accuracy_by_structure_timing": mcq_cells,
+                "reading_heatmaps": heatmaps,
+            }
@@ -0,0 +1,197 @@
+"""
+Response compression and cache headers.
+
+Dynamic responses (HTML pages, JSON) are compressed in an after_request hook
+with brotli when the optional `brotli` package is installed and the browser
+accepts it, else gzip. Compressed bodies of responses that carry a strong
+ETag (the rendered-page cache) are memoised, so a cached page is compressed
+once per encoding rather than on every request. Compressed responses get a
+weak ETag (as nginx does), which still revalidates to a 304.
+
+Files under static/ (and study_core/static/, shared by both arms) are served
+through StaticAssets: precompressed .br / .gz siblings (written by
+precompress() at warmup or by scripts/precompress_static.py) are sent as-is,
+and URLs built with static_url() carry a content hash (?v=...) so they can
+be cached for a year as immutable. Unversioned static URLs are revalidated instead.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+
+from flask import abort, request, send_file, url_for
+from werkzeug.security import safe_join
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    "text/html", "text/css", "text/plain", "text/csv", "text/javascript",
+    "application/javascript", "application/json", "image/svg+xml",
+}
+MIN_SIZE = 512
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5            # dynamic responses: fast enough per request
+BROTLI_QUALITY_STATIC = 11    # precompressed once
+STATIC_MAX_AGE = 365 * 24 * 3600
+MAX_MEMO = 256
+
+
+def available_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encodings, encodings=None):
+    """Best content coding the client accepts (q > 0), or None for identity."""
+    for coding in encodings or available_encodings():
+        if accept_encodings[coding] > 0:
+            return coding
+    return None
+
+
+def compress(data, coding, static=False):
+    if coding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY_STATIC if static else BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=9 if static else GZIP_LEVEL, mtime=0)
+
+
+class ResponseCompressor:
+    """after_request hook compressing text responses; memoises bodies by strong ETag."""
+
+    def __init__(self, max_entries=MAX_MEMO, min_size=MIN_SIZE):
+        self.max_entries = max_entries
+        self.min_size = min_size
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or "Content-Encoding" in response.headers
+                or response.mimetype not in COMPRESSIBLE_TYPES):
+            return response
+        response.vary.add("Accept-Encoding")
+        coding = negotiate(request.accept_encodings)
+        if coding is None or (response.content_length or 0) < self.min_size:
+            return response
+
+        etag, weak = response.get_etag()
+        key = (etag, coding) if etag and not weak else None
+        body = None
+        if key is not None:
+            with self._lock:
+                body = self._memo.get(key)
+                if body is not None:
+                    self._memo.move_to_end(key)
+        if body is None:
+            body = compress(response.get_data(), coding)
+            if key is not None:
+                with self._lock:
+                    self._memo[key] = body
+                    while len(self._memo) > self.max_entries:
+                        self._memo.popitem(last=False)
+
+        response.set_data(body)
+        response.headers["Content-Encoding"] = coding
+        if etag:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+def precompress(static_dir, encodings=None):
+    """Write <file>.gz / <file>.br next to each compressible static file when missing or stale.
+
+    Returns the number of files written.
+    """
+    written = 0
+    for root, _, files in os.walk(static_dir):
+        for name in files:
+            if name.endswith((".gz", ".br")):
+                continue
+            path = os.path.join(root, name)
+            if mimetypes.guess_type(name)[0] not in COMPRESSIBLE_TYPES or os.path.getsize(path) < MIN_SIZE:
+                continue
+            data = None
+            for coding in encodings or available_encodings():
+                target = path + (".br" if coding == "br" else ".gz")
+                if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+                    continue
+                if data is None:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                tmp = f"{target}.tmp{os.getpid()}"
+                with open(tmp, "wb") as f:
+                    f.write(compress(data, coding, static=True))
+                os.replace(tmp, target)
+                written += 1
+    return written
+
+
+class StaticAssets:
+    """
+    Serves static/ with precompressed variants and content-hashed, immutable URLs.
+    A file missing from static_dir is looked up in shared_dirs (e.g.
+    study_core/static, the service worker both arms serve).
+    """
+
+    def __init__(self, static_dir, shared_dirs=()):
+        self.static_dir = static_dir
+        self.dirs = (static_dir,) + tuple(shared_dirs)
+        self._versions = {}
+
+    def path(self, filename):
+        """The file's path in the first directory that has it, or None."""
+        for static_dir in self.dirs:
+            path = safe_join(static_dir, filename)
+            if path is not None and os.path.isfile(path):
+                return path
+        return None
+
+    def version(self, filename):
+        """Short content hash of a static file (recomputed when its mtime changes)."""
+        path = self.path(filename)
+        if path is None:
+            return None
+        mtime = os.path.getmtime(path)
+        cached = self._versions.get(filename)
+        if cached is None or cached[0] != mtime:
+            with open(path, "rb") as f:
+                cached = (mtime, hashlib.sha1(f.read()).hexdigest()[:12])
+            self._versions[filename] = cached
+        return cached[1]
+
+    def url(self, filename):
+        """url_for('static') plus ?v=<content hash>; use this in templates."""
+        return url_for("static", filename=filename, v=self.version(filename))
+
+    def send(self, filename):
+        """View function for the static endpoint."""
+        path = self.path(filename)
+        if path is None:
+            abort(404)
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        coding = None
+        if mimetype in COMPRESSIBLE_TYPES:
+            for candidate in ("br", "gzip"):
+                variant = path + (".br" if candidate == "br" else ".gz")
+                if (request.accept_encodings[candidate] > 0 and os.path.isfile(variant)
+                        and os.path.getmtime(variant) >= os.path.getmtime(path)):
+                    coding, path = candidate, variant
+                    break
+        response = send_file(path, mimetype=mimetype, conditional=True, etag=True, max_age=0)
+        if mimetype in COMPRESSIBLE_TYPES:
+            response.vary.add("Accept-Encoding")
+        if coding:
+            response.headers["Content-Encoding"] = coding
+        if request.args.get("v") and request.args.get("v") == self.version(filename):
+            response.cache_control.public = True
+            response.cache_control.max_age = STATIC_MAX_AGE
+            response.cache_control.immutable = True
+            response.cache_control.no_cache = None
+        else:
+            response.cache_control.no_cache = True
+        return response
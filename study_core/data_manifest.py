@@ -0,0 +1,188 @@
+"""
+Content manifests and delta exports for experiment_data/.
+
+A manifest lists every exported file with its size, mtime and a block-chained
+SHA-256 (h[i+1] = sha256(h[i] + block[i]) over 1 MiB blocks, final hash =
+sha256(h[k] + tail)). The chain state at the last full block is kept with each
+entry, so when a participant log grows only the new bytes (plus at most one
+block) are hashed, and an earlier manifest's hash can be re-checked against
+the current file to prove the old content is an unchanged prefix.
+
+Manifests are content-addressed and stored in DATA_DIR/.manifests/. A delta
+against an earlier manifest lists, per file, either the whole file (new or
+rewritten) or just the appended byte range, plus deleted files.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+BLOCK_SIZE = 1024 * 1024
+MAX_MANIFESTS = 100
+_ZERO_CHAIN = "00" * 32
+
+
+def _advance(f, chain, offset, size):
+    """Hash [offset, size) of f starting from the chain state at offset.
+
+    Returns (chain, chain_offset, final_hash) for the prefix of length size.
+    """
+    f.seek(offset)
+    h = bytes.fromhex(chain)
+    pos = offset
+    while size - pos >= BLOCK_SIZE:
+        block = f.read(BLOCK_SIZE)
+        if len(block) < BLOCK_SIZE:
+            raise OSError("file shrank while hashing")
+        h = hashlib.sha256(h + block).digest()
+        pos += BLOCK_SIZE
+    tail = f.read(size - pos)
+    if len(tail) < size - pos:
+        raise OSError("file shrank while hashing")
+    return h.hex(), pos, hashlib.sha256(h + tail).hexdigest()
+
+
+def file_hash(path, size=None):
+    """Block-chained hash of the first `size` bytes of a file (whole file by default)."""
+    size = os.path.getsize(path) if size is None else size
+    with open(path, "rb") as f:
+        return _advance(f, _ZERO_CHAIN, 0, size)[2]
+
+
+def hash_entry(path, name, previous=None):
+    """Manifest entry for one file, extending `previous` when the file only grew."""
+    st = os.stat(path)
+    size, mtime_ns = st.st_size, st.st_mtime_ns
+    if previous and previous["size"] == size and previous["mtime_ns"] == mtime_ns:
+        return dict(previous)
+
+    with open(path, "rb") as f:
+        chain, chain_offset = _ZERO_CHAIN, 0
+        if previous and size >= previous["size"]:
+            # Re-hash only the old tail block to confirm the old content is a prefix
+            try:
+                if _advance(f, previous["chain"], previous["chain_offset"], previous["size"])[2] == previous["hash"]:
+                    chain, chain_offset = previous["chain"], previous["chain_offset"]
+            except OSError:
+                pass
+        chain, chain_offset, digest = _advance(f, chain, chain_offset, size)
+
+    return {
+        "name": name,
+        "size": size,
+        "mtime_ns": mtime_ns,
+        "mtime": datetime.fromtimestamp(st.st_mtime).astimezone().isoformat(),
+        "hash": digest,
+        "chain": chain,
+        "chain_offset": chain_offset,
+    }
+
+
+def is_prefix(path, entry):
+    """True if the first entry['size'] bytes of path still hash to entry['hash']."""
+    try:
+        if os.path.getsize(path) < entry["size"]:
+            return False
+        with open(path, "rb") as f:
+            return _advance(f, entry["chain"], entry["chain_offset"], entry["size"])[2] == entry["hash"]
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+class ManifestStore:
+    """Builds, persists and diffs manifests for a data directory."""
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.manifest_dir = os.path.join(data_dir, ".manifests")
+        self._lock = threading.Lock()
+        self._latest = {}   # name -> entry, reused when size and mtime are unchanged
+
+    def build(self, entries):
+        """Manifest for (path, name) pairs; persisted and returned as a dict."""
+        with self._lock:
+            files = []
+            for path, name in entries:
+                try:
+                    files.append(hash_entry(path, name, self._latest.get(name)))
+                except OSError:
+                    continue  # renamed or removed while listing
+            self._latest = {entry["name"]: entry for entry in files}
+
+            digest = hashlib.sha256()
+            for entry in files:
+                digest.update(f"{entry['name']}\0{entry['size']}\0{entry['hash']}\n".encode("utf-8"))
+            manifest = {
+                "manifest_id": digest.hexdigest()[:16],
+                "created": datetime.now().astimezone().isoformat(),
+                "block_size": BLOCK_SIZE,
+                "files": files,
+            }
+            self._save(manifest)
+            return manifest
+
+    def _save(self, manifest):
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        path = os.path.join(self.manifest_dir, f"{manifest['manifest_id']}.json")
+        if not os.path.exists(path):
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            os.replace(tmp, path)
+        self._prune()
+
+    def _prune(self):
+        saved = [os.path.join(self.manifest_dir, n) for n in os.listdir(self.manifest_dir) if n.endswith(".json")]
+        if len(saved) <= MAX_MANIFESTS:
+            return
+        saved.sort(key=os.path.getmtime)
+        for path in saved[:-MAX_MANIFESTS]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def load(self, manifest_id):
+        """Earlier manifest by id, or None if unknown (or pruned)."""
+        if not manifest_id or not all(c in "0123456789abcdef" for c in manifest_id):
+            return None
+        path = os.path.join(self.manifest_dir, f"{manifest_id}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def delta(self, old, new, paths):
+        """Changes from manifest `old` (None = everything) to `new`.
+
+        paths: {name: path} for the files in `new`.
+        Returns a dict with "files" (mode full/append with offset and length)
+        and "deleted" names.
+        """
+        old_files = {entry["name"]: entry for entry in (old or {}).get("files", [])}
+        changes = []
+        for entry in new["files"]:
+            before = old_files.get(entry["name"])
+            if before and before["hash"] == entry["hash"]:
+                continue
+            if before and entry["size"] > before["size"] and is_prefix(paths[entry["name"]], before):
+                mode, offset = "append", before["size"]
+            else:
+                mode, offset = "full", 0
+            changes.append({
+                "name": entry["name"],
+                "mode": mode,
+                "offset": offset,
+                "length": entry["size"] - offset,
+                "size": entry["size"],
+                "hash": entry["hash"],
+            })
+        new_names = {entry["name"] for entry in new["files"]}
+        return {
+            "manifest_id": new["manifest_id"],
+            "since": (old or {}).get("manifest_id"),
+            "files": changes,
+            "deleted": sorted(name for name in old_files if name not in new_names),
+        }
@@ -0,0 +1,161 @@
+"""
+Compact edit timeline of the free-recall bullets.
+
+test.html records every change to a bullet input as one operation
+(dt, bullet, offset, length): milliseconds since the previous operation (the
+first one since the recall started), the bullet number, where the change
+happened and how many characters were inserted (> 0) or deleted (< 0). A
+replacement (typing over a selection) is a delete followed by an insert
+with dt = 0. The typed text itself is not recorded; the final text is in
+the recall_response row.
+
+Wire format (version 1): per operation four zigzag LEB128 varints
+    dt, bullet, offset - cursor, length
+where cursor is where the previous operation in the same bullet left the
+caret (offset + inserted length), so sequential typing encodes as
+(dt, bullet, 0, 1) and most operations take four bytes. The byte string is
+gzip-compressed in the browser when CompressionStream is available
+("encoding": "gzip", else "raw") and sent base64-encoded with the recall:
+
+    {"v": 1, "encoding": "gzip", "ops": 412, "truncated": false, "data": "H4sI..."}
+
+decode() turns a payload back into absolute operations and summarize()
+reduces them to writing bursts and pauses.
+"""
+
+import base64
+import gzip
+import statistics
+import zlib
+from collections import namedtuple
+
+VERSION = 1
+MAX_PAYLOAD_CHARS = 512 * 1024       # base64 characters accepted per recall
+MAX_DECODED_BYTES = 4 * 1024 * 1024
+PAUSE_MS = 2000                      # a gap of at least this long ends a burst
+PAUSE_BINS_MS = (2000, 5000, 10000, 30000)
+
+Op = namedtuple("Op", "t_ms bullet offset length")
+
+
+def _varints(raw):
+    value = shift = 0
+    for byte in raw:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            if shift > 63:
+                raise ValueError("varint too long")
+            continue
+        yield (value >> 1) ^ -(value & 1)
+        value = shift = 0
+    if shift:
+        raise ValueError("truncated varint")
+
+
+def decode(payload):
+    """Payload dict (as sent by test.html) -> list of Op with times relative to the recall start.
+
+    Raises ValueError if the payload is malformed.
+    """
+    if not isinstance(payload, dict) or payload.get("v") != VERSION:
+        raise ValueError("unsupported edit timeline payload")
+    data = payload.get("data")
+    if not isinstance(data, str) or len(data) > MAX_PAYLOAD_CHARS:
+        raise ValueError("edit timeline data missing or too large")
+    try:
+        raw = base64.b64decode(data, validate=True)
+        if payload.get("encoding") == "gzip":
+            inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            raw = inflater.decompress(raw, MAX_DECODED_BYTES)
+            if inflater.unconsumed_tail:
+                raise ValueError("edit timeline too large")
+        elif payload.get("encoding") != "raw":
+            raise ValueError(f"unknown encoding {payload.get('encoding')!r}")
+    except (ValueError, zlib.error) as e:
+        raise ValueError(f"cannot decode edit timeline: {e}") from None
+
+    values = list(_varints(raw))
+    if len(values) % 4:
+        raise ValueError("edit timeline length is not a multiple of 4")
+    ops = []
+    cursors = {}
+    t_ms = 0
+    for i in range(0, len(values), 4):
+        dt, bullet, offset_delta, length = values[i:i + 4]
+        if dt < 0 or bullet < 0:
+            raise ValueError("negative time step or bullet number")
+        t_ms += dt
+        offset = cursors.get(bullet, 0) + offset_delta
+        if offset < 0:
+            raise ValueError("negative offset")
+        cursors[bullet] = offset + max(length, 0)
+        ops.append(Op(t_ms, bullet, offset, length))
+    if "ops" in payload and payload["ops"] != len(ops):
+        raise ValueError(f"expected {payload['ops']} operations, decoded {len(ops)}")
+    return ops
+
+
+def encode(ops, encoding="gzip"):
+    """List of Op -> payload dict (the inverse of decode(); used by scripts and checks)."""
+    out = bytearray()
+    cursors = {}
+    last_t = 0
+    for op in ops:
+        offset_delta = op.offset - cursors.get(op.bullet, 0)
+        cursors[op.bullet] = op.offset + max(op.length, 0)
+        for value in (op.t_ms - last_t, op.bullet, offset_delta, op.length):
+            value = (value << 1) ^ (value >> 63)
+            while value > 0x7F:
+                out.append((value & 0x7F) | 0x80)
+                value >>= 7
+            out.append(value)
+        last_t = op.t_ms
+    raw = gzip.compress(bytes(out)) if encoding == "gzip" else bytes(out)
+    return {"v": VERSION, "encoding": encoding, "ops": len(ops), "truncated": False,
+            "data": base64.b64encode(raw).decode("ascii")}
+
+
+def bursts(ops, pause_ms=PAUSE_MS):
+    """Split operations at gaps >= pause_ms -> list of (start_ms, end_ms, inserted, deleted, n_ops)."""
+    result = []
+    current = None
+    for op in ops:
+        if current is None or op.t_ms - current[1] >= pause_ms:
+            current = [op.t_ms, op.t_ms, 0, 0, 0]
+            result.append(current)
+        current[1] = op.t_ms
+        current[2 if op.length > 0 else 3] += abs(op.length)
+        current[4] += 1
+    return [tuple(b) for b in result]
+
+
+def summarize(ops, pause_ms=PAUSE_MS):
+    """Writing-burst and pause measures for one recall."""
+    gaps = [b.t_ms - a.t_ms for a, b in zip(ops, ops[1:])]
+    pauses = [g for g in gaps if g >= pause_ms]
+    spans = bursts(ops, pause_ms)
+    inserted = sum(op.length for op in ops if op.length > 0)
+    deleted = -sum(op.length for op in ops if op.length < 0)
+    row = {
+        "ops": len(ops),
+        "first_edit_ms": ops[0].t_ms if ops else "",
+        "last_edit_ms": ops[-1].t_ms if ops else "",
+        "inserted_chars": inserted,
+        "deleted_chars": deleted,
+        "final_chars": inserted - deleted,
+        "bullets_edited": len({op.bullet for op in ops}),
+        "bursts": len(spans),
+        "mean_burst_chars": round(statistics.mean(b[2] for b in spans), 1) if spans else "",
+        "mean_burst_ms": round(statistics.mean(b[1] - b[0] for b in spans)) if spans else "",
+        "median_gap_ms": statistics.median(gaps) if gaps else "",
+        "pauses": len(pauses),
+        "pause_total_ms": sum(pauses),
+        "median_pause_ms": statistics.median(pauses) if pauses else "",
+        "max_pause_ms": max(pauses) if pauses else "",
+    }
+    edges = PAUSE_BINS_MS + (float("inf"),)
+    for low, high in zip(edges, edges[1:]):
+        label = f"pauses_{low // 1000}s_plus" if high == float("inf") else f"pauses_{low // 1000}_{high // 1000}s"
+        row[label] = sum(1 for p in pauses if low <= p < high)
+    return row
@@ -0,0 +1,140 @@
+"""
+Participant -> log file index.
+
+A participant's log starts as <PID>_log.csv and is renamed once to
+<PID>-<name>-<condition>_log.csv when the name (and, in the AI app, the
+structure) is known. LogPaths keeps that mapping in memory and appends every
+change to DATA_DIR/.log_index ("PID<TAB>filename" lines, later lines win),
+so log_data() never has to probe the filesystem for the current name and
+analysis tools can look a participant up without listing the directory.
+
+Other processes' changes are picked up by reading any new index lines
+(one pread, no stat) before each lookup. Callers hold the participant's
+lock from log_lock.py, which keeps the rename and its index line together.
+"""
+
+import glob
+import os
+import re
+import threading
+
+INDEX_FILE = ".log_index"
+_CHUNK = 1 << 16
+
+
+def named_log(data_dir, participant_id):
+    """<PID>-<name>-<condition>_log.csv if the participant's log was already renamed, else None."""
+    matches = sorted(glob.glob(os.path.join(data_dir, f"{glob.escape(str(participant_id))}-*_log.csv")))
+    return matches[0] if matches else None
+
+
+def _parse_index(text, paths):
+    for line in text.splitlines():
+        participant_id, sep, filename = line.partition("\t")
+        if sep and filename:
+            paths[participant_id] = filename
+
+
+def scan_logs(data_dir):
+    """participant id -> log filename from a directory listing (renamed logs win over <PID>_log.csv)."""
+    paths = {}
+    for filename in sorted(os.listdir(data_dir)):
+        if filename.endswith("_log.csv"):
+            participant_id = re.split(r"[-_]", filename, maxsplit=1)[0]
+            if participant_id not in paths or filename != f"{participant_id}_log.csv":
+                paths[participant_id] = filename
+    return paths
+
+
+def load_index(data_dir):
+    """participant id -> log path, read from the index (scans data_dir if there is none)."""
+    paths = {}
+    try:
+        with open(os.path.join(data_dir, INDEX_FILE), "r", encoding="utf-8") as f:
+            _parse_index(f.read(), paths)
+    except OSError:
+        pass
+    if not paths:
+        paths = scan_logs(data_dir)
+    return {participant_id: os.path.join(data_dir, filename) for participant_id, filename in paths.items()}
+
+
+def find_log(data_dir, participant_id):
+    """One participant's log path, or None.
+
+    Looks in the index first. On a miss or a stale entry (e.g. logs copied in
+    from another server) the directory is scanned and the result appended to
+    the index, so the next lookup is a hit.
+    """
+    path = load_index(data_dir).get(participant_id)
+    if path and os.path.exists(path):
+        return path
+    filename = scan_logs(data_dir).get(participant_id)
+    if filename is None:
+        return None
+    try:
+        fd = os.open(os.path.join(data_dir, INDEX_FILE), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, f"{participant_id}\t{filename}\n".encode("utf-8"))
+        finally:
+            os.close(fd)
+    except OSError:
+        pass  # read-only copy of the data; the scan result is still right
+    return os.path.join(data_dir, filename)
+
+
+class LogPaths:
+    """Resolves and fixes each participant's log path once."""
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self._paths = {}
+        self._offset = 0
+        self._lock = threading.Lock()
+        self._fd = os.open(os.path.join(data_dir, INDEX_FILE), os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        with self._lock:
+            self._refresh()
+            if not self._paths:
+                # First start with the index: adopt logs written before it existed
+                self._append(scan_logs(data_dir).items())
+
+    def _refresh(self):
+        while True:
+            chunk = os.pread(self._fd, _CHUNK, self._offset)
+            end = chunk.rfind(b"\n") + 1
+            if not end:
+                return
+            _parse_index(chunk[:end].decode("utf-8"), self._paths)
+            self._offset += end
+
+    def _append(self, items):
+        lines = "".join(f"{participant_id}\t{filename}\n" for participant_id, filename in items)
+        if lines:
+            os.write(self._fd, lines.encode("utf-8"))
+            self._refresh()
+
+    def resolve(self, participant_id, named=None):
+        """Path to append to; renames <PID>_log.csv to `named` (a filename) the first time one is given."""
+        plain = f"{participant_id}_log.csv"
+        with self._lock:
+            self._refresh()
+            current = self._paths.get(participant_id)
+            if current is None:
+                existing = named_log(self.data_dir, participant_id)
+                current = os.path.basename(existing) if existing else plain
+                self._append([(participant_id, current)])
+            if named and current == plain:
+                try:
+                    os.rename(os.path.join(self.data_dir, plain), os.path.join(self.data_dir, named))
+                except OSError:
+                    pass  # e.g. nothing logged under <PID>_log.csv yet; continue with the new name
+                current = named
+                self._append([(participant_id, current)])
+            return os.path.join(self.data_dir, current)
+
+    def get(self, participant_id):
+        """Current log path, or None if the participant has not logged anything."""
+        with self._lock:
+            self._refresh()
+            filename = self._paths.get(participant_id)
+        return os.path.join(self.data_dir, filename) if filename else None
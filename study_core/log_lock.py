@@ -0,0 +1,80 @@
+"""
+Per-participant locking for participant log appends.
+
+log_data() may rename <PID>_log.csv once the name / structure is known and
+then appends a row; a /log_reading beacon and a /submit_test from the same
+participant can arrive together on a threaded or multi-worker server.
+Holding the participant's lock around the rename + append keeps rows whole
+and in one file.
+
+Two levels, both striped by a hash of the participant id so different
+participants rarely contend:
+
+    in-process     one threading.Lock per stripe
+    cross-process  an fcntl byte-range lock on DATA_DIR/.log_locks at the
+                   participant's offset (POSIX record locks are per process,
+                   so the thread lock is taken first)
+
+The lock file descriptor stays open for the life of the process: closing any
+descriptor of a file drops all of the process's POSIX locks on it.
+"""
+
+import csv
+import fcntl
+import io
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+
+N_STRIPES = 64
+N_RANGES = 1 << 16
+
+
+def _hash(participant_id):
+    return zlib.crc32(str(participant_id).encode("utf-8"))
+
+
+class ParticipantLocks:
+    """Striped thread locks plus fcntl range locks keyed by participant id."""
+
+    def __init__(self, lock_path, stripes=N_STRIPES):
+        self.lock_path = lock_path
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        self._fd = None
+        self._fd_lock = threading.Lock()
+
+    def _lock_fd(self):
+        if self._fd is None:
+            with self._fd_lock:
+                if self._fd is None:
+                    self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        return self._fd
+
+    @contextmanager
+    def hold(self, participant_id):
+        h = _hash(participant_id)
+        with self._stripes[h % len(self._stripes)]:
+            fd = self._lock_fd()
+            offset = h % N_RANGES
+            fcntl.lockf(fd, fcntl.LOCK_EX, 1, offset, os.SEEK_SET)
+            try:
+                yield
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN, 1, offset, os.SEEK_SET)
+
+
+def append_row(path, fieldnames, row):
+    """Append one CSV row (plus the header if the file is new) with a single write."""
+    buf = io.StringIO(newline="")
+    w = csv.DictWriter(buf, fieldnames=fieldnames)
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        if os.fstat(fd).st_size == 0:
+            w.writeheader()
+        w.writerow(row)
+        data = buf.getvalue().encode("utf-8")
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
@@ -0,0 +1,100 @@
+"""
+Rendered-HTML cache for the static experiment pages.
+
+consent, instructions, excluded, recall_instruction, language_selection
+and break only depend on the session language and a few
+explicit template arguments, so their HTML is rendered once per key and then
+served from memory with a strong ETag (sha1 of the body). A browser that
+revalidates (reload, back navigation) gets a 304 without any rendering.
+
+The caller builds the key; it should include everything the page depends on
+(template, language, arguments, and a translation cache generation so a page
+rendered before a translation arrived is not served forever). Entries are
+kept in LRU order up to max_entries. Pages that carry per-participant
+arguments (debrief shows the participant id) are not cached: every
+participant would add an entry and evict the shared pages.
+
+Render CPU (thread time) is measured on every miss; each hit is credited with
+that template's average render cost, which /admin/page_cache reports as CPU
+saved per template, in total and per participant (the caller passes the
+participant count it already keeps; the cache itself stores no ids).
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+MAX_ENTRIES = 512
+
+
+class PageCache:
+    """LRU cache of (html, etag) plus render / hit accounting."""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _template_stats(self, template_name):
+        stats = self._stats.get(template_name)
+        if stats is None:
+            stats = self._stats[template_name] = {"renders": 0, "render_cpu_s": 0.0, "hits": 0, "not_modified": 0}
+        return stats
+
+    def get_or_render(self, key, render):
+        """(html, etag) for key; render() is called (outside the lock) only on a miss."""
+        template_name = key[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._template_stats(template_name)["hits"] += 1
+                return entry
+
+        t0 = time.thread_time()
+        html = render()
+        cpu = time.thread_time() - t0
+        entry = (html, hashlib.sha1(html.encode("utf-8")).hexdigest())
+        with self._lock:
+            stats = self._template_stats(template_name)
+            stats["renders"] += 1
+            stats["render_cpu_s"] += cpu
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def count_not_modified(self, template_name):
+        with self._lock:
+            self._template_stats(template_name)["not_modified"] += 1
+
+    def stats(self, participants=None):
+        """JSON-ready counters and estimated render CPU saved (also per participant if given)."""
+        with self._lock:
+            templates = []
+            saved_total = 0.0
+            for name, s in sorted(self._stats.items()):
+                avg = s["render_cpu_s"] / s["renders"] if s["renders"] else 0.0
+                saved = avg * s["hits"]
+                saved_total += saved
+                templates.append({
+                    "template": name,
+                    "renders": s["renders"],
+                    "hits": s["hits"],
+                    "not_modified": s["not_modified"],
+                    "avg_render_cpu_ms": round(avg * 1000, 3),
+                    "cpu_saved_ms": round(saved * 1000, 3),
+                })
+            stats = {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "cpu_saved_ms": round(saved_total * 1000, 3),
+                "templates": templates,
+            }
+        if participants is not None:
+            stats["participants"] = participants
+            stats["cpu_saved_ms_per_participant"] = round(saved_total * 1000 / participants, 3) if participants else None
+        return stats
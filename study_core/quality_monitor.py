@@ -0,0 +1,252 @@
+"""
+Streaming data-quality scoring for the experiment logs.
+
+log_data() hands every event to QualityMonitor.observe(), which updates a few
+running per-participant features in O(1) and raises flags as soon as a
+participant looks like a speeder or is inattentive:
+
+- speeder_reading   reading speed above MAX_READING_WPM (article words / reading minutes)
+- speeder_mcq       at least FAST_MCQ_SHARE of MCQ answers faster than MIN_MCQ_ANSWER_MS
+                    (answer times are cumulative; the latency is the gap between clicks)
+- tab_hidden        tab hidden for more than MAX_HIDDEN_RATIO of an article's reading time
+- paste_attempts    paste blocked in the recall box
+- over_limit        recall submitted over the word limit
+- high_familiarity  prior-knowledge exclusion rule fired
+
+Flags are kept in memory for /admin/quality and appended once to
+experiment_data/quality_flags.csv; the file is read back when the monitor is
+created, so a restarted worker keeps earlier flags. Only the
+standard library is used (the app's requirements are Flask + deep-translator).
+"""
+
+import csv
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+MAX_READING_WPM = 600        # ~2-3x normal reading speed for expository text
+MIN_MCQ_ANSWER_MS = 2000     # faster than reading the question stem
+FAST_MCQ_SHARE = 0.5
+MAX_HIDDEN_RATIO = 0.25
+
+FLAG_WEIGHTS = {
+    "speeder_reading": 30,
+    "speeder_mcq": 30,
+    "tab_hidden": 15,
+    "paste_attempts": 15,
+    "over_limit": 5,
+    "high_familiarity": 40,
+}
+
+
+def _event_time(data):
+    """Epoch seconds of an event (client timestamp if logged, else now)."""
+    ts = data.get("timestamp")
+    if ts:
+        try:
+            return datetime.fromisoformat(str(ts).replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+
+def _as_bool(value):
+    return value is True or str(value).strip().lower() == "true"
+
+
+def _as_float(value, default=0.0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class QualityMonitor:
+    """Running per-participant quality features and flags."""
+
+    def __init__(self, article_words=None, flag_log_path=None):
+        self.article_words = dict(article_words or {})
+        self.flag_log_path = flag_log_path
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._participants = {}
+        self._load_flags()
+
+    def _load_flags(self):
+        """Restore the flags persisted by earlier runs (without re-appending them)."""
+        if not self.flag_log_path or not os.path.exists(self.flag_log_path):
+            return
+        try:
+            with open(self.flag_log_path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    participant_id, flag = row.get("participant_id"), row.get("flag")
+                    if participant_id and flag:
+                        state = self._state(participant_id)
+                        state["flags"].setdefault(flag, {"detail": row.get("detail", ""),
+                                                         "at": row.get("timestamp", "")})
+        except Exception as e:
+            print(f"[QUALITY] Could not read {self.flag_log_path}: {e}")
+
+    def _state(self, participant_id):
+        state = self._participants.get(participant_id)
+        if state is None:
+            state = {
+                "events": 0,
+                "first_seen": time.time(),
+                "last_seen": None,
+                "last_phase": "",
+                "reading_wpm": {},
+                "hidden_ratio": {},
+                "hidden_ms": {},        # article_key -> hidden ms while reading it
+                "hidden_since": {},     # article_key -> epoch s the tab was hidden
+                "mcq_answers": 0,
+                "mcq_fast_answers": 0,
+                "paste_attempts": 0,
+                "over_limit_count": 0,
+                "flags": {},
+            }
+            self._participants[participant_id] = state
+        return state
+
+    def _flag(self, participant_id, state, flag, detail, new_flags):
+        if flag in state["flags"]:
+            return
+        state["flags"][flag] = {"detail": detail, "at": datetime.now().astimezone().isoformat()}
+        new_flags.append([state["flags"][flag]["at"], participant_id, flag, detail])
+        print(f"[QUALITY] {participant_id}: {flag} ({detail})")
+
+    def _persist(self, new_flags):
+        """Append new flags to the CSV (called after the state lock is released)."""
+        if not self.flag_log_path or not new_flags:
+            return
+        try:
+            with self._file_lock:
+                file_exists = os.path.exists(self.flag_log_path)
+                with open(self.flag_log_path, "a", newline="", encoding="utf-8") as f:
+                    w = csv.writer(f)
+                    if not file_exists:
+                        w.writerow(["timestamp", "participant_id", "flag", "detail"])
+                    w.writerows(new_flags)
+        except Exception as e:
+            print(f"[QUALITY] Could not persist flag: {e}")
+
+    def observe(self, participant_id, phase, data):
+        """Update features for one logged event (constant work per event)."""
+        if not participant_id:
+            return
+        data = data or {}
+        new_flags = []
+        with self._lock:
+            state = self._state(participant_id)
+            state["events"] += 1
+            state["last_seen"] = time.time()
+            state["last_phase"] = phase
+
+            if phase == "prior_knowledge":
+                reasons = str(data.get("exclusion_reasons", ""))
+                if _as_bool(data.get("excluded")) and "high_familiarity" in reasons:
+                    self._flag(participant_id, state, "high_familiarity",
+                               f"familiarity_mean={_as_float(data.get('familiarity_mean')):.2f}", new_flags)
+
+            elif phase == "reading_behavior":
+                event = data.get("event")
+                article_key = data.get("article_key") or ""
+                hidden_since = state["hidden_since"]
+                if event == "visibility_change":
+                    now = _event_time(data)
+                    if _as_bool(data.get("hidden")):
+                        hidden_since.setdefault(article_key, now)
+                    elif article_key in hidden_since:
+                        state["hidden_ms"][article_key] = (state["hidden_ms"].get(article_key, 0.0)
+                                                           + (now - hidden_since.pop(article_key)) * 1000.0)
+                elif event == "reading_complete":
+                    reading_ms = _as_float(data.get("totalReadingTime"))
+                    hidden_ms = state["hidden_ms"].pop(article_key, 0.0)
+                    if article_key in hidden_since:
+                        hidden_ms += (_event_time(data) - hidden_since.pop(article_key)) * 1000.0
+                    words = self.article_words.get(article_key, 0)
+                    if reading_ms > 0 and words:
+                        wpm = words / (reading_ms / 60000.0)
+                        state["reading_wpm"][article_key] = round(wpm, 1)
+                        if wpm > MAX_READING_WPM:
+                            self._flag(participant_id, state, "speeder_reading",
+                                       f"{article_key}: {wpm:.0f} wpm", new_flags)
+                    if reading_ms > 0:
+                        ratio = min(1.0, hidden_ms / reading_ms)
+                        state["hidden_ratio"][article_key] = round(ratio, 3)
+                        if ratio > MAX_HIDDEN_RATIO:
+                            self._flag(participant_id, state, "tab_hidden",
+                                       f"{article_key}: hidden {ratio:.0%} of reading", new_flags)
+
+            elif phase == "mcq_responses":
+                times = data.get("mcq_answer_times_ms") or {}
+                if isinstance(times, str):
+                    try:
+                        times = json.loads(times)
+                    except ValueError:
+                        times = {}
+                values = list(times.values()) if isinstance(times, dict) else list(times)
+                # Times are cumulative from the start of the MCQ page; per-answer
+                # latency is the gap to the previous click
+                cumulative = sorted(_as_float(v) for v in values if _as_float(v) > 0)
+                values = [b - a for a, b in zip([0.0] + cumulative[:-1], cumulative)]
+                state["mcq_answers"] += len(values)
+                state["mcq_fast_answers"] += sum(1 for v in values if v < MIN_MCQ_ANSWER_MS)
+                if state["mcq_answers"] and state["mcq_fast_answers"] / state["mcq_answers"] >= FAST_MCQ_SHARE:
+                    self._flag(participant_id, state, "speeder_mcq",
+                               f"{state['mcq_fast_answers']}/{state['mcq_answers']} answers < {MIN_MCQ_ANSWER_MS} ms",
+                               new_flags)
+
+            elif phase == "recall_response":
+                pastes = int(_as_float(data.get("paste_attempts")))
+                if pastes > 0:
+                    state["paste_attempts"] += pastes
+                    self._flag(participant_id, state, "paste_attempts",
+                               f"{data.get('article_key', '')}: {pastes} attempt(s)", new_flags)
+                if _as_bool(data.get("over_limit")):
+                    state["over_limit_count"] += 1
+                    self._flag(participant_id, state, "over_limit", f"{data.get('article_key', '')}", new_flags)
+        self._persist(new_flags)
+
+    def _summary(self, participant_id, state):
+        score = max(0, 100 - sum(FLAG_WEIGHTS.get(flag, 10) for flag in state["flags"]))
+        return {
+            "participant_id": participant_id,
+            "quality_score": score,
+            "flags": state["flags"],
+            "events": state["events"],
+            "last_phase": state["last_phase"],
+            "last_seen": datetime.fromtimestamp(state["last_seen"]).astimezone().isoformat()
+            if state["last_seen"] else None,
+            "reading_wpm": state["reading_wpm"],
+            "hidden_ratio": state["hidden_ratio"],
+            "mcq_fast_share": round(state["mcq_fast_answers"] / state["mcq_answers"], 3)
+            if state["mcq_answers"] else None,
+            "paste_attempts": state["paste_attempts"],
+            "over_limit_count": state["over_limit_count"],
+        }
+
+    def snapshot(self, participant_id=None, flagged_only=False):
+        """JSON-ready view of one participant or the whole cohort."""
+        with self._lock:
+            if participant_id:
+                state = self._participants.get(participant_id)
+                return self._summary(participant_id, state) if state else None
+            rows = [self._summary(pid, st) for pid, st in self._participants.items()
+                    if st["flags"] or not flagged_only]
+            total = len(self._participants)
+            flagged = sum(1 for st in self._participants.values() if st["flags"])
+        rows.sort(key=lambda r: (r["quality_score"], r["participant_id"]))
+        return {
+            "participants": total,
+            "flagged": flagged,
+            "thresholds": {
+                "max_reading_wpm": MAX_READING_WPM,
+                "min_mcq_answer_ms": MIN_MCQ_ANSWER_MS,
+                "fast_mcq_share": FAST_MCQ_SHARE,
+                "max_hidden_ratio": MAX_HIDDEN_RATIO,
+            },
+            "rows": rows,
+        }
@@ -0,0 +1,321 @@
+"""
+Routes that are the same in both arms: the service worker, the
+next-article bundles, the health probes and the ADMIN_KEY-protected admin
+endpoints. Registered on each
+arm's app by arm.create_app(); every view reads its arm's data from
+current_app.extensions["study_arm"] (see arm.Arm). Their templates live in
+study_core/templates/.
+"""
+
+import json
+import os
+from datetime import datetime
+from functools import wraps
+
+from flask import Blueprint, Response, current_app, jsonify, render_template, request, session, stream_with_context, url_for
+
+from study_core.zip_stream import export_entries, iter_zip, parse_level
+
+# templates/ holds the pages only these routes render (admin_dashboard.html)
+shared = Blueprint("shared", __name__, template_folder="templates")
+
+
+def _arm():
+    return current_app.extensions["study_arm"]
+
+
+def require_admin_key(fn):
+    """403 unless ?key= matches the ADMIN_KEY environment variable."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        admin_key = os.environ.get("ADMIN_KEY")
+        provided_key = request.args.get("key")
+        if not admin_key or provided_key != admin_key:
+            return jsonify({"error": "Unauthorized. Set ADMIN_KEY environment variable."}), 403
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def require_pid(fn):
+    """The arm's own participant guard (Arm.require_pid), looked up per request."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        return _arm().require_pid(fn)(*args, **kwargs)
+    return wrapper
+
+
+@shared.route("/sw.js")
+def service_worker():
+    """study_core/static/sw.js (unless the arm has its own) served from the root so the worker's scope covers every page"""
+    return _arm().static_assets.send("sw.js")
+
+
+@shared.after_app_request
+def _offline_scope(response):
+    # study_core/static/sw.js keys its offline copies by this; study_server.py gives each arm its own cookie name
+    response.headers["X-Offline-Scope"] = current_app.config["SESSION_COOKIE_NAME"]
+    return response
+
+
+# ------------------------------------------------------------------------------
+# Next-article bundle (prefetched by break.html) and offline article copies
+# ------------------------------------------------------------------------------
+def _timing(article_num):
+    timing_order = session.get("timing_order") or []
+    return timing_order[article_num] if 0 <= article_num < len(timing_order) else None
+
+
+@shared.route("/next_bundle/<int:article_num>")
+@require_pid
+def next_bundle(article_num: int):
+    """
+    The page that follows the between-articles break, rendered now in the
+    participant's language: in the AI arm the summary for a pre-reading
+    article whose summary has not been viewed yet, otherwise the reading
+    page. break.html shows it from memory when the break ends, so the page
+    appears without rendering it then.
+    Read-only: the session fields the page sets (current article/key/timing)
+    are recorded by /bundle_shown when the page is actually displayed.
+    """
+    arm = _arm()
+    if arm.summary_first(article_num):
+        url = url_for(arm.summary_endpoint, article_num=article_num)
+        page = arm.summary_page(article_num, record=False)
+    else:
+        url = url_for("reading_phase", article_num=article_num)
+        page = arm.reading_page(article_num, record=False)
+    if not isinstance(page, str):
+        # The route would redirect (session incomplete, out of range): let the normal navigation handle it
+        return jsonify({"url": None})
+    response = jsonify({
+        "url": url,
+        "html": page,
+        "lang": arm.get_lang(),
+        "shown_url": url_for(".bundle_shown", article_num=article_num),
+    })
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+@shared.route("/article_bundles")
+@require_pid
+def article_bundles():
+    """
+    The participant's articles in their order and language (plus the arm's
+    bundle fields: summary and timing in the AI arm), for the service
+    worker's offline reading copy. Read-only: no session changes, no logging.
+    """
+    arm = _arm()
+    article_order = session.get("article_order") or []
+    if not article_order:
+        return ("", 204)
+    articles = []
+    for article_num, article_key in enumerate(article_order):
+        article = arm.localized_article(article_key)
+        bundle = {
+            "article_num": article_num,
+            "article_key": article_key,
+            "title": article.get("title", ""),
+            "text": article.get("text", ""),
+        }
+        if arm.bundle_fields is not None:
+            bundle.update(arm.bundle_fields(article_num, article_key, article))
+        articles.append(bundle)
+    response = jsonify({"lang": arm.get_lang(), "articles": articles})
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+@shared.route("/bundle_shown/<int:article_num>", methods=["POST"])
+@require_pid
+def bundle_shown(article_num: int):
+    """break.html shows the prefetched page now: record what its GET would have"""
+    arm = _arm()
+    article_order = session.get("article_order") or []
+    if 0 <= article_num < len(article_order):
+        timing = None if arm.summary_first(article_num) else _timing(article_num)
+        arm.record_article(article_num, article_order[article_num], timing)
+    return ("", 204)
+
+
+# ------------------------------------------------------------------------------
+# Admin Data Export Routes (for cloud deployment)
+# ------------------------------------------------------------------------------
+@shared.route("/admin/export", methods=["GET"])
+@require_admin_key
+def admin_export_data():
+    """
+    Export all experiment data as a ZIP file, streamed while it is compressed
+    (no temporary file, bounded memory).
+    Requires ADMIN_KEY environment variable for security.
+    Usage: /admin/export?key=YOUR_ADMIN_KEY[&level=0-9|stored]
+    """
+    arm = _arm()
+    try:
+        compress_type, compresslevel = parse_level(request.args.get("level"))
+    except ValueError:
+        return jsonify({"error": "level must be 0-9 or 'stored'"}), 400
+
+    entries = export_entries(arm.data_dir, extra_files=arm.export_extra_files())
+    download_name = f'experiment_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip'
+    blobs = []
+
+    # Delta export: ?since=<manifest_id> (empty = everything) adds delta.json and
+    # only includes new/rewritten files and the appended ranges of growing logs
+    if "since" in request.args:
+        since = request.args.get("since", "").strip()
+        old = arm.manifests.load(since) if since else None
+        if since and old is None:
+            return jsonify({"error": f"Unknown manifest {since}; sync again with an empty since="}), 404
+        new = arm.manifests.build(entries)
+        paths = {name: path for path, name in entries}
+        delta = arm.manifests.delta(old, new, paths)
+        # Byte ranges are fixed by the new manifest, so each entry matches its hash
+        # even if a log keeps growing while the archive streams
+        entries = [
+            (paths[f["name"]], f["name"] if f["mode"] == "full" else "appends/" + f["name"], f["offset"], f["length"])
+            for f in delta["files"]
+        ]
+        blobs = [("delta.json", json.dumps(delta, indent=2))]
+        download_name = f'experiment_data_delta_{new["manifest_id"]}.zip'
+
+    return Response(
+        stream_with_context(iter_zip(entries, compress_type, compresslevel, blobs=blobs)),
+        mimetype="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={download_name}"},
+    )
+
+
+@shared.route("/admin/manifest", methods=["GET"])
+@require_admin_key
+def admin_manifest():
+    """
+    Current manifest of every exported file (size, mtime, block-chained SHA-256).
+    Pass its manifest_id to /admin/export?since= to download only what changed.
+    Requires ADMIN_KEY environment variable.
+    Usage: /admin/manifest?key=YOUR_ADMIN_KEY
+    """
+    arm = _arm()
+    entries = export_entries(arm.data_dir, extra_files=arm.export_extra_files())
+    manifest = arm.manifests.build(entries)
+    manifest["files"] = [{k: f[k] for k in ("name", "size", "mtime", "hash")} for f in manifest["files"]]
+    return jsonify(manifest)
+
+
+@shared.route("/admin/stats", methods=["GET"])
+@require_admin_key
+def admin_stats():
+    """
+    Get statistics about experiment data.
+    Requires ADMIN_KEY environment variable.
+    Usage: /admin/stats?key=YOUR_ADMIN_KEY
+    """
+    data_dir = _arm().data_dir
+    stats = {
+        "participant_count": 0,
+        "data_files": [],
+        "total_data_size_mb": 0,
+        "last_update": None,
+        "data_directory": os.path.abspath(data_dir)
+    }
+
+    if os.path.exists(data_dir):
+        csv_files = [f for f in os.listdir(data_dir) if f.endswith('.csv')]
+        stats["data_files"] = sorted(csv_files)
+
+        # Count participants
+        participants_file = os.path.join(data_dir, "participants.csv")
+        if os.path.exists(participants_file):
+            try:
+                with open(participants_file, 'r', encoding='utf-8') as f:
+                    stats["participant_count"] = max(0, sum(1 for line in f) - 1)  # Subtract header
+            except Exception:
+                stats["participant_count"] = 0
+
+        # Calculate total size
+        total_size = sum(
+            os.path.getsize(os.path.join(data_dir, f))
+            for f in csv_files
+        )
+        stats["total_data_size_mb"] = round(total_size / (1024 * 1024), 2)
+
+        # Get last modification time
+        if csv_files:
+            latest_file = max(
+                csv_files,
+                key=lambda f: os.path.getmtime(os.path.join(data_dir, f))
+            )
+            stats["last_update"] = datetime.fromtimestamp(
+                os.path.getmtime(os.path.join(data_dir, latest_file))
+            ).isoformat()
+
+    return jsonify(stats)
+
+
+@shared.route("/admin/quality", methods=["GET"])
+@require_admin_key
+def admin_quality():
+    """
+    Live data-quality flags (speeders, hidden tab, paste attempts, exclusions).
+    Requires ADMIN_KEY environment variable.
+    Usage: /admin/quality?key=YOUR_ADMIN_KEY[&participant=P123][&flagged=1]
+    """
+    monitor = _arm().quality_monitor
+    participant_id = request.args.get("participant")
+    if participant_id:
+        summary = monitor.snapshot(participant_id.upper())
+        if summary is None:
+            return jsonify({"error": f"No events seen for {participant_id} since startup"}), 404
+        return jsonify(summary)
+
+    flagged_only = request.args.get("flagged") in ("1", "true", "yes")
+    return jsonify(monitor.snapshot(flagged_only=flagged_only))
+
+
+@shared.route("/admin/dashboard", methods=["GET"])
+@require_admin_key
+def admin_dashboard():
+    """
+    Live cohort dashboard: completions per condition cell, dropout by stage,
+    median stage durations and running MCQ accuracy by timing.
+    Served from in-memory aggregates updated by log_data (no file scans).
+    Requires ADMIN_KEY environment variable.
+    Usage: /admin/dashboard?key=YOUR_ADMIN_KEY[&format=json]
+    """
+    snapshot = _arm().cohort.snapshot()
+    if request.args.get("format") == "json":
+        return jsonify(snapshot)
+    return render_template("admin_dashboard.html", stats=snapshot)
+
+
+@shared.route("/admin/page_cache", methods=["GET"])
+@require_admin_key
+def admin_page_cache():
+    """
+    Rendered-page cache counters: renders, hits, 304s and the render CPU saved
+    (total and per participant) since startup. Participants are those the
+    cohort dashboard has seen, i.e. the ones logged since the last restart
+    plus the replayed logs.
+    Requires ADMIN_KEY environment variable.
+    Usage: /admin/page_cache?key=YOUR_ADMIN_KEY
+    """
+    arm = _arm()
+    participants = arm.cohort.started if arm.cohort is not None else None
+    return jsonify(arm.page_cache.stats(participants=participants))
+
+
+# ------------------------------------------------------------------------------
+# Health probes
+# ------------------------------------------------------------------------------
+@shared.route("/healthz")
+def healthz():
+    """Liveness: the process is up and serving requests."""
+    return jsonify({"status": "ok"})
+
+
+@shared.route("/readyz")
+def readyz():
+    """Readiness: 200 once the translation cache and templates are warm, 503 before."""
+    status = _arm().warmup.status()
+    return jsonify(status), (200 if status["ready"] else 503)
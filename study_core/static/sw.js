@@ -0,0 +1,294 @@
+// Service worker for the experiment pages (registered by sw_register.js,
+// served from /sw.js so its scope is the whole site).
+//
+// - Static assets: precached on install, then stale-while-revalidate.
+// - Article bundles: /article_bundles (the participant's articles in their
+//   order and language) is cached on 'start'; if a /reading/<n> navigation
+//   fails, an offline copy of that article is shown until the network is back.
+// - Pages the server marks X-Offline-Cacheable (consent, instructions,
+//   breaks, ...) are kept and served when their navigation fails.
+// - Page copies and bundles are keyed by the X-Offline-Scope the server
+//   sends (its session cookie name): under study_server.py both arms serve
+//   the same paths, and an offline page must come from the participant's arm.
+// - Telemetry and submission POSTs get an X-Submission-Id and are retried a
+//   few times in place; if the network is still down they are queued in
+//   IndexedDB and replayed later (Background Sync, 'online' from the page,
+//   or the next 'start'). The server answers a repeated id with the first
+//   response, so a retry never logs twice. The page gets a 202 whose
+//   redirect is a holding page; once the queue is delivered that page moves
+//   on to wherever the server's answer to the last submission pointed.
+
+const VERSION = 'v2';
+const ASSET_CACHE = `study-assets-${VERSION}`;
+const PAGE_CACHE = `study-pages-${VERSION}`;
+const BUNDLE_URL = '/article_bundles';
+const PRECACHE = ['/static/disable_back.js', '/static/sw_register.js'];
+const QUEUED_PATHS = [
+    '/log_reading', '/log_summary_viewing', '/submit_test', '/submit_post_article_ratings',
+    '/submit_manipulation', '/submit_prior_knowledge', '/submit_ai_trust',
+];
+const QUEUED_PAGE = '/offline/queued';
+const SCOPE_KEY = '/__offline_scope';
+const REDIRECT_KEY = '/__queued_redirect';
+const RETRY_DELAYS_MS = [500, 2000, 5000];
+const DB_NAME = 'study-queue';
+const STORE = 'requests';
+const SYNC_TAG = 'flush-queue';
+
+// ---- IndexedDB queue -------------------------------------------------------
+
+function openDb() {
+    return new Promise((resolve, reject) => {
+        const req = indexedDB.open(DB_NAME, 1);
+        req.onupgradeneeded = () => req.result.createObjectStore(STORE, { keyPath: 'id', autoIncrement: true });
+        req.onsuccess = () => resolve(req.result);
+        req.onerror = () => reject(req.error);
+    });
+}
+
+function withStore(mode, fn) {
+    return openDb().then(db => new Promise((resolve, reject) => {
+        const tx = db.transaction(STORE, mode);
+        const result = fn(tx.objectStore(STORE));
+        tx.oncomplete = () => { db.close(); resolve(result && 'result' in result ? result.result : undefined); };
+        tx.onerror = () => { db.close(); reject(tx.error); };
+    }));
+}
+
+const enqueue = entry => withStore('readwrite', store => store.add(entry));
+const queued = () => withStore('readonly', store => store.getAll());
+const dequeue = id => withStore('readwrite', store => store.delete(id));
+
+// ---- Submissions -----------------------------------------------------------
+
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+function newSubmissionId() {
+    if (self.crypto && crypto.randomUUID) return crypto.randomUUID();
+    return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 12)}`;
+}
+
+async function sendOrQueue(request) {
+    const entry = {
+        url: request.url,
+        body: await request.clone().text(),
+        headers: {
+            'Content-Type': request.headers.get('Content-Type') || 'application/json',
+            'X-Submission-Id': request.headers.get('X-Submission-Id') || newSubmissionId(),
+        },
+        queuedAt: Date.now(),
+    };
+    const articleToken = request.headers.get('X-Article-Token');
+    if (articleToken) entry.headers['X-Article-Token'] = articleToken;
+    for (let attempt = 0; ; attempt++) {
+        try {
+            return await fetch(entry.url, {
+                method: 'POST', body: entry.body, headers: entry.headers, credentials: 'same-origin',
+            });
+        } catch (err) {
+            if (attempt >= RETRY_DELAYS_MS.length) break;
+            await sleep(RETRY_DELAYS_MS[attempt]);
+        }
+    }
+    await enqueue(entry);
+    await (await caches.open(PAGE_CACHE)).delete(REDIRECT_KEY);  // only answers to this and later entries count
+    if (self.registration.sync) {
+        self.registration.sync.register(SYNC_TAG).catch(() => {});
+    }
+    // Accepted, not processed: pages follow `redirect` as they do with the
+    // server's answer, and the holding page waits for the delivery
+    return new Response(JSON.stringify({ status: 'queued', redirect: QUEUED_PAGE }), {
+        status: 202, headers: { 'Content-Type': 'application/json' },
+    });
+}
+
+let flushing = null;
+
+function flush() {
+    if (!flushing) {
+        flushing = flushQueue().catch(() => {}).finally(() => { flushing = null; });
+    }
+    return flushing;
+}
+
+async function flushQueue() {
+    for (const entry of await queued()) {
+        let response;
+        try {
+            response = await fetch(entry.url, {
+                method: 'POST',
+                body: entry.body,
+                headers: Object.assign({}, entry.headers, { 'X-Submission-Replay': '1' }),
+                credentials: 'same-origin',
+                redirect: 'manual',
+            });
+        } catch (err) {
+            return;  // still offline: keep this and later entries, in order
+        }
+        if (response.status >= 500) return;
+        const type = response.headers.get('Content-Type') || '';
+        if (response.ok && type.includes('application/json')) {
+            const data = await response.json().catch(() => null);
+            if (data && data.redirect) {
+                await (await caches.open(PAGE_CACHE)).put(REDIRECT_KEY, new Response(String(data.redirect)));
+            }
+        }
+        await dequeue(entry.id);  // delivered (or rejected for good, e.g. the session is gone)
+    }
+}
+
+// ---- Caches ----------------------------------------------------------------
+
+let scope = null;  // X-Offline-Scope of the last page the server answered ('' = none yet)
+
+const scopedKey = (path, pageScope) => `${path}?offline_scope=${encodeURIComponent(pageScope)}`;
+
+async function rememberScope(value) {
+    if (!value || value === scope) return;
+    scope = value;
+    await (await caches.open(PAGE_CACHE)).put(SCOPE_KEY, new Response(value));
+}
+
+async function currentScope() {
+    if (scope === null) {
+        const stored = await (await caches.open(PAGE_CACHE)).match(SCOPE_KEY);
+        scope = stored ? await stored.text() : '';
+    }
+    return scope;
+}
+
+async function cacheBundles() {
+    try {
+        const response = await fetch(BUNDLE_URL, { credentials: 'same-origin' });
+        const type = response.headers.get('Content-Type') || '';
+        const bundleScope = response.headers.get('X-Offline-Scope');
+        if (response.status === 200 && type.includes('application/json') && bundleScope) {
+            await (await caches.open(PAGE_CACHE)).put(scopedKey(BUNDLE_URL, bundleScope), response);
+        }
+    } catch (err) {
+        // offline: keep whatever copy we have
+    }
+}
+
+async function cachedBundle(pageScope) {
+    const cached = pageScope && await (await caches.open(PAGE_CACHE)).match(scopedKey(BUNDLE_URL, pageScope));
+    return cached ? cached.json() : null;
+}
+
+async function staleWhileRevalidate(request) {
+    const cache = await caches.open(ASSET_CACHE);
+    const cached = await cache.match(request);
+    const refresh = fetch(request).then(response => {
+        if (response.ok) cache.put(request, response.clone());
+        return response;
+    });
+    if (cached) {
+        refresh.catch(() => {});
+        return cached;
+    }
+    return refresh;
+}
+
+function escapeHtml(text) {
+    return String(text).replace(/[&<>"']/g, c => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' }[c]));
+}
+
+function offlinePage(title, bodyHtml, lang) {
+    const html = `<!DOCTYPE html><html lang="${escapeHtml(lang || 'en')}"><head><meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0"><title>${escapeHtml(title)}</title>
+<style>body{font-family:system-ui,sans-serif;max-width:760px;margin:0 auto;padding:24px;line-height:1.7;color:#222}
+.offline{background:#fff4e5;border:1px solid #f0c36d;border-radius:8px;padding:10px 14px;margin-bottom:20px}</style></head>
+<body><div class="offline">${lang === 'zh' ? '网络连接已断开，正在重新连接…' : 'Connection lost. Reconnecting…'}</div>${bodyHtml}
+<script>setInterval(function(){fetch('/healthz',{cache:'no-store'}).then(function(r){if(r.ok)location.reload();}).catch(function(){});},5000);</script>
+</body></html>`;
+    return new Response(html, { status: 503, headers: { 'Content-Type': 'text/html; charset=utf-8' } });
+}
+
+async function offlineReading(pathname, pageScope) {
+    const match = pathname.match(/^\/reading\/(\d+)$/);
+    if (!match) return null;
+    const bundle = await cachedBundle(pageScope);
+    if (!bundle) return null;
+    const article = (bundle.articles || []).find(a => a.article_num === Number(match[1]));
+    if (!article) return null;
+    const paragraphs = String(article.text || '').split(/\n\s*\n/).map(p => `<p>${escapeHtml(p.trim())}</p>`).join('');
+    return offlinePage(article.title, `<h1>${escapeHtml(article.title)}</h1>${paragraphs}`, bundle.lang);
+}
+
+async function queuedPage() {
+    await flush();
+    const cache = await caches.open(PAGE_CACHE);
+    if (!(await queued()).length) {
+        const stored = await cache.match(REDIRECT_KEY);
+        let target = new URL(stored ? await stored.text() : '/', self.location.origin);
+        if (target.origin !== self.location.origin) target = new URL('/', self.location.origin);
+        await cache.delete(REDIRECT_KEY);
+        return Response.redirect(target.href, 302);
+    }
+    const bundle = await cachedBundle(await currentScope());
+    const lang = bundle && bundle.lang;
+    const text = lang === 'zh' ? '您的答案已保存，连接恢复后将自动提交并继续。'
+        : 'Your answers are saved. They will be sent and the study will continue once the connection is back.';
+    return offlinePage('Offline', `<p>${text}</p>`, lang);
+}
+
+async function navigate(request) {
+    const url = new URL(request.url);
+    try {
+        const response = await fetch(request);
+        const pageScope = response.headers.get('X-Offline-Scope');
+        rememberScope(pageScope).catch(() => {});
+        if (response.ok && pageScope && response.headers.get('X-Offline-Cacheable')) {
+            const copy = response.clone();
+            caches.open(PAGE_CACHE).then(cache => cache.put(scopedKey(url.pathname, pageScope), copy));
+        }
+        return response;
+    } catch (err) {
+        // ?arm= switches arms (study_server.py), so the last scope says nothing about this page
+        const pageScope = url.searchParams.has('arm') ? '' : await currentScope();
+        const cached = pageScope && await (await caches.open(PAGE_CACHE)).match(scopedKey(url.pathname, pageScope));
+        return cached || await offlineReading(url.pathname, pageScope) || offlinePage('Offline', '');
+    }
+}
+
+// ---- Lifecycle -------------------------------------------------------------
+
+self.addEventListener('install', event => {
+    event.waitUntil(caches.open(ASSET_CACHE).then(cache => cache.addAll(PRECACHE)).then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys.filter(k => k.startsWith('study-') && !k.endsWith(VERSION)).map(k => caches.delete(k))))
+            .then(() => self.clients.claim())
+            .then(flush)
+    );
+});
+
+self.addEventListener('message', event => {
+    const type = event.data && event.data.type;
+    if (type === 'start') event.waitUntil(Promise.all([cacheBundles(), flush()]));
+    else if (type === 'flush') event.waitUntil(flush());
+});
+
+self.addEventListener('sync', event => {
+    if (event.tag === SYNC_TAG) event.waitUntil(flush());
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) return;
+    if (request.method === 'POST' && QUEUED_PATHS.includes(url.pathname)) {
+        event.respondWith(sendOrQueue(request));
+    } else if (request.method !== 'GET') {
+        return;
+    } else if (url.pathname.startsWith('/static/')) {
+        event.respondWith(staleWhileRevalidate(request));
+    } else if (request.mode === 'navigate' && url.pathname === QUEUED_PAGE) {
+        event.respondWith(queuedPage());
+    } else if (request.mode === 'navigate') {
+        event.respondWith(navigate(request));
+    }
+});
@@ -0,0 +1,17 @@
+// Registers the service worker (/sw.js) and tells it when to cache this
+// participant's article bundles and to flush queued submissions.
+(function () {
+    if (!('serviceWorker' in navigator)) return;
+
+    function post(type) {
+        navigator.serviceWorker.ready.then(function (registration) {
+            if (registration.active) registration.active.postMessage({ type: type });
+        });
+    }
+
+    navigator.serviceWorker.register('/sw.js').then(function () {
+        post('start');
+    }).catch(function () {});
+
+    window.addEventListener('online', function () { post('flush'); });
+})();
@@ -0,0 +1,148 @@
+"""
+Server-side deduplication of client submissions.
+
+The service worker (study_core/static/sw.js) tags every telemetry / submission POST
+with an X-Submission-Id and retries it after a dropped connection, possibly
+long after the first attempt actually reached the server. SubmissionIds
+remembers the response of each processed (participant, submission id), so a
+retry gets the original response back instead of logging the rows twice.
+
+Processed ids are appended to DATA_DIR/.submissions
+("PID<TAB>ID<TAB>STATUS<TAB>BODY" lines) and picked up by other workers with
+one pread per lookup, as in log_index.py. Once the file passes MAX_BYTES the
+first worker to notice renames it to .submissions.1 (replacing the previous
+generation) and everyone continues in a fresh file, so a worker holds and
+loads at most two generations. Callers hold a per-participant lock around
+get() + handling + record().
+
+ArticleTokens signs the article a page was rendered for; a queued
+log_reading row replayed after the participant moved on carries the token,
+so the server can attribute it to that article without trusting the body.
+"""
+
+import fcntl
+import os
+import re
+import threading
+
+from itsdangerous import BadSignature, URLSafeSerializer
+
+INDEX_FILE = ".submissions"
+MAX_BYTES = 4 << 20
+_CHUNK = 1 << 16
+SUBMISSION_ID = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+
+
+class _Generation:
+    """One .submissions file: an append descriptor and the ids read from it so far."""
+
+    def __init__(self, path, create=True):
+        flags = os.O_RDWR | os.O_APPEND | (os.O_CREAT if create else 0)
+        self.fd = os.open(path, flags, 0o644)
+        self.inode = os.fstat(self.fd).st_ino
+        self.offset = 0
+        self.seen = {}
+
+    def refresh(self):
+        while True:
+            chunk = os.pread(self.fd, _CHUNK, self.offset)
+            end = chunk.rfind(b"\n") + 1
+            if not end:
+                return
+            for line in chunk[:end].decode("utf-8").splitlines():
+                parts = line.split("\t", 3)
+                if len(parts) == 4 and parts[2].isdigit():
+                    self.seen[(parts[0], parts[1])] = (int(parts[2]), parts[3])
+            self.offset += end
+
+    def close(self):
+        os.close(self.fd)
+
+
+class SubmissionIds:
+    """(participant, submission id) -> (status, JSON body) of the first response."""
+
+    def __init__(self, data_dir, max_bytes=MAX_BYTES):
+        self.data_dir = data_dir
+        self.max_bytes = max_bytes
+        self._path = os.path.join(data_dir, INDEX_FILE)
+        self._lock = threading.Lock()
+        try:
+            self._previous = _Generation(self._path + ".1", create=False)
+        except FileNotFoundError:
+            self._previous = None
+        self._current = _Generation(self._path)
+
+    def _rotate(self):
+        """Move on to a fresh file; only one worker renames, the others just reopen."""
+        fcntl.flock(self._current.fd, fcntl.LOCK_EX)
+        try:
+            try:
+                inode = os.stat(self._path).st_ino
+            except FileNotFoundError:
+                inode = None
+            if inode == self._current.inode:
+                os.replace(self._path, self._path + ".1")
+        finally:
+            fcntl.flock(self._current.fd, fcntl.LOCK_UN)
+        # Keep reading .submissions.1: a worker that has not rotated yet still appends to it.
+        # Usually that is the file just left; after a long idle spell it may be a newer one.
+        if self._previous is not None:
+            self._previous.close()
+        self._previous = self._current
+        try:
+            inode = os.stat(self._path + ".1").st_ino
+        except FileNotFoundError:
+            inode = None
+        if inode != self._current.inode:
+            self._current.close()
+            self._previous = _Generation(self._path + ".1", create=False) if inode is not None else None
+        self._current = _Generation(self._path)
+
+    def _refresh(self):
+        while True:
+            if self._previous is not None:
+                self._previous.refresh()
+            self._current.refresh()
+            if self._current.offset < self.max_bytes:
+                return
+            self._rotate()
+
+    def get(self, participant_id, submission_id):
+        key = (participant_id, submission_id)
+        with self._lock:
+            self._refresh()
+            seen = self._current.seen.get(key)
+            if seen is None and self._previous is not None:
+                seen = self._previous.seen.get(key)
+            return seen
+
+    def record(self, participant_id, submission_id, status, body):
+        body = body.replace("\n", " ").replace("\t", " ")
+        line = f"{participant_id}\t{submission_id}\t{status}\t{body}\n"
+        with self._lock:
+            self._refresh()
+            os.write(self._current.fd, line.encode("utf-8"))
+            self._current.refresh()
+
+
+class ArticleTokens:
+    """Signed (participant, article_num) pairs, sent back as X-Article-Token."""
+
+    def __init__(self, secret_key):
+        self._serializer = URLSafeSerializer(secret_key, salt="article-token")
+
+    def issue(self, participant_id, article_num):
+        return self._serializer.dumps([participant_id, article_num])
+
+    def article_num(self, token, participant_id):
+        """The article the token was issued for, or None if it is missing, forged or someone else's."""
+        if not token:
+            return None
+        try:
+            signed_pid, article_num = self._serializer.loads(token)
+        except (BadSignature, TypeError, ValueError):
+            return None
+        if signed_pid != participant_id or not isinstance(article_num, int):
+            return None
+        return article_num
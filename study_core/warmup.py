@@ -0,0 +1,93 @@
+"""
+Background warmup so the server can bind (and answer /healthz) immediately.
+
+Startup work — loading the translation cache, compiling the Jinja templates,
+optional network pre-translation — is registered as named steps and run in
+order on one daemon thread. Required steps make the process ready (/readyz
+returns 200); optional steps (pre-translation) keep running afterwards and
+are only reported.
+
+A step that raises is recorded as failed and does not block readiness: every
+cache warmed here is also filled lazily on first use, so a failed step means
+slower first requests, not broken ones.
+"""
+
+import threading
+import time
+import traceback
+
+
+class Warmup:
+    """Ordered startup steps run once on a background thread."""
+
+    def __init__(self, name):
+        self.name = name
+        self._steps = []
+        self._state = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._created = time.monotonic()
+        self._started = None
+        self._ready_at = None
+        self.ready_event = threading.Event()
+
+    def add(self, name, fn, required=True):
+        """Register a step; required steps run before optional ones."""
+        self._steps.append((name, fn, required))
+        self._steps.sort(key=lambda step: not step[2])
+        self._state[name] = {"name": name, "required": required, "state": "pending", "seconds": None}
+        return self
+
+    @property
+    def started(self):
+        return self._thread is not None
+
+    @property
+    def ready(self):
+        return self.ready_event.is_set()
+
+    def start(self):
+        """Start the warmup thread (idempotent)."""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._started = time.monotonic()
+                    self._thread = threading.Thread(target=self._run, name=f"warmup-{self.name}", daemon=True)
+                    self._thread.start()
+        return self
+
+    def _set_ready(self):
+        if not self.ready_event.is_set():
+            self._ready_at = time.monotonic()
+            self.ready_event.set()
+            print(f"[WARMUP] {self.name} ready after {self._ready_at - self._started:.2f}s")
+
+    def _run(self):
+        for name, fn, required in self._steps:
+            if not required:
+                self._set_ready()
+            state = self._state[name]
+            state["state"] = "running"
+            t0 = time.monotonic()
+            try:
+                fn()
+                state["state"] = "done"
+            except Exception as e:
+                state["state"] = "failed"
+                state["error"] = repr(e)
+                print(f"[WARMUP] {self.name}/{name} failed: {e}")
+                traceback.print_exc()
+            state["seconds"] = round(time.monotonic() - t0, 3)
+        self._set_ready()
+
+    def status(self):
+        """JSON-ready progress for /readyz."""
+        now = time.monotonic()
+        return {
+            "name": self.name,
+            "ready": self.ready,
+            "started": self.started,
+            "uptime_s": round(now - self._created, 3),
+            "ready_after_s": round(self._ready_at - self._started, 3) if self._ready_at else None,
+            "steps": [dict(self._state[name]) for name, _, _ in self._steps],
+        }
@@ -0,0 +1,116 @@
+"""
+Streaming ZIP writer for /admin/export.
+
+zipfile can write to a non-seekable stream (it then emits data descriptors
+after each entry), so the archive is produced straight into a small in-memory
+buffer that is drained after every chunk. The response starts with the first
+compressed bytes, memory stays bounded by CHUNK_SIZE plus the compressor's
+window, and nothing is written to disk.
+"""
+
+import os
+import zipfile
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_LEVEL = 6
+# Already-compressed formats gain nothing from deflate
+COMPACT_EXTENSIONS = (".zip", ".gz", ".bz2", ".xz", ".br", ".png", ".jpg", ".jpeg", ".pdf", ".xlsx", ".docx")
+
+
+class _StreamBuffer:
+    """Write-only, non-seekable sink; zipfile only needs write/flush/tell."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def parse_level(value):
+    """?level= -> (compress_type, compresslevel). 'stored' / 'store' / 0 means no compression."""
+    if value is None or value == "":
+        return zipfile.ZIP_DEFLATED, DEFAULT_LEVEL
+    value = str(value).strip().lower()
+    if value in ("stored", "store", "0"):
+        return zipfile.ZIP_STORED, None
+    level = int(value)
+    if not 1 <= level <= 9:
+        raise ValueError("level must be 0-9 or 'stored'")
+    return zipfile.ZIP_DEFLATED, level
+
+
+def iter_zip(entries, compress_type=zipfile.ZIP_DEFLATED, compresslevel=DEFAULT_LEVEL, blobs=()):
+    """Yield the bytes of a ZIP archive.
+
+    entries: (path, arcname) pairs, or (path, arcname, offset, length) to
+    include only a byte range of the file. blobs: (arcname, bytes) written
+    first. Files are read in CHUNK_SIZE pieces and each piece is yielded as
+    soon as it has been compressed. Missing files are skipped (a log may be
+    renamed while the export runs); files already in a compact format are
+    stored.
+    """
+    sink = _StreamBuffer()
+    with zipfile.ZipFile(sink, "w", compression=compress_type, compresslevel=compresslevel) as zf:
+        for arcname, data in blobs:
+            zf.writestr(arcname, data)
+            yield sink.drain()  # blobs are small; nothing to chunk
+        for entry in entries:
+            path, arcname = entry[0], entry[1]
+            offset, length = (entry[2], entry[3]) if len(entry) > 2 else (0, None)
+            try:
+                src = open(path, "rb")
+            except OSError:
+                continue
+            if path.lower().endswith(COMPACT_EXTENSIONS):
+                target = zipfile.ZipInfo.from_file(path, arcname)
+                target.compress_type = zipfile.ZIP_STORED
+            else:
+                # Opened by name, the entry takes the ZipFile's compression and compresslevel
+                target = arcname
+            with src, zf.open(target, "w", force_zip64=True) as dest:
+                src.seek(offset)
+                remaining = length
+                while remaining is None or remaining > 0:
+                    chunk = src.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    if remaining is not None:
+                        remaining -= len(chunk)
+                    dest.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def export_entries(data_dir, extra_files=()):
+    """(path, arcname) for every CSV in data_dir plus any (path, arcname) extras that exist."""
+    entries = []
+    if os.path.exists(data_dir):
+        for filename in sorted(os.listdir(data_dir)):
+            if filename.endswith(".csv"):
+                entries.append((os.path.join(data_dir, filename), filename))
+    for path, arcname in extra_files:
+        if os.path.exists(path):
+            entries.append((path, arcname))
+    return entries
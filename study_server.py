@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Single server process hosting both study arms.
+
+The AI arm (ai_experiment/app.py) and the control arm
+(no_ai_experiment/app_control.py) are loaded side by side and share one
+process: one translation cache, one background warmup (cache load, template
+compilation, pre-translation; see /readyz) and one pool of request threads. Each arm keeps its own templates,
+materials, session cookie and experiment_data/ directory, so its logs look
+exactly like those of a standalone deployment.
+
+Both arms use the same URL paths (templates call '/submit_test', '/log_reading',
+... directly), so requests are routed by an arm cookie rather than by a path
+prefix:
+
+    /?arm=ai or /?arm=control   pins the browser to an arm (any path works,
+                                e.g. /admin/export?key=...&arm=control)
+    no cookie                   ARM_ASSIGNMENT decides:
+                                  off (default) -> DEFAULT_ARM
+                                  balanced      -> arm with fewer participant logs
+                                  random        -> coin flip
+
+Each arm is built by study_core.arm.create_app() and imported with
+study_core.arm.load_arm(), which keeps the arm's directory off sys.path, so
+neither arm can import the other arm's sibling modules (materials.py, ...).
+
+Usage:
+    python3 study_server.py
+    ARM_ASSIGNMENT=balanced PORT=8080 python3 study_server.py
+"""
+
+import glob
+import os
+import random
+import threading
+
+from werkzeug.serving import run_simple
+from werkzeug.wrappers import Request
+
+from study_core.arm import load_arm
+from study_core.warmup import Warmup
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+ai_arm = load_arm(os.path.join(ROOT_DIR, "ai_experiment", "app.py"))
+control_arm = load_arm(os.path.join(ROOT_DIR, "no_ai_experiment", "app_control.py"))
+
+ARMS = {"ai": ai_arm, "control": control_arm}
+ARM_COOKIE = "study_arm"
+ARM_COOKIE_MAX_AGE = 30 * 24 * 3600
+HEALTH_PATHS = ("/healthz", "/readyz")
+DEFAULT_ARM = os.environ.get("DEFAULT_ARM", "ai")
+ARM_ASSIGNMENT = os.environ.get("ARM_ASSIGNMENT", "off").lower()
+
+if DEFAULT_ARM not in ARMS:
+    raise SystemExit(f"DEFAULT_ARM must be one of {sorted(ARMS)}, got {DEFAULT_ARM!r}")
+if ARM_ASSIGNMENT not in ("off", "balanced", "random"):
+    raise SystemExit(f"ARM_ASSIGNMENT must be off, balanced or random, got {ARM_ASSIGNMENT!r}")
+
+# Separate session cookies so switching arms never carries one arm's
+# progress (current_article, condition, ...) into the other
+ai_arm.app.config["SESSION_COOKIE_NAME"] = "session_ai"
+control_arm.app.config["SESSION_COOKIE_NAME"] = "session_control"
+
+
+def share_translation_cache():
+    """Point both arms at the same translation cache dict and file.
+
+    The control arm already reads and writes ai_experiment/translation_cache/,
+    so sharing the in-memory dict means a string translated for one arm is a
+    cache hit for the other and both save the same, complete file. The file
+    itself is merged into the dict by the warmup thread.
+    """
+    control_arm._translation_cache = ai_arm._translation_cache
+    control_arm.TRANSLATION_CACHE_FILE = ai_arm.TRANSLATION_CACHE_FILE
+    control_arm.ARM.translation_cache_file = ai_arm.TRANSLATION_CACHE_FILE
+
+
+def load_translation_cache():
+    ai_arm._load_translation_cache()
+    control_arm._translation_cache_loaded.set()  # same dict, already filled
+
+
+def compile_templates():
+    for arm in ARMS.values():
+        arm.ARM.compile_templates()
+
+
+def precompress_static():
+    for arm in ARMS.values():
+        arm.ARM.precompress_static()
+
+
+def prerender_pages():
+    for arm in ARMS.values():
+        arm.ARM.prerender_pages()
+
+
+def pre_translate():
+    """Warm the shared cache; the control pass only fills what the AI pass missed."""
+    pretranslate_articles = os.environ.get("DISABLE_PRETRANSLATE") != "1"
+    for arm in (ai_arm, control_arm):
+        arm._pre_translate_ui_text()
+        if pretranslate_articles:
+            arm._pre_translate_all_articles()
+
+
+def replay_cohort_logs():
+    """Seed each arm's live dashboard from its own experiment_data/ logs."""
+    for arm in ARMS.values():
+        arm.ARM.replay_cohort_logs()
+
+
+def build_warmup():
+    """One warmup for the whole process, shared by both arms' /readyz and before_request hooks."""
+    warmup = Warmup("study")
+    warmup.add("translation_cache", load_translation_cache)
+    warmup.add("templates", compile_templates)
+    # First optional step: live dashboard events are held until it has run
+    warmup.add("cohort_replay", replay_cohort_logs, required=False)
+    if ai_arm.GoogleTranslator is not None:
+        warmup.add("pretranslate", pre_translate, required=False)
+    warmup.add("precompress_static", precompress_static, required=False)
+    warmup.add("page_cache", prerender_pages, required=False)
+    ai_arm.ARM.warmup = control_arm.ARM.warmup = warmup
+    return warmup
+
+
+class ArmDispatcher:
+    """WSGI app that forwards each request to the arm named by the arm cookie."""
+
+    def __init__(self, arms, default_arm, assignment="off"):
+        self.arms = arms
+        self.default_arm = default_arm
+        self.assignment = assignment
+        self._lock = threading.Lock()
+
+    def participant_count(self, name):
+        return len(glob.glob(os.path.join(self.arms[name].DATA_DIR, "*_log.csv")))
+
+    def assign(self):
+        if self.assignment == "random":
+            return random.choice(sorted(self.arms))
+        if self.assignment == "balanced":
+            with self._lock:
+                counts = {name: self.participant_count(name) for name in self.arms}
+            fewest = min(counts.values())
+            return random.choice(sorted(name for name, n in counts.items() if n == fewest))
+        return self.default_arm
+
+    def __call__(self, environ, start_response):
+        request = Request(environ)
+        requested = request.args.get("arm")
+        current = request.cookies.get(ARM_COOKIE)
+        if requested in self.arms:
+            arm = requested
+        elif current in self.arms:
+            arm = current
+        elif request.path.startswith("/static/") or request.path in HEALTH_PATHS:
+            # Assets and probes never decide the arm; the page that loads them already did
+            arm = self.default_arm
+        else:
+            arm = self.assign()
+
+        if arm == current or request.path in HEALTH_PATHS:
+            return self.arms[arm].app(environ, start_response)
+
+        cookie = f"{ARM_COOKIE}={arm}; Max-Age={ARM_COOKIE_MAX_AGE}; Path=/; SameSite=Lax; HttpOnly"
+
+        def start_with_cookie(status, headers, exc_info=None):
+            return start_response(status, list(headers) + [("Set-Cookie", cookie)], exc_info)
+
+        return self.arms[arm].app(environ, start_with_cookie)
+
+
+share_translation_cache()
+WARMUP = build_warmup()
+application = ArmDispatcher(ARMS, DEFAULT_ARM, ARM_ASSIGNMENT)
+
+
+if __name__ == "__main__":
+    # Cache load, template compilation and pre-translation run in the
+    # background so the server binds right away (/healthz, /readyz)
+    WARMUP.start()
+
+    print("\n" + "=" * 50)
+    print("Memory Experiment Platform - AI + CONTROL arms")
+    print("=" * 50)
+
+    port = int(os.environ.get("PORT", 8080))
+    host = os.environ.get("HOST", "127.0.0.1")
+    if os.environ.get("FLASK_ENV") == "production" or os.environ.get("PORT"):
+        host = "0.0.0.0"
+
+    print(f"\nServer starting at http://{host}:{port}")
+    print(f"Arm assignment: {ARM_ASSIGNMENT} (default arm: {DEFAULT_ARM})")
+    for name, arm in ARMS.items():
+        print(f"  {name:<8} data -> {arm.DATA_DIR}")
+    print("\nPress CTRL+C to stop the server\n")
+
+    # IMPORTANT: disable reloader so secret key doesn't rotate & kill session
+    run_simple(host, port, application, threaded=True, use_reloader=False,
+               use_debugger=os.environ.get("FLASK_ENV") != "production")
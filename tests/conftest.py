@@ -0,0 +1,10 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AI_DIR = os.path.join(ROOT, "ai_experiment")
+ANALYSIS_DIR = os.path.join(AI_DIR, "data_analysis")
+
+for path in (ROOT, AI_DIR, ANALYSIS_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
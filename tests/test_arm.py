@@ -0,0 +1,87 @@
+import sys
+
+import pytest
+
+from study_core.arm import load_arm
+
+ARM_MODULE = '''
+import os
+from study_core.arm import create_app
+from helper import VALUE
+
+app, ARM = create_app({name!r}, os.path.dirname(os.path.abspath(__file__)), __name__)
+'''
+
+
+def make_arm(root, name, stem, helper=None):
+    arm_dir = root / name
+    (arm_dir / "templates").mkdir(parents=True)
+    (arm_dir / "static").mkdir()
+    if helper is not None:
+        (arm_dir / "helper.py").write_text(f"VALUE = {helper!r}\n")
+    path = arm_dir / f"{stem}.py"
+    path.write_text(ARM_MODULE.format(name=name))
+    return str(path)
+
+
+def test_arms_keep_their_own_sibling_modules(tmp_path, monkeypatch):
+    monkeypatch.setenv("ADMIN_KEY", "k")
+    monkeypatch.setenv("TEMPLATE_CACHE", "0")
+    first = load_arm(make_arm(tmp_path, "first", "arm_first", helper="first"))
+    second = load_arm(make_arm(tmp_path, "second", "arm_second", helper="second"))
+
+    assert (first.VALUE, second.VALUE) == ("first", "second")
+    assert "helper" not in sys.modules
+    assert str(tmp_path / "first") not in sys.path
+
+    # The shared routes read each arm's own state
+    for module in (first, second):
+        stats = module.app.test_client().get("/admin/stats?key=k").get_json()
+        assert stats["data_directory"] == module.ARM.data_dir
+        # The service worker is served from study_core/static/
+        assert module.app.test_client().get("/sw.js").status_code == 200
+        with module.app.test_request_context():
+            url = module.ARM.static_assets.url("sw_register.js")
+        assert "v=" in url and module.app.test_client().get(url).status_code == 200
+
+
+def test_arm_cannot_import_another_arms_module(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEMPLATE_CACHE", "0")
+    load_arm(make_arm(tmp_path, "with_helper", "arm_with_helper", helper="mine"))
+    with pytest.raises(ImportError):
+        load_arm(make_arm(tmp_path, "without_helper", "arm_without_helper"))
+    assert "study_arm_arm_without_helper" not in sys.modules
+
+
+def test_shared_bundles_call_the_arms_pages(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEMPLATE_CACHE", "0")
+    module = load_arm(make_arm(tmp_path, "pages", "arm_pages", helper="pages"))
+    arm, app = module.ARM, module.app
+    app.add_url_rule("/reading/<int:article_num>", "reading_phase", lambda article_num: "")
+    app.add_url_rule("/summary/<int:article_num>", "summary_view", lambda article_num: "")
+    arm.get_lang = lambda: "en"
+    arm.localized_article = lambda key: {"title": key.upper(), "text": key}
+    arm.require_pid = lambda fn: fn
+    arm.reading_page = lambda article_num, record: f"reading {article_num}"
+    arm.summary_page = lambda article_num, record: f"summary {article_num}"
+    arm.summary_endpoint = "summary_view"
+    arm.summary_first = lambda article_num: article_num == 0
+
+    client = app.test_client()
+    with client.session_transaction() as s:
+        s["participant_id"] = "P1"
+        s["article_order"] = ["uhi", "cbt"]
+        s["timing_order"] = ["pre_reading", "synchronous"]
+    assert client.get("/next_bundle/0").get_json()["html"] == "summary 0"
+    assert client.get("/next_bundle/1").get_json()["url"] == "/reading/1"
+    assert [a["title"] for a in client.get("/article_bundles").get_json()["articles"]] == ["UHI", "CBT"]
+
+    client.post("/bundle_shown/1")
+    token = arm.article_tokens.issue("P1", 0)
+    with app.test_request_context(headers={"X-Submission-Replay": "1", "X-Article-Token": token}):
+        from flask import session
+        session.update(participant_id="P1", article_order=["uhi", "cbt"], timing_order=["pre_reading", "synchronous"],
+                       current_article=1, current_article_key="cbt")
+        assert arm.reading_row({"article_num": 1}) == {"article_num": 0, "article_key": "uhi", "timing": "pre_reading"}
+    with client.session_transaction() as s:
+        assert (s["current_article"], s["current_timing"]) == (1, "synchronous")
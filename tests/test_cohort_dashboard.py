@@ -0,0 +1,96 @@
+import csv
+import statistics
+from datetime import datetime
+
+from study_core import cohort_dashboard
+from study_core.cohort_dashboard import CohortAggregates
+
+
+def test_stage_durations_are_bounded(monkeypatch):
+    monkeypatch.setattr(cohort_dashboard, "MAX_DURATION_SAMPLES", 200)
+    cohort = CohortAggregates()
+    seconds = []
+    for i in range(3000):
+        pid = f"P{i}"
+        cohort.observe(pid, "demographics", {}, at=1000.0)
+        cohort.observe(pid, "consent", {}, at=1000.0 + 10 + i % 100)
+        seconds.append(10 + i % 100)
+
+    assert len(cohort.durations["consent"]) == 200
+    assert cohort.durations["consent"] == sorted(cohort.durations["consent"])
+    row = next(r for r in cohort.snapshot()["stage_durations"] if r["stage"] == "consent")
+    assert row["n"] == 3000
+    assert abs(row["median_seconds"] - statistics.median(seconds)) < 15
+
+
+def test_replay_dir_reads_existing_logs(tmp_path):
+    with open(tmp_path / "P300_log.csv", "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["timestamp", "phase", "full_name"])
+        w.writerow(["2026-03-01T10:00:00", "demographics", "A"])
+        w.writerow(["2026-03-01T10:01:00", "consent", "yes"])
+    cohort = CohortAggregates()
+    assert cohort.replay_dir(str(tmp_path)) == 1
+    snapshot = cohort.snapshot()
+    assert snapshot["participants"] == 1
+    assert snapshot["stage_durations"] == [{"stage": "consent", "n": 1, "median_seconds": 60.0}]
+
+
+def test_replay_reads_the_control_layout(tmp_path):
+    rows = [
+        ["2026-03-01T10:00:00", "randomization", '["uhi", "crispr", "cbt"]', "control_no_ai"],
+        ["2026-03-01T10:05:00", "mcq_responses", "0", "uhi", "{}", "{}", "{}", "90000", "4", "5", "0.8", "{}"],
+        ["2026-03-01T10:06:00", "post_article_ratings", "0", "uhi", "4", "3", "5"],
+        ["2026-03-01T10:20:00", "post_article_ratings", "2", "cbt", "4", "3", "5"],
+    ]
+    with open(tmp_path / "P301-Ann-NON-AI_log.csv", "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["timestamp", "phase", "article_order", "condition"])
+        w.writerows(rows)
+    cohort = CohortAggregates(completion_stage="post_article_ratings", articles=3, timing_column=False)
+    assert cohort.replay_dir(str(tmp_path)) == 1
+    snapshot = cohort.snapshot()
+    assert snapshot["completed"] == 1
+    assert snapshot["cells"][0]["article_order"] == "uhi>crispr>cbt"
+    assert snapshot["mcq_accuracy_by_timing"] == [{"timing": "control", "correct": 4, "total": 5, "accuracy": 0.8}]
+
+    live = CohortAggregates(completion_stage="post_article_ratings", articles=3, timing_column=False)
+    live.observe("P302", "post_article_ratings", {"article_num": 0}, at=1000.0)
+    assert live.snapshot()["completed"] == 0
+    live.observe("P302", "post_article_ratings", {"article_num": 2}, at=2000.0)
+    assert live.snapshot()["completed"] == 1
+
+
+def test_replay_does_not_double_count_live_events(tmp_path):
+    header = ["timestamp", "phase", "article_num", "article_key", "timing", "a", "b", "c", "d",
+              "correct_count", "total_questions"]
+
+    def mcq(pid, correct, total, at=None):
+        """Log one mcq_responses row like log_data: observe live, then append with the current time."""
+        data = {"timing": "synchronous", "correct_count": correct, "total_questions": total}
+        if at is None:
+            cohort.observe(pid, "mcq_responses", data)
+            at = datetime.now().astimezone().isoformat()
+        path = tmp_path / f"{pid}_log.csv"
+        new = not path.exists()
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            if new:
+                w.writerow(header)
+            w.writerow([at, "mcq_responses", "0", "uhi", "synchronous", "", "", "", "", correct, total])
+
+    # Logged by the previous process
+    mcq("P400", 3, 5, at="2026-03-01T10:00:00")
+    cohort = CohortAggregates(replay=True)
+    # Submitted while the server is warming up, before and during the replay
+    mcq("P400", 4, 5)
+    mcq("P401", 2, 5)
+    cohort.replay_dir(str(tmp_path))
+    mcq("P401", 5, 5)
+
+    expected = {"timing": "synchronous", "correct": 14, "total": 20, "accuracy": 0.7}
+    assert cohort.snapshot()["mcq_accuracy_by_timing"] == [expected]
+    fresh = CohortAggregates()
+    fresh.replay_dir(str(tmp_path))
+    assert fresh.snapshot()["mcq_accuracy_by_timing"] == [expected]
+    assert cohort.snapshot()["participants"] == 2
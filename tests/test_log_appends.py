@@ -0,0 +1,118 @@
+"""Concurrent appends to one participant's log (what log_data() does under LOG_LOCKS)."""
+
+import csv
+import fcntl
+import glob
+import multiprocessing
+import os
+import random
+import threading
+
+from study_core.log_index import INDEX_FILE, LogPaths, load_index
+from study_core import log_lock
+from study_core.log_lock import ParticipantLocks, append_row
+
+PARTICIPANT_ID = "P999"
+NAMED = f"{PARTICIPANT_ID}-Stress-Test-Integrated_log.csv"
+TEXT = 'line one, with "quotes"\nline two, 中文\n'
+FIELDS = ["timestamp", "phase", "worker", "seq", "text", "pad"]
+
+
+def _pad(worker, seq):
+    return "x" * random.Random(f"{worker}:{seq}").randint(0, 8192)
+
+
+def _append_rows(data_dir, process_index, n_threads, n_rows):
+    """One worker process: its own lock file descriptor and index, n_threads appending threads."""
+    locks = ParticipantLocks(os.path.join(data_dir, ".log_locks"))
+    paths = LogPaths(data_dir)
+    errors = []
+
+    def work(thread_index):
+        worker = f"{process_index}.{thread_index}"
+        # Each thread learns the final name at a different row, so the rename races the appends
+        switch_at = random.Random(worker).randint(0, n_rows)
+        try:
+            for seq in range(n_rows):
+                with locks.hold(PARTICIPANT_ID):
+                    path = paths.resolve(PARTICIPANT_ID, NAMED if seq >= switch_at else None)
+                    append_row(path, FIELDS, {"timestamp": "t", "phase": "stress_test", "worker": worker,
+                                              "seq": seq, "text": TEXT, "pad": _pad(worker, seq)})
+        except Exception as e:
+            errors.append(f"{worker}: {e!r}")
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return errors
+
+
+def _process_main(data_dir, process_index, n_threads, n_rows):
+    os._exit(1 if _append_rows(data_dir, process_index, n_threads, n_rows) else 0)
+
+
+def _check_log(data_dir, expected_rows):
+    logs = glob.glob(os.path.join(data_dir, "*_log.csv"))
+    assert [os.path.basename(p) for p in logs] == [NAMED]
+    assert load_index(data_dir)[PARTICIPANT_ID] == logs[0], f"{INDEX_FILE} points elsewhere"
+
+    seen = set()
+    with open(logs[0], "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        assert next(reader) == FIELDS
+        for row in reader:
+            assert len(row) == 6 and row[1] == "stress_test" and row[4] == TEXT
+            worker, seq = row[2], int(row[3])
+            assert row[5] == _pad(worker, seq), f"padding of {worker}/{seq} corrupted"
+            assert (worker, seq) not in seen, f"duplicate {worker}/{seq}"
+            seen.add((worker, seq))
+    assert len(seen) == expected_rows
+
+
+def test_threads_append_whole_rows_to_one_file(tmp_path):
+    assert _append_rows(str(tmp_path), 0, n_threads=8, n_rows=40) == []
+    _check_log(str(tmp_path), 8 * 40)
+
+
+def test_processes_append_whole_rows_to_one_file(tmp_path):
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_process_main, args=(str(tmp_path), i, 4, 25)) for i in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+    assert [p.exitcode for p in procs] == [0, 0, 0]
+    _check_log(str(tmp_path), 3 * 4 * 25)
+
+
+def _try_lock(lock_path, offset, result):
+    fd = os.open(lock_path, os.O_RDWR)
+    try:
+        fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, offset, os.SEEK_SET)
+        result.value = 1
+    except OSError:
+        result.value = 0
+    finally:
+        os.close(fd)
+
+
+def test_hold_locks_only_the_participants_range_across_processes(tmp_path):
+    lock_path = os.path.join(str(tmp_path), ".log_locks")
+    locks = ParticipantLocks(lock_path)
+    other = next(f"P{i}" for i in range(1000)
+                 if log_lock._hash(f"P{i}") % log_lock.N_RANGES != log_lock._hash(PARTICIPANT_ID) % log_lock.N_RANGES)
+    ctx = multiprocessing.get_context("fork")
+
+    def probe(participant_id):
+        result = ctx.Value("i", -1)
+        p = ctx.Process(target=_try_lock, args=(lock_path, log_lock._hash(participant_id) % log_lock.N_RANGES, result))
+        p.start()
+        p.join(10)
+        return result.value
+
+    with locks.hold(PARTICIPANT_ID):
+        assert probe(PARTICIPANT_ID) == 0   # held by this process
+        assert probe(other) == 1            # other participants' ranges stay free
+    assert probe(PARTICIPANT_ID) == 1
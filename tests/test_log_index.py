@@ -0,0 +1,35 @@
+import os
+
+from study_core.log_index import INDEX_FILE, LogPaths, find_log, load_index
+
+
+def test_find_log_uses_the_index(tmp_path):
+    data_dir = str(tmp_path)
+    paths = LogPaths(data_dir)
+    path = paths.resolve("P1")
+    open(path, "w").close()
+    renamed = paths.resolve("P1", "P1-Ann-Integrated_log.csv")
+    assert os.path.exists(renamed)
+    assert find_log(data_dir, "P1") == renamed
+
+
+def test_find_log_falls_back_to_a_scan_and_refreshes_the_index(tmp_path):
+    data_dir = str(tmp_path)
+    LogPaths(data_dir)  # index exists but knows nobody yet
+    (tmp_path / "P1_log.csv").write_text("timestamp,phase\n")
+    LogPaths(data_dir).resolve("P1")
+    # Copied in later, without an index line
+    (tmp_path / "P2-Bo-Segmented_log.csv").write_text("timestamp,phase\n")
+    assert "P2" not in load_index(data_dir)
+
+    assert find_log(data_dir, "P2") == os.path.join(data_dir, "P2-Bo-Segmented_log.csv")
+    assert load_index(data_dir)["P2"] == os.path.join(data_dir, "P2-Bo-Segmented_log.csv")
+    assert find_log(data_dir, "P3") is None
+
+
+def test_find_log_replaces_a_stale_entry(tmp_path):
+    data_dir = str(tmp_path)
+    (tmp_path / INDEX_FILE).write_text("P4\tP4_log.csv\n")
+    (tmp_path / "P4-Cy-Integrated_log.csv").write_text("timestamp,phase\n")
+    assert find_log(data_dir, "P4") == os.path.join(data_dir, "P4-Cy-Integrated_log.csv")
+    assert LogPaths(data_dir).get("P4") == os.path.join(data_dir, "P4-Cy-Integrated_log.csv")
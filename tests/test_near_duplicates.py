@@ -0,0 +1,35 @@
+import near_duplicates
+from near_duplicates import MIN_SHINGLES, find_near_duplicates, lsh_candidates, minhash_signatures, shingles
+
+RECALL = ("Urban heat islands form because dark roofs and asphalt absorb sunlight and release it at night, "
+          "while trees and cool roofs lower surface temperatures across the city.")
+OTHER = ("CRISPR uses a guide RNA to lead the Cas9 enzyme to a matching DNA sequence, "
+         "where it cuts both strands so the cell repairs the break.")
+
+
+def test_duplicates_are_found_and_indices_map_back():
+    texts = ["", RECALL, "short", OTHER, RECALL.replace("night", "nighttime")]
+    pairs = find_near_duplicates(texts)
+    assert [(i, j) for i, j, _est, _exact in pairs] == [(1, 4)]
+    _i, _j, estimate, exact = pairs[0]
+    assert estimate >= near_duplicates.THRESHOLD
+    assert 0 < exact <= 1
+
+
+def test_empty_and_short_recalls_are_not_hashed(monkeypatch):
+    short = ["", " ", "ok", "too short", "a b c d e f"]
+    assert all(len(shingles(t)) < MIN_SHINGLES for t in short)
+
+    seen = []
+    real_candidates = lsh_candidates
+    monkeypatch.setattr(near_duplicates, "lsh_candidates",
+                        lambda sig, bands: seen.append(sig.shape[0]) or real_candidates(sig, bands=bands))
+
+    texts = short * 40 + [RECALL, OTHER]
+    assert find_near_duplicates(texts) == []
+    assert seen == [2]
+
+
+def test_no_usable_recalls():
+    assert find_near_duplicates(["", "x", "tiny"]) == []
+    assert minhash_signatures([]).shape == (0, near_duplicates.NUM_PERM)
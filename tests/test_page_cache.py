@@ -0,0 +1,25 @@
+from study_core.page_cache import PageCache
+
+
+def test_lru_hits_and_stats():
+    cache = PageCache(max_entries=2)
+    renders = []
+
+    def render(text):
+        return lambda: renders.append(text) or text
+
+    html, etag = cache.get_or_render(("consent.html", "en"), render("<p>consent</p>"))
+    assert cache.get_or_render(("consent.html", "en"), render("other")) == (html, etag)
+    cache.get_or_render(("consent.html", "zh"), render("<p>同意</p>"))
+    cache.get_or_render(("excluded.html", "en"), render("<p>excluded</p>"))   # evicts consent/en
+    cache.get_or_render(("consent.html", "en"), render("<p>consent</p>"))
+    assert renders == ["<p>consent</p>", "<p>同意</p>", "<p>excluded</p>", "<p>consent</p>"]
+
+    cache.count_not_modified("consent.html")
+    stats = cache.stats(participants=4)
+    assert stats["entries"] == 2
+    assert stats["participants"] == 4
+    assert abs(stats["cpu_saved_ms_per_participant"] - stats["cpu_saved_ms"] / 4) <= 0.001
+    consent = next(t for t in stats["templates"] if t["template"] == "consent.html")
+    assert (consent["renders"], consent["hits"], consent["not_modified"]) == (3, 1, 1)
+    assert cache.stats(participants=0)["cpu_saved_ms_per_participant"] is None
@@ -0,0 +1,61 @@
+import csv
+
+from study_core.quality_monitor import QualityMonitor
+
+
+def _iso(seconds):
+    return f"2026-03-01T10:{int(seconds) // 60:02d}:{int(seconds) % 60:02d}+00:00"
+
+
+def test_speeder_mcq_uses_gaps_between_cumulative_times():
+    monitor = QualityMonitor()
+    # Cumulative from page load: 10 s per answer, none of them fast
+    steady = {f"q{i}": 10000 * (i + 1) for i in range(14)}
+    monitor.observe("P1", "mcq_responses", {"mcq_answer_times_ms": steady})
+    assert "speeder_mcq" not in monitor.snapshot("P1")["flags"]
+
+    # A long first read, then a click every second
+    burst = {f"q{i}": 60000 + 1000 * i for i in range(14)}
+    monitor.observe("P2", "mcq_responses", {"mcq_answer_times_ms": burst})
+    summary = monitor.snapshot("P2")
+    assert "speeder_mcq" in summary["flags"]
+    assert summary["mcq_fast_share"] > 0.9
+
+
+def test_hidden_time_is_kept_per_article():
+    monitor = QualityMonitor(article_words={"uhi": 600, "crispr": 600})
+    hide = {"event": "visibility_change", "hidden": True}
+    show = {"event": "visibility_change", "hidden": False}
+    # Hidden for 100 s while reading crispr, which is never completed here
+    monitor.observe("P1", "reading_behavior", dict(hide, article_key="crispr", timestamp=_iso(0)))
+    monitor.observe("P1", "reading_behavior", dict(show, article_key="crispr", timestamp=_iso(100)))
+    # uhi: hidden 30 s out of 300 s
+    monitor.observe("P1", "reading_behavior", dict(hide, article_key="uhi", timestamp=_iso(200)))
+    monitor.observe("P1", "reading_behavior", dict(show, article_key="uhi", timestamp=_iso(230)))
+    monitor.observe("P1", "reading_behavior", {"event": "reading_complete", "article_key": "uhi",
+                                               "totalReadingTime": 300000, "timestamp": _iso(500)})
+    summary = monitor.snapshot("P1")
+    assert summary["hidden_ratio"] == {"uhi": 0.1}
+    assert "tab_hidden" not in summary["flags"]
+
+    monitor.observe("P1", "reading_behavior", {"event": "reading_complete", "article_key": "crispr",
+                                               "totalReadingTime": 200000, "timestamp": _iso(600)})
+    summary = monitor.snapshot("P1")
+    assert summary["hidden_ratio"]["crispr"] == 0.5
+    assert "tab_hidden" in summary["flags"]
+
+
+def test_flags_are_persisted_once_and_reloaded(tmp_path):
+    path = tmp_path / "quality_flags.csv"
+    monitor = QualityMonitor(flag_log_path=str(path))
+    for _ in range(2):
+        monitor.observe("P7", "recall_response", {"article_key": "uhi", "paste_attempts": 2})
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [(r["participant_id"], r["flag"]) for r in rows] == [("P7", "paste_attempts")]
+
+    restarted = QualityMonitor(flag_log_path=str(path))
+    assert set(restarted.snapshot("P7")["flags"]) == {"paste_attempts"}
+    restarted.observe("P7", "recall_response", {"article_key": "crispr", "paste_attempts": 1})
+    with open(path, newline="", encoding="utf-8") as f:
+        assert len(list(csv.DictReader(f))) == 1
@@ -0,0 +1,37 @@
+import os
+
+from study_core.submission_ids import INDEX_FILE, ArticleTokens, SubmissionIds
+
+
+def test_other_workers_see_recorded_ids(tmp_path):
+    first, second = SubmissionIds(str(tmp_path)), SubmissionIds(str(tmp_path))
+    first.record("P1", "sub-00001", 200, '{"status": "ok"}')
+    assert second.get("P1", "sub-00001") == (200, '{"status": "ok"}')
+    assert second.get("P2", "sub-00001") is None
+
+
+def test_rotation_keeps_two_generations(tmp_path):
+    data_dir = str(tmp_path)
+    first = SubmissionIds(data_dir, max_bytes=200)
+    lagging = SubmissionIds(data_dir, max_bytes=200)
+    for i in range(20):
+        first.record("P1", f"sub-{i:05d}", 200, '{"status": "ok"}')
+    assert os.path.getsize(os.path.join(data_dir, INDEX_FILE)) < 200
+    assert os.path.exists(os.path.join(data_dir, INDEX_FILE + ".1"))
+
+    # The newest ids are found by every worker, including one started afterwards
+    for ids in (first, lagging, SubmissionIds(data_dir, max_bytes=200)):
+        assert ids.get("P1", "sub-00019") is not None
+        assert ids.get("P1", "sub-00012") is not None
+    # Ids older than the previous generation are forgotten
+    assert first.get("P1", "sub-00000") is None
+
+
+def test_article_tokens_are_bound_to_the_participant():
+    tokens = ArticleTokens("secret")
+    token = tokens.issue("P1", 2)
+    assert tokens.article_num(token, "P1") == 2
+    assert tokens.article_num(token, "P2") is None
+    assert tokens.article_num(token + "x", "P1") is None
+    assert tokens.article_num("", "P1") is None
+    assert ArticleTokens("other").article_num(token, "P1") is None
@@ -0,0 +1,41 @@
+import io
+import os
+import zipfile
+
+from study_core.zip_stream import iter_zip, parse_level
+
+
+def _log(tmp_path, name="P1_log.csv"):
+    path = tmp_path / name
+    rows = "".join(f"2026-03-01T10:00:{i % 60:02d},reading_behavior,scroll,{i * 7919 % 1000}\n" for i in range(5000))
+    path.write_text("timestamp,phase,event,value\n" + rows, encoding="utf-8")
+    return str(path)
+
+
+def _archive(entries, level, blobs=()):
+    compress_type, compresslevel = parse_level(level)
+    return b"".join(iter_zip(entries, compress_type, compresslevel, blobs=blobs))
+
+
+def test_level_applies_to_streamed_files(tmp_path):
+    path = _log(tmp_path)
+    sizes = {}
+    for level in ("1", "9", "stored"):
+        data = _archive([(path, "P1_log.csv")], level)
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            info = zf.getinfo("P1_log.csv")
+            assert zf.read(info) == open(path, "rb").read()
+            sizes[level] = info.compress_size
+    assert sizes["9"] < sizes["1"] < sizes["stored"] == os.path.getsize(path)
+
+
+def test_byte_ranges_compact_files_and_blobs(tmp_path):
+    path = _log(tmp_path)
+    image = tmp_path / "figure.png"
+    image.write_bytes(os.urandom(4096))
+    data = _archive([(path, "tail.csv", 100, 50), (str(image), "figure.png"),
+                     (str(tmp_path / "missing.csv"), "missing.csv")], "6", blobs=[("delta.json", "{}")])
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.namelist() == ["delta.json", "tail.csv", "figure.png"]
+        assert zf.read("tail.csv") == open(path, "rb").read()[100:150]
+        assert zf.getinfo("figure.png").compress_type == zipfile.ZIP_STORED